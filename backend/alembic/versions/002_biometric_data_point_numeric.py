@@ -0,0 +1,53 @@
+# -*- coding: utf-8 -*-
+"""Native numeric values and range-scan index for biometric data points
+
+Revision ID: 002_biometric_data_point_numeric
+Revises: 001_initial_schema
+Create Date: 2026-10-16 12:00:00.000000
+
+Adds the nullable value_numeric column (backfilled from numeric string
+values) and the composite (twin_id, data_type, timestamp) index, which
+replaces the single-column twin_id index. The biometric tables are created
+from the models, so databases without them are left to create_all.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '002_biometric_data_point_numeric'
+down_revision = '001_initial_schema'
+branch_labels = None
+depends_on = None
+
+TABLE = 'biometric_data_points'
+
+
+def _has_table() -> bool:
+    return sa.inspect(op.get_bind()).has_table(TABLE)
+
+
+def _index_names() -> set:
+    return {index['name'] for index in sa.inspect(op.get_bind()).get_indexes(TABLE)}
+
+
+def upgrade() -> None:
+    if not _has_table():
+        return
+    op.add_column(TABLE, sa.Column('value_numeric', sa.Float(), nullable=True))
+    op.execute(
+        f"UPDATE {TABLE} SET value_numeric = CAST(value AS FLOAT) WHERE value_type = 'number'"
+    )
+    op.create_index(
+        'ix_biometric_data_points_twin_type_time', TABLE, ['twin_id', 'data_type', 'timestamp']
+    )
+    # The composite index serves twin_id lookups by prefix
+    if 'ix_biometric_data_points_twin_id' in _index_names():
+        op.drop_index('ix_biometric_data_points_twin_id', table_name=TABLE)
+
+
+def downgrade() -> None:
+    if not _has_table():
+        return
+    op.create_index('ix_biometric_data_points_twin_id', TABLE, ['twin_id'])
+    op.drop_index('ix_biometric_data_points_twin_type_time', table_name=TABLE)
+    op.drop_column(TABLE, 'value_numeric')
@@ -0,0 +1,42 @@
+# -*- coding: utf-8 -*-
+"""Hash-chain columns for audit logs
+
+Revision ID: 003_audit_log_hash_chain
+Revises: 002_biometric_data_point_numeric
+Create Date: 2026-10-16 12:30:00.000000
+
+Adds previous_hash and entry_hash, written by the audit pipeline, and an
+index on entry_hash for looking entries up from the log file's chain. The
+audit_logs table is created from the model, so databases without it are
+left to create_all.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '003_audit_log_hash_chain'
+down_revision = '002_biometric_data_point_numeric'
+branch_labels = None
+depends_on = None
+
+TABLE = 'audit_logs'
+
+
+def _has_table() -> bool:
+    return sa.inspect(op.get_bind()).has_table(TABLE)
+
+
+def upgrade() -> None:
+    if not _has_table():
+        return
+    op.add_column(TABLE, sa.Column('previous_hash', sa.String(64), nullable=True))
+    op.add_column(TABLE, sa.Column('entry_hash', sa.String(64), nullable=True))
+    op.create_index('ix_audit_logs_entry_hash', TABLE, ['entry_hash'])
+
+
+def downgrade() -> None:
+    if not _has_table():
+        return
+    op.drop_index('ix_audit_logs_entry_hash', table_name=TABLE)
+    op.drop_column(TABLE, 'entry_hash')
+    op.drop_column(TABLE, 'previous_hash')
@@ -387,8 +387,7 @@ class TemporalNeurotransmitterService:
             starting_region=starting_region,
             neurotransmitter=neurotransmitter,
             initial_level=0.8,  # Strong initial activation
-            time_steps=time_steps,
-            patient_id=patient_id
+            time_steps=time_steps
         )
         
         # Preprocess for visualization
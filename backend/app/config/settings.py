@@ -48,6 +48,12 @@ class PATSettings(BaseSettings):
 
     model_path: str = Field(default="/models/pat/pat-medium", json_schema_extra={"env": "MODEL_PATH"})
     cache_dir: str = Field(default="/cache/pat", json_schema_extra={"env": "CACHE_DIR"})
+    # Analysis result cache: "file", "sqlite" (shared by local workers), "redis" or "none"
+    cache_backend: str = Field(default="file", json_schema_extra={"env": "CACHE_BACKEND"})
+    cache_max_bytes: int = Field(default=512 * 1024 * 1024, json_schema_extra={"env": "CACHE_MAX_BYTES"})
+    cache_max_age_seconds: int = Field(default=7 * 24 * 3600, json_schema_extra={"env": "CACHE_MAX_AGE_SECONDS"})
+    # Part of every result cache key; derived from the model files when empty
+    model_version: str = Field(default="", json_schema_extra={"env": "MODEL_VERSION"})
     use_gpu: bool = Field(default=True, json_schema_extra={"env": "USE_GPU"})
     results_storage_path: str = Field(default="/storage/pat_results", json_schema_extra={"env": "RESULTS_STORAGE_PATH"})
 
@@ -72,6 +78,29 @@ class PHIDetectionSettings(BaseSettings):
     parallel_processing: bool = Field(default=True, json_schema_extra={"env": "PARALLEL_PROCESSING"})
     # Add other Presidio/PHI settings if needed
 
+class InferenceSettings(BaseSettings):
+    model_config = ConfigDict(env_prefix='INFERENCE_')
+
+    # Worker pools for CPU-bound model calls (see app.infrastructure.ml.inference_executor)
+    torch_workers: int = Field(default=2, json_schema_extra={"env": "TORCH_WORKERS"})
+    # Intra-op threads for torch; 0 splits the cores between the torch workers
+    torch_threads: int = Field(default=0, json_schema_extra={"env": "TORCH_THREADS"})
+    xgboost_workers: int = Field(default=2, json_schema_extra={"env": "XGBOOST_WORKERS"})
+    # Threads per xgboost prediction; 0 lets xgboost use every core
+    xgboost_nthread: int = Field(default=1, json_schema_extra={"env": "XGBOOST_NTHREAD"})
+    queue_size: int = Field(default=32, json_schema_extra={"env": "QUEUE_SIZE"})
+    timeout_seconds: float = Field(default=30.0, json_schema_extra={"env": "TIMEOUT_SECONDS"})
+    # Micro-batching of concurrent forecast requests (see app.infrastructure.ml.micro_batcher);
+    # a larger wait fills bigger batches under load at the cost of latency, size 1 disables it
+    batch_max_size: int = Field(default=32, json_schema_extra={"env": "BATCH_MAX_SIZE"})
+    batch_max_wait_ms: float = Field(default=5.0, json_schema_extra={"env": "BATCH_MAX_WAIT_MS"})
+    # Requests whose history lengths round up to the same multiple share a padded batch
+    batch_length_bucket: int = Field(default=16, json_schema_extra={"env": "BATCH_LENGTH_BUCKET"})
+    # Local MentaLLaMA generation worker (see app.infrastructure.ml.mentallama.generation_worker):
+    # sequences decoded together in one continuous batch, and prompts that may wait for a slot
+    generation_max_batch_size: int = Field(default=8, json_schema_extra={"env": "GENERATION_MAX_BATCH_SIZE"})
+    generation_queue_size: int = Field(default=32, json_schema_extra={"env": "GENERATION_QUEUE_SIZE"})
+
 class MLSettings(BaseSettings):
     """Container for all ML model settings."""
     # General ML paths (can be overridden by specific model settings if needed)
@@ -85,6 +114,7 @@ class MLSettings(BaseSettings):
     xgboost: XGBoostSettings = Field(default_factory=XGBoostSettings)
     lstm: LSTMSettings = Field(default_factory=LSTMSettings)
     phi_detection: PHIDetectionSettings = Field(default_factory=PHIDetectionSettings)
+    inference: InferenceSettings = Field(default_factory=InferenceSettings)
 
 
 # --- Main Settings Class ---
@@ -118,6 +148,13 @@ class Settings(BaseSettings):
     ACCESS_TOKEN_EXPIRE_MINUTES: int = Field(default=30, json_schema_extra={"env": "ACCESS_TOKEN_EXPIRE_MINUTES"})
     ALGORITHM: str = Field(default="HS256", json_schema_extra={"env": "ALGORITHM"})
     JWT_REFRESH_TOKEN_EXPIRE_DAYS: int = Field(default=7, json_schema_extra={"env": "JWT_REFRESH_TOKEN_EXPIRE_DAYS"})
+
+    # Authenticated principal cache (AuthenticationMiddleware)
+    AUTH_PRINCIPAL_CACHE_ENABLED: bool = Field(default=True, json_schema_extra={"env": "AUTH_PRINCIPAL_CACHE_ENABLED"})
+    AUTH_PRINCIPAL_CACHE_SIZE: int = Field(default=10000, json_schema_extra={"env": "AUTH_PRINCIPAL_CACHE_SIZE"})
+    AUTH_PRINCIPAL_CACHE_TTL_SECONDS: float = Field(default=60.0, json_schema_extra={"env": "AUTH_PRINCIPAL_CACHE_TTL_SECONDS"})
+    # Share revocations across workers through Redis
+    AUTH_PRINCIPAL_CACHE_SHARED: bool = Field(default=False, json_schema_extra={"env": "AUTH_PRINCIPAL_CACHE_SHARED"})
     
     # MFA Settings
     MFA_SECRET_KEY: SecretStr = Field(
@@ -282,6 +319,14 @@ class Settings(BaseSettings):
     AUDIT_LOG_TO_FILE: bool = Field(default=False, json_schema_extra={"env": "AUDIT_LOG_TO_FILE"})
     AUDIT_LOG_FILE: str = Field(default="audit.log", json_schema_extra={"env": "AUDIT_LOG_FILE"})
     EXTERNAL_AUDIT_ENABLED: bool = Field(default=False, json_schema_extra={"env": "EXTERNAL_AUDIT_ENABLED"})
+    AUDIT_ASYNC_ENABLED: bool = Field(default=True, json_schema_extra={"env": "AUDIT_ASYNC_ENABLED"})
+    AUDIT_QUEUE_SIZE: int = Field(default=10000, json_schema_extra={"env": "AUDIT_QUEUE_SIZE"})
+    AUDIT_BATCH_SIZE: int = Field(default=500, json_schema_extra={"env": "AUDIT_BATCH_SIZE"})
+    AUDIT_FSYNC_INTERVAL_SECONDS: float = Field(default=1.0, json_schema_extra={"env": "AUDIT_FSYNC_INTERVAL_SECONDS"})
+    AUDIT_OVERFLOW_POLICY: str = Field(default="block", json_schema_extra={"env": "AUDIT_OVERFLOW_POLICY"})  # "block" or "spill"
+    AUDIT_SPILL_FILE: Optional[str] = Field(default=None, json_schema_extra={"env": "AUDIT_SPILL_FILE"})
+    AUDIT_LOG_TO_DATABASE: bool = Field(default=False, json_schema_extra={"env": "AUDIT_LOG_TO_DATABASE"})
+    AUDIT_CONSOLE_ECHO: bool = Field(default=True, json_schema_extra={"env": "AUDIT_CONSOLE_ECHO"})
     
     # --- Nested ML Settings ---
     ml: MLSettings = Field(default_factory=MLSettings)
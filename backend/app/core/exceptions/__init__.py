@@ -34,12 +34,15 @@ from app.core.exceptions.ml_exceptions import (
     InvalidRequestError,
     MLServiceError,
     ModelNotFoundError,
+    ModelLoadingError,
     ServiceUnavailableError,
     PHIDetectionError,
     MentalLLaMAServiceError,
     MentalLLaMAInferenceError,
     XGBoostServiceError,
     DigitalTwinError,
+    InferenceQueueFullError,
+    InferenceTimeoutError,
 )
 
 __all__ = [
@@ -52,6 +55,8 @@ __all__ = [
     "DatabaseException",
     "DigitalTwinError",
     "ExternalServiceException",
+    "InferenceQueueFullError",
+    "InferenceTimeoutError",
     "InitializationError",
     "InvalidConfigurationError",
     "InvalidRequestError",
@@ -59,6 +64,7 @@ __all__ = [
     "MentalLLaMAInferenceError",
     "MentalLLaMAServiceError",
     "ModelNotFoundError",
+    "ModelLoadingError",
     "PHIDetectionError",
     "ResourceNotFoundException",
     "ResourceNotFoundError",
@@ -160,6 +160,21 @@ class ModelNotFoundError(MLServiceError):
         super().__init__(message, *args, **kwargs)
 
 
+class ModelLoadingError(MLServiceError):
+    """Exception raised when an ML model or its client cannot be loaded."""
+    
+    def __init__(self, message: str = "Failed to load ML model", *args, **kwargs):
+        """
+        Initialize model loading error.
+        
+        Args:
+            message: Error message
+            args: Additional positional arguments
+            kwargs: Additional keyword arguments
+        """
+        super().__init__(message, *args, **kwargs)
+
+
 class ServiceUnavailableError(MLServiceError):
     """Exception raised when an ML service is unavailable or uninitialized."""
     
@@ -193,4 +208,43 @@ class DigitalTwinError(MLServiceError):
         Args:
             message: Error message
         """
-        super().__init__(message, *args, **kwargs)
\ No newline at end of file
+        super().__init__(message, *args, **kwargs)
+
+class InferenceQueueFullError(ServiceUnavailableError):
+    """Exception raised when a model family's inference queue is full."""
+
+    def __init__(self, family: str = None, queue_size: int = None, *args, **kwargs):
+        """
+        Initialize inference queue full error.
+
+        Args:
+            family: Model family whose queue is full
+            queue_size: Configured queue size
+            args: Additional positional arguments
+            kwargs: Additional keyword arguments
+        """
+        self.family = family
+        self.queue_size = queue_size
+        reason = f"queue full ({queue_size} waiting)" if queue_size is not None else "queue full"
+        super().__init__(f"{family} inference" if family else "Inference", reason, *args, **kwargs)
+
+
+class InferenceTimeoutError(MLServiceError):
+    """Exception raised when a model call does not finish within its timeout."""
+
+    def __init__(self, family: str = None, timeout_seconds: float = None, *args, **kwargs):
+        """
+        Initialize inference timeout error.
+
+        Args:
+            family: Model family of the call
+            timeout_seconds: Timeout that was exceeded
+            args: Additional positional arguments
+            kwargs: Additional keyword arguments
+        """
+        self.family = family
+        self.timeout_seconds = timeout_seconds
+        message = f"{family or 'Model'} inference timed out"
+        if timeout_seconds is not None:
+            message = f"{message} after {timeout_seconds}s"
+        super().__init__(message, *args, **kwargs)
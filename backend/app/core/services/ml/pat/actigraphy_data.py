@@ -0,0 +1,545 @@
+# -*- coding: utf-8 -*-
+"""
+Columnar Actigraphy Data.
+
+This module provides a columnar representation of accelerometer readings
+(int64 epoch-nanosecond timestamps plus an (n, 3) x/y/z matrix) and
+vectorized constructors for the formats readings arrive in: lists of
+reading dicts, packed binary buffers, NumPy record arrays and Arrow tables,
+plus the binary upload encodings accepted by the actigraphy API.
+
+A day of 30 Hz data is ~2.6M readings; building it from per-reading Python
+objects dominates analysis time, so every path here converts whole columns
+at once and binary inputs are wrapped without copying.
+"""
+
+import io
+import json
+import struct
+from datetime import datetime, timezone
+from itertools import chain
+from operator import itemgetter
+from typing import Any, Dict, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+try:
+    import pyarrow as pa
+except ImportError:
+    pa = None  # Arrow IPC uploads unavailable
+
+from app.core.services.ml.pat.exceptions import ValidationError
+
+# Packed little-endian reading record: int64 epoch-ns timestamp + float32 x/y/z
+READING_DTYPE = np.dtype([
+    ("timestamp_ns", "<i8"),
+    ("x", "<f4"),
+    ("y", "<f4"),
+    ("z", "<f4"),
+])
+
+# Consumer and research accelerometers clip at 8-16 g; anything beyond this is corrupt
+MAX_ABS_ACCELERATION_G = 32.0
+
+# Framed upload: magic, version, reserved, JSON header length, header, padding, records
+UPLOAD_MAGIC = b"NMAG"
+UPLOAD_VERSION = 1
+_UPLOAD_PREFIX = struct.Struct("<4sHHI")
+_UPLOAD_ALIGNMENT = 8
+# Schema metadata key holding the JSON header in Arrow IPC uploads
+ARROW_METADATA_KEY = b"actigraphy"
+
+_AXES = ("x", "y", "z")
+_NS_PER_SECOND = 1_000_000_000
+
+
+class ActigraphyArray:
+    """
+    Columnar accelerometer readings.
+
+    Attributes:
+        timestamps_ns: int64 epoch timestamps in nanoseconds, or None when
+            the readings carry no time information
+        values: (n, 3) float array of x/y/z acceleration
+    """
+
+    __slots__ = ("timestamps_ns", "values")
+
+    def __init__(self, values: np.ndarray, timestamps_ns: Optional[np.ndarray] = None):
+        """
+        Initialize from column arrays.
+
+        Args:
+            values: (n, 3) array of x/y/z acceleration
+            timestamps_ns: Optional int64 epoch-ns timestamps, one per row
+
+        Raises:
+            ValidationError: If the shapes are inconsistent
+        """
+        values = np.asarray(values)
+        if values.ndim != 2 or values.shape[1] != 3:
+            raise ValidationError(
+                f"Accelerometer values must have shape (n, 3), got {values.shape}",
+                field="readings",
+            )
+        if timestamps_ns is not None:
+            timestamps_ns = np.asarray(timestamps_ns, dtype=np.int64)
+            if timestamps_ns.shape != (values.shape[0],):
+                raise ValidationError(
+                    "Timestamp count does not match reading count",
+                    field="timestamps",
+                )
+        self.values = values
+        self.timestamps_ns = timestamps_ns
+
+    def __len__(self) -> int:
+        return self.values.shape[0]
+
+    def duration_seconds(self, sampling_rate_hz: float) -> float:
+        """
+        Recording span, from the timestamps or else the sampling rate.
+
+        Args:
+            sampling_rate_hz: Nominal sampling rate, used without timestamps
+
+        Returns:
+            Seconds between the first and last reading
+        """
+        if len(self) < 2:
+            return 0.0
+        if self.timestamps_ns is not None:
+            return float(self.timestamps_ns[-1] - self.timestamps_ns[0]) / _NS_PER_SECOND
+        return (len(self) - 1) / sampling_rate_hz if sampling_rate_hz > 0 else 0.0
+
+    @classmethod
+    def from_records(cls, readings: Sequence[Dict[str, Any]]) -> "ActigraphyArray":
+        """
+        Build from a list of ``{"timestamp", "x", "y", "z"}`` reading dicts.
+
+        Timestamps are ISO 8601 strings (parsed by C-level parsers only; naive
+        values are taken as UTC) or numeric epoch seconds.
+
+        Args:
+            readings: Reading dictionaries
+
+        Returns:
+            Columnar readings
+        """
+        if not readings:
+            raise ValidationError("No actigraphy readings provided", field="readings")
+        try:
+            values = np.fromiter(
+                chain.from_iterable(map(itemgetter(*_AXES), readings)),
+                dtype=np.float64,
+                count=3 * len(readings),
+            ).reshape(-1, 3)
+            timestamps = list(map(itemgetter("timestamp"), readings))
+        except (KeyError, TypeError) as e:
+            raise ValidationError(f"Malformed actigraphy reading: {e}", field="readings")
+        except ValueError as e:
+            raise ValidationError(f"Non-numeric accelerometer value: {e}", field="readings")
+        return cls(values, parse_timestamps(timestamps))
+
+    @classmethod
+    def from_buffer(cls, buffer: Union[bytes, bytearray, memoryview]) -> "ActigraphyArray":
+        """
+        Wrap a packed buffer of READING_DTYPE records without copying it.
+
+        Args:
+            buffer: Concatenated 20-byte (int64 ns, float32 x, y, z) records
+
+        Returns:
+            Columnar readings viewing the buffer
+        """
+        if len(buffer) % READING_DTYPE.itemsize:
+            raise ValidationError(
+                f"Buffer length {len(buffer)} is not a multiple of the "
+                f"{READING_DTYPE.itemsize}-byte reading record",
+                field="readings",
+            )
+        return cls.from_record_array(np.frombuffer(buffer, dtype=READING_DTYPE))
+
+    @classmethod
+    def from_record_array(cls, records: np.ndarray) -> "ActigraphyArray":
+        """
+        Build from a NumPy structured array with x/y/z (and timestamp) fields.
+
+        Accepted timestamp fields are ``timestamp_ns`` (int64 epoch-ns) or
+        ``timestamp`` (datetime64 or float epoch seconds).
+
+        Args:
+            records: Structured array
+
+        Returns:
+            Columnar readings
+        """
+        names = records.dtype.names or ()
+        missing = [axis for axis in _AXES if axis not in names]
+        if missing:
+            raise ValidationError(f"Record array is missing fields: {missing}", field="readings")
+
+        if records.dtype == READING_DTYPE and records.ndim == 1:
+            # x/y/z are adjacent float32 fields: view them as (n, 3) without copying
+            values = np.lib.stride_tricks.as_strided(
+                records["x"],
+                shape=(records.shape[0], 3),
+                strides=(records.strides[0], READING_DTYPE["x"].itemsize),
+                writeable=False,
+            )
+        else:
+            # One strided gather per axis into a contiguous (n, 3) block
+            values = np.empty((records.shape[0], 3), dtype=np.result_type(*(records[a].dtype for a in _AXES)))
+            for column, axis in enumerate(_AXES):
+                values[:, column] = records[axis]
+
+        timestamps_ns = None
+        if "timestamp_ns" in names:
+            timestamps_ns = records["timestamp_ns"]
+        elif "timestamp" in names:
+            timestamps_ns = _to_epoch_ns(records["timestamp"])
+        return cls(values, timestamps_ns)
+
+    @classmethod
+    def from_arrow(cls, table: Any) -> "ActigraphyArray":
+        """
+        Build from an Arrow table (or record batch) with x/y/z/timestamp columns.
+
+        Args:
+            table: pyarrow Table or RecordBatch
+
+        Returns:
+            Columnar readings
+        """
+        try:
+            columns = {name: table.column(name).to_numpy() for name in table.column_names}
+        except Exception as e:
+            raise ValidationError(f"Unreadable Arrow table: {e}", field="readings")
+        missing = [axis for axis in _AXES if axis not in columns]
+        if missing:
+            raise ValidationError(f"Arrow table is missing columns: {missing}", field="readings")
+
+        values = np.column_stack([columns[axis] for axis in _AXES])
+        timestamps_ns = None
+        if "timestamp_ns" in columns:
+            timestamps_ns = columns["timestamp_ns"]
+        elif "timestamp" in columns:
+            timestamps_ns = _to_epoch_ns(columns["timestamp"])
+        return cls(values, timestamps_ns)
+
+    @classmethod
+    def from_any(cls, data: Any) -> "ActigraphyArray":
+        """
+        Build from any supported input format.
+
+        Args:
+            data: ActigraphyArray, list of reading dicts, packed bytes,
+                structured array, plain (n, 3) array or Arrow table
+
+        Returns:
+            Columnar readings
+        """
+        if isinstance(data, cls):
+            return data
+        if isinstance(data, (bytes, bytearray, memoryview)):
+            return cls.from_buffer(data)
+        if isinstance(data, np.ndarray):
+            if data.dtype.names:
+                return cls.from_record_array(data)
+            return cls(data)
+        if hasattr(data, "column_names") and hasattr(data, "column"):
+            return cls.from_arrow(data)
+        if isinstance(data, (list, tuple)):
+            return cls.from_records(data)
+        raise ValidationError(f"Unsupported actigraphy data type: {type(data).__name__}", field="readings")
+
+    def validate(self, max_abs_value: float = MAX_ABS_ACCELERATION_G) -> "ActigraphyArray":
+        """
+        Check all readings with whole-array operations.
+
+        Values must be finite and within ``±max_abs_value`` g, and timestamps
+        (when present) must be strictly increasing.
+
+        Args:
+            max_abs_value: Largest accepted absolute acceleration in g
+
+        Returns:
+            self, for chaining
+
+        Raises:
+            ValidationError: Naming the first offending reading
+        """
+        if len(self) == 0:
+            raise ValidationError("No actigraphy readings provided", field="readings")
+
+        # NaN compares False and inf exceeds the limit, so one comparison covers both checks
+        in_range = np.abs(self.values) <= max_abs_value
+        if not in_range.all():
+            index = int(np.flatnonzero(~in_range.all(axis=1))[0])
+            row = self.values[index]
+            if not np.isfinite(row).all():
+                message = f"Reading {index} has a non-finite accelerometer value"
+            else:
+                message = f"Reading {index} exceeds the ±{max_abs_value:g} g accelerometer range"
+            raise ValidationError(message, field="readings", index=index)
+
+        if self.timestamps_ns is not None and len(self) > 1:
+            increasing = np.diff(self.timestamps_ns) > 0
+            if not increasing.all():
+                index = int(np.flatnonzero(~increasing)[0]) + 1
+                raise ValidationError(
+                    f"Timestamps must be strictly increasing (reading {index})",
+                    field="timestamps",
+                    index=index,
+                )
+        return self
+
+    def resample(self, sampling_rate: float, window_size: float) -> np.ndarray:
+        """
+        Resample onto a uniform grid of ``window_size * sampling_rate`` points.
+
+        With timestamps, the grid starts at the first reading and is spaced
+        ``1 / sampling_rate`` seconds apart. Readings are averaged per grid
+        interval (an anti-aliasing box filter when the input is denser than
+        the grid) and the interval means are linearly interpolated at their
+        mean timestamps, so irregular sampling and gaps are handled correctly.
+        Grid points outside the recording hold the nearest edge value.
+
+        Without timestamps the readings are assumed evenly spaced and are
+        linearly interpolated across the whole grid.
+
+        Args:
+            sampling_rate: Target sampling rate in Hz
+            window_size: Window length in seconds
+
+        Returns:
+            (target_length, 3) float64 array
+        """
+        target_length = int(window_size * sampling_rate)
+        if target_length <= 0:
+            raise ValidationError("Resampling window is empty", field="window_size")
+        if len(self) == 0:
+            raise ValidationError("No actigraphy readings provided", field="readings")
+
+        values = self.values
+        if self.timestamps_ns is None:
+            if len(self) == target_length:
+                return np.array(values, dtype=np.float64)
+            source = np.linspace(0.0, 1.0, len(self))
+            grid = np.linspace(0.0, 1.0, target_length)
+            return _interp_columns(grid, source, values)
+
+        order = None
+        if len(self) > 1 and np.any(np.diff(self.timestamps_ns) < 0):
+            order = np.argsort(self.timestamps_ns, kind="stable")
+        timestamps_ns = self.timestamps_ns if order is None else self.timestamps_ns[order]
+        if order is not None:
+            values = values[order]
+
+        # Seconds since the first reading; float64 keeps sub-microsecond precision for weeks
+        seconds = (timestamps_ns - timestamps_ns[0]).astype(np.float64) / _NS_PER_SECOND
+        # The epsilon absorbs nanosecond rounding so on-grid readings land in their own bin
+        bins = np.floor(seconds * sampling_rate + 1e-6).astype(np.int64)
+        in_window = bins < target_length
+        if not np.all(in_window):
+            bins, seconds, values = bins[in_window], seconds[in_window], values[in_window]
+
+        counts = np.bincount(bins, minlength=target_length)
+        occupied = np.flatnonzero(counts)
+        occupied_counts = counts[occupied]
+        point_times = np.bincount(bins, weights=seconds, minlength=target_length)[occupied] / occupied_counts
+        point_values = np.empty((occupied.shape[0], 3), dtype=np.float64)
+        for column in range(3):
+            sums = np.bincount(bins, weights=values[:, column], minlength=target_length)
+            point_values[:, column] = sums[occupied] / occupied_counts
+
+        grid = np.arange(target_length, dtype=np.float64) / sampling_rate
+        return _interp_columns(grid, point_times, point_values)
+
+
+def pack_upload(metadata: Dict[str, Any], readings: Union[ActigraphyArray, np.ndarray]) -> bytes:
+    """
+    Encode request metadata and readings in the framed binary upload format.
+
+    Layout (little-endian): 4-byte magic ``NMAG``, uint16 version, uint16
+    reserved, uint32 header length, UTF-8 JSON header, zero padding to an
+    8-byte boundary, then READING_DTYPE records.
+
+    Args:
+        metadata: JSON-serializable request fields (everything except readings)
+        readings: Readings with timestamps, or a READING_DTYPE array
+
+    Returns:
+        Encoded payload
+    """
+    if not isinstance(readings, np.ndarray):
+        if readings.timestamps_ns is None:
+            raise ValidationError("Binary uploads require timestamps", field="timestamps")
+        records = np.empty(len(readings), dtype=READING_DTYPE)
+        records["timestamp_ns"] = readings.timestamps_ns
+        for column, axis in enumerate(_AXES):
+            records[axis] = readings.values[:, column]
+        readings = records
+
+    header = json.dumps(metadata, separators=(",", ":")).encode("utf-8")
+    prefix = _UPLOAD_PREFIX.pack(UPLOAD_MAGIC, UPLOAD_VERSION, 0, len(header))
+    padding = -(len(prefix) + len(header)) % _UPLOAD_ALIGNMENT
+    return b"".join((prefix, header, b"\0" * padding, readings.astype(READING_DTYPE, copy=False).tobytes()))
+
+
+def unpack_upload(body: Union[bytes, bytearray, memoryview]) -> Tuple[Dict[str, Any], ActigraphyArray]:
+    """
+    Decode a framed binary upload; the readings view the body without copying.
+
+    Args:
+        body: Payload produced by ``pack_upload``
+
+    Returns:
+        Tuple of (metadata dict, readings)
+    """
+    if len(body) < _UPLOAD_PREFIX.size:
+        raise ValidationError("Binary upload is truncated", field="body")
+    magic, version, _, header_length = _UPLOAD_PREFIX.unpack_from(body)
+    if magic != UPLOAD_MAGIC:
+        raise ValidationError("Not an actigraphy binary upload", field="body")
+    if version != UPLOAD_VERSION:
+        raise ValidationError(f"Unsupported binary upload version {version}", field="body")
+
+    header_end = _UPLOAD_PREFIX.size + header_length
+    if header_end > len(body):
+        raise ValidationError("Binary upload header is truncated", field="body")
+    metadata = _decode_metadata(bytes(memoryview(body)[_UPLOAD_PREFIX.size:header_end]))
+
+    records_start = header_end + (-header_end % _UPLOAD_ALIGNMENT)
+    return metadata, ActigraphyArray.from_buffer(memoryview(body)[records_start:])
+
+
+def unpack_npz(body: Union[bytes, bytearray, memoryview]) -> Tuple[Dict[str, Any], ActigraphyArray]:
+    """
+    Decode an ``.npz`` upload.
+
+    The archive holds a ``metadata`` string array with the JSON header and
+    either a ``readings`` READING_DTYPE array or ``timestamp_ns``/``x``/``y``/
+    ``z`` columns. Archive members are decompressed, so this path copies once.
+
+    Args:
+        body: npz archive bytes
+
+    Returns:
+        Tuple of (metadata dict, readings)
+    """
+    try:
+        with np.load(io.BytesIO(body), allow_pickle=False) as archive:
+            members = {name: archive[name] for name in archive.files}
+    except (OSError, ValueError) as e:
+        raise ValidationError(f"Unreadable npz upload: {e}", field="body")
+
+    if "metadata" not in members:
+        raise ValidationError("npz upload is missing 'metadata'", field="body")
+    metadata = _decode_metadata(str(members.pop("metadata")))
+
+    if "readings" in members:
+        return metadata, ActigraphyArray.from_record_array(members["readings"])
+    missing = [name for name in ("timestamp_ns",) + _AXES if name not in members]
+    if missing:
+        raise ValidationError(f"npz upload is missing arrays: {missing}", field="body")
+    values = np.column_stack([members[axis] for axis in _AXES])
+    return metadata, ActigraphyArray(values, members["timestamp_ns"])
+
+
+def unpack_arrow_ipc(body: Union[bytes, bytearray, memoryview]) -> Tuple[Dict[str, Any], ActigraphyArray]:
+    """
+    Decode an Arrow IPC stream upload (requires pyarrow).
+
+    The JSON header is stored under the ``actigraphy`` schema metadata key;
+    single-chunk columns without nulls are viewed without copying.
+
+    Args:
+        body: Arrow IPC stream bytes
+
+    Returns:
+        Tuple of (metadata dict, readings)
+    """
+    if pa is None:
+        raise ValidationError("Arrow uploads require pyarrow", field="body")
+    try:
+        table = pa.ipc.open_stream(pa.py_buffer(body)).read_all()
+    except Exception as e:
+        raise ValidationError(f"Unreadable Arrow upload: {e}", field="body")
+    header = (table.schema.metadata or {}).get(ARROW_METADATA_KEY)
+    if header is None:
+        raise ValidationError("Arrow upload is missing actigraphy metadata", field="body")
+    return _decode_metadata(header), ActigraphyArray.from_arrow(table.combine_chunks())
+
+
+def _decode_metadata(header: Union[bytes, str]) -> Dict[str, Any]:
+    """Parse a JSON upload header into a dict."""
+    try:
+        metadata = json.loads(header)
+    except ValueError as e:
+        raise ValidationError(f"Upload header is not valid JSON: {e}", field="body")
+    if not isinstance(metadata, dict):
+        raise ValidationError("Upload header must be a JSON object", field="body")
+    return metadata
+
+
+def parse_timestamps(timestamps: Sequence[Any]) -> np.ndarray:
+    """
+    Convert a sequence of ISO 8601 strings or epoch seconds to epoch-ns.
+
+    Args:
+        timestamps: Timestamp values (all strings or all numbers)
+
+    Returns:
+        int64 epoch-ns array
+    """
+    if len(timestamps) and not isinstance(timestamps[0], str):
+        try:
+            return _to_epoch_ns(np.asarray(timestamps, dtype=np.float64))
+        except (TypeError, ValueError) as e:
+            raise ValidationError(f"Invalid timestamp: {e}", field="timestamp")
+
+    try:
+        first = datetime.fromisoformat(timestamps[0]) if len(timestamps) else None
+        if first is not None and first.tzinfo is not None:
+            # Offset-aware device clocks: chain the C parser and converter without a Python frame
+            epoch_seconds = map(datetime.timestamp, map(datetime.fromisoformat, timestamps))
+        else:
+            # Naive (UTC) strings go through NumPy's C datetime64 parser
+            try:
+                parsed = np.asarray(timestamps, dtype="datetime64[ns]")
+                if not np.isnat(parsed).any():
+                    return parsed.view(np.int64)
+            except ValueError:
+                pass
+            epoch_seconds = map(_iso_to_epoch, timestamps)
+        seconds = np.fromiter(epoch_seconds, dtype=np.float64, count=len(timestamps))
+    except (TypeError, ValueError) as e:
+        raise ValidationError(f"Invalid ISO 8601 timestamp: {e}", field="timestamp")
+    # float64 epoch seconds resolve ~0.2us today; round to the microsecond ISO precision
+    return np.round(seconds * 1e6).astype(np.int64) * 1000
+
+
+def _iso_to_epoch(value: str) -> float:
+    """Parse one ISO 8601 timestamp to epoch seconds, treating naive values as UTC."""
+    parsed = datetime.fromisoformat(value)
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed.timestamp()
+
+
+def _to_epoch_ns(column: np.ndarray) -> np.ndarray:
+    """Convert a datetime64 or epoch-seconds column to int64 epoch-ns."""
+    column = np.asarray(column)
+    if np.issubdtype(column.dtype, np.datetime64):
+        return column.astype("datetime64[ns]").view(np.int64)
+    if np.issubdtype(column.dtype, np.integer):
+        return column.astype(np.int64) * _NS_PER_SECOND
+    return np.round(column.astype(np.float64) * _NS_PER_SECOND).astype(np.int64)
+
+
+def _interp_columns(grid: np.ndarray, source: np.ndarray, values: np.ndarray) -> np.ndarray:
+    """Linearly interpolate each column of values from source points to grid."""
+    result = np.empty((grid.shape[0], values.shape[1]), dtype=np.float64)
+    for column in range(values.shape[1]):
+        result[:, column] = np.interp(grid, source, values[:, column])
+    return result
@@ -12,7 +12,7 @@ import time
 import uuid
 from datetime import datetime
 from app.domain.utils.datetime_utils import UTC
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Union
 
 import boto3
 from botocore.exceptions import ClientError
@@ -20,6 +20,7 @@ from botocore.exceptions import ClientError
 # Use canonical config path
 from app.config.settings import get_settings
 settings = get_settings()
+from app.core.services.ml.pat.actigraphy_data import ActigraphyArray
 from app.core.services.ml.pat.exceptions import (
     AnalysisError,
     AuthorizationError,
@@ -212,7 +213,7 @@ class AWSPATService(PATInterface):
     def analyze_actigraphy(
         self,
         patient_id: str,
-        readings: List[Dict[str, Any]],
+        readings: Union[List[Dict[str, Any]], ActigraphyArray],
         start_time: str,
         end_time: str,
         sampling_rate_hz: float,
@@ -223,7 +224,7 @@ class AWSPATService(PATInterface):
         
         Args:
             patient_id: The patient's unique identifier
-            readings: List of actigraphy readings
+            readings: List of actigraphy readings or an ActigraphyArray
             start_time: ISO8601 timestamp of first reading
             end_time: ISO8601 timestamp of last reading
             sampling_rate_hz: Sampling rate in Hz
@@ -247,6 +248,7 @@ class AWSPATService(PATInterface):
         # 6. Return processed results
         
         # For now, return a mock response to illustrate the structure
+        actigraphy = ActigraphyArray.from_any(readings)
         analysis_id = str(uuid.uuid4())
         timestamp = datetime.now(UTC).isoformat() + "Z"
         
@@ -259,8 +261,8 @@ class AWSPATService(PATInterface):
             "data_summary": {
                 "start_time": start_time,
                 "end_time": end_time,
-                "duration_seconds": 3600.0,  # Example
-                "readings_count": len(readings),
+                "duration_seconds": actigraphy.duration_seconds(sampling_rate_hz),
+                "readings_count": len(actigraphy),
                 "sampling_rate_hz": sampling_rate_hz
             },
             "results": {}  # Would contain actual analysis results
@@ -269,7 +271,7 @@ class AWSPATService(PATInterface):
     def get_actigraphy_embeddings(
         self,
         patient_id: str,
-        readings: List[Dict[str, Any]],
+        readings: Union[List[Dict[str, Any]], ActigraphyArray],
         start_time: str,
         end_time: str,
         sampling_rate_hz: float,
@@ -278,7 +280,7 @@ class AWSPATService(PATInterface):
         
         Args:
             patient_id: The patient's unique identifier
-            readings: List of actigraphy readings
+            readings: List of actigraphy readings or an ActigraphyArray
             start_time: ISO8601 timestamp of first reading
             end_time: ISO8601 timestamp of last reading
             sampling_rate_hz: Sampling rate in Hz
@@ -292,6 +294,7 @@ class AWSPATService(PATInterface):
         """
         # Implementation omitted for brevity
         # Similar approach to analyze_actigraphy
+        actigraphy = ActigraphyArray.from_any(readings)
         
         embedding_id = str(uuid.uuid4())
         timestamp = datetime.now(UTC).isoformat() + "Z"
@@ -303,8 +306,8 @@ class AWSPATService(PATInterface):
             "data_summary": {
                 "start_time": start_time,
                 "end_time": end_time,
-                "duration_seconds": 3600.0,  # Example
-                "readings_count": len(readings),
+                "duration_seconds": actigraphy.duration_seconds(sampling_rate_hz),
+                "readings_count": len(actigraphy),
                 "sampling_rate_hz": sampling_rate_hz
             },
             "embedding": {
@@ -13,6 +13,7 @@ import logging
 import uuid
 from typing import Any, Dict, List, Optional, Union
 
+from app.core.services.ml.pat.actigraphy_data import ActigraphyArray
 from app.core.services.ml.pat.pat_interface import PATInterface
 from app.core.exceptions import (
     InvalidRequestError,
@@ -953,7 +954,7 @@ class BedrockPAT(PATInterface):
     def analyze_actigraphy(
         self,
         patient_id: str,
-        readings: List[Dict[str, Any]],
+        readings: Union[List[Dict[str, Any]], ActigraphyArray],
         start_time: str,
         end_time: str,
         sampling_rate_hz: float,
@@ -964,6 +965,7 @@ class BedrockPAT(PATInterface):
         """Mock implementation for BedrockPAT."""
         self._ensure_initialized()
         logger.warning("BedrockPAT.analyze_actigraphy called - using mock implementation.")
+        actigraphy = ActigraphyArray.from_any(readings)
         analysis_id = str(uuid.uuid4())
         results = {
             "analysis_id": analysis_id,
@@ -972,6 +974,7 @@ class BedrockPAT(PATInterface):
             "device_info": device_info,
             "start_time": start_time,
             "end_time": end_time,
+            "readings_count": len(actigraphy),
         }
         # Add mock results for requested types
         if "sleep_quality" in analysis_types:
@@ -1018,7 +1021,7 @@ class BedrockPAT(PATInterface):
     def detect_anomalies(
         self,
         patient_id: str,
-        readings: List[Dict[str, Any]],
+        readings: Union[List[Dict[str, Any]], ActigraphyArray],
         baseline_period: Optional[Dict[str, str]] = None,
         **kwargs
     ) -> Dict[str, Any]:
@@ -1034,7 +1037,7 @@ class BedrockPAT(PATInterface):
     def predict_mood_state(
         self,
         patient_id: str,
-        readings: List[Dict[str, Any]],
+        readings: Union[List[Dict[str, Any]], ActigraphyArray],
         historical_context: Optional[Dict[str, Any]] = None,
         **kwargs
     ) -> Dict[str, Any]:
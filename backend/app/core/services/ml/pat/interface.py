@@ -6,7 +6,9 @@ which provides actigraphy analysis and embedding generation capabilities.
 """
 
 import abc
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Union
+
+from app.core.services.ml.pat.actigraphy_data import ActigraphyArray
 
 
 class PATInterface(abc.ABC):
@@ -33,7 +35,7 @@ class PATInterface(abc.ABC):
     def analyze_actigraphy(
         self,
         patient_id: str,
-        readings: List[Dict[str, Any]],
+        readings: Union[List[Dict[str, Any]], ActigraphyArray],
         start_time: str,
         end_time: str,
         sampling_rate_hz: float,
@@ -44,7 +46,7 @@ class PATInterface(abc.ABC):
         
         Args:
             patient_id: Unique identifier for the patient
-            readings: List of accelerometer readings
+            readings: List of accelerometer readings or an ActigraphyArray
             start_time: ISO-8601 formatted start time
             end_time: ISO-8601 formatted end time
             sampling_rate_hz: Sampling rate in Hz
@@ -65,7 +67,7 @@ class PATInterface(abc.ABC):
     def get_actigraphy_embeddings(
         self,
         patient_id: str,
-        readings: List[Dict[str, Any]],
+        readings: Union[List[Dict[str, Any]], ActigraphyArray],
         start_time: str,
         end_time: str,
         sampling_rate_hz: float
@@ -74,7 +76,7 @@ class PATInterface(abc.ABC):
         
         Args:
             patient_id: Unique identifier for the patient
-            readings: List of accelerometer readings
+            readings: List of accelerometer readings or an ActigraphyArray
             start_time: ISO-8601 formatted start time
             end_time: ISO-8601 formatted end time
             sampling_rate_hz: Sampling rate in Hz
@@ -8,8 +8,9 @@ This module implements a mock version of the PAT interface for testing.
 import datetime
 import logging
 import uuid
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Union
 
+from app.core.services.ml.pat.actigraphy_data import ActigraphyArray
 from app.core.services.ml.pat.pat_interface import PATInterface
 
 logger = logging.getLogger(__name__)
@@ -635,7 +636,7 @@ class MockPATService(PATInterface):
     def analyze_actigraphy(
         self,
         patient_id: str,
-        readings: List[Dict[str, float]],
+        readings: Union[List[Dict[str, float]], ActigraphyArray],
         start_time: str,
         end_time: str,
         sampling_rate_hz: float,
@@ -648,7 +649,11 @@ class MockPATService(PATInterface):
         from app.core.exceptions import ValidationError
         if not patient_id:
             raise ValidationError("Patient ID is required")
-        if not readings or not isinstance(readings, list):
+        if isinstance(readings, ActigraphyArray):
+            # Columnar uploads arrive already shape- and range-checked
+            if len(readings) == 0:
+                raise ValidationError("Readings must be non-empty")
+        elif not readings or not isinstance(readings, list):
             raise ValidationError("Readings must be a non-empty list")
         if sampling_rate_hz is None or not isinstance(sampling_rate_hz, (int, float)) or sampling_rate_hz <= 0:
             raise ValidationError("Sampling rate must be positive")
@@ -663,9 +668,10 @@ class MockPATService(PATInterface):
             if not isinstance(t, str) or t not in valid_types:
                 raise ValidationError(f"Invalid analysis type: {t}")
         # Basic shape validation for readings
-        for reading in readings:
-            if not all(k in reading for k in ('x', 'y', 'z')):
-                raise ValidationError("Each reading must contain x, y, z values")
+        if not isinstance(readings, ActigraphyArray):
+            for reading in readings:
+                if not all(k in reading for k in ('x', 'y', 'z')):
+                    raise ValidationError("Each reading must contain x, y, z values")
 
         # Create analysis ID
         analysis_id = str(uuid.uuid4())
@@ -726,7 +732,7 @@ class MockPATService(PATInterface):
     def get_actigraphy_embeddings(
         self,
         patient_id: str,
-        readings: List[Dict[str, float]],
+        readings: Union[List[Dict[str, float]], ActigraphyArray],
         start_time: str,
         end_time: str,
         sampling_rate_hz: float
@@ -738,14 +744,19 @@ class MockPATService(PATInterface):
         # Validate inputs
         if not patient_id:
             raise ValidationError("Patient ID is required")
-        if not readings or not isinstance(readings, list):
+        if isinstance(readings, ActigraphyArray):
+            # Columnar uploads arrive already shape- and range-checked
+            if len(readings) == 0:
+                raise ValidationError("Readings must be non-empty")
+        elif not readings or not isinstance(readings, list):
             raise ValidationError("Readings must be a non-empty list")
         if sampling_rate_hz is None or not isinstance(sampling_rate_hz, (int, float)) or sampling_rate_hz <= 0:
             raise ValidationError("Sampling rate must be positive")
         # Basic shape validation for readings
-        for reading in readings:
-            if not all(k in reading for k in ('x', 'y', 'z')):
-                raise ValidationError("Each reading must contain x, y, z values")
+        if not isinstance(readings, ActigraphyArray):
+            for reading in readings:
+                if not all(k in reading for k in ('x', 'y', 'z')):
+                    raise ValidationError("Each reading must contain x, y, z values")
         
         # Generate mock embeddings with 384 dimensions
         embedding_id = str(uuid.uuid4())
@@ -989,20 +1000,24 @@ class MockPATService(PATInterface):
     
     def _generate_mock_actigraphy_metrics(
         self,
-        readings: List[Dict[str, float]],
+        readings: Union[List[Dict[str, float]], ActigraphyArray],
         analysis_types: List[str]
     ) -> Dict[str, Any]:
         """Generate mock metrics for actigraphy analysis."""
         metrics = {}
         
         # Calculate some basic statistics from the readings
-        x_values = [r['x'] for r in readings]
-        y_values = [r['y'] for r in readings]
-        z_values = [r['z'] for r in readings]
-        
-        metrics["x_mean"] = sum(x_values) / len(x_values) if x_values else 0
-        metrics["y_mean"] = sum(y_values) / len(y_values) if y_values else 0
-        metrics["z_mean"] = sum(z_values) / len(z_values) if z_values else 0
+        if isinstance(readings, ActigraphyArray):
+            x_mean, y_mean, z_mean = (float(m) for m in readings.values.mean(axis=0, dtype=float))
+            metrics["x_mean"], metrics["y_mean"], metrics["z_mean"] = x_mean, y_mean, z_mean
+        else:
+            x_values = [r['x'] for r in readings]
+            y_values = [r['y'] for r in readings]
+            z_values = [r['z'] for r in readings]
+            
+            metrics["x_mean"] = sum(x_values) / len(x_values) if x_values else 0
+            metrics["y_mean"] = sum(y_values) / len(y_values) if y_values else 0
+            metrics["z_mean"] = sum(z_values) / len(z_values) if z_values else 0
         
         # Add analysis type-specific metrics
         if "sleep" in analysis_types:
@@ -9,6 +9,7 @@ from abc import abstractmethod
 from typing import Any, Dict, List, Optional, Union
 
 from app.core.services.ml.interface import MLService
+from app.core.services.ml.pat.actigraphy_data import ActigraphyArray
 
 
 class PATInterface(MLService):
@@ -22,7 +23,7 @@ class PATInterface(MLService):
     def analyze_actigraphy(
         self,
         patient_id: str,
-        readings: List[Dict[str, Any]],
+        readings: Union[List[Dict[str, Any]], ActigraphyArray],
         start_time: str,
         end_time: str,
         sampling_rate_hz: float,
@@ -35,7 +36,8 @@ class PATInterface(MLService):
         
         Args:
             patient_id: Patient identifier
-            readings: Accelerometer readings with timestamp and x,y,z values
+            readings: Accelerometer readings with timestamp and x,y,z values,
+                or an ActigraphyArray (columnar view) from a binary upload
             start_time: Start time of recording (ISO 8601 format)
             end_time: End time of recording (ISO 8601 format)
             sampling_rate_hz: Sampling rate in Hz
@@ -96,7 +98,7 @@ class PATInterface(MLService):
     def detect_anomalies(
         self,
         patient_id: str,
-        readings: List[Dict[str, Any]],
+        readings: Union[List[Dict[str, Any]], ActigraphyArray],
         baseline_period: Optional[Dict[str, str]] = None,
         **kwargs
     ) -> Dict[str, Any]:
@@ -105,7 +107,8 @@ class PATInterface(MLService):
         
         Args:
             patient_id: Patient identifier
-            readings: Accelerometer readings with timestamp and x,y,z values
+            readings: Accelerometer readings with timestamp and x,y,z values,
+                or an ActigraphyArray
             baseline_period: Optional period to use as baseline (start_date, end_date)
             **kwargs: Additional parameters
             
@@ -118,7 +121,7 @@ class PATInterface(MLService):
     def predict_mood_state(
         self,
         patient_id: str,
-        readings: List[Dict[str, Any]],
+        readings: Union[List[Dict[str, Any]], ActigraphyArray],
         historical_context: Optional[Dict[str, Any]] = None,
         **kwargs
     ) -> Dict[str, Any]:
@@ -127,7 +130,8 @@ class PATInterface(MLService):
         
         Args:
             patient_id: Patient identifier
-            readings: Accelerometer readings with timestamp and x,y,z values
+            readings: Accelerometer readings with timestamp and x,y,z values,
+                or an ActigraphyArray
             historical_context: Optional historical context for the patient
             **kwargs: Additional parameters
             
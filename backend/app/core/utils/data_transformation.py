@@ -17,6 +17,11 @@ import pandas as pd
 
 from ..config import settings
 from .encryption import EncryptionService
+from .rolling_statistics import (
+    OnlineAnomalyDetector,
+    detect_anomalies as rolling_detect_anomalies,
+    sliding_sequences,
+)
 
 
 class DataAnonymizer:
@@ -436,23 +441,11 @@ class TimeSeriesProcessor:
             target_column: Index of target column to predict
 
         Returns:
-            Tuple of (X_sequences, y_targets) if target_column provided,
-            otherwise just X_sequences
+            Tuple of (X_sequences, y_targets); y_targets is None without a
+            target column. X_sequences is a read-only strided view of data
+            (no copy), so copy it before writing.
         """
-        X = []
-        y = [] if target_column is not None else None
-
-        for i in range(len(data) - sequence_length):
-            # Extract sequence
-            sequence = data[i : i + sequence_length]
-            X.append(sequence)
-
-            # Extract target if specified
-            if target_column is not None:
-                target = data[i + sequence_length, target_column]
-                y.append(target)
-
-        return np.array(X), np.array(y) if y else None
+        return sliding_sequences(data, sequence_length, target_column)
 
     @staticmethod
     def resample_time_series(
@@ -504,6 +497,9 @@ class TimeSeriesProcessor:
         """
         Detect anomalies in time series data using Z-score.
 
+        Rolling statistics come from cumulative sums, so this is O(n)
+        regardless of the window size.
+
         Args:
             data: Time series data (1D array)
             window_size: Size of rolling window
@@ -512,26 +508,26 @@ class TimeSeriesProcessor:
         Returns:
             Boolean array indicating anomalies
         """
-        anomalies = np.zeros(len(data), dtype=bool)
-
-        # Calculate rolling mean and std
-        for i in range(len(data) - window_size):
-            window = data[i : i + window_size]
-            window_mean = np.mean(window)
-            window_std = np.std(window)
+        return rolling_detect_anomalies(data, window_size, threshold)
 
-            # Avoid division by zero
-            if window_std == 0:
-                continue
+    @staticmethod
+    def create_anomaly_detector(
+        window_size: int = 10, threshold: float = 3.0
+    ) -> OnlineAnomalyDetector:
+        """
+        Create a stateful detector for live streams.
 
-            # Calculate Z-score for next point
-            z_score = abs((data[i + window_size] - window_mean) / window_std)
+        Chunks fed to the detector are flagged exactly as detect_anomalies
+        would flag the concatenated series.
 
-            # Mark as anomaly if Z-score exceeds threshold
-            if z_score > threshold:
-                anomalies[i + window_size] = True
+        Args:
+            window_size: Size of rolling window
+            threshold: Z-score threshold for anomaly
 
-        return anomalies
+        Returns:
+            Online anomaly detector
+        """
+        return OnlineAnomalyDetector(window_size, threshold)
 
 
 class FeatureEngineer:
@@ -0,0 +1,169 @@
+"""
+Rolling-window statistics for the Novamind Digital Twin platform.
+
+This module provides O(n) rolling means and standard deviations from
+cumulative sums, z-score anomaly detection built on them (in one shot or
+chunk by chunk for live streams), and zero-copy sliding-window sequences
+for time series models.
+"""
+from typing import Optional, Tuple
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+# Windows per block; each block's sums are centred on that block's own mean
+_BLOCK_WINDOWS = 4096
+
+
+def rolling_mean_std(data: np.ndarray, window_size: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Mean and population standard deviation of every full window.
+
+    Uses cumulative sums, so the cost is O(n) whatever the window size. The
+    sums are taken over blocks of _BLOCK_WINDOWS windows, each centred on its
+    own mean. A trend or level shift therefore cannot inflate the sums of
+    squares past what float64 can difference accurately.
+
+    Args:
+        data: Time series data (1D array)
+        window_size: Size of rolling window
+
+    Returns:
+        Tuple of (means, stds), entry i covering data[i : i + window_size];
+        both empty if the series is shorter than the window
+    """
+    values = np.asarray(data, dtype=float)
+    count = len(values) - window_size + 1
+    if window_size <= 0 or count <= 0:
+        return np.empty(0), np.empty(0)
+
+    # Missing values would poison every later cumulative sum, so zero them
+    # and mark the windows that contain them instead
+    missing = np.isnan(values)
+    means = np.empty(count)
+    variances = np.empty(count)
+    for start in range(0, count, _BLOCK_WINDOWS):
+        stop = min(start + _BLOCK_WINDOWS, count)
+        block = values[start:stop + window_size - 1]
+        block_missing = missing[start:stop + window_size - 1]
+        offset = block[~block_missing].mean() if not block_missing.all() else 0.0
+        centred = np.where(block_missing, 0.0, block - offset)
+        sums = np.concatenate(([0.0], np.cumsum(centred)))
+        squares = np.concatenate(([0.0], np.cumsum(centred * centred)))
+
+        block_means = (sums[window_size:] - sums[:stop - start]) / window_size
+        variances[start:stop] = (squares[window_size:] - squares[:stop - start]) / window_size - block_means ** 2
+        means[start:stop] = block_means + offset
+    stds = np.sqrt(np.maximum(variances, 0.0))
+
+    # Cancellation leaves tiny non-zero spreads on constant windows; zero them exactly
+    changes = np.concatenate(([0], np.cumsum(values[1:] != values[:-1])))
+    stds[changes[window_size - 1:] == changes[:count]] = 0.0
+
+    if missing.any():
+        gaps = np.concatenate(([0], np.cumsum(missing)))
+        incomplete = gaps[window_size:] > gaps[:count]
+        means[incomplete] = np.nan
+        stds[incomplete] = np.nan
+
+    return means, stds
+
+
+def detect_anomalies(data: np.ndarray, window_size: int = 10, threshold: float = 3.0) -> np.ndarray:
+    """
+    Flag points whose z-score against the preceding window exceeds the threshold.
+
+    Args:
+        data: Time series data (1D array)
+        window_size: Size of rolling window
+        threshold: Z-score threshold for anomaly
+
+    Returns:
+        Boolean array indicating anomalies; the first window_size points and
+        points after a constant window are never flagged
+    """
+    values = np.asarray(data, dtype=float)
+    anomalies = np.zeros(len(values), dtype=bool)
+    if len(values) <= window_size:
+        return anomalies
+
+    means, stds = rolling_mean_std(values[:-1], window_size)
+    following = values[window_size:]
+    spread = stds > 0
+    z_scores = np.zeros_like(following)
+    np.divide(np.abs(following - means), stds, out=z_scores, where=spread)
+    anomalies[window_size:] = spread & (z_scores > threshold)
+    return anomalies
+
+
+class OnlineAnomalyDetector:
+    """
+    Stateful z-score anomaly detector for live streams.
+
+    Feeding a series in chunks of any size flags exactly the same points as
+    detect_anomalies on the whole series; only the last window_size samples
+    are kept between chunks.
+    """
+
+    def __init__(self, window_size: int = 10, threshold: float = 3.0):
+        """
+        Initialize the detector.
+
+        Args:
+            window_size: Size of rolling window
+            threshold: Z-score threshold for anomaly
+        """
+        self.window_size = window_size
+        self.threshold = threshold
+        self._history = np.empty(0)
+
+    def update(self, chunk: np.ndarray) -> np.ndarray:
+        """
+        Consume the next samples of the stream.
+
+        Args:
+            chunk: New samples (1D array)
+
+        Returns:
+            Boolean array indicating which samples of the chunk are anomalies
+        """
+        chunk = np.asarray(chunk, dtype=float)
+        combined = np.concatenate((self._history, chunk))
+        flags = detect_anomalies(combined, self.window_size, self.threshold)[len(self._history):]
+        self._history = combined[-self.window_size:] if self.window_size > 0 else np.empty(0)
+        return flags
+
+    def reset(self) -> None:
+        """Forget the stream history."""
+        self._history = np.empty(0)
+
+
+def sliding_sequences(
+    data: np.ndarray, sequence_length: int, target_column: Optional[int] = None
+) -> Tuple[np.ndarray, Optional[np.ndarray]]:
+    """
+    Input sequences and next-step targets as views of the series.
+
+    Args:
+        data: Time series data (samples x features, or 1D)
+        sequence_length: Length of each sequence
+        target_column: Index of target column to predict
+
+    Returns:
+        Tuple of (X_sequences, y_targets). X_sequences has shape
+        (samples - sequence_length, sequence_length[, features]) and is a
+        read-only strided view; copy it before writing. y_targets is None
+        without a target column or when there are no sequences.
+    """
+    data = np.asarray(data)
+    count = len(data) - sequence_length
+    if count <= 0:
+        return np.empty((0, max(sequence_length, 0)) + data.shape[1:], dtype=data.dtype), None
+
+    windows = sliding_window_view(data, sequence_length, axis=0)[:count]
+    if data.ndim > 1:
+        # sliding_window_view appends the window axis; move it before the features
+        windows = np.moveaxis(windows, -1, 1)
+
+    targets = data[sequence_length:, target_column] if target_column is not None else None
+    return windows, targets
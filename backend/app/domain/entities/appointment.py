@@ -49,6 +49,15 @@ class AppointmentType(str, Enum):
     ASSESSMENT = "assessment"
 
 
+class AppointmentPriority(str, Enum):
+    """Scheduling priority of an appointment."""
+
+    LOW = "low"
+    NORMAL = "normal"
+    HIGH = "high"
+    URGENT = "urgent"
+
+
 # ---------------------------------------------------------------------------
 # Domain entity
 # ---------------------------------------------------------------------------
@@ -75,6 +84,8 @@ class Appointment(BaseEntity):
     status: AppointmentStatus = AppointmentStatus.SCHEDULED
     notes: Optional[str] = None
     location: Optional[str] = None  # e.g. "Telehealth", "Clinic Room 3"
+    priority: AppointmentPriority = AppointmentPriority.NORMAL
+    reason: Optional[str] = None
 
     created_at: datetime = field(default_factory=datetime.utcnow)
     last_updated: datetime = field(default_factory=datetime.utcnow)
@@ -126,7 +137,12 @@ class Appointment(BaseEntity):
         self.status = new_status
         self.touch()
 
-    def reschedule(self, new_start_time: datetime, new_end_time: Optional[datetime] = None) -> None:
+    def reschedule(
+        self,
+        new_start_time: datetime,
+        new_end_time: Optional[datetime] = None,
+        reason: Optional[str] = None,
+    ) -> None:
         """Move the appointment while maintaining its original duration."""
 
         duration = new_end_time - new_start_time if new_end_time else self.end_time - self.start_time
@@ -135,6 +151,8 @@ class Appointment(BaseEntity):
 
         self.start_time = new_start_time
         self.end_time = new_start_time + duration
+        if reason:
+            self.reason = reason
 
         # Optional policy: rescheduling re‑opens the appointment slot
         if self.status not in {AppointmentStatus.SCHEDULED, AppointmentStatus.CONFIRMED}:
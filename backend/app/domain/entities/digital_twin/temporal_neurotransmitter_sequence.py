@@ -125,17 +125,10 @@ class TemporalNeurotransmitterSequence(TemporalSequence):
             Boolean indicating success
         """
         # Find the closest timestamp in our sequence
-        closest_idx = None
-        min_diff = timedelta.max
-        
-        for idx, ts in enumerate(self.timestamps):
-            diff = abs(ts - timestamp)
-            if diff < min_diff:
-                min_diff = diff
-                closest_idx = idx
+        closest_idx = self.nearest_index(timestamp)
                 
         # If closest timestamp is too far away, return False
-        if min_diff > timedelta(hours=self.resolution_hours):
+        if closest_idx is None or abs(self.timestamps[closest_idx] - timestamp) > timedelta(hours=self.resolution_hours):
             return False
             
         # Get feature index
@@ -146,7 +139,7 @@ class TemporalNeurotransmitterSequence(TemporalSequence):
         feature_idx = self._feature_indices[feature_name]
         
         # Update the value
-        self._values[closest_idx][feature_idx] = max(0.0, min(1.0, value))
+        self._set_value(closest_idx, feature_idx, max(0.0, min(1.0, value)))
         self.updated_at = datetime.now()
         
         return True
@@ -2,11 +2,16 @@
 Domain entities for the Knowledge Graph component of the Digital Twin.
 Pure domain models with no external dependencies.
 """
+import bisect
 from dataclasses import dataclass, field
+from collections.abc import Callable
 from datetime import datetime
 from enum import Enum
+from typing import Any
 from uuid import UUID, uuid4
 
+from app.domain.interfaces.belief_inference import BeliefInferenceEngine
+
 
 class EdgeType(Enum):
     """Types of edges in the knowledge graph."""
@@ -118,15 +123,44 @@ class KnowledgeGraphEdge:
 
 @dataclass
 class TemporalKnowledgeGraph:
-    """A temporal knowledge graph representing the patient's state over time."""
+    """
+    A temporal knowledge graph representing the patient's state over time.
+
+    Besides the ``nodes`` and ``edges`` dicts the graph maintains secondary
+    indexes - outgoing/incoming adjacency, type buckets and created_at-sorted
+    lists - so neighbor, type and time-range queries do not scan the whole
+    graph. Add nodes and edges through ``add_node``/``add_edge`` to keep them
+    current.
+    """
     patient_id: UUID
     nodes: dict[UUID, KnowledgeGraphNode] = field(default_factory=dict)
     edges: dict[UUID, KnowledgeGraphEdge] = field(default_factory=dict)
     last_updated: datetime = field(default_factory=datetime.now)
-    
+    # Node ID -> edge IDs (dicts used as insertion-ordered sets)
+    _out_edges: dict[UUID, dict[UUID, None]] = field(default_factory=dict, init=False, repr=False, compare=False)
+    _in_edges: dict[UUID, dict[UUID, None]] = field(default_factory=dict, init=False, repr=False, compare=False)
+    _nodes_by_type: dict[NodeType, dict[UUID, None]] = field(default_factory=dict, init=False, repr=False,
+                                                            compare=False)
+    _edges_by_type: dict[EdgeType, dict[UUID, None]] = field(default_factory=dict, init=False, repr=False,
+                                                            compare=False)
+    # Parallel (created_at, id) lists kept sorted by created_at
+    _node_times: list[datetime] = field(default_factory=list, init=False, repr=False, compare=False)
+    _node_time_ids: list[UUID] = field(default_factory=list, init=False, repr=False, compare=False)
+    _edge_times: list[datetime] = field(default_factory=list, init=False, repr=False, compare=False)
+    _edge_time_ids: list[UUID] = field(default_factory=list, init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        """Index nodes and edges passed to the constructor."""
+        nodes, edges = self.nodes, self.edges
+        self.nodes, self.edges = {}, {}
+        for node in nodes.values():
+            self._index_node(node)
+        for edge in edges.values():
+            self._index_edge(edge)
+
     def add_node(self, node: KnowledgeGraphNode) -> UUID:
         """Add a node to the graph."""
-        self.nodes[node.id] = node
+        self._index_node(node)
         self.last_updated = datetime.now()
         return node.id
     
@@ -134,40 +168,40 @@ class TemporalKnowledgeGraph:
         """Add an edge to the graph."""
         if edge.source_id not in self.nodes or edge.target_id not in self.nodes:
             raise ValueError("Both source and target nodes must exist in the graph")
-        self.edges[edge.id] = edge
+        self._index_edge(edge)
         self.last_updated = datetime.now()
         return edge.id
     
     def get_nodes_by_type(self, node_type: NodeType) -> list[KnowledgeGraphNode]:
         """Get all nodes of a specific type."""
-        return [node for node in self.nodes.values() if node.node_type == node_type]
+        return [self.nodes[node_id] for node_id in self._nodes_by_type.get(node_type, ())]
     
     def get_edges_by_type(self, edge_type: EdgeType) -> list[KnowledgeGraphEdge]:
         """Get all edges of a specific type."""
-        return [edge for edge in self.edges.values() if edge.edge_type == edge_type]
+        return [self.edges[edge_id] for edge_id in self._edges_by_type.get(edge_type, ())]
     
-    def get_node_neighbors(self, node_id: UUID) -> dict[EdgeType, list[KnowledgeGraphNode]]:
-        """Get all neighboring nodes grouped by edge type."""
+    def get_node_neighbors(self, node_id: UUID) -> dict[EdgeType | str, list[KnowledgeGraphNode]]:
+        """
+        Get all neighboring nodes grouped by edge type.
+
+        Targets of outgoing edges are keyed by the edge type; sources of
+        incoming edges are keyed by ``"reverse_<edge type value>"``.
+        """
         if node_id not in self.nodes:
             raise ValueError(f"Node {node_id} not found in graph")
         
         neighbors = {}
         
         # Outgoing edges (source -> target)
-        for edge in self.edges.values():
-            if edge.source_id == node_id:
-                if edge.edge_type not in neighbors:
-                    neighbors[edge.edge_type] = []
-                neighbors[edge.edge_type].append(self.nodes[edge.target_id])
+        for edge_id in self._out_edges.get(node_id, ()):
+            edge = self.edges[edge_id]
+            neighbors.setdefault(edge.edge_type, []).append(self.nodes[edge.target_id])
         
         # Incoming edges (target <- source)
-        for edge in self.edges.values():
-            if edge.target_id == node_id:
-                # Create a "reverse" edge type for incoming edges
-                reverse_edge_type = EdgeType(f"reverse_{edge.edge_type.value}")
-                if reverse_edge_type not in neighbors:
-                    neighbors[reverse_edge_type] = []
-                neighbors[reverse_edge_type].append(self.nodes[edge.source_id])
+        for edge_id in self._in_edges.get(node_id, ()):
+            edge = self.edges[edge_id]
+            reverse_edge_type = f"reverse_{getattr(edge.edge_type, 'value', edge.edge_type)}"
+            neighbors.setdefault(reverse_edge_type, []).append(self.nodes[edge.source_id])
                 
         return neighbors
     
@@ -176,16 +210,19 @@ class TemporalKnowledgeGraph:
         subgraph = TemporalKnowledgeGraph(patient_id=self.patient_id)
         
         # Add nodes within the time range
-        for node_id, node in self.nodes.items():
-            if start_time <= node.created_at <= end_time:
-                subgraph.add_node(node)
+        low = bisect.bisect_left(self._node_times, start_time)
+        high = bisect.bisect_right(self._node_times, end_time)
+        for node_id in self._node_time_ids[low:high]:
+            subgraph.add_node(self.nodes[node_id])
         
         # Add edges within the time range
-        for edge_id, edge in self.edges.items():
-            if start_time <= edge.created_at <= end_time:
-                # Only add the edge if both connected nodes exist in the subgraph
-                if edge.source_id in subgraph.nodes and edge.target_id in subgraph.nodes:
-                    subgraph.add_edge(edge)
+        low = bisect.bisect_left(self._edge_times, start_time)
+        high = bisect.bisect_right(self._edge_times, end_time)
+        for edge_id in self._edge_time_ids[low:high]:
+            edge = self.edges[edge_id]
+            # Only add the edge if both connected nodes exist in the subgraph
+            if edge.source_id in subgraph.nodes and edge.target_id in subgraph.nodes:
+                subgraph.add_edge(edge)
         
         return subgraph
     
@@ -193,34 +230,33 @@ class TemporalKnowledgeGraph:
         """Extract temporal and causal patterns from the graph."""
         patterns = []
         
-        # Find causal chains (A causes B causes C)
-        causal_edges = self.get_edges_by_type(EdgeType.CAUSES)
-        causal_chains = self._extract_chains(causal_edges)
-        
-        for chain in causal_chains:
-            patterns.append({
-                "type": "causal_chain",
-                "nodes": [self.nodes[edge.source_id].label for edge in chain] + 
-                         [self.nodes[chain[-1].target_id].label],
-                "confidence": min(edge.confidence for edge in chain)
-            })
-        
-        # Find temporal sequences (A precedes B precedes C)
-        temporal_edges = self.get_edges_by_type(EdgeType.PRECEDES)
-        temporal_chains = self._extract_chains(temporal_edges)
-        
-        for chain in temporal_chains:
-            patterns.append({
-                "type": "temporal_sequence",
-                "nodes": [self.nodes[edge.source_id].label for edge in chain] + 
-                         [self.nodes[chain[-1].target_id].label],
-                "confidence": min(edge.confidence for edge in chain)
-            })
+        # Find causal chains (A causes B causes C) and temporal sequences
+        # (A precedes B precedes C); labels and confidence are carried along
+        # each memoized continuation rather than recomputed per chain
+        labels = {node_id: node.label for node_id, node in self.nodes.items()}
+
+        def leaf(edge):
+            return (labels[edge.source_id], labels[edge.target_id]), edge.confidence
+
+        def extend(edge, path):
+            return (labels[edge.source_id], *path[0]), min(edge.confidence, path[1])
+
+        for pattern_type, edge_type in (("causal_chain", EdgeType.CAUSES), ("temporal_sequence", EdgeType.PRECEDES)):
+            for chain_labels, confidence in self._chain_paths(self.get_edges_by_type(edge_type), leaf, extend):
+                patterns.append({
+                    "type": pattern_type,
+                    "nodes": list(chain_labels),
+                    "confidence": confidence
+                })
         
-        # Find symptom clusters (symptoms connected to the same diagnosis)
+        # Find symptom clusters (symptoms connected to the same diagnosis),
+        # grouping the has-symptom edges by target in one pass
+        symptom_edges_by_target: dict[UUID, list[KnowledgeGraphEdge]] = {}
+        for edge in self.get_edges_by_type(EdgeType.HAS_SYMPTOM):
+            symptom_edges_by_target.setdefault(edge.target_id, []).append(edge)
+
         for node in self.get_nodes_by_type(NodeType.DIAGNOSIS):
-            symptom_edges = [e for e in self.edges.values() 
-                              if e.target_id == node.id and e.edge_type == EdgeType.HAS_SYMPTOM]
+            symptom_edges = symptom_edges_by_target.get(node.id, [])
             if len(symptom_edges) >= 3:  # At least 3 symptoms to form a cluster
                 patterns.append({
                     "type": "symptom_cluster",
@@ -233,49 +269,137 @@ class TemporalKnowledgeGraph:
     
     def _extract_chains(self, edges: list[KnowledgeGraphEdge]) -> list[list[KnowledgeGraphEdge]]:
         """Helper method to extract chains of connected edges."""
-        # Build an adjacency list representation
-        adjacency = {}
-        for edge in edges:
-            if edge.source_id not in adjacency:
-                adjacency[edge.source_id] = []
-            adjacency[edge.source_id].append(edge)
-        
-        chains = []
-        for edge in edges:
-            # Start a chain from each edge
-            self._dfs_chain(edge, [], chains, adjacency)
-        
-        # Filter to keep only chains with at least 2 edges
-        return [chain for chain in chains if len(chain) >= 2]
+        return [
+            list(chain)
+            for chain in self._chain_paths(edges, lambda edge: (edge,), lambda edge, path: (edge, *path))
+        ]
     
-    def _dfs_chain(self, current_edge: KnowledgeGraphEdge, current_chain: list[KnowledgeGraphEdge], 
-                   chains: list[list[KnowledgeGraphEdge]], adjacency: dict[UUID, list[KnowledgeGraphEdge]]):
-        """Depth-first search to find chains of edges."""
-        current_chain.append(current_edge)
-        
-        # If there are no outgoing edges from the target node, we've reached the end of a chain
-        if current_edge.target_id not in adjacency:
-            if len(current_chain) >= 2:
-                chains.append(current_chain.copy())
-            current_chain.pop()
-            return
-        
-        # Explore all outgoing edges from the target node
-        for next_edge in adjacency[current_edge.target_id]:
-            self._dfs_chain(next_edge, current_chain, chains, adjacency)
-        
-        current_chain.pop()
+    @staticmethod
+    def _chain_paths(
+        edges: list[KnowledgeGraphEdge],
+        leaf: Callable[[KnowledgeGraphEdge], Any],
+        extend: Callable[[KnowledgeGraphEdge, Any], Any],
+    ) -> list[Any]:
+        """
+        Memoized depth-first search for chains of at least two edges.
+
+        A chain starts at one of the edges and follows outgoing edges until a
+        node without any; an edge back into the path being explored ends it.
+        The continuations of each edge are built once and shared by every
+        chain that reaches it, instead of re-running the search from every
+        edge.
+
+        Args:
+            edges: Edges to chain
+            leaf: Builds the path value for a single edge
+            extend: Builds the path value for an edge followed by a path value
+
+        Returns:
+            Path values of every chain, grouped by starting edge in input order
+        """
+        adjacency: dict[UUID, list[KnowledgeGraphEdge]] = {}
+        for edge in edges:
+            adjacency.setdefault(edge.source_id, []).append(edge)
+
+        # Edge ID -> path values of the chains starting with that edge
+        paths: dict[UUID, list[Any]] = {}
+        # Edges whose only path is the edge itself
+        terminal: set[UUID] = set()
+        finished: set[UUID] = set()
+        in_progress: set[UUID] = set()
+
+        for root in adjacency:
+            if root in finished:
+                continue
+            in_progress.add(root)
+            stack = [(root, iter(adjacency[root]))]
+            while stack:
+                node, pending = stack[-1]
+                for edge in pending:
+                    target = edge.target_id
+                    if target in adjacency and target not in finished and target not in in_progress:
+                        in_progress.add(target)
+                        stack.append((target, iter(adjacency[target])))
+                        break
+                else:
+                    stack.pop()
+                    in_progress.discard(node)
+                    finished.add(node)
+                    for edge in adjacency[node]:
+                        if edge.target_id in finished:
+                            paths[edge.id] = [
+                                extend(edge, path)
+                                for next_edge in adjacency[edge.target_id]
+                                for path in paths[next_edge.id]
+                            ]
+                        else:
+                            # A node without outgoing edges, or one closing a cycle
+                            paths[edge.id] = [leaf(edge)]
+                            terminal.add(edge.id)
+
+        return [path for edge in edges if edge.id not in terminal for path in paths[edge.id]]
+
+    def _index_node(self, node: KnowledgeGraphNode) -> None:
+        """Store a node (replacing any with the same ID) and update the indexes."""
+        previous = self.nodes.get(node.id)
+        self.nodes[node.id] = node
+        if previous is None or previous.node_type != node.node_type:
+            if previous is not None:
+                self._nodes_by_type[previous.node_type].pop(node.id, None)
+            self._nodes_by_type.setdefault(node.node_type, {})[node.id] = None
+        if previous is None or previous.created_at != node.created_at:
+            if previous is not None:
+                _unindex_time(self._node_times, self._node_time_ids, previous.created_at, node.id)
+            _index_time(self._node_times, self._node_time_ids, node.created_at, node.id)
+
+    def _index_edge(self, edge: KnowledgeGraphEdge) -> None:
+        """Store an edge (replacing any with the same ID) and update the indexes."""
+        previous = self.edges.get(edge.id)
+        self.edges[edge.id] = edge
+        if previous is not None:
+            self._out_edges[previous.source_id].pop(edge.id, None)
+            self._in_edges[previous.target_id].pop(edge.id, None)
+            self._edges_by_type[previous.edge_type].pop(edge.id, None)
+            _unindex_time(self._edge_times, self._edge_time_ids, previous.created_at, edge.id)
+        self._out_edges.setdefault(edge.source_id, {})[edge.id] = None
+        self._in_edges.setdefault(edge.target_id, {})[edge.id] = None
+        self._edges_by_type.setdefault(edge.edge_type, {})[edge.id] = None
+        _index_time(self._edge_times, self._edge_time_ids, edge.created_at, edge.id)
+
+
+def _index_time(times: list[datetime], ids: list[UUID], created_at: datetime, item_id: UUID) -> None:
+    """Insert an ID into parallel lists sorted by creation time."""
+    position = bisect.bisect_right(times, created_at)
+    times.insert(position, created_at)
+    ids.insert(position, item_id)
+
+
+def _unindex_time(times: list[datetime], ids: list[UUID], created_at: datetime, item_id: UUID) -> None:
+    """Remove an ID from parallel lists sorted by creation time."""
+    low = bisect.bisect_left(times, created_at)
+    high = bisect.bisect_right(times, created_at)
+    position = ids.index(item_id, low, high)
+    del times[position]
+    del ids[position]
 
 
 @dataclass
 class BayesianBeliefNetwork:
-    """A Bayesian belief network for probabilistic reasoning about patient state."""
+    """
+    A Bayesian belief network for probabilistic reasoning about patient state.
+
+    Beliefs are computed by the BeliefInferenceEngine given as ``inference``
+    (the infrastructure layer provides exact junction-tree inference). The
+    engine may cache compiled state, so change the network through its
+    methods, which keep the engine informed.
+    """
     patient_id: UUID
     variables: dict[str, dict] = field(default_factory=dict)  # Variable name -> properties
     conditional_probabilities: dict[str, dict] = field(default_factory=dict)  # Variable -> parent configurations -> probabilities
     evidence: dict[str, float] = field(default_factory=dict)  # Current evidence (variable -> value)
     last_updated: datetime = field(default_factory=datetime.now)
-    
+    inference: BeliefInferenceEngine | None = field(default=None, repr=False, compare=False)
+
     def add_variable(self, name: str, states: list[str], description: str | None = None) -> None:
         """Add a variable (node) to the network."""
         self.variables[name] = {
@@ -283,13 +407,17 @@ class BayesianBeliefNetwork:
             "description": description or name,
             "parents": []
         }
-    
+        if self.inference is not None:
+            self.inference.network_changed()
+
     def add_dependency(self, child: str, parent: str) -> None:
         """Add a dependency between variables (parent -> child)."""
         if child not in self.variables or parent not in self.variables:
             raise ValueError(f"Both child ({child}) and parent ({parent}) must exist in the network")
         
         self.variables[child]["parents"].append(parent)
+        if self.inference is not None:
+            self.inference.network_changed(child)
     
     def set_conditional_probability(self, variable: str, parent_values: dict[str, str], probabilities: dict[str, float]) -> None:
         """Set the conditional probability for a variable given its parents' values."""
@@ -309,6 +437,10 @@ class BayesianBeliefNetwork:
         prob_sum = sum(probabilities.values())
         if not 0.99 <= prob_sum <= 1.01:
             raise ValueError(f"Probabilities for {variable} must sum to 1.0, got {prob_sum}")
+
+        for state in probabilities:
+            if state not in self.variables[variable]["states"]:
+                raise ValueError(f"{state} is not a valid state for variable {variable}")
         
         # Create parent configuration string
         config = self._parent_config_to_string(parent_values)
@@ -317,63 +449,50 @@ class BayesianBeliefNetwork:
             self.conditional_probabilities[variable] = {}
         
         self.conditional_probabilities[variable][config] = probabilities
+        if self.inference is not None:
+            self.inference.table_changed(self, variable, parent_values)
     
     def update_beliefs(self, evidence: dict[str, str]) -> None:
         """Update the network with new evidence."""
+        self._validate_evidence(evidence)
+        self.evidence.update(evidence)
+        self.last_updated = datetime.now()
+    
+    def get_belief_state(self) -> dict[str, dict[str, float]]:
+        """Get the current belief state (probability distribution for each variable)."""
+        return self._inference_engine().belief_state(self)
+
+    def get_belief_states(self, evidence_sets: list[dict[str, str]]) -> list[dict[str, dict[str, float]]]:
+        """
+        Get belief states for many evidence sets in one query.
+
+        Useful for querying one network structure against the evidence of many
+        patients. The network's own evidence is neither used nor changed.
+
+        Args:
+            evidence_sets: Evidence (variable -> state) per query
+
+        Returns:
+            Belief state per evidence set, in the same order
+        """
+        for evidence in evidence_sets:
+            self._validate_evidence(evidence)
+        return self._inference_engine().belief_states(self, evidence_sets)
+
+    def _inference_engine(self) -> BeliefInferenceEngine:
+        """The configured inference engine."""
+        if self.inference is None:
+            raise ValueError("No inference engine configured for this network")
+        return self.inference
+
+    def _validate_evidence(self, evidence: dict[str, str]) -> None:
+        """Check that evidence names known variables and valid states."""
         for var, value in evidence.items():
             if var not in self.variables:
                 raise ValueError(f"Variable {var} not found in network")
             if value not in self.variables[var]["states"]:
                 raise ValueError(f"Value {value} is not a valid state for variable {var}")
-            
-            self.evidence[var] = value
-        
-        self.last_updated = datetime.now()
-    
-    def get_belief_state(self) -> dict[str, dict[str, float]]:
-        """Get the current belief state (probability distribution for each variable)."""
-        # This is a simplified approximation; a real implementation would use 
-        # proper Bayesian inference algorithms like variable elimination
-        beliefs = {}
-        
-        # Start with variables that have evidence
-        for var, value in self.evidence.items():
-            beliefs[var] = {state: 1.0 if state == value else 0.0 
-                            for state in self.variables[var]["states"]}
-        
-        # Process variables in topological order (parents before children)
-        ordered_vars = self._topological_sort()
-        
-        for var in ordered_vars:
-            if var in beliefs:  # Already processed (has evidence)
-                continue
-                
-            # Get parents and their values
-            parents = self.variables[var]["parents"]
-            
-            # If any parent doesn't have a belief yet, skip for now
-            if any(parent not in beliefs for parent in parents):
-                continue
-            
-            # Initialize belief for this variable
-            beliefs[var] = {state: 0.0 for state in self.variables[var]["states"]}
-            
-            # For each possible parent configuration
-            for parent_config in self._generate_parent_configs(var, beliefs):
-                config_str = self._parent_config_to_string(parent_config)
-                
-                # If we don't have this configuration, use uniform distribution
-                if var not in self.conditional_probabilities or config_str not in self.conditional_probabilities[var]:
-                    prob = 1.0 / len(self.variables[var]["states"])
-                    for state in self.variables[var]["states"]:
-                        beliefs[var][state] += prob * self._parent_config_probability(parent_config, beliefs)
-                else:
-                    # Use the defined conditional probabilities
-                    for state, prob in self.conditional_probabilities[var][config_str].items():
-                        beliefs[var][state] += prob * self._parent_config_probability(parent_config, beliefs)
-        
-        return beliefs
-    
+
     def _parent_config_to_string(self, parent_values: dict[str, str]) -> str:
         """Convert parent configuration to a string key."""
         return ",".join(f"{parent}={value}" for parent, value in sorted(parent_values.items()))
@@ -403,29 +522,3 @@ class BayesianBeliefNetwork:
                 visit(node)
         
         return result
-    
-    def _generate_parent_configs(self, var: str, beliefs: dict[str, dict[str, float]]) -> list[dict[str, str]]:
-        """Generate all possible parent configurations for a variable."""
-        parents = self.variables[var]["parents"]
-        
-        if not parents:
-            return [{}]
-        
-        configs = [{}]
-        for parent in parents:
-            new_configs = []
-            for config in configs:
-                for state in self.variables[parent]["states"]:
-                    new_config = config.copy()
-                    new_config[parent] = state
-                    new_configs.append(new_config)
-            configs = new_configs
-        
-        return configs
-    
-    def _parent_config_probability(self, config: dict[str, str], beliefs: dict[str, dict[str, float]]) -> float:
-        """Calculate the probability of a specific parent configuration."""
-        prob = 1.0
-        for parent, value in config.items():
-            prob *= beliefs[parent][value]
-        return prob
\ No newline at end of file
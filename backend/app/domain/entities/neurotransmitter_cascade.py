@@ -0,0 +1,192 @@
+"""
+Neurotransmitter cascade simulation for the Temporal Neurotransmitter System.
+
+Region-to-region connectivity is held as a dense transmission matrix (the
+brain region set is small, so a dense matrix beats a sparse one), and each
+time step is a single matrix product followed by decay and clipping. A batch
+axis lets one call simulate many starting conditions, neurotransmitters or
+patients at once.
+"""
+from typing import Dict, List, Mapping, Sequence
+
+import numpy as np
+
+from app.domain.entities.digital_twin_enums import BrainRegion
+
+
+# Default connectivity between regions: source_region -> {target_region: connection_strength}
+DEFAULT_REGION_CONNECTIVITY: Dict[BrainRegion, Dict[BrainRegion, float]] = {
+    BrainRegion.AMYGDALA: {
+        BrainRegion.PREFRONTAL_CORTEX: 0.7,
+        BrainRegion.HIPPOCAMPUS: 0.8,
+        BrainRegion.STRIATUM: 0.5,
+        BrainRegion.HYPOTHALAMUS: 0.6,
+        BrainRegion.THALAMUS: 0.4
+    },
+    BrainRegion.PREFRONTAL_CORTEX: {
+        BrainRegion.AMYGDALA: 0.6,
+        BrainRegion.STRIATUM: 0.7,
+        BrainRegion.THALAMUS: 0.5,
+        BrainRegion.HIPPOCAMPUS: 0.5,
+        BrainRegion.VENTRAL_STRIATUM: 0.6
+    },
+    BrainRegion.HIPPOCAMPUS: {
+        BrainRegion.AMYGDALA: 0.7,
+        BrainRegion.PREFRONTAL_CORTEX: 0.6,
+        BrainRegion.THALAMUS: 0.4,
+        BrainRegion.HYPOTHALAMUS: 0.5
+    },
+    BrainRegion.STRIATUM: {
+        BrainRegion.PREFRONTAL_CORTEX: 0.6,
+        BrainRegion.THALAMUS: 0.5,
+        BrainRegion.SUBSTANTIA_NIGRA: 0.7
+    },
+    BrainRegion.THALAMUS: {
+        BrainRegion.PREFRONTAL_CORTEX: 0.7,
+        BrainRegion.STRIATUM: 0.6,
+        BrainRegion.HIPPOCAMPUS: 0.5,
+        BrainRegion.HYPOTHALAMUS: 0.6
+    },
+    BrainRegion.HYPOTHALAMUS: {
+        BrainRegion.THALAMUS: 0.7,
+        BrainRegion.AMYGDALA: 0.5,
+        BrainRegion.PITUITARY: 0.8
+    },
+    BrainRegion.VENTRAL_TEGMENTAL_AREA: {
+        BrainRegion.STRIATUM: 0.8,
+        BrainRegion.PREFRONTAL_CORTEX: 0.6,
+        BrainRegion.NUCLEUS_ACCUMBENS: 0.9
+    },
+    BrainRegion.LOCUS_COERULEUS: {
+        BrainRegion.PREFRONTAL_CORTEX: 0.7,
+        BrainRegion.THALAMUS: 0.5,
+        BrainRegion.HIPPOCAMPUS: 0.6
+    },
+    BrainRegion.RAPHE_NUCLEI: {
+        BrainRegion.PREFRONTAL_CORTEX: 0.6,
+        BrainRegion.THALAMUS: 0.5,
+        BrainRegion.HIPPOCAMPUS: 0.7,
+        BrainRegion.AMYGDALA: 0.6
+    },
+    BrainRegion.SUBSTANTIA_NIGRA: {
+        BrainRegion.STRIATUM: 0.9,
+        BrainRegion.THALAMUS: 0.4,
+        BrainRegion.DORSAL_STRIATUM: 0.8
+    },
+    BrainRegion.VENTRAL_STRIATUM: {
+        BrainRegion.PREFRONTAL_CORTEX: 0.7,
+        BrainRegion.AMYGDALA: 0.6,
+        BrainRegion.NUCLEUS_ACCUMBENS: 0.8
+    },
+    BrainRegion.DORSAL_STRIATUM: {
+        BrainRegion.SUBSTANTIA_NIGRA: 0.8,
+        BrainRegion.PREFRONTAL_CORTEX: 0.6,
+        BrainRegion.THALAMUS: 0.5
+    },
+    # Minimal connections for the remaining regions
+    BrainRegion.NUCLEUS_ACCUMBENS: {
+        BrainRegion.PREFRONTAL_CORTEX: 0.7,
+        BrainRegion.VENTRAL_TEGMENTAL_AREA: 0.8
+    },
+    BrainRegion.PITUITARY: {
+        BrainRegion.HYPOTHALAMUS: 0.9
+    }
+}
+
+
+class CascadeSimulator:
+    """
+    Simulates how activity spreads between brain regions over discrete time steps.
+
+    At each step every region keeps ``1 - decay_rate`` of its previous level and
+    receives ``level * strength * transmission_rate`` from each connected source
+    region whose previous level is above ``activity_threshold``; levels are then
+    clipped to [0, 1].
+    """
+
+    def __init__(
+        self,
+        connectivity: Mapping[BrainRegion, Mapping[BrainRegion, float]] = DEFAULT_REGION_CONNECTIVITY,
+        regions: Sequence[BrainRegion] = tuple(BrainRegion),
+        decay_rate: float = 0.2,
+        transmission_rate: float = 0.4,
+        activity_threshold: float = 0.01
+    ):
+        """
+        Build the transmission matrix.
+
+        Args:
+            connectivity: source_region -> {target_region: connection_strength}
+            regions: Regions to simulate, in output column order
+            decay_rate: Fraction of a region's level lost per step
+            transmission_rate: Fraction of source level times strength passed on per step
+            activity_threshold: Source levels at or below this transmit nothing
+        """
+        self.regions = list(regions)
+        self.region_index = {region: i for i, region in enumerate(self.regions)}
+        self.decay_rate = decay_rate
+        self.activity_threshold = activity_threshold
+
+        # transmission[source, target], so a step is levels @ transmission
+        self.transmission = np.zeros((len(self.regions), len(self.regions)))
+        for source, targets in connectivity.items():
+            if source not in self.region_index:
+                continue
+            for target, strength in targets.items():
+                if target in self.region_index:
+                    self.transmission[self.region_index[source], self.region_index[target]] = strength * transmission_rate
+
+    def initial_levels(self, levels: Sequence[Mapping[BrainRegion, float]]) -> np.ndarray:
+        """
+        Convert per-region starting levels to a (batch, regions) array.
+
+        Args:
+            levels: One mapping of region -> starting level per simulation
+
+        Returns:
+            Starting levels, zero for regions not given
+        """
+        initial = np.zeros((len(levels), len(self.regions)))
+        for row, starting in enumerate(levels):
+            for region, level in starting.items():
+                initial[row, self.region_index[region]] = level
+        return initial
+
+    def simulate(self, initial: np.ndarray, time_steps: int) -> np.ndarray:
+        """
+        Run the cascade for a batch of starting conditions.
+
+        Args:
+            initial: Starting levels, shape (regions,) or (batch, regions)
+            time_steps: Number of time steps to return, including the start
+
+        Returns:
+            Levels of shape (batch, time_steps, regions), or (time_steps, regions)
+            for a single starting condition
+        """
+        initial = np.asarray(initial, dtype=float)
+        single = initial.ndim == 1
+        current = np.atleast_2d(initial)
+
+        trajectory = np.empty((current.shape[0], max(time_steps, 0), len(self.regions)))
+        if time_steps > 0:
+            trajectory[:, 0] = current
+        retained = 1.0 - self.decay_rate
+        for t in range(1, time_steps):
+            previous = trajectory[:, t - 1]
+            active = np.where(previous > self.activity_threshold, previous, 0.0)
+            np.clip(previous * retained + active @ self.transmission, 0.0, 1.0, out=trajectory[:, t])
+
+        return trajectory[0] if single else trajectory
+
+    def to_region_series(self, trajectory: np.ndarray) -> Dict[BrainRegion, List[float]]:
+        """
+        Convert one (time_steps, regions) trajectory to region -> list of levels.
+
+        Args:
+            trajectory: Levels for a single starting condition
+
+        Returns:
+            Temporal sequence of levels for every simulated region
+        """
+        return {region: trajectory[:, i].tolist() for i, region in enumerate(self.regions)}
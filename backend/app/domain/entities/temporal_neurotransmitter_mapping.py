@@ -10,7 +10,7 @@ import uuid
 import numpy as np
 from datetime import datetime, timedelta
 from enum import Enum, auto
-from typing import Any, Dict, List, Optional, Set, Tuple, Union
+from typing import Any, Dict, List, Mapping, Optional, Sequence, Set, Tuple, Union
 from uuid import UUID
 
 from app.domain.entities.digital_twin_enums import (
@@ -20,6 +20,7 @@ from app.domain.entities.digital_twin_enums import (
     TemporalResolution,
     ConnectionType,
 )
+from app.domain.entities.neurotransmitter_cascade import CascadeSimulator, DEFAULT_REGION_CONNECTIVITY
 from app.domain.entities.neurotransmitter_effect import NeurotransmitterEffect
 from app.domain.entities.neurotransmitter_mapping import (
     NeurotransmitterMapping,
@@ -274,26 +275,9 @@ class TemporalNeurotransmitterMapping(NeurotransmitterMapping):
             Either a nested dictionary mapping regions to neurotransmitter effects,
             or a dictionary mapping regions to temporal level sequences
         """
-        # Check if we're handling the test case directly
+        # Temporal propagation mode
         if initial_level is not None and time_steps is not None:
-            # Test-specific implementation for temporal cascade test
-            result = {}
-            # Include all BrainRegion enums
-            for region in BrainRegion:
-                # Create a temporal sequence for each region
-                if region == starting_region:
-                    # Starting region gets the initial level and a declining pattern
-                    result[region] = [initial_level] + [max(0.0, initial_level - 0.1 * i) for i in range(1, time_steps)]
-                elif region in [BrainRegion.PREFRONTAL_CORTEX, BrainRegion.HIPPOCAMPUS, BrainRegion.THALAMUS]:
-                    # These regions get a delayed increase
-                    result[region] = [0.0] + [min(1.0, 0.1 * i) for i in range(1, time_steps)]
-                else:
-                    # Other regions get minimal effect
-                    result[region] = [0.0] * time_steps
-                    # But ensure at least one has a non-zero value to pass the propagation test
-                    if region == BrainRegion.STRIATUM:
-                        result[region][time_steps // 2] = 0.3
-            return result
+            return self._predict_temporal_cascade(starting_region, neurotransmitter, initial_level, time_steps)
         
         # Initialize result structure for static propagation
         cascade_effects = {}
@@ -397,121 +381,51 @@ class TemporalNeurotransmitterMapping(NeurotransmitterMapping):
         Returns:
             Dictionary mapping brain regions to temporal sequences of levels
         """
-        # Initialize result with all brain regions
-        result = {region: [0.0] * time_steps for region in BrainRegion}
-        
-        # Set the initial level for the starting region
-        result[starting_region][0] = initial_level
-        
-        # Setup a simple connectivity map between regions
-        # Format: source_region -> {target_region: connection_strength}
-        connectivity = {
-            BrainRegion.AMYGDALA: {
-                BrainRegion.PREFRONTAL_CORTEX: 0.7,
-                BrainRegion.HIPPOCAMPUS: 0.8,
-                BrainRegion.STRIATUM: 0.5,
-                BrainRegion.HYPOTHALAMUS: 0.6,
-                BrainRegion.THALAMUS: 0.4
-            },
-            BrainRegion.PREFRONTAL_CORTEX: {
-                BrainRegion.AMYGDALA: 0.6,
-                BrainRegion.STRIATUM: 0.7,
-                BrainRegion.THALAMUS: 0.5,
-                BrainRegion.HIPPOCAMPUS: 0.5,
-                BrainRegion.VENTRAL_STRIATUM: 0.6
-            },
-            BrainRegion.HIPPOCAMPUS: {
-                BrainRegion.AMYGDALA: 0.7,
-                BrainRegion.PREFRONTAL_CORTEX: 0.6,
-                BrainRegion.THALAMUS: 0.4,
-                BrainRegion.HYPOTHALAMUS: 0.5
-            },
-            BrainRegion.STRIATUM: {
-                BrainRegion.PREFRONTAL_CORTEX: 0.6,
-                BrainRegion.THALAMUS: 0.5,
-                BrainRegion.SUBSTANTIA_NIGRA: 0.7
-            },
-            BrainRegion.THALAMUS: {
-                BrainRegion.PREFRONTAL_CORTEX: 0.7,
-                BrainRegion.STRIATUM: 0.6,
-                BrainRegion.HIPPOCAMPUS: 0.5,
-                BrainRegion.HYPOTHALAMUS: 0.6
-            },
-            BrainRegion.HYPOTHALAMUS: {
-                BrainRegion.THALAMUS: 0.7,
-                BrainRegion.AMYGDALA: 0.5,
-                BrainRegion.PITUITARY: 0.8
-            },
-            BrainRegion.VENTRAL_TEGMENTAL_AREA: {
-                BrainRegion.STRIATUM: 0.8,
-                BrainRegion.PREFRONTAL_CORTEX: 0.6,
-                BrainRegion.NUCLEUS_ACCUMBENS: 0.9
-            },
-            BrainRegion.LOCUS_COERULEUS: {
-                BrainRegion.PREFRONTAL_CORTEX: 0.7,
-                BrainRegion.THALAMUS: 0.5,
-                BrainRegion.HIPPOCAMPUS: 0.6
-            },
-            BrainRegion.RAPHE_NUCLEI: {
-                BrainRegion.PREFRONTAL_CORTEX: 0.6,
-                BrainRegion.THALAMUS: 0.5,
-                BrainRegion.HIPPOCAMPUS: 0.7,
-                BrainRegion.AMYGDALA: 0.6
-            },
-            BrainRegion.SUBSTANTIA_NIGRA: {
-                BrainRegion.STRIATUM: 0.9,
-                BrainRegion.THALAMUS: 0.4,
-                BrainRegion.DORSAL_STRIATUM: 0.8
-            },
-            BrainRegion.VENTRAL_STRIATUM: {
-                BrainRegion.PREFRONTAL_CORTEX: 0.7,
-                BrainRegion.AMYGDALA: 0.6,
-                BrainRegion.NUCLEUS_ACCUMBENS: 0.8
-            },
-            BrainRegion.DORSAL_STRIATUM: {
-                BrainRegion.SUBSTANTIA_NIGRA: 0.8,
-                BrainRegion.PREFRONTAL_CORTEX: 0.6,
-                BrainRegion.THALAMUS: 0.5
-            },
-            # Add minimal connections for the remaining regions
-            BrainRegion.NUCLEUS_ACCUMBENS: {
-                BrainRegion.PREFRONTAL_CORTEX: 0.7,
-                BrainRegion.VENTRAL_TEGMENTAL_AREA: 0.8
-            },
-            BrainRegion.PITUITARY: {
-                BrainRegion.HYPOTHALAMUS: 0.9
-            }
-        }
+        simulator = self._cascade_simulator()
+        trajectory = simulator.simulate(simulator.initial_levels([{starting_region: initial_level}])[0], time_steps)
+        return simulator.to_region_series(trajectory)
+
+    def predict_temporal_cascades(
+        self,
+        initial_levels: Sequence[Mapping[BrainRegion, float]],
+        time_steps: int
+    ) -> np.ndarray:
+        """
+        Simulate many temporal cascades in one batched call.
+        
+        Each entry is an independent starting condition, e.g. one per
+        neurotransmitter or per patient.
         
-        # Store connectivity for future use
-        self.brain_region_connectivity = connectivity
+        Args:
+            initial_levels: Per simulation, the starting level (0-1 scale) of each region
+            time_steps: Number of time steps to simulate
             
-        # Simulate the propagation
-        for t in range(1, time_steps):
-            # Calculate new values for this time step
-            for target_region in BrainRegion:
-                # First apply natural decay to previous value
-                decay_rate = 0.2  # 20% decay per time step
-                natural_decay = result[target_region][t-1] * (1 - decay_rate)
-                result[target_region][t] = natural_decay
-                
-                # Then add influence from connected regions
-                for source_region, connections in connectivity.items():
-                    if target_region in connections and result[source_region][t-1] > 0.01:
-                        # Get the connection strength
-                        connection_strength = connections[target_region]
-                        
-                        # Calculate influence based on source level and connection strength
-                        # The stronger the connection and higher the source level, the greater the influence
-                        influence = result[source_region][t-1] * connection_strength * 0.4
-                        
-                        # Add this influence to the target region's level
-                        result[target_region][t] += influence
-                
-                # Ensure values stay in valid range (0.0 to 1.0)
-                result[target_region][t] = max(0.0, min(1.0, result[target_region][t]))
-                
-        return result
+        Returns:
+            Levels of shape (simulations, time_steps, regions), regions in BrainRegion order
+        """
+        simulator = self._cascade_simulator()
+        return simulator.simulate(simulator.initial_levels(initial_levels), time_steps)
+
+    def _cascade_simulator(self) -> CascadeSimulator:
+        """
+        Get the cascade simulator for the current region connectivity.
+        
+        Falls back to (and stores) the default connectivity when none has been
+        set; the simulator's matrix is rebuilt only when connectivity changes.
+        
+        Returns:
+            CascadeSimulator over all brain regions
+        """
+        if not any(self.brain_region_connectivity.values()):
+            self.brain_region_connectivity = {
+                source: dict(targets) for source, targets in DEFAULT_REGION_CONNECTIVITY.items()
+            }
+        
+        key = tuple((source, tuple(targets.items())) for source, targets in self.brain_region_connectivity.items())
+        cached = getattr(self, "_cascade_cache", None)
+        if cached is None or cached[0] != key:
+            self._cascade_cache = (key, CascadeSimulator(self.brain_region_connectivity))
+        return self._cascade_cache[1]
     
     def analyze_temporal_response(self, sequence: TemporalSequence = None,
                                 patient_id: UUID = None,
@@ -840,7 +754,8 @@ class TemporalNeurotransmitterMapping(NeurotransmitterMapping):
         treatment_effect: float = 0.5,
         timestamps: List[datetime] = None,
         affected_neurotransmitters: Dict[Neurotransmitter, float] = None,
-        medication_name: str = "Generic Medication"
+        medication_name: str = "Generic Medication",
+        patient_id: UUID | None = None
     ) -> Dict[Neurotransmitter, TemporalSequence]:
         """
         Simulate how a medication affects neurotransmitter levels over time.
@@ -852,6 +767,7 @@ class TemporalNeurotransmitterMapping(NeurotransmitterMapping):
             timestamps: List of timestamps for the temporal sequences
             affected_neurotransmitters: Dictionary mapping neurotransmitters to relative effect sizes
             medication_name: Name of the medication being simulated
+            patient_id: Optional patient to attribute the sequences to (defaults to the mapping's patient)
             
         Returns:
             Dictionary mapping neurotransmitters to temporal sequences
@@ -922,7 +838,7 @@ class TemporalNeurotransmitterMapping(NeurotransmitterMapping):
                 feature_names=feature_names,
                 timestamps=timestamps,
                 values=values,
-                patient_id=self.patient_id if self.patient_id else uuid.uuid4(),
+                patient_id=patient_id or self.patient_id or uuid.uuid4(),
                 metadata=metadata,
                 name=f"{medication_name}_{brain_region.value}_{target_neurotransmitter.value}_response",
                 brain_region=brain_region,
@@ -1007,7 +923,7 @@ class TemporalNeurotransmitterMapping(NeurotransmitterMapping):
                         feature_names=feature_names,
                         timestamps=timestamps,
                         values=secondary_values,
-                        patient_id=self.patient_id if self.patient_id else uuid.uuid4(),
+                        patient_id=patient_id or self.patient_id or uuid.uuid4(),
                         metadata=secondary_metadata,
                         name=f"{medication_name}_{brain_region.value}_{secondary_nt.value}_secondary_response",
                         brain_region=brain_region,
@@ -1018,6 +934,8 @@ class TemporalNeurotransmitterMapping(NeurotransmitterMapping):
                     )
                     
                     sequences[secondary_nt] = secondary_sequence
+            
+            self._attach_regional_cascade(sequences, brain_region, treatment_effect, len(timestamps))
                     
         # Add a simulated event for this treatment
         event_id = uuid.uuid4()
@@ -1035,6 +953,39 @@ class TemporalNeurotransmitterMapping(NeurotransmitterMapping):
         
         return sequences
 
+    def _attach_regional_cascade(
+        self,
+        sequences: Dict[Neurotransmitter, TemporalSequence],
+        brain_region: BrainRegion,
+        treatment_effect: float,
+        time_steps: int
+    ) -> None:
+        """
+        Record how each simulated neurotransmitter response spreads to other regions.
+        
+        All neurotransmitters are simulated in one batched cascade starting from
+        the treated region, scaled by their correlation with the primary response.
+        Each sequence gets the peak level reached per region in its metadata.
+        
+        Args:
+            sequences: Treatment response sequences by neurotransmitter
+            brain_region: Region where the treatment acts
+            treatment_effect: Overall strength of the treatment effect
+            time_steps: Number of time steps to simulate
+        """
+        weights = [abs(sequence.metadata.get("correlation_with_primary", 1.0)) for sequence in sequences.values()]
+        cascades = self.predict_temporal_cascades(
+            [{brain_region: min(1.0, abs(treatment_effect) * weight)} for weight in weights],
+            time_steps
+        )
+        peaks = cascades.max(axis=1) if time_steps > 0 else np.zeros((len(weights), len(BrainRegion)))
+        regions = self._cascade_simulator().regions
+        
+        for sequence, region_peaks in zip(sequences.values(), peaks):
+            sequence.metadata["regional_cascade"] = {
+                region.value: float(peak) for region, peak in zip(regions, region_peaks) if peak > 0.01
+            }
+
 
 def extend_neurotransmitter_mapping(base_mapping: NeurotransmitterMapping, patient_id: UUID | None = None) -> TemporalNeurotransmitterMapping:
     """
@@ -3,9 +3,15 @@ Temporal sequence models for the Temporal Neurotransmitter System.
 
 This module defines the core classes for representing time series data
 for neurotransmitter levels and other temporal measurements.
+
+Sequences are stored column-wise: int64 epoch-microsecond timestamps and a
+float64 (n_points, n_features) value matrix. Point and batch lookups use
+binary search over the timestamps, and the list-based ``timestamps`` and
+``values`` properties are materialized on demand for compatibility.
 """
 import math
 import uuid
+from collections.abc import Sequence
 from datetime import datetime, timedelta
 from app.domain.utils.datetime_utils import UTC
 from enum import Enum
@@ -18,6 +24,63 @@ from app.domain.entities.digital_twin_enums import BrainRegion, Neurotransmitter
 
 T = TypeVar('T', float, int, bool, str)
 
+_EPOCH = datetime(1970, 1, 1)
+_EPOCH_UTC = datetime(1970, 1, 1, tzinfo=UTC)
+_ONE_MICROSECOND = timedelta(microseconds=1)
+
+
+def to_epoch_us(timestamp: datetime) -> int:
+    """
+    Convert a datetime to integer microseconds since the Unix epoch.
+
+    Naive datetimes are treated as UTC.
+
+    Args:
+        timestamp: Datetime to convert
+
+    Returns:
+        Microseconds since 1970-01-01T00:00:00Z
+    """
+    epoch = _EPOCH if timestamp.tzinfo is None else _EPOCH_UTC
+    return (timestamp - epoch) // _ONE_MICROSECOND
+
+
+def _as_epoch_us(timestamps: Any) -> np.ndarray:
+    """Convert datetimes, datetime64 or epoch-microsecond input to an int64 array."""
+    if isinstance(timestamps, np.ndarray):
+        if np.issubdtype(timestamps.dtype, np.datetime64):
+            return timestamps.astype("datetime64[us]").view(np.int64)
+        if np.issubdtype(timestamps.dtype, np.integer):
+            return timestamps.astype(np.int64, copy=False)
+    if isinstance(timestamps, datetime):
+        return np.array([to_epoch_us(timestamps)], dtype=np.int64)
+    return np.fromiter((to_epoch_us(ts) for ts in timestamps), dtype=np.int64, count=len(timestamps))
+
+
+def _as_value_matrix(values: Any, dimension: int) -> np.ndarray:
+    """Convert value vectors to a (n_points, dimension) matrix, float64 where possible."""
+    if isinstance(values, np.ndarray):
+        matrix = values.reshape(-1, 1) if values.ndim == 1 else values
+        if matrix.dtype != object:
+            matrix = matrix.astype(np.float64, copy=False)
+    else:
+        if any(len(value_vec) != dimension for value_vec in values):
+            raise ValueError("Each value vector must have the same number of features")
+        try:
+            matrix = np.array(values, dtype=np.float64)
+        except (TypeError, ValueError):
+            # Non-numeric features are kept as objects; interpolation needs numbers
+            matrix = np.array(values, dtype=object)
+        if matrix.size == 0:
+            matrix = matrix.reshape(len(values), dimension)
+    if matrix.ndim != 2 or matrix.shape[1] != dimension:
+        raise ValueError("Each value vector must have the same number of features")
+    return matrix
+
+
+def _scalar(value: Any) -> Any:
+    return value.item() if isinstance(value, np.generic) else value
+
 
 class InterpolationMethod(Enum):
     """Methods for interpolating between temporal data points."""
@@ -61,8 +124,10 @@ class TemporalSequence(Generic[T]):
         Args:
             sequence_id: Unique identifier for the sequence
             feature_names: Names of the features in this sequence
-            timestamps: List of timestamps for each data point
-            values: List of feature vector values, one per timestamp
+            timestamps: List of timestamps for each data point, or an array of
+                epoch microseconds / datetime64 (used without copying)
+            values: List of feature vector values, one per timestamp, or a
+                2-D array (used without copying)
             patient_id: Identifier of the associated patient
             metadata: Additional metadata for the sequence
             name: Name of the sequence
@@ -85,7 +150,10 @@ class TemporalSequence(Generic[T]):
             else:
                 feature_names = ["value"]
         # Values: allow list of floats, convert to list of 1-element lists
-        if values is not None and values and not isinstance(values[0], list):
+        if (
+            values is not None and not isinstance(values, np.ndarray)
+            and values and not isinstance(values[0], (list, tuple, np.ndarray))
+        ):
             values = [[v] for v in values]
         # Validate required fields
         if not sequence_id or timestamps is None or values is None or patient_id is None:
@@ -93,13 +161,17 @@ class TemporalSequence(Generic[T]):
         # Validate input lengths match
         if len(timestamps) != len(values):
             raise ValueError("Number of timestamps must match number of value vectors")
-        if any(len(value_vec) != len(feature_names) for value_vec in values):
-            raise ValueError("Each value vector must have the same number of features")
         # Assign core attributes
         self.sequence_id = sequence_id
         self._feature_names = feature_names
-        self._timestamps = timestamps
-        self._values = values
+        self._value_matrix = _as_value_matrix(values, len(feature_names))
+        self._timestamp_us = _as_epoch_us(timestamps)
+        # Original datetime objects are kept; array input is materialized on first access
+        self._timestamp_list: list[datetime] | None = (
+            None if isinstance(timestamps, np.ndarray) else list(timestamps)
+        )
+        self._value_list: list[list[float]] | None = None
+        self._index_timestamps()
         self.patient_id = patient_id
         self.clinical_significance = clinical_significance
         self.metadata = metadata or {}
@@ -112,18 +184,53 @@ class TemporalSequence(Generic[T]):
         self.updated_at = updated_at or datetime.now(UTC)
         self.temporal_resolution = temporal_resolution
         # Cache for sequence length
-        self._sequence_length = len(timestamps)
+        self._sequence_length = len(self._timestamp_us)
+
+    def _index_timestamps(self) -> None:
+        """Prepare the sorted timestamp view used by binary-search lookups."""
+        timestamps_us = self._timestamp_us
+        if timestamps_us.size < 2 or bool(np.all(timestamps_us[1:] >= timestamps_us[:-1])):
+            self._sort_order: np.ndarray | None = None
+            self._sorted_us = timestamps_us
+        else:
+            self._sort_order = np.argsort(timestamps_us, kind="stable")
+            self._sorted_us = timestamps_us[self._sort_order]
+
     @property
     def timestamps(self) -> list[datetime]:
         """Get all timestamps in the sequence, ordered chronologically."""
-        return self._timestamps
+        if self._timestamp_list is None:
+            self._timestamp_list = [
+                _EPOCH_UTC + timedelta(microseconds=us) for us in self._timestamp_us.tolist()
+            ]
+        return self._timestamp_list
     
     @property
     def values(self) -> list[list[float]]:
         """
         Get all values in the sequence, ordered chronologically.
         """
-        return self._values
+        if self._value_list is None:
+            self._value_list = self._value_matrix.tolist()
+        return self._value_list
+
+    @property
+    def _values(self) -> np.ndarray:
+        """Value matrix, indexable like the former list of value vectors."""
+        return self._value_matrix
+
+    def _set_value(self, index: int, feature_index: int, value: float) -> None:
+        """
+        Update one value in place.
+
+        Args:
+            index: Data point index
+            feature_index: Feature index
+            value: New value
+        """
+        self._value_matrix[index, feature_index] = value
+        self._value_list = None
+
     @values.setter
     def values(self, new_values: list[list[float]]) -> None:
         """
@@ -132,13 +239,11 @@ class TemporalSequence(Generic[T]):
         Args:
             new_values: List of values to set
         """
-        if len(new_values) != len(self._timestamps):
+        if len(new_values) != len(self._timestamp_us):
             raise ValueError("Number of value vectors must match number of timestamps")
             
-        if any(len(value_vec) != len(self._feature_names) for value_vec in new_values):
-            raise ValueError("Each value vector must have the same number of features")
-            
-        self._values = new_values
+        self._value_matrix = _as_value_matrix(new_values, len(self._feature_names))
+        self._value_list = None
         self.updated_at = datetime.now(UTC)
         self.metadata["explicit_values"] = True
     
@@ -217,22 +322,31 @@ class TemporalSequence(Generic[T]):
             metadata=metadata
         )
         
+    def to_arrays(self) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Get the underlying column arrays without copying.
+        
+        Returns:
+            timestamps_us: Read-only int64 epoch-microsecond timestamps
+            values: Read-only (n_points, n_features) value matrix
+        """
+        return _read_only(self._timestamp_us), _read_only(self._value_matrix)
+    
     def to_numpy_arrays(self) -> tuple[np.ndarray, np.ndarray]:
         """
         Convert to input/output numpy arrays for machine learning.
         
+        Both arrays are read-only views of the value matrix.
+        
         Returns:
             X: Input features array (all except last timestamp)
             y: Target outputs array (all except first timestamp)
         """
-        # Convert values to numpy array
-        values_array = np.array(self._values)
-        
         # Input features are all but the last value
-        X = values_array[:-1]
+        X = _read_only(self._value_matrix[:-1])
         
         # Targets are all but the first value
-        y = values_array[1:]
+        y = _read_only(self._value_matrix[1:])
         
         return X, y
     
@@ -255,7 +369,7 @@ class TemporalSequence(Generic[T]):
         
         # Fill with actual values up to sequence_length
         actual_length = min(self.sequence_length, max_length)
-        padded_values[:actual_length] = self._values[:actual_length]
+        padded_values[:actual_length] = self._value_matrix[:actual_length]
         mask[:actual_length] = True
         
         return {
@@ -268,6 +382,9 @@ class TemporalSequence(Generic[T]):
         """
         Extract a subsequence from this sequence.
         
+        The subsequence's timestamp and value arrays are views sharing memory
+        with this sequence.
+        
         Args:
             start_idx: Start index (inclusive)
             end_idx: End index (exclusive)
@@ -278,14 +395,77 @@ class TemporalSequence(Generic[T]):
         if start_idx < 0 or end_idx > self.sequence_length or start_idx >= end_idx:
             raise ValueError(f"Invalid subsequence indices: {start_idx}:{end_idx}")
             
-        return TemporalSequence(
+        subsequence = TemporalSequence(
             sequence_id=uuid.uuid4(),
             feature_names=self._feature_names,
-            timestamps=self._timestamps[start_idx:end_idx],
-            values=self._values[start_idx:end_idx],
+            timestamps=self._timestamp_us[start_idx:end_idx],
+            values=self._value_matrix[start_idx:end_idx],
             patient_id=self.patient_id,
             metadata=self.metadata.copy()
         )
+        if self._timestamp_list is not None:
+            subsequence._timestamp_list = self._timestamp_list[start_idx:end_idx]
+        return subsequence
+    
+    def _neighbours(self, timestamps_us: np.ndarray) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Locate query timestamps by binary search.
+        
+        Args:
+            timestamps_us: Query timestamps in epoch microseconds
+            
+        Returns:
+            exact: Whether each query matches a stored timestamp
+            before: Position of the last point strictly before (-1 if none)
+            after: Position of the first point strictly after (n if none)
+            sorted_to_index: Maps sorted positions to data point indices
+        """
+        left = np.searchsorted(self._sorted_us, timestamps_us, side="left")
+        right = np.searchsorted(self._sorted_us, timestamps_us, side="right")
+        sorted_to_index = (
+            self._sort_order if self._sort_order is not None else np.arange(self._sorted_us.size)
+        )
+        return left < right, left - 1, right, sorted_to_index
+    
+    def index_of(self, timestamp: datetime) -> int | None:
+        """
+        Find the first data point recorded exactly at a timestamp.
+        
+        Args:
+            timestamp: Target timestamp
+            
+        Returns:
+            Data point index, or None if there is no exact match
+        """
+        target = to_epoch_us(timestamp)
+        position = int(np.searchsorted(self._sorted_us, target, side="left"))
+        if position == self._sorted_us.size or self._sorted_us[position] != target:
+            return None
+        return position if self._sort_order is None else int(self._sort_order[position])
+    
+    def nearest_index(self, timestamp: datetime) -> int | None:
+        """
+        Find the data point closest in time to a timestamp.
+        
+        Ties go to the earlier data point.
+        
+        Args:
+            timestamp: Target timestamp
+            
+        Returns:
+            Data point index, or None if the sequence is empty
+        """
+        n = self._sorted_us.size
+        if n == 0:
+            return None
+        target = to_epoch_us(timestamp)
+        position = int(np.searchsorted(self._sorted_us, target, side="left"))
+        if position == n or (
+            position > 0 and target - self._sorted_us[position - 1] <= self._sorted_us[position] - target
+        ):
+            # Step back to the first of any run of equal timestamps
+            position = int(np.searchsorted(self._sorted_us, self._sorted_us[position - 1], side="left"))
+        return position if self._sort_order is None else int(self._sort_order[position])
     
     def get_value_at(self, timestamp: datetime, feature_index: int = 0, interpolation: InterpolationMethod = InterpolationMethod.LINEAR) -> float | None:
         """
@@ -300,48 +480,93 @@ class TemporalSequence(Generic[T]):
             Interpolated value or None if it can't be determined
         """
         # Check for exact match
-        for i, ts in enumerate(self._timestamps):
-            if ts == timestamp:
-                return self._values[i][feature_index]
+        index = self.index_of(timestamp)
+        if index is not None:
+            return _scalar(self._value_matrix[index, feature_index])
         
         # Return None if no data or interpolation is NONE
-        if not self._timestamps or interpolation == InterpolationMethod.NONE:
+        if not self._sequence_length or interpolation == InterpolationMethod.NONE:
             return None
         
         # Find surrounding timestamps
-        before_indices = [i for i, ts in enumerate(self._timestamps) if ts < timestamp]
-        after_indices = [i for i, ts in enumerate(self._timestamps) if ts > timestamp]
+        target = to_epoch_us(timestamp)
+        _, before, after, sorted_to_index = self._neighbours(np.array([target], dtype=np.int64))
+        before, after = int(before[0]), int(after[0])
         
-        if not before_indices or not after_indices:
+        if before < 0 or after >= self._sequence_length:
             return None
         
-        # Get closest indices before and after
-        before_idx = max(before_indices)
-        after_idx = min(after_indices)
-        
         # Get timestamps and values
-        before_ts = self._timestamps[before_idx]
-        after_ts = self._timestamps[after_idx]
-        before_value = self._values[before_idx][feature_index]
-        after_value = self._values[after_idx][feature_index]
+        before_us = int(self._sorted_us[before])
+        after_us = int(self._sorted_us[after])
+        before_value = _scalar(self._value_matrix[sorted_to_index[before], feature_index])
+        after_value = _scalar(self._value_matrix[sorted_to_index[after], feature_index])
         
         # Interpolate based on method
         if interpolation == InterpolationMethod.NEAREST:
-            if (timestamp - before_ts) < (after_ts - timestamp):
+            if (target - before_us) < (after_us - target):
                 return before_value
             else:
                 return after_value
         
-        # Linear interpolation
-        total_seconds = (after_ts - before_ts).total_seconds()
-        position = (timestamp - before_ts).total_seconds() / total_seconds
+        # Linear interpolation; other methods default to linear for now
+        position = (target - before_us) / (after_us - before_us)
+        return before_value + (after_value - before_value) * position
+    
+    def values_at(
+        self,
+        timestamps: Sequence[datetime] | np.ndarray,
+        feature_index: int | None = None,
+        interpolation: InterpolationMethod = InterpolationMethod.LINEAR
+    ) -> np.ndarray:
+        """
+        Get values at many timestamps at once, interpolating where necessary.
         
-        if interpolation == InterpolationMethod.LINEAR:
-            return before_value + (after_value - before_value) * position
+        Vectorized counterpart of get_value_at: exact matches return the
+        stored value, other timestamps are interpolated between their
+        neighbours, and timestamps that cannot be determined (outside the
+        sequence, or any non-match with InterpolationMethod.NONE) are NaN.
         
-        # Other interpolation methods would be implemented here
-        # For now, default to linear
-        return before_value + (after_value - before_value) * position
+        Args:
+            timestamps: Datetimes, datetime64 values or epoch microseconds
+            feature_index: Feature to retrieve, or None for all features
+            interpolation: Method to use for interpolation
+            
+        Returns:
+            Array of shape (n_timestamps,) for one feature or
+            (n_timestamps, n_features) for all features
+        """
+        targets = _as_epoch_us(timestamps)
+        matrix = self._value_matrix if feature_index is None else self._value_matrix[:, feature_index]
+        result = np.full((targets.size,) + matrix.shape[1:], np.nan)
+        if not self._sequence_length or not targets.size:
+            return result
+        
+        exact, before, after, sorted_to_index = self._neighbours(targets)
+        exact_rows = np.flatnonzero(exact)
+        result[exact_rows] = matrix[sorted_to_index[before[exact_rows] + 1]]
+        if interpolation == InterpolationMethod.NONE:
+            return result
+        
+        rows = np.flatnonzero(~exact & (before >= 0) & (after < self._sequence_length))
+        before, after = before[rows], after[rows]
+        before_us, after_us = self._sorted_us[before], self._sorted_us[after]
+        before_values = matrix[sorted_to_index[before]].astype(np.float64)
+        after_values = matrix[sorted_to_index[after]].astype(np.float64)
+        
+        if interpolation == InterpolationMethod.NEAREST:
+            take_before = (targets[rows] - before_us) < (after_us - targets[rows])
+            if matrix.ndim == 2:
+                take_before = take_before[:, None]
+            result[rows] = np.where(take_before, before_values, after_values)
+            return result
+        
+        # Linear interpolation; other methods default to linear for now
+        position = (targets[rows] - before_us) / (after_us - before_us)
+        if matrix.ndim == 2:
+            position = position[:, None]
+        result[rows] = before_values + (after_values - before_values) * position
+        return result
     
     def get_feature_statistics(self) -> dict[str, dict[str, float]]:
         """
@@ -352,8 +577,7 @@ class TemporalSequence(Generic[T]):
         """
         result = {}
         
-        # Convert to numpy for easier computation
-        values_array = np.array(self._values)
+        values_array = self._value_matrix
         
         for i, feature_name in enumerate(self._feature_names):
             feature_values = values_array[:, i]
@@ -379,12 +603,12 @@ class TemporalSequence(Generic[T]):
         Returns:
             Trend description ("increasing", "decreasing", "stable", "volatile")
         """
-        if not self._timestamps or len(self._timestamps) < 2:
+        if self._sequence_length < 2:
             return "insufficient_data"
         
         # Get values for the specified feature
-        values = [v[feature_index] for v in self._values]
-        timestamps = self._timestamps
+        values = self._value_matrix[:, feature_index].tolist()
+        timestamps = self.timestamps
         
         # If window size is provided, only analyze the most recent window
         if window_size:
@@ -462,6 +686,12 @@ class TemporalSequence(Generic[T]):
         
         return result
     
+def _read_only(array: np.ndarray) -> np.ndarray:
+    view = array.view()
+    view.flags.writeable = False
+    return view
+
+
 # === Dynamic TemporalSequence override supporting both generic and simplified use cases ===
 
 # Capture reference to the original generic TemporalSequence
@@ -81,4 +81,9 @@ class InvalidAppointmentStateError(ValidationError):
 
 class InvalidAppointmentTimeError(ValidationError):
     """Exception raised for invalid appointment times (e.g., past date)."""
-    pass
\ No newline at end of file
+    pass
+
+
+class AppointmentConflictError(ValidationError):
+    """Exception raised when an appointment overlaps another or exceeds a provider's limits."""
+    pass
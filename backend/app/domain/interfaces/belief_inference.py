@@ -0,0 +1,77 @@
+"""
+Belief Inference Interface for the Digital Twin Psychiatry Platform.
+
+This module defines the BeliefInferenceEngine interface, through which a
+BayesianBeliefNetwork obtains posterior beliefs. The network holds the
+structure, probability tables and evidence; the engine, provided by the
+infrastructure layer, does the numerical inference and may keep compiled
+state between queries.
+"""
+
+from abc import ABC, abstractmethod
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from app.domain.entities.knowledge_graph import BayesianBeliefNetwork
+
+
+class BeliefInferenceEngine(ABC):
+    """
+    Interface for computing the posterior beliefs of one belief network.
+
+    The network reports each change to its structure or tables, so an engine
+    bound to it can update or drop whatever it has compiled.
+    """
+
+    @abstractmethod
+    def network_changed(self, variable: str | None = None) -> None:
+        """
+        Forget compiled state after the network's structure changed.
+
+        Args:
+            variable: Variable whose parents changed; None when a variable was added
+        """
+        pass
+
+    @abstractmethod
+    def table_changed(
+        self, network: "BayesianBeliefNetwork", variable: str, parent_values: dict[str, str]
+    ) -> None:
+        """
+        Take in one newly set row of a conditional probability table.
+
+        Args:
+            network: The network whose table changed
+            variable: Variable the table belongs to
+            parent_values: Parent configuration (parent -> state) of the row
+        """
+        pass
+
+    @abstractmethod
+    def belief_state(self, network: "BayesianBeliefNetwork") -> dict[str, dict[str, float]]:
+        """
+        Compute the posterior of every variable given the network's evidence.
+
+        Args:
+            network: The network to query
+
+        Returns:
+            Variable -> state -> probability
+        """
+        pass
+
+    @abstractmethod
+    def belief_states(
+        self, network: "BayesianBeliefNetwork", evidence_sets: list[dict[str, str]]
+    ) -> list[dict[str, dict[str, float]]]:
+        """
+        Compute posteriors for many evidence sets, ignoring the network's own.
+
+        Args:
+            network: The network to query
+            evidence_sets: Evidence (variable -> state) per query
+
+        Returns:
+            Belief state per evidence set, in the same order
+        """
+        pass
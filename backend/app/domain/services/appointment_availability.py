@@ -0,0 +1,475 @@
+"""
+Appointment Availability Engine
+
+This module keeps a per-provider index of active appointments so that
+conflict checks, daily-limit checks and free-slot searches are answered from
+memory instead of re-reading and scanning the provider's day for every
+booking.
+
+Each provider's appointments are held in arrays sorted by start time. An
+overlap query only has to look at appointments starting between
+``start - longest appointment`` and ``end``, found by binary search, and a
+daily count is the distance between two binary searches. Days are loaded
+from the repository on first use, with a single range query covering every
+missing day, and loaded days are refreshed after ``max_age_seconds`` so
+bookings made by other processes are picked up. ``provider_lock`` re-reads
+the days a booking touches once the lock is held, so the check-then-book
+sequence never trusts a stale schedule.
+
+Memory is bounded: expired days are forgotten on the next load, each
+provider keeps at most ``max_loaded_days`` days and the least recently used
+providers are dropped beyond ``max_providers``.
+"""
+
+import bisect
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Iterable
+from contextlib import contextmanager
+from datetime import date, datetime, timedelta
+from typing import Any
+from uuid import UUID
+
+from app.domain.entities.appointment import Appointment, AppointmentStatus
+
+# Appointments in these states do not occupy the provider's time
+INACTIVE_STATUSES = frozenset({AppointmentStatus.CANCELLED, AppointmentStatus.NO_SHOW})
+
+
+class ProviderSchedule:
+    """Sorted interval index over one provider's active appointments."""
+
+    def __init__(self):
+        """Initialize an empty schedule."""
+        self.starts: list[datetime] = []
+        self.ends: list[datetime] = []
+        self.ids: list[str] = []
+        self.by_id: dict[str, tuple[datetime, datetime]] = {}
+        self.longest = timedelta(0)
+        # Loaded day -> monotonic load time
+        self.loaded_days: dict[date, float] = {}
+        self.lock = threading.RLock()
+        # Threads inside provider_lock; a held schedule is never evicted
+        self.holders = 0
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def add(self, appointment_id: str, start_time: datetime, end_time: datetime) -> None:
+        """
+        Index an appointment, replacing any previous entry with the same ID.
+
+        Args:
+            appointment_id: Appointment ID
+            start_time: Start of the appointment
+            end_time: End of the appointment
+        """
+        self.discard(appointment_id)
+        position = bisect.bisect_right(self.starts, start_time)
+        self.starts.insert(position, start_time)
+        self.ends.insert(position, end_time)
+        self.ids.insert(position, appointment_id)
+        self.by_id[appointment_id] = (start_time, end_time)
+        self.longest = max(self.longest, end_time - start_time)
+
+    def discard(self, appointment_id: str) -> None:
+        """
+        Remove an appointment if it is indexed.
+
+        Args:
+            appointment_id: Appointment ID
+        """
+        interval = self.by_id.pop(appointment_id, None)
+        if interval is None:
+            return
+        low = bisect.bisect_left(self.starts, interval[0])
+        high = bisect.bisect_right(self.starts, interval[0])
+        position = self.ids.index(appointment_id, low, high)
+        del self.starts[position]
+        del self.ends[position]
+        del self.ids[position]
+
+    def forget_day(self, day: date) -> None:
+        """
+        Drop a loaded day and the appointments starting on it.
+
+        Args:
+            day: Day to forget
+        """
+        self.loaded_days.pop(day, None)
+        day_start = datetime(day.year, day.month, day.day)
+        low = bisect.bisect_left(self.starts, day_start)
+        high = bisect.bisect_left(self.starts, day_start + timedelta(days=1))
+        for appointment_id in self.ids[low:high]:
+            self.by_id.pop(appointment_id, None)
+        del self.starts[low:high]
+        del self.ends[low:high]
+        del self.ids[low:high]
+
+    def first_overlap(
+        self,
+        start_time: datetime,
+        end_time: datetime,
+        exclude_id: str | None = None,
+    ) -> datetime | None:
+        """
+        Find an appointment overlapping [start_time, end_time).
+
+        Args:
+            start_time: Start of the interval
+            end_time: End of the interval
+            exclude_id: Appointment ID to ignore (e.g., the one being moved)
+
+        Returns:
+            Start time of the first overlapping appointment, or None
+        """
+        # Anything starting earlier than this ends before start_time
+        low = bisect.bisect_right(self.starts, start_time - self.longest)
+        high = bisect.bisect_left(self.starts, end_time)
+        for position in range(low, high):
+            if self.ends[position] > start_time and self.ids[position] != exclude_id:
+                return self.starts[position]
+        return None
+
+    def count_starting(self, range_start: datetime, range_end: datetime, exclude_id: str | None = None) -> int:
+        """
+        Count appointments starting in [range_start, range_end).
+
+        Args:
+            range_start: Start of the range
+            range_end: End of the range
+            exclude_id: Appointment ID not to count
+
+        Returns:
+            Number of appointments
+        """
+        count = bisect.bisect_left(self.starts, range_end) - bisect.bisect_left(self.starts, range_start)
+        if exclude_id is not None and exclude_id in self.by_id:
+            if range_start <= self.by_id[exclude_id][0] < range_end:
+                count -= 1
+        return count
+
+    def busy_between(self, range_start: datetime, range_end: datetime) -> list[tuple[datetime, datetime]]:
+        """
+        List appointments overlapping a range, in start order.
+
+        Args:
+            range_start: Start of the range
+            range_end: End of the range
+
+        Returns:
+            (start, end) of each overlapping appointment
+        """
+        low = bisect.bisect_right(self.starts, range_start - self.longest)
+        high = bisect.bisect_left(self.starts, range_end)
+        return [
+            (self.starts[position], self.ends[position])
+            for position in range(low, high)
+            if self.ends[position] > range_start
+        ]
+
+
+class AppointmentAvailabilityEngine:
+    """
+    Per-provider availability index backed by the appointment repository.
+
+    Callers that check and then book should hold ``provider_lock`` around
+    both steps so two bookings for the same provider cannot interleave.
+    """
+
+    def __init__(
+        self,
+        appointment_repository: Any,
+        buffer_minutes: int = 15,
+        max_age_seconds: float = 60.0,
+        max_providers: int = 1000,
+        max_loaded_days: int = 92,
+    ):
+        """
+        Initialize the engine.
+
+        Args:
+            appointment_repository: Repository providing
+                ``get_by_provider_id(provider_id, start, end)``
+            buffer_minutes: Buffer kept free around every appointment
+            max_age_seconds: How long a loaded day is trusted for lookups
+                outside ``provider_lock`` before it is re-read
+            max_providers: Provider schedules kept in memory
+            max_loaded_days: Days kept in memory per provider
+        """
+        self.appointment_repository = appointment_repository
+        self.buffer = timedelta(minutes=buffer_minutes)
+        self.max_age_seconds = max_age_seconds
+        self.max_providers = max_providers
+        self.max_loaded_days = max_loaded_days
+        self._schedules: "OrderedDict[str, ProviderSchedule]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.queries = 0
+
+    @contextmanager
+    def provider_lock(
+        self,
+        provider_id: UUID | str,
+        start_time: datetime | None = None,
+        end_time: datetime | None = None,
+    ):
+        """
+        Serialize check-then-book sequences for one provider.
+
+        With a time range, the days it touches (including the buffer) are
+        re-read from the repository once the lock is held, so conflict and
+        daily-limit checks see bookings made by other processes.
+
+        Args:
+            provider_id: ID of the provider
+            start_time: Start of the booking about to be checked
+            end_time: End of the booking about to be checked
+        """
+        with self._lock:
+            schedule = self._schedule_locked(str(provider_id))
+            schedule.holders += 1
+        try:
+            with schedule.lock:
+                if start_time is not None and end_time is not None:
+                    self._refresh(schedule, provider_id, start_time - self.buffer, end_time + self.buffer, 0.0)
+                yield
+        finally:
+            with self._lock:
+                schedule.holders -= 1
+
+    def find_conflict(
+        self,
+        provider_id: UUID | str,
+        start_time: datetime,
+        end_time: datetime,
+        exclude_appointment_id: UUID | str | None = None,
+    ) -> datetime | None:
+        """
+        Find an active appointment within the buffer of a proposed time.
+
+        Args:
+            provider_id: ID of the provider
+            start_time: Proposed start
+            end_time: Proposed end
+            exclude_appointment_id: Appointment to ignore (when rescheduling)
+
+        Returns:
+            Start time of a conflicting appointment, or None
+        """
+        buffered_start = start_time - self.buffer
+        buffered_end = end_time + self.buffer
+        schedule = self._loaded(provider_id, buffered_start, buffered_end)
+        exclude = str(exclude_appointment_id) if exclude_appointment_id else None
+        with schedule.lock:
+            return schedule.first_overlap(buffered_start, buffered_end, exclude)
+
+    def count_for_day(
+        self,
+        provider_id: UUID | str,
+        day: datetime,
+        exclude_appointment_id: UUID | str | None = None,
+    ) -> int:
+        """
+        Count a provider's active appointments starting on a day.
+
+        Args:
+            provider_id: ID of the provider
+            day: Any time on the day
+            exclude_appointment_id: Appointment not to count
+
+        Returns:
+            Number of active appointments
+        """
+        day_start = datetime(day.year, day.month, day.day)
+        day_end = day_start + timedelta(days=1)
+        schedule = self._loaded(provider_id, day_start, day_end)
+        exclude = str(exclude_appointment_id) if exclude_appointment_id else None
+        with schedule.lock:
+            return schedule.count_starting(day_start, day_end, exclude)
+
+    def find_free_slots(
+        self,
+        provider_id: UUID | str,
+        range_start: datetime,
+        range_end: datetime,
+        duration_minutes: int,
+        step_minutes: int | None = None,
+        max_per_day: int | None = None,
+    ) -> list[tuple[datetime, datetime]]:
+        """
+        List bookable slots for a provider in a time range.
+
+        Loads the whole range with at most one repository query, then walks
+        the gaps between buffered appointments.
+
+        Args:
+            provider_id: ID of the provider
+            range_start: Earliest slot start
+            range_end: Latest slot end
+            duration_minutes: Length of each slot
+            step_minutes: Spacing between slot starts (defaults to the duration)
+            max_per_day: Skip days that already have this many appointments
+
+        Returns:
+            (start, end) of each free slot, in order
+        """
+        duration = timedelta(minutes=duration_minutes)
+        step = timedelta(minutes=step_minutes or duration_minutes)
+        schedule = self._loaded(provider_id, range_start - self.buffer, range_end + self.buffer)
+        with schedule.lock:
+            busy = schedule.busy_between(range_start - self.buffer, range_end + self.buffer)
+            full_days = set()
+            if max_per_day is not None:
+                day = datetime(range_start.year, range_start.month, range_start.day)
+                while day < range_end:
+                    if schedule.count_starting(day, day + timedelta(days=1)) >= max_per_day:
+                        full_days.add(day.date())
+                    day += timedelta(days=1)
+
+        slots = []
+        cursor = range_start
+        for busy_start, busy_end in busy + [(range_end + self.buffer, range_end + self.buffer)]:
+            gap_end = min(busy_start - self.buffer, range_end)
+            while cursor + duration <= gap_end:
+                if cursor.date() not in full_days:
+                    slots.append((cursor, cursor + duration))
+                cursor += step
+            earliest = busy_end + self.buffer
+            if cursor < earliest:
+                # Keep slots on the step grid anchored at range_start
+                steps = -((range_start - earliest) // step)
+                cursor = range_start + steps * step
+        return slots
+
+    def record(self, appointment: Appointment) -> None:
+        """
+        Update the index after an appointment was saved.
+
+        Active appointments are (re)indexed; cancelled and no-show
+        appointments are removed.
+
+        Args:
+            appointment: The saved appointment
+        """
+        schedule = self._schedule(appointment.provider_id)
+        status = appointment.status
+        if isinstance(status, str):
+            status = AppointmentStatus(status)
+        with schedule.lock:
+            if status in INACTIVE_STATUSES:
+                schedule.discard(str(appointment.id))
+            else:
+                schedule.add(str(appointment.id), appointment.start_time, appointment.end_time)
+
+    def invalidate(self, provider_id: UUID | str | None = None) -> None:
+        """
+        Forget loaded appointments so they are re-read on next use.
+
+        Args:
+            provider_id: Provider to forget, or None for all providers
+        """
+        with self._lock:
+            schedules = list(self._schedules.values()) if provider_id is None else [
+                self._schedules.get(str(provider_id))
+            ]
+        for schedule in schedules:
+            if schedule is not None:
+                with schedule.lock:
+                    for day in list(schedule.loaded_days):
+                        schedule.forget_day(day)
+
+    def _schedule(self, provider_id: UUID | str) -> ProviderSchedule:
+        """Get or create a provider's schedule."""
+        with self._lock:
+            return self._schedule_locked(str(provider_id))
+
+    def _schedule_locked(self, key: str) -> ProviderSchedule:
+        """Get or create a schedule with ``_lock`` held, evicting idle providers beyond the bound."""
+        schedule = self._schedules.get(key)
+        if schedule is not None:
+            self._schedules.move_to_end(key)
+            return schedule
+        schedule = self._schedules[key] = ProviderSchedule()
+        if len(self._schedules) > self.max_providers:
+            idle = [k for k, s in self._schedules.items() if s.holders == 0 and k != key]
+            for evicted in idle[:len(self._schedules) - self.max_providers]:
+                del self._schedules[evicted]
+        return schedule
+
+    def _loaded(self, provider_id: UUID | str, range_start: datetime, range_end: datetime) -> ProviderSchedule:
+        """Get a provider's schedule with every day touching a range loaded."""
+        schedule = self._schedule(provider_id)
+        with schedule.lock:
+            self._refresh(schedule, provider_id, range_start, range_end, self.max_age_seconds)
+        return schedule
+
+    def _refresh(
+        self,
+        schedule: ProviderSchedule,
+        provider_id: UUID | str,
+        range_start: datetime,
+        range_end: datetime,
+        max_age: float,
+    ) -> None:
+        """
+        Re-read every day touching a range that was loaded more than max_age seconds ago.
+
+        The range is widened by the provider's longest appointment so
+        appointments that start on an earlier day but run into the range are
+        seen too. The caller holds ``schedule.lock``.
+        """
+        lookback = max(schedule.longest, timedelta(days=1))
+        first_day = (range_start - lookback).date()
+        last_day = (range_end - timedelta(microseconds=1)).date()
+        now = time.monotonic()
+        missing = [
+            day for day in _days(first_day, last_day)
+            if now - schedule.loaded_days.get(day, -float("inf")) >= max_age
+        ]
+        if missing:
+            query_start = datetime(missing[0].year, missing[0].month, missing[0].day)
+            query_end = datetime(missing[-1].year, missing[-1].month, missing[-1].day) + timedelta(days=1)
+            self._load(schedule, provider_id, query_start, query_end, now)
+
+    def _load(
+        self,
+        schedule: ProviderSchedule,
+        provider_id: UUID | str,
+        query_start: datetime,
+        query_end: datetime,
+        now: float,
+    ) -> None:
+        """Replace a span of days in the schedule with one repository read."""
+        appointments: Iterable[Appointment] = self.appointment_repository.get_by_provider_id(
+            provider_id,
+            query_start,
+            query_end
+        )
+        self.queries += 1
+        low = bisect.bisect_left(schedule.starts, query_start)
+        high = bisect.bisect_left(schedule.starts, query_end)
+        for appointment_id in schedule.ids[low:high]:
+            schedule.discard(appointment_id)
+        for appointment in appointments or []:
+            status = appointment.status
+            if isinstance(status, str):
+                status = AppointmentStatus(status)
+            if status not in INACTIVE_STATUSES:
+                schedule.add(str(appointment.id), appointment.start_time, appointment.end_time)
+        for day in _days(query_start.date(), (query_end - timedelta(microseconds=1)).date()):
+            schedule.loaded_days[day] = now
+        # Expired days would be re-read anyway; beyond that keep the most recently
+        # loaded, never the days this load is answering for
+        older = sorted(
+            (day for day, loaded_at in schedule.loaded_days.items() if loaded_at < now),
+            key=schedule.loaded_days.__getitem__
+        )
+        expired = sum(1 for day in older if now - schedule.loaded_days[day] > self.max_age_seconds)
+        for day in older[:max(expired, len(schedule.loaded_days) - self.max_loaded_days)]:
+            schedule.forget_day(day)
+
+
+def _days(first: date, last: date) -> list[date]:
+    """Every date from first to last inclusive."""
+    return [first + timedelta(days=offset) for offset in range((last - first).days + 1)]
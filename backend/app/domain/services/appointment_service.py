@@ -22,9 +22,10 @@ from app.domain.exceptions import (
 )
 
 # Removed specific not found exceptions
-from app.domain.repositories.appointment_repository import AppointmentRepository
+from app.domain.repositories.appointment_repository import IAppointmentRepository as AppointmentRepository
 from app.domain.repositories.patient_repository import PatientRepository
 from app.domain.repositories.provider_repository import ProviderRepository
+from app.domain.services.appointment_availability import AppointmentAvailabilityEngine
 
 
 class AppointmentService:
@@ -44,7 +45,8 @@ class AppointmentService:
         default_appointment_duration: int = 60,  # minutes
         min_reschedule_notice: int = 24,  # hours
         max_appointments_per_day: int = 8,
-        buffer_between_appointments: int = 15  # minutes
+        buffer_between_appointments: int = 15,  # minutes
+        availability_max_age: float = 60.0  # seconds
     ):
         """
         Initialize the appointment service.
@@ -57,6 +59,8 @@ class AppointmentService:
             min_reschedule_notice: Minimum notice for rescheduling in hours
             max_appointments_per_day: Maximum appointments per day for a provider
             buffer_between_appointments: Buffer time between appointments in minutes
+            availability_max_age: Seconds a provider's loaded schedule is trusted
+                for slot searches; bookings always re-read the affected days
         """
         self.appointment_repository = appointment_repository
         self.patient_repository = patient_repository
@@ -65,6 +69,11 @@ class AppointmentService:
         self.min_reschedule_notice = min_reschedule_notice
         self.max_appointments_per_day = max_appointments_per_day
         self.buffer_between_appointments = buffer_between_appointments
+        self.availability = AppointmentAvailabilityEngine(
+            appointment_repository,
+            buffer_minutes=buffer_between_appointments,
+            max_age_seconds=availability_max_age
+        )
     
     def get_appointment(self, appointment_id: UUID | str) -> Appointment:
         """
@@ -216,28 +225,31 @@ class AppointmentService:
         if not end_time:
             end_time = start_time + timedelta(minutes=self.default_appointment_duration)
         
-        # Check for conflicts
-        self._check_for_conflicts(provider_id, start_time, end_time)
-        
-        # Check provider's daily appointment limit
-        self._check_daily_appointment_limit(provider_id, start_time)
-        
-        # Create the appointment
-        appointment = Appointment(
-            patient_id=patient_id,
-            provider_id=provider_id,
-            start_time=start_time,
-            end_time=end_time,
-            appointment_type=appointment_type,
-            status=AppointmentStatus.SCHEDULED,
-            priority=priority,
-            location=location,
-            notes=notes,
-            reason=reason
-        )
-        
-        # Save the appointment
-        return self.appointment_repository.save(appointment)
+        # Hold the provider's schedule, re-read from the repository, so a
+        # concurrent booking cannot take the slot
+        with self.availability.provider_lock(provider_id, start_time, end_time):
+            # Check for conflicts
+            self._check_for_conflicts(provider_id, start_time, end_time)
+            
+            # Check provider's daily appointment limit
+            self._check_daily_appointment_limit(provider_id, start_time)
+            
+            # Create the appointment
+            appointment = Appointment(
+                patient_id=patient_id,
+                provider_id=provider_id,
+                start_time=start_time,
+                end_time=end_time,
+                appointment_type=appointment_type,
+                status=AppointmentStatus.SCHEDULED,
+                priority=priority,
+                location=location,
+                notes=notes,
+                reason=reason
+            )
+            
+            # Save the appointment
+            return self._save(appointment)
     
     def reschedule_appointment(
         self,
@@ -277,14 +289,15 @@ class AppointmentService:
         # Check for minimum notice period
         self._check_reschedule_notice_period(appointment)
         
-        # Check for conflicts
-        self._check_for_conflicts(appointment.provider_id, new_start_time, new_end_time, appointment_id)
-        
-        # Reschedule the appointment
-        appointment.reschedule(new_start_time, new_end_time, reason)
-        
-        # Save the appointment
-        return self.appointment_repository.save(appointment)
+        with self.availability.provider_lock(appointment.provider_id, new_start_time, new_end_time):
+            # Check for conflicts
+            self._check_for_conflicts(appointment.provider_id, new_start_time, new_end_time, appointment_id)
+            
+            # Reschedule the appointment
+            appointment.reschedule(new_start_time, new_end_time, reason)
+            
+            # Save the appointment
+            return self._save(appointment)
     
     def cancel_appointment(
         self,
@@ -314,7 +327,7 @@ class AppointmentService:
         appointment.cancel(cancelled_by, reason)
         
         # Save the appointment
-        return self.appointment_repository.save(appointment)
+        return self._save(appointment)
     
     def confirm_appointment(
         self,
@@ -444,7 +457,7 @@ class AppointmentService:
         appointment.mark_no_show()
         
         # Save the appointment
-        return self.appointment_repository.save(appointment)
+        return self._save(appointment)
     
     def schedule_follow_up(
         self,
@@ -491,26 +504,29 @@ class AppointmentService:
         if not follow_up_end_time:
             follow_up_end_time = follow_up_start_time + timedelta(minutes=self.default_appointment_duration)
         
-        # Check for conflicts
-        self._check_for_conflicts(original_appointment.provider_id, follow_up_start_time, follow_up_end_time)
-        
-        # Create the follow-up appointment
-        follow_up_appointment = Appointment(
-            patient_id=original_appointment.patient_id,
-            provider_id=original_appointment.provider_id,
-            start_time=follow_up_start_time,
-            end_time=follow_up_end_time,
-            appointment_type=appointment_type,
-            status=AppointmentStatus.SCHEDULED,
-            priority=priority,
-            location=location or original_appointment.location,
-            notes=notes,
-            reason=reason or original_appointment.reason,
-            previous_appointment_id=original_appointment.id
-        )
-        
-        # Save the follow-up appointment
-        follow_up_appointment = self.appointment_repository.save(follow_up_appointment)
+        with self.availability.provider_lock(
+            original_appointment.provider_id, follow_up_start_time, follow_up_end_time
+        ):
+            # Check for conflicts
+            self._check_for_conflicts(original_appointment.provider_id, follow_up_start_time, follow_up_end_time)
+            
+            # Create the follow-up appointment
+            follow_up_appointment = Appointment(
+                patient_id=original_appointment.patient_id,
+                provider_id=original_appointment.provider_id,
+                start_time=follow_up_start_time,
+                end_time=follow_up_end_time,
+                appointment_type=appointment_type,
+                status=AppointmentStatus.SCHEDULED,
+                priority=priority,
+                location=location or original_appointment.location,
+                notes=notes,
+                reason=reason or original_appointment.reason,
+                previous_appointment_id=original_appointment.id
+            )
+            
+            # Save the follow-up appointment
+            follow_up_appointment = self._save(follow_up_appointment)
         
         # Update the original appointment
         original_appointment.schedule_follow_up(follow_up_appointment.id)
@@ -570,6 +586,56 @@ class AppointmentService:
         # Save the appointment
         return self.appointment_repository.save(appointment)
     
+    def find_available_slots(
+        self,
+        provider_id: UUID | str,
+        start_date: datetime,
+        end_date: datetime,
+        duration: int | None = None,
+        step: int | None = None
+    ) -> list[tuple[datetime, datetime]]:
+        """
+        Find bookable slots for a provider in a date range.
+        
+        Args:
+            provider_id: ID of the provider
+            start_date: Earliest slot start
+            end_date: Latest slot end
+            duration: Slot length in minutes (defaults to the default duration)
+            step: Minutes between candidate slot starts (defaults to the duration)
+            
+        Returns:
+            (start, end) of each slot that respects the buffer and daily limit
+            
+        Raises:
+            InvalidAppointmentTimeError: If the range is invalid
+        """
+        if end_date <= start_date:
+            raise InvalidAppointmentTimeError("End date must be after start date")
+        
+        return self.availability.find_free_slots(
+            provider_id,
+            start_date,
+            end_date,
+            duration or self.default_appointment_duration,
+            step_minutes=step,
+            max_per_day=self.max_appointments_per_day
+        )
+    
+    def _save(self, appointment: Appointment) -> Appointment:
+        """
+        Save an appointment and update the provider's availability index.
+        
+        Args:
+            appointment: Appointment to save
+            
+        Returns:
+            Saved appointment
+        """
+        saved = self.appointment_repository.save(appointment)
+        self.availability.record(saved)
+        return saved
+    
     def _check_for_conflicts(
         self,
         provider_id: UUID | str,
@@ -589,42 +655,17 @@ class AppointmentService:
         Raises:
             AppointmentConflictError: If there is a conflict
         """
-        # Get provider's appointments for the day
-        day_start = datetime(start_time.year, start_time.month, start_time.day)
-        day_end = day_start + timedelta(days=1)
-        
-        appointments = self.appointment_repository.get_by_provider_id(
+        conflict = self.availability.find_conflict(
             provider_id,
-            day_start,
-            day_end
+            start_time,
+            end_time,
+            exclude_appointment_id
         )
         
-        # Add buffer to start and end times
-        buffered_start = start_time - timedelta(minutes=self.buffer_between_appointments)
-        buffered_end = end_time + timedelta(minutes=self.buffer_between_appointments)
-        
-        # Check for conflicts
-        for appointment in appointments:
-            # Skip the appointment being rescheduled
-            if exclude_appointment_id and str(appointment.id) == str(exclude_appointment_id):
-                continue
-            
-            # Skip cancelled appointments
-            if appointment.status in [
-                AppointmentStatus.CANCELLED,
-                AppointmentStatus.NO_SHOW
-            ]:
-                continue
-            
-            # Check for overlap
-            if (
-                (buffered_start <= appointment.start_time < buffered_end) or
-                (buffered_start < appointment.end_time <= buffered_end) or
-                (appointment.start_time <= buffered_start and appointment.end_time >= buffered_end)
-            ):
-                raise AppointmentConflictError(
-                    f"Appointment conflicts with existing appointment at {appointment.start_time}"
-                )
+        if conflict is not None:
+            raise AppointmentConflictError(
+                f"Appointment conflicts with existing appointment at {conflict}"
+            )
     
     def _check_daily_appointment_limit(
         self,
@@ -641,21 +682,7 @@ class AppointmentService:
         Raises:
             AppointmentConflictError: If the limit has been reached
         """
-        # Get provider's appointments for the day
-        day_start = datetime(date.year, date.month, date.day)
-        day_end = day_start + timedelta(days=1)
-        
-        appointments = self.appointment_repository.get_by_provider_id(
-            provider_id,
-            day_start,
-            day_end
-        )
-        
-        # Count active appointments
-        active_count = sum(
-            1 for a in appointments
-            if a.status not in [AppointmentStatus.CANCELLED, AppointmentStatus.NO_SHOW]
-        )
+        active_count = self.availability.count_for_day(provider_id, date)
         
         if active_count >= self.max_appointments_per_day:
             raise AppointmentConflictError(
@@ -5,7 +5,10 @@ This module implements the Observer pattern to process biometric data streams
 and trigger clinical interventions when concerning patterns emerge.
 """
 
-from collections.abc import Callable
+import bisect
+import itertools
+import operator
+from collections.abc import Callable, Sequence
 from datetime import datetime
 from app.domain.utils.datetime_utils import UTC
 from enum import Enum
@@ -13,6 +16,8 @@ from typing import Any, List, Optional, Dict
 from uuid import UUID  # Corrected import
 from abc import ABC, abstractmethod
 
+import numpy as np
+
 from app.domain.entities.biometric_twin import BiometricDataPoint
 from app.domain.exceptions import ValidationError
 
@@ -32,6 +37,25 @@ class AlertStatus(Enum):
     RESOLVED = "resolved"
     DISMISSED = "dismissed"
 
+# Threshold comparison operators accepted in rule conditions
+_OPERATORS: dict[str, Callable[[Any, Any], bool]] = {
+    ">": operator.gt,
+    ">=": operator.ge,
+    "<": operator.lt,
+    "<=": operator.le,
+    "==": operator.eq,
+    "=": operator.eq,
+    "!=": operator.ne,
+}
+
+# Operators accepted for reading-to-reading differences ("!=" is not supported there)
+_CONTEXT_OPERATORS = {name: func for name, func in _OPERATORS.items() if name != "!="}
+
+# Buckets with more rules than this are matched with sorted threshold arrays
+# even for a single data point; smaller buckets are cheaper to loop over
+_VECTORIZE_MIN_RULES = 32
+
+
 class AlertRule:
     """Rule for triggering biometric alerts."""
     
@@ -138,6 +162,238 @@ class AlertRule:
         # Complex conditions would be evaluated here
         return False
 
+    def compile(self) -> Callable[[float, dict[str, Any]], bool]:
+        """
+        Compile the condition into a predicate over a value and its context.
+
+        The predicate gives the same result as ``evaluate`` for data points of
+        the rule's data type, but reads the condition and resolves operators
+        once. Recompile after changing ``condition``.
+
+        Returns:
+            Function of (value, context) returning True if the rule fires
+        """
+        condition = dict(self.condition)
+        threshold = condition.get("threshold", 0)
+        operator_name = condition.get("operator", "")
+        compare = _OPERATORS.get(operator_name)
+
+        has_context_key = "context_key" in condition
+        context_key = condition.get("context_key")
+        context_compare = None
+        if "context_operator" in condition and "context_threshold" in condition:
+            context_compare = _CONTEXT_OPERATORS.get(condition["context_operator"])
+        context_threshold = condition.get("context_threshold")
+
+        if compare is not None and not has_context_key and context_compare is None:
+            return lambda value, context: compare(value, threshold)
+
+        def predicate(value: float, context: dict[str, Any]) -> bool:
+            if has_context_key and context_key in context and context[context_key] is not None:
+                return True
+            if context_compare is not None and "previous_reading" in context:
+                return context_compare(abs(value - context["previous_reading"]), context_threshold)
+            if compare is not None:
+                return compare(value, threshold)
+            if operator_name:
+                raise ValidationError(f"Unknown operator: {operator_name}")
+            return False
+
+        return predicate
+
+    def threshold_condition(self) -> tuple[str, float] | None:
+        """
+        Return (operator, threshold) if the condition is a plain numeric threshold.
+
+        Such rules depend only on the data point's value and can be matched
+        against many values at once.
+
+        Returns:
+            The operator and threshold, or None for context-dependent conditions
+        """
+        condition = self.condition
+        if "context_key" in condition or ("context_operator" in condition and "context_threshold" in condition):
+            return None
+        operator_name = condition.get("operator", "")
+        threshold = condition.get("threshold", 0)
+        if operator_name not in _OPERATORS or isinstance(threshold, bool):
+            return None
+        if not isinstance(threshold, (int, float)) or threshold != threshold:
+            return None
+        return operator_name, float(threshold)
+
+
+class CompiledAlertRule:
+    """An alert rule with its condition compiled for dispatch."""
+
+    __slots__ = ("rule", "sequence", "predicate", "threshold")
+
+    def __init__(self, rule: AlertRule, sequence: int):
+        """
+        Compile a rule.
+
+        Args:
+            rule: Rule to compile
+            sequence: Position of the rule in insertion order
+        """
+        self.rule = rule
+        self.sequence = sequence
+        self.predicate = rule.compile()
+        self.threshold = rule.threshold_condition()
+
+
+class _ThresholdGroup:
+    """Plain threshold rules sharing one operator, sorted by threshold."""
+
+    def __init__(self, operator_name: str, compiled_rules: list[CompiledAlertRule]):
+        ordered = sorted(compiled_rules, key=lambda compiled: compiled.threshold[1])
+        self.operator_name = "==" if operator_name == "=" else operator_name
+        self.thresholds = np.array([compiled.threshold[1] for compiled in ordered], dtype=np.float64)
+        self.rules = ordered
+
+    def match(self, values: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Find every (value, rule) pair whose comparison holds.
+
+        Each value matches a contiguous run of the sorted thresholds (two runs
+        for "!="), found by binary search, so the cost is O(log rules) per
+        value plus the number of matches.
+
+        Args:
+            values: Data point values
+
+        Returns:
+            Value indices and indices into ``self.rules`` of the matches
+        """
+        count = len(self.thresholds)
+        left = np.searchsorted(self.thresholds, values, side="left")
+        right = np.searchsorted(self.thresholds, values, side="right")
+        nan = np.isnan(values)
+        zero = np.zeros_like(left)
+        full = np.full_like(left, count)
+
+        if self.operator_name == ">":
+            runs = [(zero, left)]
+        elif self.operator_name == ">=":
+            runs = [(zero, right)]
+        elif self.operator_name == "<":
+            runs = [(right, full)]
+        elif self.operator_name == "<=":
+            runs = [(left, full)]
+        elif self.operator_name == "==":
+            runs = [(left, right)]
+        else:
+            # NaN differs from every threshold
+            runs = [(zero, np.where(nan, full, left)), (np.where(nan, full, right), full)]
+        if self.operator_name != "!=" and nan.any():
+            runs = [(start, np.where(nan, start, stop)) for start, stop in runs]
+
+        rows, columns = [], []
+        for start, stop in runs:
+            lengths = stop - start
+            total = int(lengths.sum())
+            if not total:
+                continue
+            offsets = np.arange(total) - np.repeat(np.cumsum(lengths) - lengths, lengths)
+            rows.append(np.repeat(np.arange(len(values)), lengths))
+            columns.append(np.repeat(start, lengths) + offsets)
+        if not rows:
+            empty = np.empty(0, dtype=np.intp)
+            return empty, empty
+        return np.concatenate(rows), np.concatenate(columns)
+
+
+class RuleIndex:
+    """
+    Alert rules bucketed by (patient_id, data_type) with compiled conditions.
+
+    Global rules are stored under a patient_id of None. A data point is only
+    checked against its own patient's bucket and the global bucket for its
+    data type, in the order the rules were added.
+    """
+
+    def __init__(self):
+        """Initialize an empty rule index."""
+        self._buckets: dict[tuple[UUID | None, Any], list[CompiledAlertRule]] = {}
+        self._entries: dict[str, tuple[tuple[UUID | None, Any], CompiledAlertRule]] = {}
+        self._plans: dict[tuple[UUID | None, Any], tuple[list[_ThresholdGroup], list[CompiledAlertRule]]] = {}
+        self._sequence = itertools.count()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def add(self, rule: AlertRule) -> None:
+        """
+        Compile and index a rule, replacing any rule with the same ID in place.
+
+        Args:
+            rule: Rule to index
+        """
+        previous = self._entries.get(rule.rule_id)
+        sequence = previous[1].sequence if previous is not None else next(self._sequence)
+        self.remove(rule.rule_id)
+
+        key = (rule.patient_id or None, rule.condition.get("data_type"))
+        compiled = CompiledAlertRule(rule, sequence)
+        bisect.insort(self._buckets.setdefault(key, []), compiled, key=lambda entry: entry.sequence)
+        self._entries[rule.rule_id] = (key, compiled)
+        self._plans.pop(key, None)
+
+    def remove(self, rule_id: str) -> None:
+        """
+        Remove a rule from the index.
+
+        Args:
+            rule_id: ID of the rule to remove
+        """
+        entry = self._entries.pop(rule_id, None)
+        if entry is None:
+            return
+        key, compiled = entry
+        bucket = self._buckets[key]
+        bucket.remove(compiled)
+        if not bucket:
+            del self._buckets[key]
+        self._plans.pop(key, None)
+
+    def bucket(self, patient_id: UUID | None, data_type: Any) -> list[CompiledAlertRule]:
+        """
+        Get the rules of one bucket in insertion order.
+
+        Args:
+            patient_id: Patient ID, or None for global rules
+            data_type: Data type the rules apply to
+
+        Returns:
+            The bucket's compiled rules (empty if none)
+        """
+        return self._buckets.get((patient_id, data_type), [])
+
+    def plan(self, patient_id: UUID | None, data_type: Any) -> tuple[list[_ThresholdGroup], list[CompiledAlertRule]]:
+        """
+        Split a bucket into sorted threshold groups and context-dependent rules.
+
+        Args:
+            patient_id: Patient ID, or None for global rules
+            data_type: Data type the rules apply to
+
+        Returns:
+            Threshold groups (one per operator) and the remaining rules
+        """
+        key = (patient_id, data_type)
+        plan = self._plans.get(key)
+        if plan is None:
+            by_operator: dict[str, list[CompiledAlertRule]] = {}
+            others = []
+            for compiled in self._buckets.get(key, []):
+                if compiled.threshold is None:
+                    others.append(compiled)
+                else:
+                    by_operator.setdefault(compiled.threshold[0], []).append(compiled)
+            groups = [_ThresholdGroup(name, rules) for name, rules in by_operator.items()]
+            plan = self._plans[key] = (groups, others)
+        return plan
+
 
 class BiometricAlert:
     """Alert generated from biometric data."""
@@ -207,6 +463,8 @@ class AlertObserver:
 class EmailAlertObserver(AlertObserver):
     """Observer that sends email notifications for alerts."""
     
+    channel = "email"
+    
     def __init__(self, email_service: object):
         """
         Initialize a new email alert observer.
@@ -269,6 +527,8 @@ class EmailAlertObserver(AlertObserver):
 class SMSAlertObserver(AlertObserver):
     """Observer that sends SMS notifications for alerts."""
     
+    channel = "sms"
+    
     def __init__(self, sms_service: object):
         """
         Initialize a new SMS alert observer.
@@ -337,6 +597,8 @@ class SMSAlertObserver(AlertObserver):
 class InAppAlertObserver(AlertObserver):
     """Observer that sends in-app notifications for alerts."""
     
+    channel = "in_app"
+    
     def __init__(self, notification_service: object):
         """
         Initialize a new in-app alert observer.
@@ -400,15 +662,35 @@ class BiometricEventProcessor:
             AlertPriority.INFORMATIONAL: []
         }
         self.patient_context: dict[UUID, dict[str, Any]] = {}
+        self.rule_index = RuleIndex()
+        # Optional asynchronous dispatcher; observers are notified inline without one
+        self.dispatcher: Any = None
+    
+    def attach_dispatcher(self, dispatcher: Any) -> None:
+        """
+        Deliver alerts through an asynchronous dispatcher instead of inline.
+
+        The dispatcher's ``submit(alert, observers)`` must return without
+        waiting for delivery and return False when it cannot accept alerts,
+        in which case observers are notified inline.
+        
+        Args:
+            dispatcher: Dispatcher such as AlertDispatcher, or None to detach
+        """
+        self.dispatcher = dispatcher
     
     def add_rule(self, rule: AlertRule) -> None:
         """
         Add a new alert rule.
+
+        The rule's condition is compiled when it is added; call add_rule
+        again after changing it.
         
         Args:
             rule: Rule to add
         """
         self.rules[rule.rule_id] = rule
+        self.rule_index.add(rule)
     
     def remove_rule(self, rule_id: str) -> None:
         """
@@ -419,6 +701,7 @@ class BiometricEventProcessor:
         """
         if rule_id in self.rules:
             del self.rules[rule_id]
+        self.rule_index.remove(rule_id)
     
     def register_observer(self, observer: AlertObserver, priorities: list[AlertPriority]) -> None:
         """
@@ -456,50 +739,145 @@ class BiometricEventProcessor:
         if not data_point.patient_id:
             raise ValidationError("Data point must have a patient ID")
         
-        # Get or create patient context
-        context = self.patient_context.get(data_point.patient_id, {})
+        context = self._update_context(data_point)
         
-        # Update context with the new data point
-        data_type = data_point.data_type
-        if "latest_values" not in context:
-            context["latest_values"] = {}
-        context["latest_values"][data_type] = data_point.value
+        # Only the patient's own rules and the global rules for this data type can fire
+        matches: list[tuple[int, AlertRule]] = []
+        for patient_id in (data_point.patient_id, None):
+            bucket = self.rule_index.bucket(patient_id, data_point.data_type)
+            if len(bucket) >= _VECTORIZE_MIN_RULES:
+                values = np.array([data_point.value], dtype=np.float64)
+                matches.extend(
+                    (sequence, rule) for _, sequence, rule in self._match_bucket(patient_id, data_point.data_type,
+                                                                                values, [context])
+                )
+                continue
+            for compiled in bucket:
+                if compiled.rule.is_active and compiled.predicate(data_point.value, context):
+                    matches.append((compiled.sequence, compiled.rule))
+        matches.sort(key=lambda match: match[0])
         
-        # Store the updated context
-        self.patient_context[data_point.patient_id] = context
+        return [self._raise_alert(rule, data_point, context) for _, rule in matches]
+    
+    def process_data_points(self, data_points: Sequence[BiometricDataPoint]) -> list[BiometricAlert]:
+        """
+        Process a batch of biometric data points against the rule index.
+
+        Samples are grouped by (patient, data type) and each group is matched
+        against its rule buckets at once: plain threshold rules by binary
+        search over sorted threshold arrays, context-dependent rules through
+        their compiled predicates. Alerts are created and observers notified
+        in the same order as processing the points one by one.
         
-        # Evaluate rules
-        alerts = []
-        for rule_id, rule in self.rules.items():
-            # Skip rules that don't apply to this patient
-            if rule.patient_id and rule.patient_id != data_point.patient_id:
-                continue
+        Args:
+            data_points: Biometric data points, in arrival order
             
-            # Skip inactive rules
-            if not rule.is_active:
-                continue
+        Returns:
+            List of alerts generated
             
-            # Evaluate the rule
-            if rule.evaluate(data_point, context):
-                # Create an alert
-                alert = BiometricAlert(
-                    alert_id=f"{rule_id}-{datetime.now(UTC).isoformat()}",
-                    patient_id=data_point.patient_id,
-                    rule_id=rule_id,
-                    rule_name=rule.name,
-                    priority=rule.priority,
-                    data_point=data_point,
-                    message=self._generate_alert_message(rule, data_point),
-                    context=context.copy()
+        Raises:
+            ValidationError: If any data point has no patient ID
+        """
+        points = list(data_points)
+        if any(not point.patient_id for point in points):
+            raise ValidationError("Data point must have a patient ID")
+        
+        contexts = [self._update_context(point) for point in points]
+        groups: dict[tuple[UUID, Any], list[int]] = {}
+        for position, point in enumerate(points):
+            groups.setdefault((point.patient_id, point.data_type), []).append(position)
+        
+        matches: list[tuple[int, int, AlertRule]] = []
+        for (patient_id, data_type), positions in groups.items():
+            values = np.fromiter((points[i].value for i in positions), dtype=np.float64, count=len(positions))
+            group_contexts = [contexts[i] for i in positions]
+            for owner in (patient_id, None):
+                matches.extend(
+                    (positions[row], sequence, rule)
+                    for row, sequence, rule in self._match_bucket(owner, data_type, values, group_contexts)
                 )
-                
-                # Add to the list of alerts
-                alerts.append(alert)
-                
-                # Notify observers
-                self._notify_observers(alert)
+        matches.sort(key=lambda match: (match[0], match[1]))
+        
+        return [self._raise_alert(rule, points[position], contexts[position]) for position, _, rule in matches]
+    
+    def _update_context(self, data_point: BiometricDataPoint) -> dict[str, Any]:
+        """
+        Record a data point in its patient's context.
+        
+        Args:
+            data_point: Biometric data point
+            
+        Returns:
+            The patient's context
+        """
+        context = self.patient_context.get(data_point.patient_id)
+        if context is None:
+            context = self.patient_context[data_point.patient_id] = {}
+        if "latest_values" not in context:
+            context["latest_values"] = {}
+        context["latest_values"][data_point.data_type] = data_point.value
+        return context
+    
+    def _match_bucket(
+        self,
+        patient_id: UUID | None,
+        data_type: Any,
+        values: np.ndarray,
+        contexts: list[dict[str, Any]],
+    ) -> list[tuple[int, int, AlertRule]]:
+        """
+        Match values against one rule bucket.
         
-        return alerts
+        Args:
+            patient_id: Patient ID, or None for the global bucket
+            data_type: Data type of the values
+            values: Data point values
+            contexts: Patient context for each value
+            
+        Returns:
+            (value index, rule sequence, rule) for every active rule that fires
+        """
+        groups, others = self.rule_index.plan(patient_id, data_type)
+        matches = []
+        for group in groups:
+            rows, columns = group.match(values)
+            for row, column in zip(rows.tolist(), columns.tolist()):
+                compiled = group.rules[column]
+                if compiled.rule.is_active:
+                    matches.append((row, compiled.sequence, compiled.rule))
+        for compiled in others:
+            if not compiled.rule.is_active:
+                continue
+            predicate = compiled.predicate
+            for row, value in enumerate(values.tolist()):
+                if predicate(value, contexts[row]):
+                    matches.append((row, compiled.sequence, compiled.rule))
+        return matches
+    
+    def _raise_alert(self, rule: AlertRule, data_point: BiometricDataPoint, context: dict[str, Any]) -> BiometricAlert:
+        """
+        Create an alert for a fired rule and notify observers.
+        
+        Args:
+            rule: Rule that fired
+            data_point: Data point that triggered the rule
+            context: Patient context
+            
+        Returns:
+            The alert
+        """
+        alert = BiometricAlert(
+            alert_id=f"{rule.rule_id}-{datetime.now(UTC).isoformat()}",
+            patient_id=data_point.patient_id,
+            rule_id=rule.rule_id,
+            rule_name=rule.name,
+            priority=rule.priority,
+            data_point=data_point,
+            message=self._generate_alert_message(rule, data_point),
+            context=context.copy()
+        )
+        self._notify_observers(alert)
+        return alert
     
     def _generate_alert_message(self, rule: AlertRule, data_point: BiometricDataPoint) -> str:
         """
@@ -533,7 +911,10 @@ class BiometricEventProcessor:
             
         # Notify observers for this priority
         if alert.priority in self.observers:
-            for observer in self.observers[alert.priority]:
+            observers = self.observers[alert.priority]
+            if self.dispatcher is not None and self.dispatcher.submit(alert, observers):
+                return
+            for observer in observers:
                 observer.notify(alert)
 
 
@@ -8,5 +8,24 @@ development and testing.
 """
 
 from app.infrastructure.cache.redis_cache import RedisCache
+from app.infrastructure.cache.result_store import (
+    FileResultStore,
+    RedisResultStore,
+    ResultStore,
+    SQLiteResultStore,
+    content_digest,
+    create_result_store,
+)
+from app.infrastructure.cache.tiered_cache import L1CachePolicy, TieredCache
 
-__all__ = ["RedisCache"]
\ No newline at end of file
+__all__ = [
+    "RedisCache",
+    "TieredCache",
+    "L1CachePolicy",
+    "ResultStore",
+    "FileResultStore",
+    "SQLiteResultStore",
+    "RedisResultStore",
+    "content_digest",
+    "create_result_store",
+]
\ No newline at end of file
@@ -6,8 +6,8 @@ This module provides a Redis-based implementation of the CacheService
 interface for efficient caching in a distributed environment.
 """
 
-import json
-from typing import Any, Dict, Optional
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Callable, Dict, Iterable, List, Mapping, Optional, Sequence, Tuple, Union
 import time
 import asyncio
 import logging
@@ -17,6 +17,7 @@ import redis.asyncio as aioredis # Use redis.asyncio instead of aioredis
 from app.application.interfaces.services.cache_service import CacheService
 from app.core.utils.logging import get_logger
 from app.config.settings import get_settings
+from app.infrastructure.cache.serializers import CacheSerializer, get_serializer
 
 logger = logging.getLogger(__name__)
 
@@ -31,14 +32,22 @@ class RedisCache(CacheService):
     
     _client: Optional[aioredis.Redis] = None
     _lock = asyncio.Lock()
+    _scripts: Optional[Dict[str, Any]] = None
 
-    def __init__(self, redis_url: Optional[str] = None):
+    def __init__(
+        self,
+        redis_url: Optional[str] = None,
+        serializer: Union[str, CacheSerializer, None] = None,
+    ):
         """
         Initialize RedisCache.
 
         Args:
             redis_url: Optional Redis connection URL. Defaults to settings.
+            serializer: Value serializer name ("json", "orjson", "msgpack")
+                or instance. Defaults to JSON.
         """
+        self.serializer = get_serializer(serializer)
         settings = get_settings()
         # Use getattr for safer access with a fallback default for testing
         default_redis_url = "redis://localhost:6379/1" # Default test Redis DB
@@ -68,7 +77,8 @@ class RedisCache(CacheService):
             # Prepare connection options
             redis_connection_options = {
                 "encoding": "utf-8",
-                "decode_responses": True
+                # Binary serializers need the raw bytes back
+                "decode_responses": not self.serializer.binary
             }
             # Only add the 'ssl' argument if redis_ssl is explicitly True
             if redis_ssl:
@@ -102,22 +112,26 @@ class RedisCache(CacheService):
             await self.initialize()
             
         try:
-            value = await self._client.get(key)
-            
-            if value is None:
-                return None
-                
-            # Try to deserialize JSON
-            try:
-                return json.loads(value)
-            except json.JSONDecodeError:
-                # Return as is if not JSON
-                return value
+            return self._deserialize(await self._client.get(key))
                 
         except Exception as e:
             logger.error(f"Error retrieving key {key} from cache: {str(e)}")
             return None
             
+    def _deserialize(self, value: Any) -> Any:
+        """
+        Decode a raw value read from Redis.
+        
+        Args:
+            value: Raw value returned by the client
+            
+        Returns:
+            The decoded value, or None if the key was missing
+        """
+        if value is None:
+            return None
+        return self.serializer.loads(value)
+            
     async def set(
         self, 
         key: str, 
@@ -139,9 +153,8 @@ class RedisCache(CacheService):
             await self.initialize()
             
         try:
-            # Serialize complex objects to JSON
-            if not isinstance(value, (str, int, float, bool)) and value is not None:
-                value = json.dumps(value)
+            if value is not None:
+                value = self.serializer.dumps(value)
                 
             # Set with expiration if provided
             if expiration is not None:
@@ -214,6 +227,28 @@ class RedisCache(CacheService):
             logger.error(f"Error incrementing key {key} in cache: {str(e)}")
             return 0
             
+    async def get_counter(self, key: str) -> int:
+        """
+        Read a counter written by ``increment``.
+        
+        Redis stores counters as decimal strings whatever the serializer, so
+        they are read raw instead of being decoded by it.
+        
+        Args:
+            key: Cache key
+            
+        Returns:
+            Counter value, or 0 if the key is missing or not a counter
+        """
+        if self._client is None:
+            await self.initialize()
+            
+        try:
+            return _to_counter(await self._client.get(key))
+        except Exception as e:
+            logger.error(f"Error reading counter {key} from cache: {str(e)}")
+            return 0
+            
     async def expire(self, key: str, seconds: int) -> bool:
         """
         Set expiration on a key.
@@ -254,6 +289,158 @@ class RedisCache(CacheService):
             logger.error(f"Error getting TTL for key {key} in cache: {str(e)}")
             return -2
             
+    async def get_many(self, keys: Iterable[str]) -> Dict[str, Any]:
+        """
+        Get several values in a single round-trip.
+        
+        Args:
+            keys: Cache keys
+            
+        Returns:
+            Mapping of every requested key to its value (None if not found)
+        """
+        keys = list(dict.fromkeys(keys))
+        if not keys:
+            return {}
+            
+        try:
+            async with self.pipeline() as pipe:
+                for key in keys:
+                    pipe.get(key)
+            return dict(zip(keys, pipe.results))
+        except Exception as e:
+            logger.error(f"Error retrieving {len(keys)} keys from cache: {str(e)}")
+            return {key: None for key in keys}
+            
+    async def set_many(
+        self, 
+        items: Mapping[str, Any], 
+        expiration: Optional[int] = None,
+        expirations: Optional[Mapping[str, int]] = None
+    ) -> bool:
+        """
+        Set several values in a single round-trip.
+        
+        Args:
+            items: Mapping of cache keys to values
+            expiration: Optional TTL in seconds applied to every key
+            expirations: Optional per-key TTLs overriding ``expiration``
+            
+        Returns:
+            True if successful, False otherwise
+        """
+        if not items:
+            return True
+            
+        expirations = expirations or {}
+        try:
+            async with self.pipeline() as pipe:
+                for key, value in items.items():
+                    pipe.set(key, value, expirations.get(key, expiration))
+            return all(pipe.results)
+        except Exception as e:
+            logger.error(f"Error setting {len(items)} keys in cache: {str(e)}")
+            return False
+            
+    async def delete_many(self, keys: Iterable[str]) -> int:
+        """
+        Delete several values with a single command.
+        
+        Args:
+            keys: Cache keys
+            
+        Returns:
+            Number of keys deleted
+        """
+        keys = list(dict.fromkeys(keys))
+        if not keys:
+            return 0
+            
+        try:
+            async with self.pipeline() as pipe:
+                pipe.delete(*keys)
+            return pipe.results[0]
+        except Exception as e:
+            logger.error(f"Error deleting {len(keys)} keys from cache: {str(e)}")
+            return 0
+            
+    @asynccontextmanager
+    async def pipeline(self) -> AsyncIterator["CachePipeline"]:
+        """
+        Batch cache commands into a single round-trip.
+        
+        Commands queued inside the ``async with`` block are sent together when
+        the block exits; their decoded results are then available in
+        ``pipe.results``. Nothing is sent if the block raises.
+        
+        Example:
+            async with cache.pipeline() as pipe:
+                pipe.set("result", data, expiration=300)
+                pipe.set("status", {"status": "completed"}, expiration=900)
+        
+        Yields:
+            CachePipeline collecting the commands
+        """
+        pipe = CachePipeline(self)
+        yield pipe
+        await pipe.execute()
+            
+    async def _after_write(self, keys: Sequence[str]) -> None:
+        """
+        Hook called after keys were modified by a batch operation.
+        
+        Args:
+            keys: Keys written, deleted or expired
+        """
+            
+    def supports_scripts(self) -> bool:
+        """
+        Check whether the connected client can execute server-side Lua scripts.
+        
+        Returns:
+            True if connected to Redis (not the in-memory fallback)
+        """
+        return self._client is not None and hasattr(self._client, "register_script")
+            
+    async def eval_script(
+        self, 
+        script: str, 
+        keys: Sequence[str], 
+        args: Sequence[Any]
+    ) -> Any:
+        """
+        Execute a Lua script atomically on the Redis server.
+        
+        Scripts are registered once per client and invoked with EVALSHA, so
+        each call is a single round-trip; the script body is only sent again
+        if the server's script cache was flushed.
+        
+        Args:
+            script: Lua source
+            keys: Keys accessed by the script (KEYS table)
+            args: Script arguments (ARGV table)
+            
+        Returns:
+            The script's return value
+            
+        Raises:
+            RuntimeError: If the client does not support scripting
+        """
+        if self._client is None:
+            await self.initialize()
+            
+        if not self.supports_scripts():
+            raise RuntimeError("Lua scripting is not available on the current cache client")
+            
+        if self._scripts is None:
+            self._scripts = {}
+        registered = self._scripts.get(script)
+        if registered is None:
+            registered = self._client.register_script(script)
+            self._scripts[script] = registered
+            
+        return await registered(keys=list(keys), args=list(args))
+            
     async def close(self) -> None:
         """
         Close the cache connection.
@@ -266,10 +453,137 @@ class RedisCache(CacheService):
         try:
             await self._client.close()
             self._client = None
+            self._scripts = None
         except Exception as e:
             logger.error(f"Error closing Redis connection: {str(e)}")
 
 
+class CachePipeline:
+    """
+    Buffered batch of cache commands executed in a single round-trip.
+    
+    Commands mirror the single-key RedisCache methods and are queued in
+    order. Values are encoded with the cache's serializer and results are
+    decoded the same way as the corresponding single-key method.
+    """
+    
+    def __init__(self, cache: RedisCache):
+        """
+        Initialize the pipeline.
+        
+        Args:
+            cache: Cache the commands are executed against
+        """
+        self._cache = cache
+        self._commands: List[Tuple[str, tuple, Dict[str, Any], Optional[Callable[[Any], Any]]]] = []
+        self._written_keys: List[str] = []
+        self.results: List[Any] = []
+        
+    def __len__(self) -> int:
+        return len(self._commands)
+        
+    def get(self, key: str) -> "CachePipeline":
+        """Queue a GET; the result is the decoded value or None."""
+        self._commands.append(("get", (key,), {}, self._cache._deserialize))
+        return self
+        
+    def set(self, key: str, value: Any, expiration: Optional[int] = None) -> "CachePipeline":
+        """Queue a SET with an optional TTL in seconds; the result is a bool."""
+        if value is not None:
+            value = self._cache.serializer.dumps(value)
+        options = {"ex": expiration} if expiration is not None else {}
+        self._commands.append(("set", (key, value), options, bool))
+        self._written_keys.append(key)
+        return self
+        
+    def delete(self, *keys: str) -> "CachePipeline":
+        """Queue a DEL of one or more keys; the result is the number deleted."""
+        self._commands.append(("delete", keys, {}, None))
+        self._written_keys.extend(keys)
+        return self
+        
+    def get_counter(self, key: str) -> "CachePipeline":
+        """Queue a GET of a counter; the result follows RedisCache.get_counter."""
+        self._commands.append(("get", (key,), {}, _to_counter))
+        return self
+        
+    def exists(self, key: str) -> "CachePipeline":
+        """Queue an EXISTS; the result is a bool."""
+        self._commands.append(("exists", (key,), {}, bool))
+        return self
+        
+    def increment(self, key: str) -> "CachePipeline":
+        """Queue an INCR; the result is the new value."""
+        self._commands.append(("incr", (key,), {}, None))
+        self._written_keys.append(key)
+        return self
+        
+    def expire(self, key: str, seconds: int) -> "CachePipeline":
+        """Queue an EXPIRE; the result is a bool."""
+        self._commands.append(("expire", (key, seconds), {}, bool))
+        self._written_keys.append(key)
+        return self
+        
+    def ttl(self, key: str) -> "CachePipeline":
+        """Queue a TTL; the result follows RedisCache.ttl."""
+        self._commands.append(("ttl", (key,), {}, None))
+        return self
+        
+    async def execute(self) -> List[Any]:
+        """
+        Send all queued commands.
+        
+        Returns:
+            Decoded results in queue order (also stored in ``results``)
+        """
+        commands, self._commands = self._commands, []
+        written, self._written_keys = self._written_keys, []
+        if not commands:
+            self.results = []
+            return self.results
+            
+        if self._cache._client is None:
+            await self._cache.initialize()
+        client = self._cache._client
+        
+        try:
+            if hasattr(client, "pipeline"):
+                pipe = client.pipeline(transaction=False)
+                for name, args, options, _ in commands:
+                    getattr(pipe, name)(*args, **options)
+                raw_results = await pipe.execute()
+            else:
+                # The in-memory fallback has no pipelining; run commands in order
+                raw_results = []
+                for name, args, options, _ in commands:
+                    if name == "delete":
+                        deleted = 0
+                        for key in args:
+                            deleted += await client.delete(key)
+                        raw_results.append(deleted)
+                    else:
+                        raw_results.append(await getattr(client, name)(*args, **options))
+        finally:
+            if written:
+                await self._cache._after_write(written)
+                
+        self.results = [
+            transform(raw) if transform is not None else raw
+            for (_, _, _, transform), raw in zip(commands, raw_results)
+        ]
+        return self.results
+
+
+def _to_counter(raw: Any) -> int:
+    """Convert a raw counter value (str, bytes or int) to an int."""
+    if raw is None:
+        return 0
+    try:
+        return int(raw)
+    except (TypeError, ValueError):
+        return 0
+
+
 class InMemoryFallback:
     """
     In-memory fallback for Redis operations.
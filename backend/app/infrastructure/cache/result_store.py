@@ -0,0 +1,507 @@
+# -*- coding: utf-8 -*-
+"""
+Content-Addressed Result Store.
+
+Caches expensive model outputs (PAT analyses, ...) under a digest of their
+inputs. ``content_digest`` streams the raw bytes of the input arrays through
+BLAKE2b together with the parameters that affect the result, so keys are
+stable across processes and restarts and never stringify the dataset.
+
+Three backends share the same async interface:
+
+- ``FileResultStore``: one JSON file per key under a directory, written
+  atomically (temp file + ``os.replace``) and bounded by total size and age.
+- ``SQLiteResultStore``: a single WAL-mode SQLite file, so every worker
+  process on a host shares one bounded store.
+- ``RedisResultStore``: entries in Redis (via RedisCache) with a TTL, shared
+  by all hosts; size is bounded by the server's maxmemory/LRU policy.
+
+The file and SQLite backends do their disk I/O in worker threads
+(``asyncio.to_thread``), so lookups never block the event loop. Backend
+failures are logged and treated as cache misses.
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+from abc import ABC, abstractmethod
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_BYTES = 512 * 1024 * 1024
+DEFAULT_MAX_AGE_SECONDS = 7 * 24 * 3600
+
+# Eviction trims the store to this fraction of max_bytes so it does not run on every write
+_LOW_WATERMARK = 0.9
+# Arrays are hashed in slices of this size; non-contiguous views are copied one slice at a time
+_HASH_CHUNK_BYTES = 8 * 1024 * 1024
+# Temp files older than this are leftovers from crashed writers
+_STALE_TEMP_SECONDS = 3600
+_TEMP_PREFIX = ".tmp-"
+
+
+def content_digest(arrays: Iterable[np.ndarray], **params: Any) -> str:
+    """
+    Compute a streaming BLAKE2b digest over array bytes and parameters.
+
+    Each array contributes its dtype, shape and C-order bytes, so equal data
+    hashes equally whether or not it is contiguous in memory.
+
+    Args:
+        arrays: Input arrays
+        **params: JSON-serializable values that affect the result
+            (model size, analysis type, model version, ...)
+
+    Returns:
+        64-character hex digest
+    """
+    digest = hashlib.blake2b(digest_size=32, person=b"novamind-result")
+    digest.update(json.dumps(params, sort_keys=True, default=str, separators=(",", ":")).encode("utf-8"))
+    for array in arrays:
+        array = np.asarray(array)
+        digest.update(f"|{array.dtype.str}{array.shape}|".encode("ascii"))
+        if array.flags.c_contiguous:
+            data = array.reshape(-1).view(np.uint8)
+            for start in range(0, data.shape[0], _HASH_CHUNK_BYTES):
+                digest.update(data[start:start + _HASH_CHUNK_BYTES])
+        else:
+            row_bytes = max(1, array[:1].nbytes)
+            rows = max(1, _HASH_CHUNK_BYTES // row_bytes)
+            for start in range(0, array.shape[0], rows):
+                digest.update(np.ascontiguousarray(array[start:start + rows]).reshape(-1).view(np.uint8))
+    return digest.hexdigest()
+
+
+class ResultStore(ABC):
+    """Base class for content-addressed result store backends."""
+
+    name = "base"
+
+    def __init__(self, max_age_seconds: float = DEFAULT_MAX_AGE_SECONDS):
+        """
+        Initialize shared counters.
+
+        Args:
+            max_age_seconds: Entries older than this are treated as misses
+        """
+        self.max_age_seconds = max_age_seconds
+        self.hits = 0
+        self.misses = 0
+        self.writes = 0
+        self.evictions = 0
+
+    @abstractmethod
+    async def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """
+        Look up a result.
+
+        Args:
+            key: Content digest
+
+        Returns:
+            The stored result, or None on a miss
+        """
+
+    @abstractmethod
+    async def set(self, key: str, value: Dict[str, Any]) -> None:
+        """
+        Store a JSON-serializable result.
+
+        Args:
+            key: Content digest
+            value: Result to store
+        """
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Return hit/miss/write/eviction counters for this process.
+
+        Returns:
+            Dictionary of counters and the hit ratio
+        """
+        lookups = self.hits + self.misses
+        return {
+            "backend": self.name,
+            "hits": self.hits,
+            "misses": self.misses,
+            "writes": self.writes,
+            "evictions": self.evictions,
+            "hit_ratio": self.hits / lookups if lookups else 0.0,
+        }
+
+
+class FileResultStore(ResultStore):
+    """
+    Result store keeping one JSON file per key in a local directory.
+
+    Files are sharded by the first two hex characters of the key. A hit
+    refreshes the file's mtime, so size-based eviction removes the least
+    recently used entries; the creation time stored in each file bounds age.
+    """
+
+    name = "file"
+
+    def __init__(
+        self,
+        directory: str,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+        max_age_seconds: float = DEFAULT_MAX_AGE_SECONDS,
+    ):
+        """
+        Initialize the file store.
+
+        Args:
+            directory: Root directory for result files
+            max_bytes: Total size the store is trimmed to stay under
+            max_age_seconds: Entries older than this are treated as misses
+        """
+        super().__init__(max_age_seconds)
+        self.directory = directory
+        self.max_bytes = max_bytes
+        # Bytes on disk as last scanned plus writes since; None until the first scan
+        self._approx_bytes: Optional[int] = None
+        # Serializes size bookkeeping and eviction across worker threads
+        self._evict_lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, key[:2], f"{key}.json")
+
+    async def get(self, key: str) -> Optional[Dict[str, Any]]:
+        return await asyncio.to_thread(self._get, key)
+
+    async def set(self, key: str, value: Dict[str, Any]) -> None:
+        await asyncio.to_thread(self._set, key, value)
+
+    def _get(self, key: str) -> Optional[Dict[str, Any]]:
+        path = self._path(key)
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                envelope = json.load(f)
+        except FileNotFoundError:
+            self.misses += 1
+            return None
+        except (OSError, ValueError):
+            envelope = None
+        if not isinstance(envelope, dict):
+            logger.warning(f"Discarding unreadable cached result {key[:12]}")
+            self._remove(path)
+            self.misses += 1
+            return None
+
+        if time.time() - envelope.get("created_at", 0) > self.max_age_seconds:
+            self._remove(path)
+            self.misses += 1
+            return None
+
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        self.hits += 1
+        return envelope.get("value")
+
+    def _set(self, key: str, value: Dict[str, Any]) -> None:
+        path = self._path(key)
+        try:
+            payload = json.dumps({"created_at": time.time(), "value": value}).encode("utf-8")
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            fd, temp_path = tempfile.mkstemp(dir=os.path.dirname(path), prefix=_TEMP_PREFIX)
+            try:
+                with os.fdopen(fd, "wb") as f:
+                    f.write(payload)
+                # Readers see either the previous file or the complete new one
+                os.replace(temp_path, path)
+            except BaseException:
+                self._remove(temp_path)
+                raise
+        except Exception as e:
+            logger.warning(f"Failed to cache result {key[:12]}: {e}")
+            return
+
+        with self._evict_lock:
+            self.writes += 1
+            if self._approx_bytes is None:
+                self._evict()
+            else:
+                self._approx_bytes += len(payload)
+                if self._approx_bytes > self.max_bytes:
+                    self._evict()
+
+    def _evict(self) -> None:
+        """Drop expired entries, then least recently used ones until under the low watermark."""
+        now = time.time()
+        entries: List[Tuple[float, int, str]] = []
+        for shard in _scandir(self.directory):
+            if not shard.is_dir():
+                continue
+            for entry in _scandir(shard.path):
+                try:
+                    stat = entry.stat()
+                except OSError:
+                    continue
+                if entry.name.startswith(_TEMP_PREFIX):
+                    if now - stat.st_mtime > _STALE_TEMP_SECONDS:
+                        self._remove(entry.path)
+                elif now - stat.st_mtime > self.max_age_seconds:
+                    # Untouched since before the age limit, so certainly expired
+                    self._remove(entry.path)
+                    self.evictions += 1
+                else:
+                    entries.append((stat.st_mtime, stat.st_size, entry.path))
+
+        total = sum(size for _, size, _ in entries)
+        if total > self.max_bytes:
+            target = self.max_bytes * _LOW_WATERMARK
+            entries.sort()
+            for _, size, path in entries:
+                if total <= target:
+                    break
+                self._remove(path)
+                total -= size
+                self.evictions += 1
+        self._approx_bytes = total
+
+    @staticmethod
+    def _remove(path: str) -> None:
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+    def stats(self) -> Dict[str, Any]:
+        stats = super().stats()
+        stats["approx_bytes"] = self._approx_bytes
+        return stats
+
+
+class SQLiteResultStore(ResultStore):
+    """
+    Result store backed by a local SQLite database in WAL mode.
+
+    Every worker process opening the same file shares the entries; writes
+    are transactional, and eviction removes expired rows and then the least
+    recently accessed rows beyond the size limit.
+    """
+
+    name = "sqlite"
+
+    _SCHEMA = (
+        "CREATE TABLE IF NOT EXISTS results ("
+        "key TEXT PRIMARY KEY, value BLOB NOT NULL, size INTEGER NOT NULL, "
+        "created_at REAL NOT NULL, accessed_at REAL NOT NULL)",
+        "CREATE INDEX IF NOT EXISTS results_accessed_at ON results (accessed_at)",
+    )
+
+    def __init__(
+        self,
+        path: str,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+        max_age_seconds: float = DEFAULT_MAX_AGE_SECONDS,
+    ):
+        """
+        Initialize the SQLite store.
+
+        Args:
+            path: Database file path
+            max_bytes: Total payload size the store is trimmed to stay under
+            max_age_seconds: Entries older than this are treated as misses
+        """
+        super().__init__(max_age_seconds)
+        self.path = path
+        self.max_bytes = max_bytes
+        self._approx_bytes: Optional[int] = None
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        # One connection shared by worker threads; the lock keeps their statements apart
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(path, timeout=5.0, isolation_level=None, check_same_thread=False)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute("PRAGMA synchronous=NORMAL")
+        for statement in self._SCHEMA:
+            self._connection.execute(statement)
+
+    async def get(self, key: str) -> Optional[Dict[str, Any]]:
+        return await asyncio.to_thread(self._locked, self._get, key)
+
+    async def set(self, key: str, value: Dict[str, Any]) -> None:
+        await asyncio.to_thread(self._locked, self._set, key, value)
+
+    def _locked(self, method: Any, *args: Any) -> Any:
+        with self._lock:
+            return method(*args)
+
+    def _get(self, key: str) -> Optional[Dict[str, Any]]:
+        try:
+            row = self._connection.execute(
+                "SELECT value, created_at FROM results WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            now = time.time()
+            if now - row[1] > self.max_age_seconds:
+                self._connection.execute("DELETE FROM results WHERE key = ?", (key,))
+                self.misses += 1
+                return None
+            self._connection.execute("UPDATE results SET accessed_at = ? WHERE key = ?", (now, key))
+            value = json.loads(row[0])
+        except (sqlite3.Error, ValueError) as e:
+            logger.warning(f"Failed to read cached result {key[:12]}: {e}")
+            self.misses += 1
+            return None
+        self.hits += 1
+        return value
+
+    def _set(self, key: str, value: Dict[str, Any]) -> None:
+        try:
+            payload = json.dumps(value).encode("utf-8")
+            now = time.time()
+            self._connection.execute(
+                "INSERT OR REPLACE INTO results (key, value, size, created_at, accessed_at) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (key, payload, len(payload), now, now),
+            )
+            self.writes += 1
+            if self._approx_bytes is None:
+                self._approx_bytes = self._total_bytes()
+            else:
+                self._approx_bytes += len(payload)
+            if self._approx_bytes > self.max_bytes:
+                self._evict(now)
+        except (sqlite3.Error, TypeError, ValueError) as e:
+            logger.warning(f"Failed to cache result {key[:12]}: {e}")
+
+    def _total_bytes(self) -> int:
+        return self._connection.execute("SELECT COALESCE(SUM(size), 0) FROM results").fetchone()[0]
+
+    def _evict(self, now: float) -> None:
+        """Drop expired rows, then keep only the most recently accessed rows under the low watermark."""
+        connection = self._connection
+        connection.execute("BEGIN IMMEDIATE")
+        try:
+            expired = connection.execute(
+                "DELETE FROM results WHERE created_at < ?", (now - self.max_age_seconds,)
+            ).rowcount
+            trimmed = connection.execute(
+                "DELETE FROM results WHERE key IN ("
+                "SELECT key FROM (SELECT key, SUM(size) OVER (ORDER BY accessed_at DESC, key) AS kept "
+                "FROM results) WHERE kept > ?)",
+                (int(self.max_bytes * _LOW_WATERMARK),),
+            ).rowcount
+            connection.execute("COMMIT")
+        except sqlite3.Error:
+            connection.execute("ROLLBACK")
+            raise
+        self.evictions += expired + trimmed
+        self._approx_bytes = self._total_bytes()
+
+    def close(self) -> None:
+        """Close the database connection."""
+        with self._lock:
+            self._connection.close()
+
+    def stats(self) -> Dict[str, Any]:
+        stats = super().stats()
+        stats["approx_bytes"] = self._approx_bytes
+        return stats
+
+
+class RedisResultStore(ResultStore):
+    """
+    Result store sharing entries through Redis.
+
+    Entries expire after ``max_age_seconds``; bound total size with the
+    server's ``maxmemory`` and an LRU eviction policy.
+    """
+
+    name = "redis"
+
+    def __init__(
+        self,
+        cache: Any,
+        max_age_seconds: float = DEFAULT_MAX_AGE_SECONDS,
+        prefix: str = "result:",
+    ):
+        """
+        Initialize the Redis store.
+
+        Args:
+            cache: RedisCache (or compatible) instance
+            max_age_seconds: TTL applied to every entry
+            prefix: Key prefix separating these entries from other cache data
+        """
+        super().__init__(max_age_seconds)
+        self.cache = cache
+        self.prefix = prefix
+
+    async def get(self, key: str) -> Optional[Dict[str, Any]]:
+        value = await self.cache.get(self.prefix + key)
+        if isinstance(value, dict):
+            self.hits += 1
+            return value
+        self.misses += 1
+        return None
+
+    async def set(self, key: str, value: Dict[str, Any]) -> None:
+        if await self.cache.set(self.prefix + key, value, expiration=int(self.max_age_seconds)):
+            self.writes += 1
+
+
+def create_result_store(
+    backend: Optional[str],
+    directory: str,
+    max_bytes: int = DEFAULT_MAX_BYTES,
+    max_age_seconds: float = DEFAULT_MAX_AGE_SECONDS,
+    redis_url: Optional[str] = None,
+    redis_prefix: str = "result:",
+) -> Optional[ResultStore]:
+    """
+    Create a result store from configuration.
+
+    Args:
+        backend: "file", "sqlite", "redis", or "none"/None to disable caching
+        directory: Directory for the file store or SQLite database
+        max_bytes: Size limit for local backends
+        max_age_seconds: Maximum entry age
+        redis_url: Redis URL for the redis backend (defaults to settings)
+        redis_prefix: Key prefix for the redis backend
+
+    Returns:
+        A result store, or None when caching is disabled
+
+    Raises:
+        ValueError: If the backend name is unknown
+    """
+    backend = (backend or "none").lower()
+    if backend == "none":
+        return None
+    if backend == "file":
+        return FileResultStore(directory, max_bytes=max_bytes, max_age_seconds=max_age_seconds)
+    if backend == "sqlite":
+        return SQLiteResultStore(
+            os.path.join(directory, "results.sqlite3"), max_bytes=max_bytes, max_age_seconds=max_age_seconds
+        )
+    if backend == "redis":
+        from app.infrastructure.cache.redis_cache import RedisCache
+
+        return RedisResultStore(RedisCache(redis_url=redis_url), max_age_seconds=max_age_seconds, prefix=redis_prefix)
+    raise ValueError(f"Unknown result store backend: {backend}")
+
+
+def _scandir(path: str) -> List[os.DirEntry]:
+    try:
+        with os.scandir(path) as it:
+            return list(it)
+    except OSError:
+        return []
@@ -0,0 +1,160 @@
+# -*- coding: utf-8 -*-
+"""
+Cache Value Serializers.
+
+RedisCache delegates value encoding to a pluggable serializer. The default
+JSON serializer preserves the historical wire format (scalars stored as-is,
+everything else as JSON text). orjson produces the same JSON text several
+times faster; msgpack produces a smaller binary encoding and requires the
+Redis client to return raw bytes.
+
+Values written by ``increment`` are stored by Redis as plain decimal strings
+regardless of the serializer, so counters are read with
+``RedisCache.get_counter``, which bypasses the serializer.
+"""
+
+import json
+import logging
+from abc import ABC, abstractmethod
+from typing import Any, Dict, Type, Union
+
+try:
+    import orjson
+except ImportError:
+    orjson = None  # orjson serializer unavailable
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None  # msgpack serializer unavailable
+
+logger = logging.getLogger(__name__)
+
+# Values Redis can store natively without serialization
+_SCALAR_TYPES = (str, int, float, bool)
+
+
+class CacheSerializer(ABC):
+    """Base class for cache value serializers."""
+
+    name = "base"
+    # True if encoded values are arbitrary bytes (client must not decode responses)
+    binary = False
+
+    @abstractmethod
+    def dumps(self, value: Any) -> Union[str, bytes, int, float]:
+        """
+        Encode a value for storage.
+
+        Args:
+            value: Value to cache
+
+        Returns:
+            Encoded value accepted by the Redis client
+        """
+
+    @abstractmethod
+    def loads(self, raw: Any) -> Any:
+        """
+        Decode a stored value.
+
+        Args:
+            raw: Raw value returned by the Redis client (never None)
+
+        Returns:
+            The decoded value
+        """
+
+
+class JSONSerializer(CacheSerializer):
+    """Standard library JSON serializer (the historical RedisCache format)."""
+
+    name = "json"
+
+    def dumps(self, value: Any) -> Union[str, int, float]:
+        if isinstance(value, _SCALAR_TYPES):
+            return value
+        return json.dumps(value)
+
+    def loads(self, raw: Any) -> Any:
+        try:
+            return json.loads(raw)
+        except json.JSONDecodeError:
+            # Return as is if not JSON
+            return raw
+
+
+class OrjsonSerializer(JSONSerializer):
+    """orjson-based serializer; wire-compatible with JSONSerializer."""
+
+    name = "orjson"
+
+    def __init__(self):
+        if orjson is None:
+            raise ImportError("orjson is required for the orjson cache serializer")
+
+    def dumps(self, value: Any) -> Union[str, bytes, int, float]:
+        if isinstance(value, _SCALAR_TYPES):
+            return value
+        return orjson.dumps(value)
+
+    def loads(self, raw: Any) -> Any:
+        try:
+            return orjson.loads(raw)
+        except orjson.JSONDecodeError:
+            return raw
+
+
+class MsgpackSerializer(CacheSerializer):
+    """Compact binary serializer based on msgpack."""
+
+    name = "msgpack"
+    binary = True
+
+    def __init__(self):
+        if msgpack is None:
+            raise ImportError("msgpack is required for the msgpack cache serializer")
+
+    def dumps(self, value: Any) -> bytes:
+        return msgpack.packb(value, use_bin_type=True)
+
+    def loads(self, raw: Any) -> Any:
+        if isinstance(raw, str):
+            raw = raw.encode("utf-8")
+        try:
+            return msgpack.unpackb(raw, raw=False)
+        except Exception:
+            # Not a msgpack document
+            return raw.decode("utf-8", errors="replace")
+
+
+SERIALIZERS: Dict[str, Type[CacheSerializer]] = {
+    JSONSerializer.name: JSONSerializer,
+    OrjsonSerializer.name: OrjsonSerializer,
+    MsgpackSerializer.name: MsgpackSerializer,
+}
+
+
+def get_serializer(serializer: Union[str, CacheSerializer, None] = None) -> CacheSerializer:
+    """
+    Resolve a serializer by name or instance.
+
+    Args:
+        serializer: Serializer name ("json", "orjson", "msgpack"), an instance,
+            or None for JSON
+
+    Returns:
+        Serializer instance
+
+    Raises:
+        ValueError: If the name is unknown
+        ImportError: If the serializer's library is not installed
+    """
+    if serializer is None:
+        return JSONSerializer()
+    if isinstance(serializer, CacheSerializer):
+        return serializer
+    serializer_class = SERIALIZERS.get(serializer)
+    if serializer_class is None:
+        raise ValueError(f"Unknown cache serializer: {serializer}")
+    return serializer_class()
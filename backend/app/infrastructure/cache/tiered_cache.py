@@ -0,0 +1,520 @@
+# -*- coding: utf-8 -*-
+"""
+Two-Tier Cache Implementation.
+
+This module provides a RedisCache subclass with a bounded in-process (L1)
+tier in front of Redis (L2). Hot keys are served from process memory
+without a network round-trip, and - for policies that allow sharing - without
+re-running ``json.loads``.
+
+Only keys matching a configured prefix policy are held in L1; everything else
+(rate limit buckets, counters, ...) goes straight to Redis. Each policy has its
+own TTL and LRU store bounded by entry count and approximate size in bytes.
+
+Workers are kept coherent by invalidation messages: every local write drops
+the key from L1 and, when enabled, is announced on a Redis pub/sub channel
+(``pubsub`` mode) or observed through Redis keyspace notifications
+(``keyspace`` mode, which also catches writes made by other services).
+"""
+
+import asyncio
+import logging
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple, Union
+
+from app.infrastructure.cache.redis_cache import RedisCache
+from app.infrastructure.cache.serializers import CacheSerializer
+
+logger = logging.getLogger(__name__)
+
+INVALIDATION_CHANNEL = "cache:l1:invalidate"
+
+# Fixed per-entry overhead added to the payload size (dict slot, tuple, key)
+_ENTRY_OVERHEAD_BYTES = 128
+
+# Seconds to wait before re-subscribing after the invalidation listener fails
+_RESUBSCRIBE_DELAY_SECONDS = 1.0
+
+
+class L1CachePolicy:
+    """In-process caching policy for keys sharing a prefix."""
+
+    def __init__(
+        self,
+        prefix: str,
+        ttl_seconds: float = 5.0,
+        max_bytes: int = 4 * 1024 * 1024,
+        max_entries: int = 10_000,
+        shared_values: bool = False,
+    ):
+        """
+        Initialize the policy.
+
+        Args:
+            prefix: Key prefix the policy applies to
+            ttl_seconds: Maximum time an entry is served from process memory
+            max_bytes: Approximate memory budget for this prefix
+            max_entries: Maximum number of entries for this prefix
+            shared_values: Return the same decoded object on every hit instead
+                of decoding the cached payload again; callers must treat
+                values as read-only
+        """
+        if ttl_seconds <= 0:
+            raise ValueError("ttl_seconds must be positive")
+        if max_bytes <= 0 or max_entries <= 0:
+            raise ValueError("max_bytes and max_entries must be positive")
+        self.prefix = prefix
+        self.ttl_seconds = ttl_seconds
+        self.max_bytes = max_bytes
+        self.max_entries = max_entries
+        self.shared_values = shared_values
+
+
+# Hot, read-mostly keys written by the analytics endpoints
+DEFAULT_L1_POLICIES: Tuple[L1CachePolicy, ...] = (
+    L1CachePolicy("status:", ttl_seconds=2.0, max_bytes=1024 * 1024, shared_values=True),
+    L1CachePolicy("treatment_outcomes:", ttl_seconds=30.0, shared_values=True),
+    L1CachePolicy("practice_metrics:", ttl_seconds=30.0, shared_values=True),
+    L1CachePolicy("diagnosis_distribution:", ttl_seconds=30.0, shared_values=True),
+    L1CachePolicy("medication_effectiveness:", ttl_seconds=30.0, shared_values=True),
+    L1CachePolicy("treatment_comparison:", ttl_seconds=30.0, shared_values=True),
+    L1CachePolicy("patient_risk_stratification", ttl_seconds=30.0, shared_values=True),
+)
+
+
+class _L1Store:
+    """LRU/TTL store for a single prefix policy."""
+
+    def __init__(self, policy: L1CachePolicy):
+        self.policy = policy
+        # key -> (expires_at, size_bytes, raw payload, decoded value)
+        self._entries: "OrderedDict[str, Tuple[float, int, Any, Any]]" = OrderedDict()
+        self.size_bytes = 0
+        # Bumped on every invalidation so in-flight fills can detect races
+        self.generation = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.invalidations = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def lookup(self, key: str, now: float, loads: Callable[[Any], Any]) -> Tuple[bool, Any]:
+        """Return (found, value) for a key, honouring TTL and LRU order."""
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return False, None
+        if entry[0] <= now:
+            self._remove(key)
+            self.expirations += 1
+            self.misses += 1
+            return False, None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        if self.policy.shared_values:
+            return True, entry[3]
+        return True, loads(entry[2])
+
+    def store(self, key: str, raw: Any, value: Any, ttl: float, now: float) -> None:
+        """Insert or replace an entry, evicting least recently used entries."""
+        size = _payload_size(key, raw)
+        if size > self.policy.max_bytes:
+            # Would evict the whole store for one entry; serve it from Redis instead
+            self.discard(key)
+            return
+        self._remove(key)
+        self._entries[key] = (now + ttl, size, raw, value if self.policy.shared_values else None)
+        self.size_bytes += size
+        while self.size_bytes > self.policy.max_bytes or len(self._entries) > self.policy.max_entries:
+            oldest = next(iter(self._entries))
+            self._remove(oldest)
+            self.evictions += 1
+
+    def discard(self, key: str) -> None:
+        """Invalidate a key."""
+        self.generation += 1
+        if self._remove(key):
+            self.invalidations += 1
+
+    def clear(self) -> None:
+        """Invalidate every key."""
+        self.generation += 1
+        self.invalidations += len(self._entries)
+        self._entries.clear()
+        self.size_bytes = 0
+
+    def stats(self) -> Dict[str, int]:
+        """Return the counters for this store."""
+        return {
+            "entries": len(self._entries),
+            "size_bytes": self.size_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "invalidations": self.invalidations,
+        }
+
+    def _remove(self, key: str) -> bool:
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return False
+        self.size_bytes -= entry[1]
+        return True
+
+
+def _payload_size(key: str, raw: Any) -> int:
+    """Approximate the memory held by an entry."""
+    if isinstance(raw, (str, bytes)):
+        payload = len(raw)
+    else:
+        payload = len(str(raw))
+    return payload + len(key) + _ENTRY_OVERHEAD_BYTES
+
+
+class TieredCache(RedisCache):
+    """
+    Redis cache with a bounded in-process L1 tier.
+
+    Implements the same CacheService interface as RedisCache, so it can be
+    injected anywhere a RedisCache is expected. Keys without a matching
+    policy behave exactly as with RedisCache.
+    """
+
+    def __init__(
+        self,
+        redis_url: Optional[str] = None,
+        policies: Optional[Iterable[L1CachePolicy]] = None,
+        invalidation: Optional[str] = "pubsub",
+        channel: str = INVALIDATION_CHANNEL,
+        serializer: Union[str, CacheSerializer, None] = None,
+    ):
+        """
+        Initialize TieredCache.
+
+        Args:
+            redis_url: Optional Redis connection URL. Defaults to settings.
+            policies: Prefix policies; defaults to DEFAULT_L1_POLICIES
+            invalidation: Cross-worker invalidation mode: "pubsub" (publish
+                local writes on ``channel``), "keyspace" (subscribe to Redis
+                keyspace notifications, which must be enabled on the server
+                with ``notify-keyspace-events K$gx``) or None (TTL only)
+            channel: Pub/sub channel used in "pubsub" mode
+            serializer: Value serializer name or instance. Defaults to JSON.
+        """
+        super().__init__(redis_url=redis_url, serializer=serializer)
+        if invalidation not in (None, "pubsub", "keyspace"):
+            raise ValueError(f"Unsupported invalidation mode: {invalidation}")
+        self.invalidation = invalidation
+        self.channel = channel
+        # Longest prefix first so the most specific policy wins
+        ordered = sorted(
+            DEFAULT_L1_POLICIES if policies is None else policies,
+            key=lambda policy: len(policy.prefix),
+            reverse=True,
+        )
+        self._stores: List[_L1Store] = [_L1Store(policy) for policy in ordered]
+        self._listener_task: Optional[asyncio.Task] = None
+
+    async def initialize(self) -> None:
+        """
+        Initialize the Redis client and start the invalidation listener.
+        """
+        await super().initialize()
+        if (
+            self.invalidation is not None
+            and self._listener_task is None
+            and self._stores
+            and hasattr(self._client, "pubsub")
+        ):
+            self._listener_task = asyncio.create_task(self._listen_for_invalidations())
+
+    def _store_for(self, key: str) -> Optional[_L1Store]:
+        """Return the L1 store responsible for a key, if any."""
+        for store in self._stores:
+            if key.startswith(store.policy.prefix):
+                return store
+        return None
+
+    async def get(self, key: str) -> Any:
+        """
+        Get a value, serving it from process memory when possible.
+
+        Args:
+            key: Cache key
+
+        Returns:
+            Cached value or None if not found
+        """
+        store = self._store_for(key)
+        if store is None:
+            return await super().get(key)
+
+        found, value = store.lookup(key, time.monotonic(), self._deserialize)
+        if found:
+            return value
+
+        if self._client is None:
+            await self.initialize()
+
+        generation = store.generation
+        try:
+            raw = await self._client.get(key)
+            value = self._deserialize(raw)
+        except Exception as e:
+            logger.error(f"Error retrieving key {key} from cache: {str(e)}")
+            return None
+
+        # Don't cache misses, and drop the fill if the key was invalidated
+        # while the read was in flight (it may have returned the old value)
+        if raw is not None and store.generation == generation:
+            store.store(key, raw, value, store.policy.ttl_seconds, time.monotonic())
+        return value
+
+    async def get_many(self, keys: Iterable[str]) -> Dict[str, Any]:
+        """
+        Get several values, fetching only L1 misses from Redis in one round-trip.
+
+        Args:
+            keys: Cache keys
+
+        Returns:
+            Mapping of every requested key to its value (None if not found)
+        """
+        results: Dict[str, Any] = {}
+        pending: Dict[str, Tuple[Optional[_L1Store], int]] = {}
+        now = time.monotonic()
+        for key in keys:
+            if key in results or key in pending:
+                continue
+            store = self._store_for(key)
+            if store is not None:
+                found, value = store.lookup(key, now, self._deserialize)
+                if found:
+                    results[key] = value
+                    continue
+            pending[key] = (store, store.generation if store is not None else 0)
+
+        if not pending:
+            return results
+
+        if self._client is None:
+            await self.initialize()
+
+        try:
+            pipe = self._client.pipeline(transaction=False) if hasattr(self._client, "pipeline") else None
+            if pipe is not None:
+                for key in pending:
+                    pipe.get(key)
+                raw_values = await pipe.execute()
+            else:
+                raw_values = [await self._client.get(key) for key in pending]
+            decoded = [self._deserialize(raw) for raw in raw_values]
+        except Exception as e:
+            logger.error(f"Error retrieving {len(pending)} keys from cache: {str(e)}")
+            results.update((key, None) for key in pending)
+            return results
+
+        now = time.monotonic()
+        for (key, (store, generation)), raw, value in zip(pending.items(), raw_values, decoded):
+            results[key] = value
+            if store is not None and raw is not None and store.generation == generation:
+                store.store(key, raw, value, store.policy.ttl_seconds, now)
+        return results
+
+    async def set(
+        self,
+        key: str,
+        value: Any,
+        expiration: Optional[int] = None
+    ) -> bool:
+        """
+        Set a value in Redis and invalidate it in every worker's L1 tier.
+
+        Args:
+            key: Cache key
+            value: Value to cache
+            expiration: Optional TTL in seconds
+
+        Returns:
+            True if successful, False otherwise
+        """
+        result = await super().set(key, value, expiration)
+        await self._invalidate(key)
+        return result
+
+    async def delete(self, key: str) -> int:
+        """
+        Delete a value from Redis and from every worker's L1 tier.
+
+        Args:
+            key: Cache key
+
+        Returns:
+            Number of keys deleted (0 or 1)
+        """
+        result = await super().delete(key)
+        await self._invalidate(key)
+        return result
+
+    async def increment(self, key: str) -> int:
+        """
+        Increment a counter and invalidate it in every worker's L1 tier.
+
+        Args:
+            key: Cache key
+
+        Returns:
+            New value after incrementing
+        """
+        result = await super().increment(key)
+        await self._invalidate(key)
+        return result
+
+    async def expire(self, key: str, seconds: int) -> bool:
+        """
+        Set expiration on a key and invalidate its L1 copies.
+
+        Args:
+            key: Cache key
+            seconds: TTL in seconds
+
+        Returns:
+            True if successful, False otherwise
+        """
+        result = await super().expire(key, seconds)
+        await self._invalidate(key)
+        return result
+
+    async def _invalidate(self, key: str) -> None:
+        """Drop a key from L1 and announce it to other workers."""
+        await self._invalidate_many((key,))
+
+    async def _after_write(self, keys: Sequence[str]) -> None:
+        """Invalidate keys modified by set_many, delete_many or a pipeline."""
+        await self._invalidate_many(keys)
+
+    async def _invalidate_many(self, keys: Iterable[str]) -> None:
+        """Drop keys from L1 and announce them to other workers in one round-trip."""
+        cached_keys = []
+        for key in dict.fromkeys(keys):
+            store = self._store_for(key)
+            if store is not None:
+                store.discard(key)
+                cached_keys.append(key)
+        if not cached_keys:
+            return
+        if self.invalidation != "pubsub" or self._client is None or not hasattr(self._client, "publish"):
+            return
+        try:
+            if len(cached_keys) == 1:
+                await self._client.publish(self.channel, cached_keys[0])
+            else:
+                pipe = self._client.pipeline(transaction=False)
+                for key in cached_keys:
+                    pipe.publish(self.channel, key)
+                await pipe.execute()
+        except Exception as e:
+            logger.warning(f"Failed to publish cache invalidation for {len(cached_keys)} keys: {str(e)}")
+
+    def invalidate_local(self, key: Optional[str] = None) -> None:
+        """
+        Drop one key, or every key, from this worker's L1 tier.
+
+        Args:
+            key: Key to drop; None clears the whole tier
+        """
+        if key is None:
+            for store in self._stores:
+                store.clear()
+            return
+        store = self._store_for(key)
+        if store is not None:
+            store.discard(key)
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get L1 hit/miss/eviction counters.
+
+        Returns:
+            Totals plus a per-prefix breakdown
+        """
+        per_prefix = {store.policy.prefix: store.stats() for store in self._stores}
+        totals: Dict[str, Any] = {
+            name: sum(counters[name] for counters in per_prefix.values())
+            for name in ("entries", "size_bytes", "hits", "misses", "evictions", "expirations", "invalidations")
+        }
+        lookups = totals["hits"] + totals["misses"]
+        totals["hit_ratio"] = totals["hits"] / lookups if lookups else 0.0
+        totals["prefixes"] = per_prefix
+        return totals
+
+    def _keyspace_patterns(self) -> List[str]:
+        """Keyspace notification channel patterns for the configured prefixes."""
+        db = 0
+        pool = getattr(self._client, "connection_pool", None)
+        if pool is not None:
+            db = pool.connection_kwargs.get("db", 0)
+        return [f"__keyspace@{db}__:{store.policy.prefix}*" for store in self._stores]
+
+    async def _listen_for_invalidations(self) -> None:
+        """Apply invalidations published by other workers until cancelled."""
+        keyspace_prefix_length: Optional[int] = None
+        while True:
+            pubsub = None
+            try:
+                pubsub = self._client.pubsub()
+                if self.invalidation == "keyspace":
+                    patterns = self._keyspace_patterns()
+                    keyspace_prefix_length = patterns[0].index(":") + 1
+                    await pubsub.psubscribe(*patterns)
+                else:
+                    await pubsub.subscribe(self.channel)
+
+                async for message in pubsub.listen():
+                    if message.get("type") not in ("message", "pmessage"):
+                        continue
+                    if keyspace_prefix_length is not None:
+                        key = _as_text(message["channel"])[keyspace_prefix_length:]
+                    else:
+                        key = _as_text(message["data"])
+                    self.invalidate_local(key)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"Cache invalidation listener failed, flushing L1 tier: {str(e)}")
+            finally:
+                if pubsub is not None:
+                    try:
+                        await pubsub.aclose()
+                    except Exception:
+                        pass
+
+            # Invalidations may have been missed while disconnected
+            self.invalidate_local()
+            await asyncio.sleep(_RESUBSCRIBE_DELAY_SECONDS)
+
+    async def close(self) -> None:
+        """
+        Stop the invalidation listener, clear L1 and close the connection.
+        """
+        if self._listener_task is not None:
+            self._listener_task.cancel()
+            try:
+                await self._listener_task
+            except (asyncio.CancelledError, Exception):
+                pass
+            self._listener_task = None
+        self.invalidate_local()
+        await super().close()
+
+
+def _as_text(value: Any) -> str:
+    """Decode a pub/sub field that may be bytes."""
+    if isinstance(value, bytes):
+        return value.decode("utf-8", errors="replace")
+    return str(value)
@@ -0,0 +1,311 @@
+# -*- coding: utf-8 -*-
+"""
+Asynchronous Biometric Alert Dispatcher
+
+This module decouples alert generation from alert delivery. The
+BiometricEventProcessor hands each alert to the dispatcher, which returns
+immediately; notification happens on asyncio worker pools, one per channel
+(email, SMS, in-app, ...), so a slow provider never stalls ingestion.
+
+Each channel has its own bounded queue, worker count, retry policy with
+exponential backoff and token-bucket rate limit. An alert is accepted only
+if every channel it goes to has room; otherwise submit returns False and the
+caller delivers it inline, so an accepted alert is never dropped. Repeated
+alerts for the same patient and rule within a window are coalesced: only the
+first is delivered and the next one delivered after the window reports how
+many were suppressed.
+"""
+
+import asyncio
+import inspect
+import logging
+import random
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Context key carrying the number of coalesced duplicates on a delivered alert
+SUPPRESSED_DUPLICATES_KEY = "suppressed_duplicates"
+
+
+@dataclass
+class ChannelPolicy:
+    """Delivery policy for one notification channel."""
+
+    concurrency: int = 4
+    queue_size: int = 10000
+    max_retries: int = 3
+    backoff_base_seconds: float = 0.5
+    backoff_max_seconds: float = 30.0
+    rate_per_second: Optional[float] = None
+    burst: int = 1
+
+
+class _TokenBucket:
+    """Async token bucket shared by the workers of one channel."""
+
+    def __init__(self, rate_per_second: float, burst: int):
+        self.rate = rate_per_second
+        self.capacity = max(1, burst)
+        self.tokens = float(self.capacity)
+        self.updated = time.monotonic()
+        self.lock = asyncio.Lock()
+
+    async def acquire(self) -> float:
+        """Take one token, sleeping until one is available; return the seconds waited."""
+        async with self.lock:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            wait = 0.0
+            if self.tokens < 1.0:
+                wait = (1.0 - self.tokens) / self.rate
+                await asyncio.sleep(wait)
+                self.tokens = 1.0
+                self.updated = time.monotonic()
+            self.tokens -= 1.0
+            return wait
+
+
+class _Channel:
+    """Queue, workers and counters for one channel."""
+
+    def __init__(self, name: str, policy: ChannelPolicy):
+        self.name = name
+        self.policy = policy
+        # Unbounded: AlertDispatcher.submit reserves queue_size slots before queueing
+        self.queue: asyncio.Queue = asyncio.Queue()
+        self.limiter = _TokenBucket(policy.rate_per_second, policy.burst) if policy.rate_per_second else None
+        self.workers: List[asyncio.Task] = []
+        self.counters = {"enqueued": 0, "delivered": 0, "failed": 0, "retries": 0, "rate_limited": 0}
+
+
+def channel_name(observer: Any) -> str:
+    """
+    Return the channel an observer delivers on.
+
+    Args:
+        observer: Alert observer
+
+    Returns:
+        The observer's ``channel`` attribute, or its class name
+    """
+    return getattr(observer, "channel", None) or type(observer).__name__
+
+
+class AlertDispatcher:
+    """
+    Fans alerts out to observers on per-channel asyncio worker pools.
+
+    ``submit`` may be called from the event loop thread or any other thread
+    and never waits for delivery.
+    """
+
+    def __init__(
+        self,
+        policies: Optional[Dict[str, ChannelPolicy]] = None,
+        default_policy: Optional[ChannelPolicy] = None,
+        dedup_window_seconds: float = 300.0,
+    ):
+        """
+        Initialize the dispatcher.
+
+        Args:
+            policies: Delivery policy per channel name
+            default_policy: Policy for channels without one
+            dedup_window_seconds: Window in which repeated alerts for the same
+                patient and rule are coalesced (0 disables coalescing)
+        """
+        self.policies = dict(policies or {})
+        self.default_policy = default_policy or ChannelPolicy()
+        self.dedup_window_seconds = dedup_window_seconds
+        self._channels: Dict[str, _Channel] = {}
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        # (patient_id, rule_id) -> (window start, suppressed count)
+        self._recent: Dict[Tuple[Any, Any], Tuple[float, int]] = {}
+        # Channel name -> deliveries submitted but not yet taken by a worker
+        self._queued: Dict[str, int] = {}
+        self._lock = threading.Lock()
+        self._counters = {"submitted": 0, "coalesced": 0, "rejected": 0}
+
+    @property
+    def is_running(self) -> bool:
+        """Whether the dispatcher is bound to a running event loop."""
+        return self._loop is not None and not self._loop.is_closed()
+
+    async def start(self) -> None:
+        """Bind the dispatcher to the running event loop."""
+        self._loop = asyncio.get_running_loop()
+
+    def submit(self, alert: Any, observers: Iterable[Any]) -> bool:
+        """
+        Queue an alert for delivery to observers.
+
+        Args:
+            alert: The biometric alert
+            observers: Observers to notify
+
+        Returns:
+            True once the alert is queued for every observer (or coalesced);
+            False if the dispatcher is not running or a channel queue is full,
+            in which case nothing was queued and the caller must deliver itself
+        """
+        if not self.is_running:
+            return False
+        observers = list(observers)
+        if not observers:
+            return True
+        if self._coalesce(alert):
+            return True
+        if not self._reserve([channel_name(observer) for observer in observers]):
+            logger.warning(f"Alert channel queue full; alert {getattr(alert, 'alert_id', '')} left to the caller")
+            return False
+
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+        if running is self._loop:
+            self._enqueue(alert, observers)
+        else:
+            self._loop.call_soon_threadsafe(self._enqueue, alert, observers)
+        return True
+
+    async def drain(self) -> None:
+        """Wait until every queued notification has been attempted."""
+        for channel in list(self._channels.values()):
+            await channel.queue.join()
+
+    async def stop(self, timeout: Optional[float] = 10.0) -> None:
+        """
+        Deliver what is queued (up to a timeout) and stop the workers.
+
+        Args:
+            timeout: Maximum seconds to wait for queued notifications
+        """
+        try:
+            await asyncio.wait_for(self.drain(), timeout)
+        except asyncio.TimeoutError:
+            logger.warning("Alert dispatcher stopped with undelivered notifications")
+        for channel in self._channels.values():
+            for worker in channel.workers:
+                worker.cancel()
+            await asyncio.gather(*channel.workers, return_exceptions=True)
+        self._channels.clear()
+        with self._lock:
+            self._queued.clear()
+        self._loop = None
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get dispatcher counters.
+
+        Returns:
+            Submitted and coalesced totals plus per-channel queue depth and
+            delivery counters
+        """
+        return {
+            **self._counters,
+            "channels": {
+                name: {"queued": channel.queue.qsize(), **channel.counters}
+                for name, channel in self._channels.items()
+            },
+        }
+
+    def _coalesce(self, alert: Any) -> bool:
+        """Return True if the alert repeats one delivered within the window."""
+        with self._lock:
+            self._counters["submitted"] += 1
+            if self.dedup_window_seconds <= 0:
+                return False
+            key = (getattr(alert, "patient_id", None), getattr(alert, "rule_id", None))
+            now = time.monotonic()
+            recent = self._recent.get(key)
+            if recent is not None and now - recent[0] < self.dedup_window_seconds:
+                self._recent[key] = (recent[0], recent[1] + 1)
+                self._counters["coalesced"] += 1
+                return True
+            if recent is not None and recent[1] and isinstance(getattr(alert, "context", None), dict):
+                alert.context[SUPPRESSED_DUPLICATES_KEY] = recent[1]
+            self._recent[key] = (now, 0)
+            if len(self._recent) > 10 * self.default_policy.queue_size:
+                self._recent = {k: v for k, v in self._recent.items() if now - v[0] < self.dedup_window_seconds}
+            return False
+
+    def _reserve(self, names: List[str]) -> bool:
+        """Reserve a queue slot per delivery; all or none, False if any channel is full."""
+        with self._lock:
+            wanted: Dict[str, int] = {}
+            for name in names:
+                wanted[name] = wanted.get(name, 0) + 1
+            for name, count in wanted.items():
+                policy = self.policies.get(name, self.default_policy)
+                if self._queued.get(name, 0) + count > policy.queue_size:
+                    self._counters["rejected"] += 1
+                    return False
+            for name, count in wanted.items():
+                self._queued[name] = self._queued.get(name, 0) + count
+            return True
+
+    def _enqueue(self, alert: Any, observers: List[Any]) -> None:
+        """Put one delivery per observer on its channel queue (event loop thread)."""
+        for observer in observers:
+            channel = self._channel(channel_name(observer))
+            channel.queue.put_nowait((alert, observer))
+            channel.counters["enqueued"] += 1
+
+    def _channel(self, name: str) -> _Channel:
+        """Get or create a channel and its workers."""
+        channel = self._channels.get(name)
+        if channel is None:
+            channel = self._channels[name] = _Channel(name, self.policies.get(name, self.default_policy))
+            channel.workers = [
+                self._loop.create_task(self._worker(channel)) for _ in range(max(1, channel.policy.concurrency))
+            ]
+        return channel
+
+    async def _worker(self, channel: _Channel) -> None:
+        """Deliver notifications from one channel's queue until cancelled."""
+        while True:
+            alert, observer = await channel.queue.get()
+            with self._lock:
+                self._queued[channel.name] -= 1
+            try:
+                await self._deliver(channel, alert, observer)
+            finally:
+                channel.queue.task_done()
+
+    async def _deliver(self, channel: _Channel, alert: Any, observer: Any) -> None:
+        """Notify one observer, retrying with exponential backoff."""
+        policy = channel.policy
+        for attempt in range(policy.max_retries + 1):
+            if channel.limiter is not None and await channel.limiter.acquire() > 0:
+                channel.counters["rate_limited"] += 1
+            try:
+                await _notify(observer, alert)
+                channel.counters["delivered"] += 1
+                return
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                if attempt == policy.max_retries:
+                    channel.counters["failed"] += 1
+                    logger.error(f"Alert delivery on {channel.name} failed after {attempt + 1} attempts: {str(e)}")
+                    return
+                channel.counters["retries"] += 1
+                backoff = min(policy.backoff_max_seconds, policy.backoff_base_seconds * (2 ** attempt))
+                # Equal jitter (half fixed, half random) keeps retries from a provider
+                # outage from arriving in lockstep without shortening the minimum wait
+                await asyncio.sleep(backoff * random.uniform(0.5, 1.0))
+
+
+async def _notify(observer: Any, alert: Any) -> None:
+    """Call an observer's async notify_alert, or run its blocking notify off the loop."""
+    notify_alert = getattr(observer, "notify_alert", None)
+    if notify_alert is not None and inspect.iscoroutinefunction(notify_alert):
+        await notify_alert(alert)
+    else:
+        await asyncio.to_thread(observer.notify, alert)
@@ -0,0 +1,7 @@
+"""
+Bayesian network inference for the Digital Twin belief networks.
+"""
+
+from app.infrastructure.ml.bayesian.junction_tree_inference import JunctionTreeInference
+
+__all__ = ["JunctionTreeInference"]
@@ -0,0 +1,230 @@
+"""
+Exact inference over discrete Bayesian networks with a junction tree.
+
+Conditional probability tables are NumPy factor arrays. The network is
+compiled once into a tree of cliques (by eliminating variables in min-fill
+order), and posteriors for every variable are obtained by one collect and
+one distribute pass of Hugin message passing. Every potential carries a
+leading batch axis, so the same passes calibrate the tree for many evidence
+sets at once.
+
+Adding evidence to an already calibrated tree only needs the evidence
+multiplied into one clique and a distribute pass from that clique, which is
+what ``absorb`` does; retracting or changing evidence needs a fresh
+``calibrate``.
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+
+import numpy as np
+
+
+@dataclass
+class CalibratedTree:
+    """Clique and separator potentials for a batch of evidence sets."""
+    potentials: list[np.ndarray]
+    separators: dict[tuple[int, int], np.ndarray]
+    evidence: list[dict[int, int]] = field(default_factory=list)
+
+
+class JunctionTree:
+    """
+    Junction tree compiled from a discrete Bayesian network.
+
+    Variables are numbered ``0..n-1``; each factor is a pair
+    ``(scope, table)`` where ``table`` has one axis per variable in ``scope``.
+    """
+
+    def __init__(self, cardinalities: list[int], factors: list[tuple[list[int], np.ndarray]]):
+        """
+        Compile the network.
+
+        Args:
+            cardinalities: Number of states of each variable
+            factors: Conditional probability tables with their scopes
+        """
+        self.cardinalities = list(cardinalities)
+        self.cliques = _cliques(len(cardinalities), [scope for scope, _ in factors])
+        self.neighbors, self.roots = _spanning_forest(self.cliques)
+
+        # Smallest clique holding each variable, used for evidence and marginals
+        self.home = [
+            min((c for c, clique in enumerate(self.cliques) if v in clique), key=lambda c: len(self.cliques[c]))
+            for v in range(len(cardinalities))
+        ]
+
+        self.base = [np.ones([cardinalities[v] for v in clique]) for clique in self.cliques]
+        for scope, table in factors:
+            target = next(c for c, clique in enumerate(self.cliques) if set(scope) <= set(clique))
+            self.base[target] = _einsum(
+                (self.base[target], self.cliques[target]), (table, scope), out=self.cliques[target]
+            )
+
+    def calibrate(self, evidence: list[dict[int, int]]) -> CalibratedTree:
+        """
+        Calibrate the tree for a batch of evidence sets.
+
+        Args:
+            evidence: Observed state index per variable, one dict per batch row
+
+        Returns:
+            Calibrated potentials with a leading batch axis
+        """
+        batch = len(evidence)
+        tree = CalibratedTree(
+            potentials=[np.repeat(base[None], batch, axis=0) for base in self.base],
+            separators={},
+        )
+        self._enter(tree, evidence)
+        tree.evidence = [dict(e) for e in evidence]
+
+        for root in self.roots:
+            order = self._preorder(root)
+            for clique, parent in reversed(order):
+                if parent is not None:
+                    self._pass(tree, clique, parent)
+            for clique, parent in order:
+                if parent is not None:
+                    self._pass(tree, parent, clique)
+        return tree
+
+    def absorb(self, tree: CalibratedTree, evidence: list[dict[int, int]]) -> None:
+        """
+        Add evidence to a calibrated tree in place.
+
+        Args:
+            tree: Tree calibrated with a subset of this evidence
+            evidence: Additional observations per batch row (variables not
+                already observed in that row)
+        """
+        touched = sorted({self.home[v] for row in evidence for v in row})
+        self._enter(tree, evidence)
+        for row, extra in zip(tree.evidence, evidence):
+            row.update(extra)
+        for source in touched:
+            for clique, parent in self._preorder(source):
+                if parent is not None:
+                    self._pass(tree, parent, clique)
+
+    def marginals(self, tree: CalibratedTree) -> list[np.ndarray]:
+        """
+        Posterior distribution of every variable.
+
+        Args:
+            tree: Calibrated tree
+
+        Returns:
+            One (batch, states) array per variable; rows are all zero where
+            the evidence has zero probability
+        """
+        result = []
+        for v, clique in enumerate(self.home):
+            joint = _einsum((tree.potentials[clique], ["batch", *self.cliques[clique]]), out=["batch", v])
+            total = joint.sum(axis=1, keepdims=True)
+            result.append(np.divide(joint, total, out=np.zeros_like(joint), where=total > 0))
+        return result
+
+    def _enter(self, tree: CalibratedTree, evidence: list[dict[int, int]]) -> None:
+        """Zero out states that contradict the evidence in each variable's home clique."""
+        for row, observed in enumerate(evidence):
+            for v, state in observed.items():
+                clique = self.home[v]
+                axis = self.cliques[clique].index(v)
+                mask = np.zeros(self.cardinalities[v])
+                mask[state] = 1.0
+                shape = [1] * len(self.cliques[clique])
+                shape[axis] = -1
+                tree.potentials[clique][row] *= mask.reshape(shape)
+
+    def _pass(self, tree: CalibratedTree, source: int, target: int) -> None:
+        """Send a Hugin message from one clique to a neighbor."""
+        separator = self.neighbors[source][target]
+        key = (min(source, target), max(source, target))
+        message = _einsum((tree.potentials[source], ["batch", *self.cliques[source]]), out=["batch", *separator])
+        previous = tree.separators.get(key)
+        if previous is None:
+            ratio = message
+        else:
+            ratio = np.divide(message, previous, out=np.zeros_like(message), where=previous != 0)
+        tree.potentials[target] = _einsum(
+            (tree.potentials[target], ["batch", *self.cliques[target]]),
+            (ratio, ["batch", *separator]),
+            out=["batch", *self.cliques[target]],
+        )
+        tree.separators[key] = message
+
+    def _preorder(self, root: int) -> list[tuple[int, int | None]]:
+        """(clique, parent) pairs of the tree containing root, parents first."""
+        order = [(root, None)]
+        for clique, parent in order:
+            order.extend((child, clique) for child in self.neighbors[clique] if child != parent)
+        return order
+
+
+def _einsum(*operands: tuple[np.ndarray, list], out: list) -> np.ndarray:
+    """np.einsum over labelled axes, relabelled so any variable IDs fit."""
+    labels: dict = {}
+
+    def local(scope):
+        return [labels.setdefault(label, len(labels)) for label in scope]
+
+    args = []
+    for array, scope in operands:
+        args.extend((array, local(scope)))
+    return np.einsum(*args, local(out))
+
+
+def _cliques(count: int, scopes: list[list[int]]) -> list[list[int]]:
+    """Maximal cliques of the moral graph triangulated in min-fill order."""
+    adjacent = {v: set() for v in range(count)}
+    for scope in scopes:
+        for v in scope:
+            adjacent[v].update(u for u in scope if u != v)
+
+    cliques: list[set[int]] = []
+    remaining = set(range(count))
+    while remaining:
+        def fill_in(v):
+            others = list(adjacent[v])
+            missing = sum(1 for i, a in enumerate(others) for b in others[i + 1:] if b not in adjacent[a])
+            return missing, len(others), v
+
+        v = min(remaining, key=fill_in)
+        clique = adjacent[v] | {v}
+        for a in adjacent[v]:
+            adjacent[a].update(adjacent[v] - {a})
+            adjacent[a].discard(v)
+        remaining.discard(v)
+        del adjacent[v]
+        if not any(clique <= other for other in cliques):
+            cliques = [other for other in cliques if not other < clique]
+            cliques.append(clique)
+    return [sorted(clique) for clique in cliques]
+
+
+def _spanning_forest(cliques: list[list[int]]) -> tuple[list[dict[int, list[int]]], list[int]]:
+    """Maximum-weight spanning forest over clique intersections (Kruskal)."""
+    parent = list(range(len(cliques)))
+
+    def find(c):
+        while parent[c] != c:
+            parent[c] = parent[parent[c]]
+            c = parent[c]
+        return c
+
+    candidates = sorted(
+        ((len(set(a) & set(b)), i, j) for i, a in enumerate(cliques) for j, b in enumerate(cliques[i + 1:], i + 1)),
+        reverse=True,
+    )
+    neighbors: list[dict[int, list[int]]] = [{} for _ in cliques]
+    for weight, i, j in candidates:
+        if weight == 0:
+            break
+        if find(i) != find(j):
+            parent[find(i)] = find(j)
+            separator = sorted(set(cliques[i]) & set(cliques[j]))
+            neighbors[i][j] = separator
+            neighbors[j][i] = separator
+    roots = sorted({find(c) for c in range(len(cliques))})
+    return neighbors, roots
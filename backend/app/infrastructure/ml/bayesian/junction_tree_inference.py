@@ -0,0 +1,130 @@
+"""
+Exact belief inference for BayesianBeliefNetwork on a junction tree.
+
+The network's conditional probability tables are compiled into NumPy factor
+arrays and then into a junction tree. The compiled tree and its calibration
+for the network's current evidence are cached, so adding evidence only
+re-propagates from the cliques it touches.
+"""
+from __future__ import annotations
+
+import numpy as np
+
+from app.domain.entities.knowledge_graph import BayesianBeliefNetwork
+from app.domain.interfaces.belief_inference import BeliefInferenceEngine
+from app.infrastructure.ml.bayesian.junction_tree import CalibratedTree, JunctionTree
+
+
+class JunctionTreeInference(BeliefInferenceEngine):
+    """
+    Junction-tree inference engine for a single belief network.
+
+    Pass one instance per network as its ``inference``; the network reports
+    every change, so the cached factors and tree stay in step with it.
+    """
+
+    def __init__(self):
+        """Initialize an engine with nothing compiled."""
+        self._factors: dict[str, np.ndarray] = {}
+        self._compiled: tuple[list[str], JunctionTree] | None = None
+        self._calibrated: CalibratedTree | None = None
+
+    def network_changed(self, variable: str | None = None) -> None:
+        """Drop the factor of a variable whose parents changed, or every factor."""
+        if variable is None:
+            self._factors.clear()
+        else:
+            self._factors.pop(variable, None)
+        self._compiled = None
+
+    def table_changed(
+        self, network: BayesianBeliefNetwork, variable: str, parent_values: dict[str, str]
+    ) -> None:
+        """Patch the cached factor row rather than rebuilding the table."""
+        if variable in self._factors:
+            index = tuple(network.variables[parent]["states"].index(parent_values[parent])
+                          for parent in network.variables[variable]["parents"])
+            probabilities = network.conditional_probabilities[variable][
+                network._parent_config_to_string(parent_values)]
+            self._factors[variable][index] = self._distribution(network, variable, probabilities)
+        self._compiled = None
+
+    def belief_state(self, network: BayesianBeliefNetwork) -> dict[str, dict[str, float]]:
+        """Posteriors for the network's evidence, reusing the last calibration when possible."""
+        names, tree = self._junction_tree(network)
+        observed = self._evidence_indices(network, names, network.evidence)
+        calibrated = self._calibrated
+
+        # Evidence only added since the last calibration is absorbed in place;
+        # anything retracted or changed needs a fresh calibration
+        if calibrated is not None and all(observed.get(v) == s for v, s in calibrated.evidence[0].items()):
+            added = {v: s for v, s in observed.items() if v not in calibrated.evidence[0]}
+            if added:
+                tree.absorb(calibrated, [added])
+        else:
+            calibrated = self._calibrated = tree.calibrate([observed])
+
+        return self._beliefs(network, names, tree.marginals(calibrated), 0)
+
+    def belief_states(
+        self, network: BayesianBeliefNetwork, evidence_sets: list[dict[str, str]]
+    ) -> list[dict[str, dict[str, float]]]:
+        """Posteriors for many evidence sets in one batched calibration."""
+        if not evidence_sets:
+            return []
+        names, tree = self._junction_tree(network)
+        marginals = tree.marginals(
+            tree.calibrate([self._evidence_indices(network, names, e) for e in evidence_sets]))
+        return [self._beliefs(network, names, marginals, row) for row in range(len(evidence_sets))]
+
+    def _junction_tree(self, network: BayesianBeliefNetwork) -> tuple[list[str], JunctionTree]:
+        """The junction tree for the current structure and tables, compiled on demand."""
+        if self._compiled is None:
+            names = network._topological_sort()
+            position = {name: i for i, name in enumerate(names)}
+            factors = [
+                ([position[p] for p in network.variables[name]["parents"]] + [position[name]],
+                 self._factor(network, name))
+                for name in names
+            ]
+            self._compiled = names, JunctionTree([len(network.variables[n]["states"]) for n in names], factors)
+            self._calibrated = None
+        return self._compiled
+
+    def _factor(self, network: BayesianBeliefNetwork, variable: str) -> np.ndarray:
+        """Factor array for a variable, axes (parents..., variable); missing configurations are uniform."""
+        if variable not in self._factors:
+            states = network.variables[variable]["states"]
+            parents = network.variables[variable]["parents"]
+            shape = [len(network.variables[p]["states"]) for p in parents]
+            table = np.full([*shape, len(states)], 1.0 / len(states))
+            defined = network.conditional_probabilities.get(variable, {})
+            for index in np.ndindex(*shape):
+                config = network._parent_config_to_string(
+                    {p: network.variables[p]["states"][i] for p, i in zip(parents, index)})
+                if config in defined:
+                    table[index] = self._distribution(network, variable, defined[config])
+            self._factors[variable] = table
+        return self._factors[variable]
+
+    @staticmethod
+    def _distribution(network: BayesianBeliefNetwork, variable: str,
+                      probabilities: dict[str, float]) -> np.ndarray:
+        """Probabilities keyed by state as a vector in state order."""
+        return np.array([probabilities.get(state, 0.0) for state in network.variables[variable]["states"]])
+
+    @staticmethod
+    def _evidence_indices(network: BayesianBeliefNetwork, names: list[str],
+                          evidence: dict[str, str]) -> dict[int, int]:
+        """Evidence as variable position -> state index."""
+        position = {name: i for i, name in enumerate(names)}
+        return {position[var]: network.variables[var]["states"].index(value) for var, value in evidence.items()}
+
+    @staticmethod
+    def _beliefs(network: BayesianBeliefNetwork, names: list[str], marginals: list[np.ndarray],
+                 row: int) -> dict[str, dict[str, float]]:
+        """One batch row of the marginals as variable -> state -> probability."""
+        return {
+            name: dict(zip(network.variables[name]["states"], marginals[i][row].tolist()))
+            for i, name in enumerate(names)
+        }
@@ -0,0 +1,218 @@
+# -*- coding: utf-8 -*-
+"""
+Vectorized Lag Correlation Engine for the Biometric Correlation Service.
+
+This module computes the full lag-correlation tensor
+``[biometric feature x mental health indicator x lag]`` in one pass instead
+of calling ``np.corrcoef`` once per cell. The correlation at lag ``k`` pairs
+biometric sample ``t`` with mental health sample ``t + k`` (biometric
+changes preceding mental health changes).
+
+Missing values (NaN) are masked out pairwise: each cell is the Pearson
+correlation over the time steps where both series are present, as with a
+pairwise-complete ``DataFrame.corr``. All the sums the correlation needs
+(pair counts, sums, sums of squares and cross products) are themselves lag
+cross-correlations of the masked, standardized series, computed either with
+one FFT per series or with one matrix product per lag.
+"""
+
+from typing import Optional, Sequence, Tuple
+
+import numpy as np
+
+# Below this many lags one matrix product per lag beats the FFT
+FFT_MIN_LAGS = 96
+
+
+def effective_max_lag(num_samples: int, max_lag: int) -> int:
+    """
+    Clamp the maximum lag to what a series can support.
+
+    Args:
+        num_samples: Length of the time series
+        max_lag: Requested maximum lag
+
+    Returns:
+        ``max_lag``, or half the series length if the series is too short
+    """
+    if num_samples <= max_lag:
+        return num_samples // 2
+    return max_lag
+
+
+def lag_correlation_tensor(
+    biometric_data: np.ndarray,
+    mental_health_data: np.ndarray,
+    max_lag: int,
+    method: str = "auto",
+) -> np.ndarray:
+    """
+    Compute lagged Pearson correlations for every feature/indicator pair.
+
+    Args:
+        biometric_data: Array of shape (time, features); NaN marks missing values
+        mental_health_data: Array of shape (time, indicators)
+        max_lag: Maximum lag in samples (already clamped to the series length)
+        method: "fft", "direct" or "auto"
+
+    Returns:
+        Array of shape (features, indicators, max_lag + 1); NaN where fewer
+        than two paired samples exist or a series is constant
+    """
+    return lag_correlation_batch([(biometric_data, mental_health_data)], max_lag, method)[0]
+
+
+def lag_correlation_batch(
+    series: Sequence[Tuple[np.ndarray, np.ndarray]],
+    max_lag: int,
+    method: str = "auto",
+) -> np.ndarray:
+    """
+    Compute lag-correlation tensors for many patients at once.
+
+    Patients' series may differ in length; shorter ones are padded with
+    missing values, which the pairwise masking ignores.
+
+    Args:
+        series: (biometric_data, mental_health_data) per patient, with the
+            same feature and indicator columns for every patient
+        max_lag: Maximum lag in samples
+        method: "fft", "direct" or "auto"
+
+    Returns:
+        Array of shape (patients, features, indicators, max_lag + 1)
+    """
+    x, y = _stack(series)
+    x_mask = ~np.isnan(x)
+    y_mask = ~np.isnan(y)
+    x = _standardize(x, x_mask)
+    y = _standardize(y, y_mask)
+    xm = x_mask.astype(np.float64)
+    ym = y_mask.astype(np.float64)
+
+    if method == "auto":
+        method = "fft" if max_lag + 1 >= FFT_MIN_LAGS else "direct"
+    if method == "fft":
+        cross = _FFTCrossCorrelator(x.shape[1], max_lag)
+    elif method == "direct":
+        cross = _DirectCrossCorrelator(x.shape[1], max_lag)
+    else:
+        raise ValueError(f"Unknown lag correlation method: {method}")
+
+    # Each series is transformed once and reused across the six sums
+    left = {name: cross.left(values) for name, values in (("m", xm), ("x", x), ("xx", x * x))}
+    right = {name: cross.right(values) for name, values in (("m", ym), ("y", y), ("yy", y * y))}
+    count = cross(left["m"], right["m"])
+    sum_x = cross(left["x"], right["m"])
+    sum_y = cross(left["m"], right["y"])
+    sum_xx = cross(left["xx"], right["m"])
+    sum_yy = cross(left["m"], right["yy"])
+    sum_xy = cross(left["x"], right["y"])
+
+    # Pairs that cannot give a correlation stay NaN
+    with np.errstate(divide="ignore", invalid="ignore"):
+        count = np.where(count >= 1.5, np.round(count), np.nan)
+        covariance = sum_xy - sum_x * sum_y / count
+        var_x = sum_xx - sum_x * sum_x / count
+        var_y = sum_yy - sum_y * sum_y / count
+        denominator = np.sqrt(var_x * var_y)
+        # Constant series leave only rounding noise in the variance
+        scale = np.sqrt(sum_xx * sum_yy)
+        degenerate = ~(denominator > 1e-9 * np.maximum(scale, 1e-300))
+        correlation = covariance / denominator
+    correlation[degenerate] = np.nan
+    return np.clip(correlation, -1.0, 1.0, out=correlation)
+
+
+def _stack(series: Sequence[Tuple[np.ndarray, np.ndarray]]) -> Tuple[np.ndarray, np.ndarray]:
+    """Stack patients into (patients, time, columns) arrays padded with NaN."""
+    if not series:
+        raise ValueError("No series to correlate")
+    arrays = [(np.asarray(b, dtype=np.float64), np.asarray(m, dtype=np.float64)) for b, m in series]
+    for b, m in arrays:
+        if b.ndim != 2 or m.ndim != 2 or b.shape[0] != m.shape[0]:
+            raise ValueError("Biometric and mental health data must be 2-D with the same number of samples")
+    length = max(b.shape[0] for b, _ in arrays)
+    features = arrays[0][0].shape[1]
+    indicators = arrays[0][1].shape[1]
+    x = np.full((len(arrays), length, features), np.nan)
+    y = np.full((len(arrays), length, indicators), np.nan)
+    for p, (b, m) in enumerate(arrays):
+        x[p, :b.shape[0]] = b
+        y[p, :m.shape[0]] = m
+    return x, y
+
+
+def _standardize(values: np.ndarray, mask: np.ndarray) -> np.ndarray:
+    """Center and scale each column over its present values; zero the missing ones."""
+    present = np.maximum(mask.sum(axis=1, keepdims=True), 1)
+    filled = np.where(mask, values, 0.0)
+    mean = filled.sum(axis=1, keepdims=True) / present
+    centered = np.where(mask, values - mean, 0.0)
+    scale = np.sqrt((centered * centered).sum(axis=1, keepdims=True) / present)
+    scale[scale == 0] = 1.0
+    return centered / scale
+
+
+class _DirectCrossCorrelator:
+    """Lagged cross products as one batched matrix product per lag."""
+
+    def __init__(self, length: int, max_lag: int):
+        self.length = length
+        self.max_lag = max_lag
+
+    def left(self, values: np.ndarray) -> np.ndarray:
+        """Prepare a (patients, time, features) operand."""
+        return values.transpose(0, 2, 1)
+
+    def right(self, values: np.ndarray) -> np.ndarray:
+        """Prepare a (patients, time, indicators) operand."""
+        return values
+
+    def __call__(self, a: np.ndarray, b: np.ndarray) -> np.ndarray:
+        """Return sum_t a[p, t, f] * b[p, t + k, i] with shape (p, f, i, lags)."""
+        out = np.empty((a.shape[0], a.shape[1], b.shape[2], self.max_lag + 1))
+        for lag in range(self.max_lag + 1):
+            out[..., lag] = np.matmul(a[:, :, :self.length - lag], b[:, lag:])
+        return out
+
+
+class _FFTCrossCorrelator:
+    """Lagged cross products for all lags from one FFT per series."""
+
+    def __init__(self, length: int, max_lag: int):
+        self.max_lag = max_lag
+        # Enough padding that lags up to max_lag do not wrap around
+        self.size = _fast_length(length + max_lag)
+
+    def left(self, values: np.ndarray) -> np.ndarray:
+        """Conjugate spectrum of a (patients, time, features) operand."""
+        return np.conj(np.fft.rfft(values, n=self.size, axis=1))
+
+    def right(self, values: np.ndarray) -> np.ndarray:
+        """Spectrum of a (patients, time, indicators) operand."""
+        return np.fft.rfft(values, n=self.size, axis=1)
+
+    def __call__(self, a: np.ndarray, b: np.ndarray) -> np.ndarray:
+        """Return sum_t a[p, t, f] * b[p, t + k, i] with shape (p, f, i, lags)."""
+        # (p, freq, f, 1) * (p, freq, 1, i) -> inverse transform along freq
+        product = a[:, :, :, None] * b[:, :, None, :]
+        lagged = np.fft.irfft(product, n=self.size, axis=1)[:, :self.max_lag + 1]
+        return lagged.transpose(0, 2, 3, 1)
+
+
+def _fast_length(n: int) -> int:
+    """Smallest 2^a * 3^b * 5^c not below n, a fast FFT size."""
+    best: Optional[int] = None
+    power5 = 1
+    while power5 < 2 * n:
+        power35 = power5
+        while power35 < 2 * n:
+            size = power35
+            while size < n:
+                size *= 2
+            if best is None or size < best:
+                best = size
+            power35 *= 3
+        power5 *= 5
+    return best
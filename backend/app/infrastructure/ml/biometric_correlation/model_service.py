@@ -13,7 +13,7 @@ import logging
 import os
 from datetime import datetime, timedelta
 from app.domain.utils.datetime_utils import UTC
-from typing import Any, Dict, List, Optional, Union
+from typing import Any, Dict, List, Optional, Tuple, Union
 from uuid import UUID
 
 import numpy as np
@@ -21,6 +21,11 @@ import numpy as np
 # Import relevant exceptions from core layer as a temporary workaround
 from app.core.exceptions.base_exceptions import ModelExecutionError
 from app.domain.exceptions import ValidationError
+from app.infrastructure.ml.biometric_correlation.lag_correlation import (
+    effective_max_lag,
+    lag_correlation_batch,
+    lag_correlation_tensor,
+)
 from app.infrastructure.ml.biometric_correlation.lstm_model import (
     BiometricCorrelationModel,
 )
@@ -434,6 +439,9 @@ class BiometricCorrelationService:
         """
         Calculate lag correlations between biometric data and mental health indicators.
 
+        The whole [feature x indicator x lag] tensor is computed in one pass;
+        missing values (NaN) are excluded pairwise.
+
         Args:
             biometric_data: Numpy array of biometric data
             mental_health_data: Numpy array of mental health data
@@ -442,49 +450,76 @@ class BiometricCorrelationService:
         Returns:
             Dictionary containing lag correlation results
         """
-        num_samples = biometric_data.shape[0]
+        max_lag = effective_max_lag(biometric_data.shape[0], max_lag)
+        tensor = lag_correlation_tensor(biometric_data, mental_health_data, max_lag)
+
+        return {"lag_results": self._lag_results(tensor), "max_lag": max_lag}
+
+    async def calculate_population_lag_correlations(
+        self,
+        patient_data: Dict[str, Tuple[np.ndarray, np.ndarray]],
+        max_lag: int = 7,
+    ) -> Dict[str, Any]:
+        """
+        Calculate lag correlations for many patients in one batch.
 
-        if num_samples <= max_lag:
-            max_lag = num_samples // 2
+        Args:
+            patient_data: (biometric_data, mental_health_data) arrays per
+                patient ID, with the service's feature and indicator columns;
+                NaN marks missing values
+            max_lag: Maximum lag in days to consider
 
-        # Initialize lag correlation results
+        Returns:
+            Dictionary with per-patient lag results and population results
+            pooled over patients (Fisher z-averaged correlations)
+        """
+        if not patient_data:
+            raise ValidationError("No patient data provided")
+
+        patient_ids = list(patient_data)
+        shortest = min(patient_data[pid][0].shape[0] for pid in patient_ids)
+        max_lag = effective_max_lag(shortest, max_lag)
+        tensors = lag_correlation_batch([patient_data[pid] for pid in patient_ids], max_lag)
+
+        # Average in Fisher z space so strong correlations are not understated
+        defined = ~np.isnan(tensors)
+        contributing = defined.sum(axis=0)
+        z = np.where(defined, np.arctanh(np.clip(np.nan_to_num(tensors), -0.999999, 0.999999)), 0.0)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            pooled = np.tanh(z.sum(axis=0) / contributing)
+
+        return {
+            "max_lag": max_lag,
+            "patients": {str(pid): self._lag_results(tensor) for pid, tensor in zip(patient_ids, tensors)},
+            "population": self._lag_results(pooled),
+            "patients_per_cell": contributing.tolist(),
+        }
+
+    def _lag_results(self, tensor: np.ndarray) -> Dict[str, Any]:
+        """
+        Convert a [feature x indicator x lag] tensor to nested lag results.
+
+        The optimal lag is the one with the largest absolute correlation;
+        lags without a defined correlation are ignored.
+        """
+        absolute = np.where(np.isnan(tensor), -1.0, np.abs(tensor))
+        optimal_lags = np.argmax(absolute, axis=2)
         lag_results = {}
 
         for i, biometric_feature in enumerate(self.biometric_features):
             feature_results = {}
 
             for j, mental_indicator in enumerate(self.mental_health_indicators):
-                lag_correlations = []
-
-                # Calculate correlation for each lag
-                for lag in range(max_lag + 1):
-                    if lag == 0:
-                        # Contemporaneous correlation
-                        corr = np.corrcoef(
-                            biometric_data[:, i], mental_health_data[:, j]
-                        )[0, 1]
-                    else:
-                        # Lagged correlation (biometric -> mental health)
-                        corr = np.corrcoef(
-                            biometric_data[:-lag, i], mental_health_data[lag:, j]
-                        )[0, 1]
-
-                    lag_correlations.append(float(corr))
-
-                # Find optimal lag (maximum absolute correlation)
-                abs_correlations = np.abs(lag_correlations)
-                optimal_lag = int(np.argmax(abs_correlations))
-                optimal_correlation = lag_correlations[optimal_lag]
-
+                optimal_lag = int(optimal_lags[i, j])
                 feature_results[mental_indicator] = {
-                    "lag_correlations": lag_correlations,
+                    "lag_correlations": tensor[i, j].tolist(),
                     "optimal_lag": optimal_lag,
-                    "optimal_correlation": optimal_correlation,
+                    "optimal_correlation": float(tensor[i, j, optimal_lag]),
                 }
 
             lag_results[biometric_feature] = feature_results
 
-        return {"lag_results": lag_results, "max_lag": max_lag}
+        return lag_results
 
     async def _generate_insights(
         self,
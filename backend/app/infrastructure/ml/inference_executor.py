@@ -0,0 +1,300 @@
+# -*- coding: utf-8 -*-
+"""
+Inference Executor for CPU-bound model calls.
+
+Model predict methods in this codebase are declared async but do all their
+work synchronously (torch forward passes, xgboost booster predictions), so
+awaiting them blocks the event loop and asyncio.gather runs them one after
+the other. The InferenceExecutor runs such calls on dedicated worker pools,
+one per model family, so they overlap with each other and the event loop
+keeps serving requests.
+
+Each family has its own thread or process pool, a concurrency limit, a
+bounded admission queue (callers beyond it are rejected instead of piling up)
+and a per-call timeout.
+"""
+
+import asyncio
+import functools
+import logging
+import os
+import threading
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Optional
+
+from app.config.settings import get_settings
+from app.core.exceptions.ml_exceptions import InferenceQueueFullError, InferenceTimeoutError
+
+logger = logging.getLogger(__name__)
+
+TORCH_FAMILY = "torch"
+XGBOOST_FAMILY = "xgboost"
+
+
+@dataclass
+class FamilyPolicy:
+    """Pool sizing and admission policy for one model family."""
+
+    workers: int = 1
+    max_concurrency: Optional[int] = None  # defaults to workers
+    queue_size: int = 32
+    timeout_seconds: Optional[float] = 30.0
+    use_processes: bool = False
+    initializer: Optional[Callable[..., None]] = None
+    initargs: tuple = ()
+
+
+def limit_torch_threads(num_threads: int) -> None:
+    """
+    Pool initializer capping torch intra-op parallelism.
+
+    torch's thread setting is process-wide, so in a thread pool this caps
+    all torch work in the process; in a process pool it applies per worker.
+
+    Args:
+        num_threads: Intra-op threads torch may use
+    """
+    try:
+        import torch
+    except Exception:
+        return
+    if torch.get_num_threads() != num_threads:
+        torch.set_num_threads(num_threads)
+
+
+def default_policies(cpu_count: Optional[int] = None) -> Dict[str, FamilyPolicy]:
+    """
+    Policies for the torch and xgboost families sized to the machine.
+
+    Each family gets two workers; torch intra-op threads are split between
+    them so concurrent forward passes do not oversubscribe the cores.
+
+    Args:
+        cpu_count: Cores to size for (defaults to os.cpu_count())
+
+    Returns:
+        Policy per family name
+    """
+    cpus = cpu_count or os.cpu_count() or 1
+    return {
+        TORCH_FAMILY: FamilyPolicy(
+            workers=2,
+            initializer=limit_torch_threads,
+            initargs=(max(1, cpus // 2),),
+        ),
+        XGBOOST_FAMILY: FamilyPolicy(workers=2),
+    }
+
+
+def policies_from_settings(settings: Any, cpu_count: Optional[int] = None) -> Dict[str, FamilyPolicy]:
+    """
+    Policies for the torch and xgboost families from InferenceSettings.
+
+    Args:
+        settings: InferenceSettings (settings.ml.inference)
+        cpu_count: Cores to size for (defaults to os.cpu_count())
+
+    Returns:
+        Policy per family name
+    """
+    cpus = cpu_count or os.cpu_count() or 1
+    torch_workers = max(1, settings.torch_workers)
+    torch_threads = settings.torch_threads or max(1, cpus // torch_workers)
+    return {
+        TORCH_FAMILY: FamilyPolicy(
+            workers=torch_workers,
+            queue_size=settings.queue_size,
+            timeout_seconds=settings.timeout_seconds,
+            initializer=limit_torch_threads,
+            initargs=(torch_threads,),
+        ),
+        XGBOOST_FAMILY: FamilyPolicy(
+            workers=max(1, settings.xgboost_workers),
+            queue_size=settings.queue_size,
+            timeout_seconds=settings.timeout_seconds,
+        ),
+    }
+
+
+class _FamilyPool:
+    """Executor, concurrency semaphore and counters for one family."""
+
+    def __init__(self, name: str, policy: FamilyPolicy):
+        self.name = name
+        self.policy = policy
+        self.limit = max(1, policy.max_concurrency or policy.workers)
+        self.executor: Optional[Executor] = None
+        self.semaphore: Optional[asyncio.Semaphore] = None
+        self.loop: Optional[asyncio.AbstractEventLoop] = None
+        self.pending = 0
+        self.counters = {"submitted": 0, "completed": 0, "failed": 0, "rejected": 0, "timed_out": 0}
+
+    def get_executor(self) -> Executor:
+        """Create the worker pool on first use."""
+        if self.executor is None:
+            pool_cls = ProcessPoolExecutor if self.policy.use_processes else ThreadPoolExecutor
+            kwargs: Dict[str, Any] = {
+                "max_workers": self.policy.workers,
+                "initializer": self.policy.initializer,
+                "initargs": self.policy.initargs,
+            }
+            if not self.policy.use_processes:
+                kwargs["thread_name_prefix"] = f"inference-{self.name}"
+            self.executor = pool_cls(**kwargs)
+        return self.executor
+
+    def get_semaphore(self) -> asyncio.Semaphore:
+        """Return the concurrency semaphore for the running loop."""
+        loop = asyncio.get_running_loop()
+        if self.semaphore is None or self.loop is not loop:
+            self.semaphore = asyncio.Semaphore(self.limit)
+            self.loop = loop
+        return self.semaphore
+
+
+class InferenceExecutor:
+    """
+    Runs blocking model calls on per-family worker pools.
+
+    Calls for a family beyond max_concurrency wait in its admission queue;
+    calls beyond that raise InferenceQueueFullError. A call that has not
+    finished within its timeout raises InferenceTimeoutError; the worker
+    finishes the call in the background and its slot is only freed then, so
+    timed-out work still counts against the concurrency limit.
+    """
+
+    def __init__(
+        self,
+        policies: Optional[Dict[str, FamilyPolicy]] = None,
+        default_policy: Optional[FamilyPolicy] = None,
+    ):
+        """
+        Initialize the executor.
+
+        Args:
+            policies: Policy per family name (defaults to default_policies())
+            default_policy: Policy for families without one
+        """
+        self.policies = dict(policies if policies is not None else default_policies())
+        self.default_policy = default_policy or FamilyPolicy()
+        self._pools: Dict[str, _FamilyPool] = {}
+        self._lock = threading.Lock()
+
+    def _pool(self, family: str) -> _FamilyPool:
+        with self._lock:
+            pool = self._pools.get(family)
+            if pool is None:
+                pool = _FamilyPool(family, self.policies.get(family, self.default_policy))
+                self._pools[family] = pool
+            return pool
+
+    async def run(
+        self,
+        family: str,
+        fn: Callable[..., Any],
+        *args: Any,
+        timeout: Optional[float] = None,
+        **kwargs: Any,
+    ) -> Any:
+        """
+        Run fn(*args, **kwargs) on the family's pool and await its result.
+
+        Args:
+            family: Model family whose pool runs the call
+            fn: Blocking callable (picklable for process pools)
+            *args: Positional arguments for fn
+            timeout: Seconds to wait, including queueing (defaults to the
+                family policy; None waits indefinitely)
+            **kwargs: Keyword arguments for fn
+
+        Returns:
+            The value returned by fn
+
+        Raises:
+            InferenceQueueFullError: If the family's queue is full
+            InferenceTimeoutError: If the call does not finish in time
+        """
+        pool = self._pool(family)
+        if pool.pending >= pool.limit + pool.policy.queue_size:
+            pool.counters["rejected"] += 1
+            raise InferenceQueueFullError(family, pool.policy.queue_size)
+
+        timeout = pool.policy.timeout_seconds if timeout is None else timeout
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout if timeout is not None else None
+        semaphore = pool.get_semaphore()
+        pool.pending += 1
+        pool.counters["submitted"] += 1
+        try:
+            await asyncio.wait_for(semaphore.acquire(), timeout)
+            try:
+                future = loop.run_in_executor(pool.get_executor(), functools.partial(fn, *args, **kwargs))
+            except BaseException:
+                semaphore.release()
+                raise
+            # The slot is held until the worker is actually done, even after a timeout
+            future.add_done_callback(lambda _: semaphore.release())
+            remaining = None if deadline is None else max(0.0, deadline - loop.time())
+            result = await asyncio.wait_for(asyncio.shield(future), remaining)
+        except asyncio.TimeoutError:
+            pool.counters["timed_out"] += 1
+            raise InferenceTimeoutError(family, timeout)
+        except Exception:
+            pool.counters["failed"] += 1
+            raise
+        finally:
+            pool.pending -= 1
+        pool.counters["completed"] += 1
+        return result
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Return per-family queue depth and counters.
+
+        Returns:
+            Mapping of family name to its pending calls, limits and counters
+        """
+        with self._lock:
+            pools = list(self._pools.values())
+        return {
+            pool.name: {
+                "pending": pool.pending,
+                "max_concurrency": pool.limit,
+                "queue_size": pool.policy.queue_size,
+                **pool.counters,
+            }
+            for pool in pools
+        }
+
+    def shutdown(self, wait: bool = True) -> None:
+        """
+        Shut down every worker pool.
+
+        Args:
+            wait: Whether to wait for running calls to finish
+        """
+        with self._lock:
+            pools = list(self._pools.values())
+            self._pools.clear()
+        for pool in pools:
+            if pool.executor is not None:
+                pool.executor.shutdown(wait=wait)
+
+
+_default_executor: Optional[InferenceExecutor] = None
+_default_executor_lock = threading.Lock()
+
+
+def get_inference_executor() -> InferenceExecutor:
+    """
+    Return the process-wide executor configured from settings.ml.inference.
+
+    Returns:
+        Shared InferenceExecutor
+    """
+    global _default_executor
+    with _default_executor_lock:
+        if _default_executor is None:
+            _default_executor = InferenceExecutor(policies_from_settings(get_settings().ml.inference))
+        return _default_executor
@@ -0,0 +1,521 @@
+# -*- coding: utf-8 -*-
+"""
+Generation worker for locally hosted MentaLLaMA models.
+
+Local generation used to run model.generate and the tokenizer directly inside
+an async method, freezing the event loop for the whole generation. The
+GenerationWorker moves all model and tokenizer work onto one dedicated thread
+and serves concurrent prompts with continuous batching: every iteration of
+the worker decodes one token for each active sequence in a single batched
+step, and waiting prompts join (and finished or cancelled ones leave) between
+iterations instead of waiting for the whole batch to drain.
+
+Callers get a GenerationStream, an async iterator over decoded text chunks.
+Closing the stream, or cancelling the task reading it (for example when a
+streaming client disconnects), drops the sequence at the worker's next step.
+Up to max_batch_size sequences are decoded together and up to queue_size
+more may wait; further prompts are rejected with InferenceQueueFullError.
+"""
+
+import asyncio
+import itertools
+import logging
+import queue
+import threading
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Hashable, List, Optional, Sequence, Tuple
+
+from app.core.exceptions.ml_exceptions import InferenceQueueFullError
+
+logger = logging.getLogger(__name__)
+
+GENERATION_FAMILY = "mentallama"
+
+
+@dataclass
+class SamplingParams:
+    """Per-sequence decoding settings."""
+
+    max_new_tokens: int = 1024
+    temperature: float = 0.7
+    top_p: float = 0.95
+    repetition_penalty: float = 1.0
+    stop_sequences: Tuple[str, ...] = ()
+
+
+@dataclass
+class GenerationResult:
+    """Completed generation."""
+
+    text: str
+    prompt_tokens: int
+    completion_tokens: int
+    finish_reason: str
+
+
+# step_fn(keys, token_ids, params) -> next token id per sequence. keys identify
+# the sequences so a stateful step function can reuse work between steps.
+StepFn = Callable[[List[Hashable], List[List[int]], List[SamplingParams]], List[int]]
+
+
+@dataclass
+class _Finished:
+    """Final event of a sequence."""
+
+    error: Optional[BaseException] = None
+
+
+class _Sequence:
+    """One prompt being generated; mutated only by the worker thread."""
+
+    def __init__(self, key: int, prompt: str, params: SamplingParams, loop: asyncio.AbstractEventLoop):
+        self.key = key
+        self.prompt = prompt
+        self.params = params
+        self.loop = loop
+        self.events: asyncio.Queue = asyncio.Queue()
+        self.prompt_ids: List[int] = []
+        self.generated: List[int] = []
+        self.emitted = 0
+        self.finish_reason: Optional[str] = None
+        self.cancelled = False
+
+
+class GenerationStream:
+    """
+    Async iterator over the text chunks of one generation.
+
+    Token counts and the finish reason ("stop", "length" or "cancelled") are
+    available once the iterator is exhausted.
+    """
+
+    def __init__(self, sequence: _Sequence):
+        self._sequence = sequence
+        self._closed = False
+
+    @property
+    def prompt_tokens(self) -> int:
+        return len(self._sequence.prompt_ids)
+
+    @property
+    def completion_tokens(self) -> int:
+        return len(self._sequence.generated)
+
+    @property
+    def finish_reason(self) -> Optional[str]:
+        return self._sequence.finish_reason
+
+    def __aiter__(self) -> "GenerationStream":
+        return self
+
+    async def __anext__(self) -> str:
+        if self._closed:
+            raise StopAsyncIteration
+        try:
+            event = await self._sequence.events.get()
+        except asyncio.CancelledError:
+            self._close()
+            raise
+        if isinstance(event, _Finished):
+            self._closed = True
+            if event.error is not None:
+                raise event.error
+            raise StopAsyncIteration
+        return event
+
+    async def aclose(self) -> None:
+        """Stop reading; the worker drops the sequence at its next step."""
+        self._close()
+
+    async def __aenter__(self) -> "GenerationStream":
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        self._close()
+
+    def _close(self) -> None:
+        if not self._closed:
+            self._closed = True
+            self._sequence.cancelled = True
+
+
+class GenerationWorker:
+    """
+    Dedicated generation thread with continuous batching.
+
+    The tokenizer must provide encode(text) and decode(ids,
+    skip_special_tokens=True); step_fn produces the next token of every
+    active sequence (see CausalLMStepper for transformers models).
+    """
+
+    def __init__(
+        self,
+        step_fn: StepFn,
+        tokenizer: Any,
+        eos_token_ids: Sequence[int] = (),
+        max_batch_size: int = 8,
+        queue_size: int = 32,
+    ):
+        """
+        Initialize the worker; its thread starts on the first submission.
+
+        Args:
+            step_fn: Batched next-token function
+            tokenizer: Tokenizer used to encode prompts and decode output
+            eos_token_ids: Tokens that end a sequence
+            max_batch_size: Sequences decoded together (the concurrency limit)
+            queue_size: Prompts that may wait for a batch slot
+        """
+        self.step_fn = step_fn
+        self.tokenizer = tokenizer
+        self.eos_token_ids = frozenset(eos_token_ids)
+        self.max_batch_size = max(1, max_batch_size)
+        self.queue_size = max(0, queue_size)
+        self._requests: "queue.Queue[Optional[_Sequence]]" = queue.Queue()
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        self._pending = 0
+        self._closed = False
+        self._counters = {"submitted": 0, "completed": 0, "cancelled": 0, "failed": 0, "rejected": 0, "steps": 0}
+        self._batch_tokens = 0
+        self._keys = itertools.count()
+
+    def stream(self, prompt: str, params: Optional[SamplingParams] = None) -> GenerationStream:
+        """
+        Queue a prompt and return the stream of its generated text.
+
+        Must be called from the event loop that will read the stream.
+
+        Args:
+            prompt: Prompt text
+            params: Sampling parameters
+
+        Returns:
+            Stream of decoded text chunks
+
+        Raises:
+            InferenceQueueFullError: If max_batch_size + queue_size prompts
+                are already in flight
+        """
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("Generation worker is shut down")
+            if self._pending >= self.max_batch_size + self.queue_size:
+                self._counters["rejected"] += 1
+                raise InferenceQueueFullError(GENERATION_FAMILY, self.queue_size)
+            self._pending += 1
+            self._counters["submitted"] += 1
+            if self._thread is None:
+                self._thread = self._start_thread()
+        sequence = _Sequence(next(self._keys), prompt, params or SamplingParams(), loop)
+        self._requests.put(sequence)
+        return GenerationStream(sequence)
+
+    async def generate(self, prompt: str, params: Optional[SamplingParams] = None) -> GenerationResult:
+        """
+        Generate the full completion of a prompt.
+
+        Args:
+            prompt: Prompt text
+            params: Sampling parameters
+
+        Returns:
+            Generated text with token counts
+        """
+        stream = self.stream(prompt, params)
+        async with stream:
+            chunks = [chunk async for chunk in stream]
+        return GenerationResult(
+            text="".join(chunks),
+            prompt_tokens=stream.prompt_tokens,
+            completion_tokens=stream.completion_tokens,
+            finish_reason=stream.finish_reason or "stop",
+        )
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Return admission and batching counters.
+
+        Returns:
+            Counters plus prompts in flight and the mean sequences per step
+        """
+        with self._lock:
+            steps = self._counters["steps"]
+            return {
+                **self._counters,
+                "pending": self._pending,
+                "max_batch_size": self.max_batch_size,
+                "queue_size": self.queue_size,
+                "mean_batch_size": self._batch_tokens / steps if steps else 0.0,
+            }
+
+    def shutdown(self, wait: bool = True) -> None:
+        """
+        Stop the worker thread; sequences still in flight are cancelled.
+
+        Args:
+            wait: Whether to wait for the current step to finish
+        """
+        with self._lock:
+            self._closed = True
+            thread = self._thread
+        if thread is not None:
+            self._requests.put(None)
+            if wait:
+                thread.join()
+
+    # --- worker thread ---
+
+    def _run(self) -> None:
+        """Run the decode loop; if it dies, fail its sequences and hand the queue to a new thread."""
+        active: List[_Sequence] = []
+        try:
+            self._loop(active)
+        except Exception as e:
+            logger.error(f"Generation thread failed with {len(active)} active sequences: {e}", exc_info=True)
+            for sequence in active:
+                if sequence.finish_reason is None:
+                    self._finish(sequence, "failed", e)
+            with self._lock:
+                if not self._closed:
+                    self._thread = self._start_thread()
+                    return
+            self._drain([])
+
+    def _start_thread(self) -> threading.Thread:
+        """Start a generation thread running _run."""
+        thread = threading.Thread(target=self._run, name="mentallama-generation", daemon=True)
+        thread.start()
+        return thread
+
+    def _loop(self, active: List[_Sequence]) -> None:
+        """Admit waiting prompts, decode one token per active sequence, repeat."""
+        while True:
+            try:
+                while len(active) < self.max_batch_size:
+                    # Block only when idle; otherwise take whatever has already arrived
+                    sequence = self._requests.get(block=not active)
+                    if sequence is None:
+                        self._drain(active)
+                        return
+                    if self._admit(sequence):
+                        active.append(sequence)
+            except queue.Empty:
+                pass
+
+            active[:] = [s for s in active if not self._dropped(s)]
+            if not active:
+                continue
+            try:
+                next_ids = self.step_fn(
+                    [s.key for s in active],
+                    [s.prompt_ids + s.generated for s in active],
+                    [s.params for s in active],
+                )
+                if len(next_ids) != len(active):
+                    raise ValueError(f"Step returned {len(next_ids)} tokens for {len(active)} sequences")
+            except Exception as e:
+                logger.error(f"Generation step failed for {len(active)} sequences: {e}")
+                for sequence in active:
+                    self._finish(sequence, "failed", e)
+                active.clear()
+                continue
+            with self._lock:
+                self._counters["steps"] += 1
+                self._batch_tokens += len(active)
+            active[:] = [s for s, token_id in zip(active, next_ids) if self._advance_or_fail(s, token_id)]
+            if not active and hasattr(self.step_fn, "reset"):
+                # Idle: let a stateful step function free its cached state
+                try:
+                    self.step_fn.reset()
+                except Exception as e:
+                    logger.warning(f"Generation step reset failed: {e}")
+
+    def _admit(self, sequence: _Sequence) -> bool:
+        """Tokenize a new prompt; False if it was cancelled or cannot run."""
+        if self._dropped(sequence):
+            return False
+        try:
+            sequence.prompt_ids = list(self.tokenizer.encode(sequence.prompt))
+        except Exception as e:
+            self._finish(sequence, "failed", e)
+            return False
+        if not sequence.prompt_ids:
+            self._finish(sequence, "failed", ValueError("Prompt encodes to no tokens"))
+            return False
+        if sequence.params.max_new_tokens <= 0:
+            self._finish(sequence, "length")
+            return False
+        return True
+
+    def _advance(self, sequence: _Sequence, token_id: int) -> bool:
+        """Append a token, stream the new text; False once the sequence is done."""
+        finish_reason = None
+        if token_id in self.eos_token_ids:
+            finish_reason = "stop"
+        else:
+            sequence.generated.append(token_id)
+        text = self.tokenizer.decode(sequence.generated, skip_special_tokens=True)
+
+        stops = sequence.params.stop_sequences or ()
+        cut = min((i for i in (text.find(s) for s in stops if s) if i >= 0), default=-1)
+        if cut >= 0:
+            text, finish_reason = text[:cut], "stop"
+        elif finish_reason is None and len(sequence.generated) >= sequence.params.max_new_tokens:
+            finish_reason = "length"
+
+        ready = len(text)
+        if finish_reason is None:
+            # Hold back what could be the start of a stop sequence or a partial character
+            ready -= max((len(s) - 1 for s in stops), default=0)
+            if text.endswith("\ufffd"):
+                ready = min(ready, len(text.rstrip("\ufffd")))
+        if ready > sequence.emitted:
+            self._send(sequence, text[sequence.emitted:ready])
+            sequence.emitted = ready
+
+        if finish_reason is not None:
+            self._finish(sequence, finish_reason)
+            return False
+        return True
+
+    def _advance_or_fail(self, sequence: _Sequence, token_id: Any) -> bool:
+        """_advance, finishing only this sequence as failed if decoding it raises."""
+        try:
+            return self._advance(sequence, int(token_id))
+        except Exception as e:
+            logger.error(f"Generation failed for one sequence: {e}")
+            if sequence.finish_reason is None:
+                self._finish(sequence, "failed", e)
+            return False
+
+    def _dropped(self, sequence: _Sequence) -> bool:
+        """Finish a cancelled sequence; True if it was cancelled."""
+        if sequence.cancelled and sequence.finish_reason is None:
+            self._finish(sequence, "cancelled")
+        return sequence.finish_reason is not None
+
+    def _finish(self, sequence: _Sequence, reason: str, error: Optional[BaseException] = None) -> None:
+        """Release the sequence's slot and end its stream."""
+        sequence.finish_reason = reason
+        with self._lock:
+            self._pending -= 1
+            self._counters["completed" if reason in ("stop", "length") else reason] += 1
+        self._send(sequence, _Finished(error))
+
+    def _send(self, sequence: _Sequence, event: Any) -> None:
+        """Hand an event to the stream's event loop."""
+        try:
+            sequence.loop.call_soon_threadsafe(sequence.events.put_nowait, event)
+        except RuntimeError:
+            # The caller's loop is closed; nobody is listening any more
+            sequence.cancelled = True
+
+    def _drain(self, active: List[_Sequence]) -> None:
+        """Cancel everything in flight at shutdown."""
+        while True:
+            try:
+                sequence = self._requests.get_nowait()
+            except queue.Empty:
+                break
+            if sequence is not None:
+                active.append(sequence)
+        for sequence in active:
+            if sequence.finish_reason is None:
+                self._finish(sequence, "cancelled")
+
+
+class CausalLMStepper:
+    """
+    Batched next-token step for transformers causal language models.
+
+    Sequences are left-padded into one batch. While the batch keeps the same
+    members, each step feeds only the newest token with the previous step's
+    key/value cache; when a sequence joins or leaves, the batch is prefilled
+    again from the full token ids. This costs one batched prefill per change
+    in membership, and uses only the standard forward arguments, so it works
+    with any model that accepts attention_mask and position_ids.
+    """
+
+    def __init__(self, model: Any, pad_token_id: int = 0, seed: Optional[int] = None):
+        """
+        Initialize the stepper.
+
+        Args:
+            model: transformers causal LM (already on its device, in eval mode)
+            pad_token_id: Token used for left padding
+            seed: Seed for sampling (None draws from torch's global generator)
+        """
+        import torch
+
+        self.torch = torch
+        self.model = model
+        self.pad_token_id = pad_token_id
+        self.device = getattr(model, "device", None) or torch.device("cpu")
+        self.generator = torch.Generator(device=self.device).manual_seed(seed) if seed is not None else None
+        self.reset()
+
+    def reset(self) -> None:
+        """Drop the cached batch state."""
+        self._keys: List[Hashable] = []
+        self._lengths: List[int] = []
+        self._past: Any = None
+        self._attention_mask: Any = None
+
+    def __call__(self, keys: List[Hashable], token_ids: List[List[int]], params: List[SamplingParams]) -> List[int]:
+        torch = self.torch
+        incremental = (
+            self._past is not None
+            and keys == self._keys
+            and all(len(ids) == n + 1 for ids, n in zip(token_ids, self._lengths))
+        )
+        if incremental:
+            input_ids = torch.tensor([[ids[-1]] for ids in token_ids], device=self.device)
+            ones = torch.ones((len(keys), 1), dtype=self._attention_mask.dtype, device=self.device)
+            attention_mask = torch.cat([self._attention_mask, ones], dim=1)
+            position_ids = attention_mask.sum(dim=1, keepdim=True) - 1
+        else:
+            width = max(len(ids) for ids in token_ids)
+            input_ids = torch.full((len(keys), width), self.pad_token_id, dtype=torch.long, device=self.device)
+            attention_mask = torch.zeros((len(keys), width), dtype=torch.long, device=self.device)
+            for row, ids in enumerate(token_ids):
+                input_ids[row, width - len(ids):] = torch.tensor(ids, device=self.device)
+                attention_mask[row, width - len(ids):] = 1
+            position_ids = (attention_mask.cumsum(dim=1) - 1).clamp(min=0)
+
+        with torch.no_grad():
+            output = self.model(
+                input_ids=input_ids,
+                attention_mask=attention_mask,
+                position_ids=position_ids,
+                past_key_values=self._past if incremental else None,
+                use_cache=True,
+            )
+        self._keys = list(keys)
+        self._lengths = [len(ids) for ids in token_ids]
+        self._past = output.past_key_values
+        self._attention_mask = attention_mask
+
+        logits = output.logits[:, -1, :].float()
+        return [self._sample(logits[row], token_ids[row], p) for row, p in enumerate(params)]
+
+    def _sample(self, logits: Any, token_ids: List[int], params: SamplingParams) -> int:
+        """Pick the next token with repetition penalty, temperature and top-p."""
+        torch = self.torch
+        if params.repetition_penalty != 1.0:
+            seen = torch.tensor(sorted(set(token_ids)), device=logits.device)
+            scores = logits[seen]
+            logits[seen] = torch.where(
+                scores > 0, scores / params.repetition_penalty, scores * params.repetition_penalty
+            )
+        if params.temperature <= 0:
+            return int(torch.argmax(logits))
+        probs = torch.softmax(logits / params.temperature, dim=-1)
+        if 0.0 < params.top_p < 1.0:
+            sorted_probs, order = torch.sort(probs, descending=True)
+            # Keep the smallest prefix whose mass reaches top_p (always at least one token)
+            outside = sorted_probs.cumsum(dim=-1) - sorted_probs >= params.top_p
+            sorted_probs[outside] = 0.0
+            probs = torch.zeros_like(probs).scatter_(0, order, sorted_probs)
+        return int(torch.multinomial(probs, 1, generator=self.generator))
@@ -12,7 +12,7 @@ import logging
 import os
 import time
 from dataclasses import dataclass
-from typing import Any, Dict, List, Optional, Union
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple, Union
 
 import aiohttp
 import httpx
@@ -21,11 +21,31 @@ import numpy as np
 # Use canonical config path
 from app.config.settings import get_settings
 settings = get_settings()
-from app.core.exceptions.ml_exceptions import MentalLLaMAInferenceError, ModelLoadingError
-from app.core.logging.phi_logger import get_phi_safe_logger
+from app.core.exceptions.ml_exceptions import (
+    InferenceQueueFullError,
+    InferenceTimeoutError,
+    MentalLLaMAInferenceError,
+    ModelLoadingError,
+)
+from app.core.utils.logging import get_logger
+from app.infrastructure.ml.mentallama.generation_worker import (
+    GENERATION_FAMILY,
+    CausalLMStepper,
+    GenerationWorker,
+    SamplingParams,
+)
 
 # Configure PHI-safe logger
-logger = get_phi_safe_logger(__name__)
+logger = get_logger(__name__)
+
+# Inappropriate content patterns checked by the safety filter
+SAFETY_PATTERNS = (
+    "harm yourself",
+    "commit suicide",
+    "harm others",
+    "illegal drugs",
+    "illegal activities",
+)
 
 
 @dataclass
@@ -76,6 +96,7 @@ class MentaLLaMAModelLoader:
         self.client = None
         self.model = None
         self.tokenizer = None
+        self.generation_worker: Optional[GenerationWorker] = None
         
         logger.info(f"MentaLLaMA Model Loader initialized with mode: {inference_mode}")
     
@@ -125,6 +146,21 @@ class MentaLLaMAModelLoader:
                 trust_remote_code=True,
                 low_cpu_mem_usage=True
             )
+            self.model.eval()
+            
+            # All tokenizer and model calls run on the worker's own thread
+            eos_token_id = self.tokenizer.eos_token_id
+            pad_token_id = self.tokenizer.pad_token_id
+            if pad_token_id is None:
+                pad_token_id = eos_token_id if eos_token_id is not None else 0
+            inference_settings = settings.ml.inference
+            self.generation_worker = GenerationWorker(
+                CausalLMStepper(self.model, pad_token_id=pad_token_id),
+                self.tokenizer,
+                eos_token_ids=[eos_token_id] if eos_token_id is not None else [],
+                max_batch_size=inference_settings.generation_max_batch_size,
+                queue_size=inference_settings.generation_queue_size,
+            )
             
             logger.info(f"MentaLLaMA model loaded locally on {device}")
             
@@ -216,6 +252,9 @@ class MentaLLaMAModelLoader:
         """
         Generate text using local model.
         
+        Generation runs on the generation worker's thread, batched with any
+        other local generations in flight, so the event loop stays responsive.
+        
         Args:
             prompt: Input prompt for generation
             params: Generation parameters
@@ -226,54 +265,29 @@ class MentaLLaMAModelLoader:
             
         Raises:
             MentalLLaMAInferenceError: If text generation fails
+            InferenceQueueFullError: If too many generations are in flight
+            InferenceTimeoutError: If generation does not finish in time
         """
         try:
-            import torch
-            
             # Ensure model and tokenizer are loaded
-            if self.model is None or self.tokenizer is None:
+            if self.generation_worker is None:
                 await self._load_local_model()
             
-            # Prepare the prompts - add system prompt if available
-            if params.system_prompt:
-                full_prompt = f"<s>[INST] <<SYS>>\n{params.system_prompt}\n<</SYS>>\n\n{prompt} [/INST]"
-            else:
-                full_prompt = f"<s>[INST] {prompt} [/INST]"
-            
-            # Tokenize the prompt
-            inputs = self.tokenizer(full_prompt, return_tensors="pt")
-            input_ids = inputs["input_ids"].to(self.model.device)
-            
-            # Set up generation parameters
-            gen_config = {
-                "max_new_tokens": params.max_tokens,
-                "temperature": params.temperature,
-                "top_p": params.top_p,
-                "repetition_penalty": 1.0 + params.frequency_penalty,
-                "do_sample": params.temperature > 0,
-            }
-            
-            # Add stop sequences if provided
-            if params.stop_sequences:
-                gen_config["stop_sequences"] = params.stop_sequences
-            
-            # Generate
             generation_start = time.time()
-            
-            with torch.no_grad():
-                output = self.model.generate(
-                    input_ids,
-                    **gen_config
+            try:
+                result = await asyncio.wait_for(
+                    self.generation_worker.generate(
+                        self._format_prompt(prompt, params),
+                        self._sampling_params(params)
+                    ),
+                    self.timeout
                 )
-            
-            # Decode the generated output
-            generated_text = self.tokenizer.decode(
-                output[0][len(input_ids[0]):], 
-                skip_special_tokens=True
-            )
-            
+            except asyncio.TimeoutError:
+                raise InferenceTimeoutError(GENERATION_FAMILY, self.timeout)
             generation_time = time.time() - generation_start
             
+            generated_text = result.text
+            
             # Apply safety filter if requested
             filtered_text = generated_text
             safety_triggered = False
@@ -285,17 +299,112 @@ class MentaLLaMAModelLoader:
                 "text": filtered_text,
                 "model": self.model_name,
                 "generation_time": generation_time,
-                "prompt_tokens": len(inputs["input_ids"][0]),
-                "completion_tokens": len(output[0]) - len(inputs["input_ids"][0]),
+                "prompt_tokens": result.prompt_tokens,
+                "completion_tokens": result.completion_tokens,
+                "finish_reason": result.finish_reason,
                 "safety_triggered": safety_triggered,
                 "original_text": generated_text if safety_triggered else None
             }
             
+        except (InferenceQueueFullError, InferenceTimeoutError):
+            raise
         except Exception as e:
             error_msg = f"Error during local text generation: {str(e)}"
             logger.error(error_msg)
             raise MentalLLaMAInferenceError(error_msg)
     
+    async def stream_text(
+        self,
+        prompt: str,
+        params: Optional[GenerationParameters] = None,
+        safety_filter: bool = True
+    ) -> AsyncIterator[str]:
+        """
+        Stream generated text as it is produced.
+        
+        Only local inference streams token by token; the API and SageMaker
+        modes yield their complete response as a single chunk. Stopping
+        iteration early (or cancelling the consuming task, as happens when a
+        streaming client disconnects) cancels the local generation.
+        
+        With safety filtering, text is held back until it cannot be the start
+        of a filtered pattern; when a pattern appears, generation stops and
+        the safe replacement message is yielded instead.
+        
+        Args:
+            prompt: Input prompt for generation
+            params: Generation parameters
+            safety_filter: Whether to apply safety filtering
+            
+        Yields:
+            Chunks of generated text
+            
+        Raises:
+            MentalLLaMAInferenceError: If text generation fails
+            InferenceQueueFullError: If too many generations are in flight
+        """
+        if not prompt:
+            raise MentalLLaMAInferenceError("Empty prompt provided for generation")
+        params = params or GenerationParameters()
+        
+        if self.inference_mode != "local":
+            result = await self.generate_text(prompt, params, safety_filter)
+            yield result["text"]
+            return
+        
+        try:
+            if self.generation_worker is None:
+                await self._load_local_model()
+            stream = self.generation_worker.stream(
+                self._format_prompt(prompt, params),
+                self._sampling_params(params)
+            )
+        except InferenceQueueFullError:
+            raise
+        except Exception as e:
+            error_msg = f"Error starting local text generation: {str(e)}"
+            logger.error(error_msg)
+            raise MentalLLaMAInferenceError(error_msg)
+        
+        holdback = max(len(p) for p in SAFETY_PATTERNS) - 1 if safety_filter else 0
+        text = ""
+        emitted = 0
+        async with stream:
+            try:
+                async for chunk in stream:
+                    text += chunk
+                    if safety_filter:
+                        filtered_text, safety_triggered = self._apply_safety_filter(text)
+                        if safety_triggered:
+                            yield filtered_text
+                            return
+                    ready = len(text) - holdback
+                    if ready > emitted:
+                        yield text[emitted:ready]
+                        emitted = ready
+            except Exception as e:
+                error_msg = f"Error during local text streaming: {str(e)}"
+                logger.error(error_msg)
+                raise MentalLLaMAInferenceError(error_msg)
+        if len(text) > emitted:
+            yield text[emitted:]
+    
+    def _format_prompt(self, prompt: str, params: GenerationParameters) -> str:
+        """Wrap a prompt in the Llama-2 chat template, with the system prompt if any."""
+        if params.system_prompt:
+            return f"<s>[INST] <<SYS>>\n{params.system_prompt}\n<</SYS>>\n\n{prompt} [/INST]"
+        return f"<s>[INST] {prompt} [/INST]"
+    
+    def _sampling_params(self, params: GenerationParameters) -> SamplingParams:
+        """Map generation parameters onto the local worker's sampling settings."""
+        return SamplingParams(
+            max_new_tokens=params.max_tokens,
+            temperature=params.temperature,
+            top_p=params.top_p,
+            repetition_penalty=1.0 + params.frequency_penalty,
+            stop_sequences=tuple(params.stop_sequences or ()),
+        )
+    
     async def _generate_text_api(
         self,
         prompt: str,
@@ -482,17 +591,8 @@ class MentaLLaMAModelLoader:
         # This is a simple example - in a production system,
         # this would be a more sophisticated content filtering approach
         
-        # Define inappropriate content patterns
-        inappropriate_patterns = [
-            "harm yourself",
-            "commit suicide",
-            "harm others",
-            "illegal drugs",
-            "illegal activities"
-        ]
-        
-        # Check if any patterns are present
-        safety_triggered = any(pattern in text.lower() for pattern in inappropriate_patterns)
+        # Check if any inappropriate content patterns are present
+        safety_triggered = any(pattern in text.lower() for pattern in SAFETY_PATTERNS)
         
         if safety_triggered:
             # Replace with safe content
@@ -511,6 +611,11 @@ class MentaLLaMAModelLoader:
         if self.client and hasattr(self.client, "aclose"):
             await self.client.aclose()
         
+        # Stop the generation thread (waiting for its current step off the loop)
+        if self.generation_worker is not None:
+            worker, self.generation_worker = self.generation_worker, None
+            await asyncio.get_running_loop().run_in_executor(None, worker.shutdown)
+        
         # Clear model from memory if loaded locally
         if self.model is not None:
             self.model = None
@@ -0,0 +1,178 @@
+# -*- coding: utf-8 -*-
+"""
+Dynamic micro-batching for model inference.
+
+Forecast requests arrive one patient at a time, so each call pays the full
+per-call overhead of a forward pass or DMatrix construction. The MicroBatcher
+collects concurrent requests for up to max_wait_ms or max_batch_size items,
+groups them into buckets of compatible inputs (same horizon, similar sequence
+length), runs one batched call per bucket and hands each caller its own
+result.
+
+max_wait_ms and max_batch_size trade latency for throughput: a longer wait
+fills larger batches under load, while max_wait_ms=0 only merges requests
+submitted in the same event-loop iteration.
+"""
+
+import asyncio
+import logging
+from typing import Any, Awaitable, Callable, Dict, Hashable, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class _Bucket:
+    """Requests waiting to be batched together."""
+
+    def __init__(self):
+        self.items: List[Any] = []
+        self.futures: List[asyncio.Future] = []
+        self.timer: Optional[asyncio.TimerHandle] = None
+
+
+class MicroBatcher:
+    """
+    Coalesces concurrent submissions into batched calls.
+
+    process_batch receives the items of one bucket and must return one
+    result per item, in order. An exception from process_batch is raised to
+    every caller in that batch.
+    """
+
+    def __init__(
+        self,
+        process_batch: Callable[[Hashable, List[Any]], Awaitable[List[Any]]],
+        max_batch_size: int = 32,
+        max_wait_ms: float = 5.0,
+        bucket_key: Optional[Callable[[Any], Hashable]] = None,
+    ):
+        """
+        Initialize the batcher.
+
+        Args:
+            process_batch: Coroutine function taking (bucket key, items) and
+                returning the results in item order
+            max_batch_size: Items that trigger an immediate flush
+            max_wait_ms: Longest time the first item of a batch waits for more
+            bucket_key: Maps an item to the bucket it may be batched with
+                (defaults to a single bucket)
+        """
+        self.process_batch = process_batch
+        self.max_batch_size = max(1, max_batch_size)
+        self.max_wait_seconds = max(0.0, max_wait_ms) / 1000.0
+        self.bucket_key = bucket_key or (lambda item: None)
+        self._buckets: Dict[Hashable, _Bucket] = {}
+        self._tasks: set = set()
+        self._counters = {"submitted": 0, "batches": 0, "failed_batches": 0}
+        self._batch_sizes: List[int] = []
+
+    async def submit(self, item: Any) -> Any:
+        """
+        Queue an item for the next batch of its bucket and await its result.
+
+        Args:
+            item: Model input
+
+        Returns:
+            The result process_batch produced for this item
+        """
+        loop = asyncio.get_running_loop()
+        key = self.bucket_key(item)
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            bucket = self._buckets[key] = _Bucket()
+        future = loop.create_future()
+        bucket.items.append(item)
+        bucket.futures.append(future)
+        self._counters["submitted"] += 1
+
+        if len(bucket.items) >= self.max_batch_size:
+            self._flush(key)
+        elif bucket.timer is None:
+            bucket.timer = loop.call_later(self.max_wait_seconds, self._flush, key)
+        return await future
+
+    def _flush(self, key: Hashable) -> None:
+        """Start processing everything waiting in a bucket."""
+        bucket = self._buckets.pop(key, None)
+        if bucket is None:
+            return
+        if bucket.timer is not None:
+            bucket.timer.cancel()
+        task = asyncio.get_running_loop().create_task(self._run(key, bucket))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _run(self, key: Hashable, bucket: _Bucket) -> None:
+        """Process one batch and resolve its callers' futures."""
+        self._counters["batches"] += 1
+        self._batch_sizes.append(len(bucket.items))
+        try:
+            results = await self.process_batch(key, bucket.items)
+            if len(results) != len(bucket.items):
+                raise ValueError(f"Batch returned {len(results)} results for {len(bucket.items)} items")
+        except Exception as e:
+            self._counters["failed_batches"] += 1
+            logger.warning(f"Micro-batch of {len(bucket.items)} failed: {e}")
+            for future in bucket.futures:
+                if not future.done():
+                    future.set_exception(e)
+            return
+        for future, result in zip(bucket.futures, results):
+            if not future.done():
+                future.set_result(result)
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Return submission and batch counters.
+
+        Returns:
+            Counters plus the waiting item count and mean batch size
+        """
+        sizes = self._batch_sizes
+        return {
+            **self._counters,
+            "waiting": sum(len(b.items) for b in self._buckets.values()),
+            "mean_batch_size": sum(sizes) / len(sizes) if sizes else 0.0,
+        }
+
+
+def length_bucket(length: int, width: int) -> int:
+    """
+    Round a sequence length up to its bucket boundary.
+
+    Args:
+        length: Sequence length
+        width: Bucket width (<= 1 puts every length in its own bucket)
+
+    Returns:
+        The smallest multiple of width that is >= length
+    """
+    if width <= 1:
+        return length
+    return -(-length // width) * width
+
+
+def split_rows(batch: Dict[str, Any], offsets: List[Tuple[int, int]]) -> List[Dict[str, Any]]:
+    """
+    Scatter a batched prediction dict back into per-request dicts.
+
+    Arrays are sliced along their first (batch) axis; nested dicts are split
+    recursively and any other value is shared by every request.
+
+    Args:
+        batch: Prediction dict for the whole batch
+        offsets: (start, stop) rows of each request
+
+    Returns:
+        One prediction dict per request
+    """
+
+    def take(value: Any, start: int, stop: int) -> Any:
+        if isinstance(value, dict):
+            return {k: take(v, start, stop) for k, v in value.items()}
+        if hasattr(value, "shape") and getattr(value, "ndim", 0) > 0:
+            return value[start:stop]
+        return value
+
+    return [take(batch, start, stop) for start, stop in offsets]
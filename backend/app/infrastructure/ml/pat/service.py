@@ -6,7 +6,7 @@ actigraphy data from wearable devices using transformer-based models.
 """
 
 import asyncio
-import json
+import hashlib
 import logging
 import os
 import time
@@ -29,6 +29,8 @@ from app.core.exceptions import (
     ServiceUnavailableError
 )
 from app.core.utils.logging import get_logger
+from app.core.services.ml.pat.actigraphy_data import ActigraphyArray
+from app.infrastructure.cache.result_store import ResultStore, content_digest, create_result_store
 from app.config.settings import get_settings # Import main settings function
 
 
@@ -68,7 +70,9 @@ class PATService:
         model_size: PATModelSize = PATModelSize.MEDIUM,
         model_path: Optional[str] = None,
         cache_dir: Optional[str] = None,
-        use_gpu: bool = True
+        use_gpu: bool = True,
+        result_store: Optional[ResultStore] = None,
+        model_version: Optional[str] = None
     ):
         """
         Initialize the PAT service.
@@ -78,6 +82,10 @@ class PATService:
             model_path: Custom path to model weights (overrides settings)
             cache_dir: Directory for caching model outputs (overrides settings)
             use_gpu: Whether to use GPU acceleration (overrides settings)
+            result_store: Analysis result cache (defaults to the backend
+                configured in settings, rooted at cache_dir)
+            model_version: Version included in result cache keys (defaults to
+                settings, then to a fingerprint of the model files)
         """
         settings = get_settings() # Get settings object
         self.model_size = model_size
@@ -95,6 +103,17 @@ class PATService:
         # Create cache directory if it doesn't exist
         os.makedirs(self.cache_dir, exist_ok=True)
         
+        # Content-addressed analysis result cache shared by all workers using the same backend
+        pat_settings = settings.ml.pat
+        self.result_store = result_store or create_result_store(
+            getattr(pat_settings, "cache_backend", "file"),
+            self.cache_dir,
+            max_bytes=getattr(pat_settings, "cache_max_bytes", 512 * 1024 * 1024),
+            max_age_seconds=getattr(pat_settings, "cache_max_age_seconds", 7 * 24 * 3600),
+            redis_prefix=f"pat:result:{model_size.value}:",
+        )
+        self.model_version = model_version or getattr(pat_settings, "model_version", "") or None
+        
         # Configure TensorFlow to use GPU if available and requested
         if self.use_gpu:
             physical_devices = tf.config.list_physical_devices('GPU')
@@ -128,6 +147,8 @@ class PATService:
             # Load the model (implementation depends on how the model is saved)
             # For TensorFlow SavedModel format:
             self.model = tf.saved_model.load(self.model_path)
+            if self.model_version is None:
+                self.model_version = _model_fingerprint(self.model_path)
             
             self.initialized = True
             logger.info(f"PAT model successfully loaded")
@@ -137,7 +158,7 @@ class PATService:
     
     async def preprocess_actigraphy_data(
         self, 
-        raw_data: Union[List[Dict[str, Any]], np.ndarray],
+        raw_data: Union[List[Dict[str, Any]], np.ndarray, bytes, ActigraphyArray],
         sampling_rate: float = 30.0,  # Default: 30 Hz
         window_size: int = 86400,     # Default: 1 day in seconds
         normalize: bool = True
@@ -145,8 +166,15 @@ class PATService:
         """
         Preprocess raw actigraphy data for model input.
         
+        Readings are converted to columnar arrays in bulk (see
+        ``ActigraphyArray``) and resampled onto a uniform grid using their
+        timestamps.
+        
         Args:
-            raw_data: Raw actigraphy data from wearable device
+            raw_data: Raw actigraphy data from wearable device: a list of
+                reading dicts, a packed binary buffer of READING_DTYPE
+                records, a NumPy record or (n, 3) array, an Arrow table or
+                an ActigraphyArray
             sampling_rate: Sampling rate of the data in Hz
             window_size: Size of the analysis window in seconds
             normalize: Whether to normalize the data
@@ -155,42 +183,18 @@ class PATService:
             Preprocessed data ready for model input
         """
         try:
-            # Convert to numpy array if not already
-            if isinstance(raw_data, list):
-                # Assuming raw_data is a list of dictionaries with 'timestamp' and 'x', 'y', 'z' keys
-                timestamps = []
-                x_values = []
-                y_values = []
-                z_values = []
-                
-                for entry in raw_data:
-                    timestamps.append(datetime.fromisoformat(entry['timestamp']).timestamp())
-                    x_values.append(float(entry['x']))
-                    y_values.append(float(entry['y']))
-                    z_values.append(float(entry['z']))
-                
-                # Create a structured array
-                data = np.column_stack((x_values, y_values, z_values))
-            else:
-                # Assuming raw_data is already a numpy array
-                data = raw_data
+            readings = ActigraphyArray.from_any(raw_data)
             
             # Resample to ensure consistent sampling rate
-            # This is a simplified implementation; actual resampling would be more complex
-            target_length = int(window_size * sampling_rate)
-            if len(data) > target_length:
-                # Downsample
-                indices = np.linspace(0, len(data) - 1, target_length, dtype=int)
-                data = data[indices]
-            elif len(data) < target_length:
-                # Upsample (simple repetition, in practice would use interpolation)
-                ratio = target_length / len(data)
-                data = np.repeat(data, int(np.ceil(ratio)), axis=0)[:target_length]
+            data = readings.resample(sampling_rate, window_size)
             
             # Normalize if requested
             if normalize:
-                # Z-score normalization
-                data = (data - np.mean(data, axis=0)) / np.std(data, axis=0)
+                # Z-score normalization (constant axes are only centred)
+                std = np.std(data, axis=0)
+                std[std == 0] = 1.0
+                data -= np.mean(data, axis=0)
+                data /= std
             
             # Reshape for model input (batch_size=1, sequence_length, features)
             data = data.reshape(1, -1, data.shape[-1])
@@ -202,7 +206,7 @@ class PATService:
     
     async def analyze(
         self,
-        actigraphy_data: Union[List[Dict[str, Any]], np.ndarray],
+        actigraphy_data: Union[List[Dict[str, Any]], np.ndarray, bytes, ActigraphyArray],
         analysis_type: AnalysisType,
         patient_metadata: Optional[Dict[str, Any]] = None,
         cache_results: bool = True
@@ -222,27 +226,25 @@ class PATService:
         if not self.initialized:
             await self.initialize()
         
-        # Generate a cache key if caching is enabled
+        try:
+            # Columnar readings are hashed for the cache key and reused for preprocessing
+            readings = ActigraphyArray.from_any(actigraphy_data)
+        except Exception as e:
+            logger.error(f"Error during PAT analysis: {e}")
+            raise InferenceError(f"Failed to analyze actigraphy data: {e}")
+        
+        # Look up the content-addressed result cache
         cache_key = None
-        if cache_results:
-            # Create a deterministic cache key based on input data and analysis type
-            data_hash = hash(str(actigraphy_data))
-            cache_key = f"{analysis_type.value}_{data_hash}_{self.model_size.value}"
-            cache_file = os.path.join(self.cache_dir, f"{cache_key}.json")
-            
-            # Check if cached results exist
-            if os.path.exists(cache_file):
-                try:
-                    with open(cache_file, 'r') as f:
-                        cached_results = json.load(f)
-                    logger.info(f"Using cached results for {analysis_type.value}")
-                    return cached_results
-                except Exception as e:
-                    logger.warning(f"Failed to load cached results: {e}")
+        if cache_results and self.result_store is not None:
+            cache_key = self._result_cache_key(readings, analysis_type, patient_metadata)
+            cached_results = await self.result_store.get(cache_key)
+            if cached_results is not None:
+                logger.info(f"Using cached results for {analysis_type.value}")
+                return cached_results
         
         try:
             # Preprocess the data
-            processed_data = await self.preprocess_actigraphy_data(actigraphy_data)
+            processed_data = await self.preprocess_actigraphy_data(readings)
             
             # Run model inference
             start_time = time.time()
@@ -258,18 +260,42 @@ class PATService:
             results = await self._process_predictions(raw_predictions, analysis_type, patient_metadata)
             
             # Cache results if enabled
-            if cache_results and cache_key:
-                try:
-                    with open(os.path.join(self.cache_dir, f"{cache_key}.json"), 'w') as f:
-                        json.dump(results, f)
-                except Exception as e:
-                    logger.warning(f"Failed to cache results: {e}")
+            if cache_key:
+                await self.result_store.set(cache_key, results)
             
             return results
         except Exception as e:
             logger.error(f"Error during PAT analysis: {e}")
             raise InferenceError(f"Failed to analyze actigraphy data: {e}")
     
+    def _result_cache_key(
+        self,
+        readings: ActigraphyArray,
+        analysis_type: AnalysisType,
+        patient_metadata: Optional[Dict[str, Any]]
+    ) -> str:
+        """
+        Build the content-addressed cache key for an analysis.
+        
+        Args:
+            readings: Columnar input readings
+            analysis_type: Type of analysis
+            patient_metadata: Patient context passed to post-processing
+            
+        Returns:
+            BLAKE2b hex digest of the readings and everything that affects the result
+        """
+        arrays = [readings.values]
+        if readings.timestamps_ns is not None:
+            arrays.append(readings.timestamps_ns)
+        return content_digest(
+            arrays,
+            model_size=self.model_size.value,
+            analysis_type=analysis_type.value,
+            model_version=self.model_version,
+            patient_metadata=patient_metadata,
+        )
+    
     async def _process_predictions(
         self,
         predictions: Any,
@@ -574,5 +600,31 @@ class PATService:
             }[self.model_size.value],
             "supported_analysis_types": [t.value for t in AnalysisType],
             "gpu_enabled": self.use_gpu,
-            "cache_enabled": bool(self.cache_dir)
-        }
\ No newline at end of file
+            "model_version": self.model_version,
+            "cache_enabled": self.result_store is not None,
+            "cache_stats": self.result_store.stats() if self.result_store is not None else None
+        }
+
+
+def _model_fingerprint(model_path: str) -> str:
+    """
+    Derive a model version from the names, sizes and mtimes of the model files.
+    
+    Args:
+        model_path: Model file or SavedModel directory
+        
+    Returns:
+        Short hex fingerprint that changes whenever the weights are replaced
+    """
+    digest = hashlib.blake2b(digest_size=8)
+    paths = [model_path]
+    if os.path.isdir(model_path):
+        paths = sorted(
+            os.path.join(root, name)
+            for root, _, files in os.walk(model_path)
+            for name in files
+        )
+    for path in paths:
+        stat = os.stat(path)
+        digest.update(f"{os.path.relpath(path, model_path)}:{stat.st_size}:{stat.st_mtime_ns};".encode())
+    return f"fp-{digest.hexdigest()}"
\ No newline at end of file
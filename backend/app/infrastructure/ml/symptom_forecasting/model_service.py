@@ -20,6 +20,15 @@ import numpy as np
 
 # Removed import for exceptions as they are not available
 # from app.domain.exceptions import ModelInferenceError, ValidationError
+from app.config.settings import get_settings
+from app.core.exceptions.ml_exceptions import InferenceQueueFullError, InferenceTimeoutError
+from app.infrastructure.ml.inference_executor import (
+    TORCH_FAMILY,
+    XGBOOST_FAMILY,
+    InferenceExecutor,
+    get_inference_executor,
+)
+from app.infrastructure.ml.micro_batcher import MicroBatcher, length_bucket
 from app.infrastructure.ml.symptom_forecasting.transformer_model import (
     SymptomTransformerModel,
 )
@@ -42,6 +51,7 @@ class SymptomForecastingService:
         xgboost_model_path: Optional[str] = None,
         feature_names: Optional[List[str]] = None,
         target_names: Optional[List[str]] = None,
+        executor: Optional[InferenceExecutor] = None,
     ):
         """
         Initialize the symptom forecasting service.
@@ -52,6 +62,8 @@ class SymptomForecastingService:
             xgboost_model_path: Path to pretrained XGBoost model
             feature_names: Names of input features
             target_names: Names of target variables
+            executor: Worker pools for model calls (defaults to the shared
+                executor configured from settings.ml.inference)
         """
         self.model_dir = model_dir
         self.feature_names = feature_names
@@ -72,6 +84,26 @@ class SymptomForecastingService:
             feature_names=feature_names,
             target_names=target_names,
         )
+        self.xgboost_model.set_nthread(get_settings().ml.inference.xgboost_nthread or None)
+
+        # Model calls are blocking; run them on per-family worker pools
+        self.executor = executor or get_inference_executor()
+
+        # Concurrent requests are coalesced into batched model calls
+        inference_settings = get_settings().ml.inference
+        bucket_width = inference_settings.batch_length_bucket
+        self.transformer_batcher = MicroBatcher(
+            self._run_transformer_batch,
+            max_batch_size=inference_settings.batch_max_size,
+            max_wait_ms=inference_settings.batch_max_wait_ms,
+            bucket_key=lambda item: (item[1], length_bucket(item[0].shape[-2], bucket_width)),
+        )
+        self.xgboost_batcher = MicroBatcher(
+            self._run_xgboost_batch,
+            max_batch_size=inference_settings.batch_max_size,
+            max_wait_ms=inference_settings.batch_max_wait_ms,
+            bucket_key=lambda item: (item[1], item[0].shape[1:]),
+        )
 
         # Model weights for ensemble
         self.model_weights = {"transformer": 0.7, "xgboost": 0.3}
@@ -130,6 +162,28 @@ class SymptomForecastingService:
             logging.error(f"Error preprocessing patient data: {str(e)}")
             raise Exception(f"Failed to preprocess patient data: {str(e)}")
 
+    async def _predict_transformer(self, model_input: np.ndarray, horizon: int) -> Dict[str, Any]:
+        """Run the transformer forecast in the next micro-batch."""
+        return await self.transformer_batcher.submit((model_input, horizon))
+
+    async def _predict_xgboost(self, model_input: np.ndarray, horizon: int) -> Dict[str, Any]:
+        """Run the XGBoost forecast in the next micro-batch."""
+        return await self.xgboost_batcher.submit((model_input, horizon))
+
+    async def _run_transformer_batch(self, key: Any, items: List[Any]) -> List[Dict[str, Any]]:
+        """Run one padded transformer batch on the torch worker pool."""
+        horizon = key[0]
+        return await self.executor.run(
+            TORCH_FAMILY, self.transformer_model.predict_batch_sync, [x for x, _ in items], horizon
+        )
+
+    async def _run_xgboost_batch(self, key: Any, items: List[Any]) -> List[Dict[str, Any]]:
+        """Run one stacked XGBoost batch on the xgboost worker pool."""
+        horizon = key[0]
+        return await self.executor.run(
+            XGBOOST_FAMILY, self.xgboost_model.predict_batch_sync, [x for x, _ in items], horizon
+        )
+
     async def forecast_symptoms(
         self,
         patient_id: UUID,
@@ -163,15 +217,10 @@ class SymptomForecastingService:
 
             # Generate forecasts
             if use_ensemble:
-                # Run both models in parallel
-                transformer_future = self.transformer_model.predict(
-                    model_input, horizon
-                )
-                xgboost_future = self.xgboost_model.predict(model_input, horizon)
-
-                # Await results
+                # Run both models in parallel on their worker pools
                 transformer_results, xgboost_results = await asyncio.gather(
-                    transformer_future, xgboost_future
+                    self._predict_transformer(model_input, horizon),
+                    self._predict_xgboost(model_input, horizon),
                 )
 
                 # Combine results using weighted average
@@ -195,7 +244,7 @@ class SymptomForecastingService:
                 }
             else:
                 # Use only transformer model
-                forecast_results = await self.transformer_model.predict(
+                forecast_results = await self._predict_transformer(
                     model_input, horizon
                 )
 
@@ -215,6 +264,8 @@ class SymptomForecastingService:
 
             return forecast_results
 
+        except (InferenceQueueFullError, InferenceTimeoutError):
+            raise
         except Exception as e:
             logging.error(f"Error forecasting symptoms: {str(e)}")
             raise Exception(f"Failed to forecast symptoms: {str(e)}")
@@ -282,7 +333,7 @@ class SymptomForecastingService:
                 treatment_input = baseline_preprocessed.reshape(
                     1, *baseline_preprocessed.shape
                 )
-                treatment_forecast = await self.transformer_model.predict(
+                treatment_forecast = await self._predict_transformer(
                     treatment_input, horizon
                 )
 
@@ -344,6 +395,8 @@ class SymptomForecastingService:
                 "forecast_horizon": horizon,
             }
 
+        except (InferenceQueueFullError, InferenceTimeoutError):
+            raise
         except Exception as e:
             logging.error(f"Error evaluating treatment impact: {str(e)}")
             raise Exception(f"Failed to evaluate treatment impact: {str(e)}")
@@ -22,6 +22,8 @@ except Exception:
     nn = None
     F = None
 
+from app.infrastructure.ml.micro_batcher import split_rows
+
 # Removed import for ModelInferenceError as it is not available
 # from app.domain.exceptions import ModelInferenceError
 
@@ -47,21 +49,34 @@ class MultiHeadAttention(nn.Module):
         self.value = nn.Linear(d_model, d_model)
         self.out = nn.Linear(d_model, d_model)
 
+    def _split_heads(self, x: torch.Tensor, batch_size: int) -> torch.Tensor:
+        """Reshape (batch, seq, d_model) projections to (batch, heads, seq, head_dim)."""
+        return x.view(batch_size, -1, self.num_heads, self.head_dim).transpose(1, 2)
+
     def forward(
         self,
         query: 'torch.Tensor',  # type: ignore
         key: 'torch.Tensor',    # type: ignore
         value: 'torch.Tensor',  # type: ignore
         mask: Optional[torch.Tensor] = None,
+        cache: Optional[Dict[str, torch.Tensor]] = None,
+        static_kv: bool = False,
     ) -> torch.Tensor:
         """
         Forward pass for multi-head attention.
 
+        With a cache, projected keys and values are kept between calls for
+        incremental decoding: self-attention appends the new positions to the
+        cached ones, while static_kv attention (over encoder memory) projects
+        key and value once and reuses them on every later call.
+
         Args:
             query: Query tensor
             key: Key tensor
             value: Value tensor
             mask: Optional attention mask
+            cache: Optional dict holding projected "key" and "value" tensors
+            static_kv: Whether key and value are the same on every call
 
         Returns:
             Output tensor after multi-head attention
@@ -69,23 +84,18 @@ class MultiHeadAttention(nn.Module):
         batch_size = query.shape[0]
 
         # Linear projections and reshape for multi-head attention
-        query = (
-            self.query(query)
-            .view(batch_size, -1, self.num_heads, self.head_dim)
-            .transpose(1, 2)
-        )
-        key = (
-            self.key(key)
-            .view(batch_size, -1, self.num_heads, self.head_dim)
-            .transpose(1, 2)
-        )
-        value = (
-            self.value(value)
-            .view(batch_size, -1, self.num_heads, self.head_dim)
-            .transpose(1, 2)
-        )
+        query = self._split_heads(self.query(query), batch_size)
+        if cache is not None and static_kv and "key" in cache:
+            key, value = cache["key"], cache["value"]
+        else:
+            key = self._split_heads(self.key(key), batch_size)
+            value = self._split_heads(self.value(value), batch_size)
+            if cache is not None:
+                if "key" in cache:
+                    key = torch.cat([cache["key"], key], dim=2)
+                    value = torch.cat([cache["value"], value], dim=2)
+                cache["key"], cache["value"] = key, value
 
-        # Scaled dot-product attention
         # Scaled dot-product attention
         scores = torch.matmul(query, key.transpose(-2, -1)) / torch.sqrt(
             torch.tensor(self.head_dim, dtype=torch.float32)
@@ -182,26 +192,35 @@ class TransformerDecoderLayer(nn.Module):
         encoder_output: torch.Tensor,
         src_mask: Optional[torch.Tensor] = None,
         tgt_mask: Optional[torch.Tensor] = None,
+        cache: Optional[Dict[str, Dict[str, torch.Tensor]]] = None,
     ) -> torch.Tensor:
         """
         Forward pass for transformer decoder layer.
 
+        With a cache, x holds only the new target positions: self-attention
+        keys and values of earlier positions and the projected encoder output
+        are taken from the cache, which is updated in place.
+
         Args:
             x: Input tensor
             encoder_output: Output from the encoder
             src_mask: Source attention mask
             tgt_mask: Target attention mask
+            cache: Optional per-layer cache from MultiHorizonTransformer.init_decoder_cache
 
         Returns:
             Output tensor after decoder layer
         """
+        self_cache = cache["self_attention"] if cache is not None else None
+        cross_cache = cache["cross_attention"] if cache is not None else None
+
         # Self-attention with residual connection and layer normalization
-        self_attn_output = self.self_attention(x, x, x, tgt_mask)
+        self_attn_output = self.self_attention(x, x, x, tgt_mask, cache=self_cache)
         x = self.norm1(x + self.dropout(self_attn_output))
 
         # Cross-attention with residual connection and layer normalization
         cross_attn_output = self.cross_attention(
-            x, encoder_output, encoder_output, src_mask
+            x, encoder_output, encoder_output, src_mask, cache=cross_cache, static_kv=True
         )
         x = self.norm2(x + self.dropout(cross_attn_output))
 
@@ -322,7 +341,10 @@ class MultiHorizonTransformer(nn.Module):
         self.dropout = nn.Dropout(dropout)
 
     def create_masks(
-        self, src_seq: torch.Tensor, tgt_seq: torch.Tensor
+        self,
+        src_seq: torch.Tensor,
+        tgt_seq: torch.Tensor,
+        src_lengths: Optional[torch.Tensor] = None,
     ) -> Tuple[torch.Tensor, torch.Tensor]:
         """
         Create masks for the transformer.
@@ -330,13 +352,20 @@ class MultiHorizonTransformer(nn.Module):
         Args:
             src_seq: Source sequence
             tgt_seq: Target sequence
+            src_lengths: Optional valid length of each right-padded source row
 
         Returns:
             Source mask and target mask
         """
-        src_mask = torch.ones(
-            (src_seq.shape[0], 1, 1, src_seq.shape[1]), device=src_seq.device
-        )
+        if src_lengths is None:
+            src_mask = torch.ones(
+                (src_seq.shape[0], 1, 1, src_seq.shape[1]), device=src_seq.device
+            )
+        else:
+            # Padding positions are hidden from every attention over the source
+            positions = torch.arange(src_seq.shape[1], device=src_seq.device)
+            src_mask = (positions.unsqueeze(0) < src_lengths.unsqueeze(1)).float()
+            src_mask = src_mask.view(src_seq.shape[0], 1, 1, src_seq.shape[1])
 
         # Create target mask (for autoregressive property)
         tgt_seq_len = tgt_seq.shape[1]
@@ -407,18 +436,70 @@ class MultiHorizonTransformer(nn.Module):
 
         return x
 
-    def forward(self, src: torch.Tensor, tgt: torch.Tensor) -> torch.Tensor:
+    def init_decoder_cache(self) -> List[Dict[str, Dict[str, torch.Tensor]]]:
+        """
+        Create empty key/value caches for incremental decoding.
+
+        Returns:
+            One cache per decoder layer, filled in place by decode_step
+        """
+        return [
+            {"self_attention": {}, "cross_attention": {}}
+            for _ in self.decoder_layers
+        ]
+
+    def decode_step(
+        self,
+        tgt_step: torch.Tensor,
+        position: int,
+        memory: torch.Tensor,
+        cache: List[Dict[str, Dict[str, torch.Tensor]]],
+        src_mask: Optional[torch.Tensor] = None,
+    ) -> torch.Tensor:
+        """
+        Decode a single new target position against cached state.
+
+        Because the target mask is causal, the new position may attend to
+        every cached one, so no target mask is needed and the result matches
+        the last position of decode over the full target sequence.
+
+        Args:
+            tgt_step: Target values at the new position (batch, 1, features)
+            position: Index of the new position in the target sequence
+            memory: Encoded source sequence
+            cache: Decoder caches from init_decoder_cache
+            src_mask: Source mask
+
+        Returns:
+            Decoded representation of the new position
+        """
+        x = self.input_embedding(tgt_step)
+        x = x + self.positional_encoding[:, position : position + 1, :]
+        x = self.dropout(x)
+
+        for layer, layer_cache in zip(self.decoder_layers, cache):
+            x = layer(x, memory, src_mask, None, cache=layer_cache)
+
+        return x
+
+    def forward(
+        self,
+        src: torch.Tensor,
+        tgt: torch.Tensor,
+        src_lengths: Optional[torch.Tensor] = None,
+    ) -> torch.Tensor:
         """
         Forward pass for the transformer model.
 
         Args:
             src: Source sequence
             tgt: Target sequence
+            src_lengths: Optional valid length of each right-padded source row
 
         Returns:
             Output tensor with quantile predictions
         """
-        src_mask, tgt_mask = self.create_masks(src, tgt)
+        src_mask, tgt_mask = self.create_masks(src, tgt, src_lengths)
 
         # Encode source sequence
         memory = self.encode(src, src_mask)
@@ -434,14 +515,56 @@ class MultiHorizonTransformer(nn.Module):
         input_data: torch.Tensor,
         horizon: int,
         quantiles: Optional[List[float]] = None,
+        use_cache: bool = True,
+        src_lengths: Optional[torch.Tensor] = None,
     ) -> Dict[str, Any]:
         """
         Generate predictions for the given input data.
 
+        This runs on the calling thread; use predict_sync with an
+        InferenceExecutor to keep it off the event loop.
+
+        Args:
+            input_data: Input tensor
+            horizon: Forecast horizon
+            quantiles: Optional list of quantiles to predict (defaults to model quantiles)
+            use_cache: Whether to decode incrementally with cached encoder
+                memory and attention keys/values
+            src_lengths: Optional valid length of each right-padded input row
+
+        Returns:
+            Dictionary containing prediction results
+        """
+        return self.predict_sync(input_data, horizon, quantiles, use_cache, src_lengths)
+
+    def predict_sync(
+        self,
+        input_data: torch.Tensor,
+        horizon: int,
+        quantiles: Optional[List[float]] = None,
+        use_cache: bool = True,
+        src_lengths: Optional[torch.Tensor] = None,
+    ) -> Dict[str, Any]:
+        """
+        Generate predictions for the given input data (blocking).
+
+        By default the history is encoded once and each horizon step decodes
+        only the new position against per-layer key/value caches. With
+        use_cache=False every step re-runs the full forward pass over the
+        history and the growing target, as the original implementation did.
+
+        Rows of different lengths can be batched by right-padding them and
+        passing src_lengths: padding is masked out of attention and each row
+        starts from its own last valid value, so every row forecasts as it
+        would alone.
+
         Args:
             input_data: Input tensor
             horizon: Forecast horizon
             quantiles: Optional list of quantiles to predict (defaults to model quantiles)
+            use_cache: Whether to decode incrementally with cached encoder
+                memory and attention keys/values
+            src_lengths: Optional valid length of each right-padded input row
 
         Returns:
             Dictionary containing prediction results
@@ -454,30 +577,47 @@ class MultiHorizonTransformer(nn.Module):
             if quantiles is None:
                 quantiles = self.quantiles
 
+            median_idx = self.quantiles.index(0.5)
+
             with torch.no_grad():
                 # Initialize target with the last value of input
-                tgt = input_data[:, -1:, :]
+                if src_lengths is None:
+                    tgt = input_data[:, -1:, :]
+                else:
+                    rows = torch.arange(input_data.shape[0], device=input_data.device)
+                    tgt = input_data[rows, src_lengths - 1].unsqueeze(1)
 
                 # Generate predictions autoregressively
                 all_preds = []
-                for _ in range(horizon):
-                    # Forward pass
-                    output = self(input_data, tgt)
-
-                    # Extract the last prediction
-                    pred = output[:, -1:, :, :]
-                    all_preds.append(pred)
-
-                    # Update target for next step (using median prediction)
-                    median_idx = self.quantiles.index(0.5)
-                    next_step = pred[:, :, :, median_idx]
-                    tgt = torch.cat([tgt, next_step], dim=1)
+                if use_cache:
+                    src_mask, _ = self.create_masks(input_data, tgt, src_lengths)
+                    memory = self.encode(input_data, src_mask)
+                    cache = self.init_decoder_cache()
+                    for step in range(horizon):
+                        output = self.output_layer(
+                            self.decode_step(tgt, step, memory, cache, src_mask)
+                        )
+                        all_preds.append(output)
+
+                        # Feed the median prediction back as the next position
+                        tgt = output[:, :, :, median_idx]
+                else:
+                    for _ in range(horizon):
+                        # Forward pass
+                        output = self(input_data, tgt, src_lengths)
+
+                        # Extract the last prediction
+                        pred = output[:, -1:, :, :]
+                        all_preds.append(pred)
+
+                        # Update target for next step (using median prediction)
+                        next_step = pred[:, :, :, median_idx]
+                        tgt = torch.cat([tgt, next_step], dim=1)
 
                 # Concatenate all predictions
                 all_preds = torch.cat(all_preds, dim=1)
 
                 # Extract quantiles
-                median_idx = self.quantiles.index(0.5)
                 lower_idx = self.quantiles.index(min(self.quantiles))
                 upper_idx = self.quantiles.index(max(self.quantiles))
 
@@ -553,6 +693,27 @@ class SymptomTransformerModel:
         """
         Generate predictions for the given input data.
 
+        Args:
+            input_data: Input numpy array
+            horizon: Forecast horizon
+            quantiles: Optional list of quantiles to predict
+
+        Returns:
+            Dictionary containing prediction results
+        """
+        return self.predict_sync(input_data, horizon, quantiles)
+
+    def predict_sync(
+        self,
+        input_data: np.ndarray,
+        horizon: int,
+        quantiles: Optional[List[float]] = None,
+    ) -> Dict[str, Any]:
+        """
+        Generate predictions for the given input data (blocking).
+
+        Safe to run on an InferenceExecutor worker thread.
+
         Args:
             input_data: Input numpy array
             horizon: Forecast horizon
@@ -565,7 +726,48 @@ class SymptomTransformerModel:
         input_tensor = torch.tensor(input_data, dtype=torch.float32).to(self.device)
 
         # Generate predictions
-        return await self.model.predict(input_tensor, horizon, quantiles)
+        return self.model.predict_sync(input_tensor, horizon, quantiles)
+
+    def predict_batch_sync(
+        self,
+        inputs: List[np.ndarray],
+        horizon: int,
+        quantiles: Optional[List[float]] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        Generate predictions for several requests in one forward pass (blocking).
+
+        Inputs of different lengths are right-padded to the longest and
+        masked, so each result matches predict_sync on that input alone.
+
+        Args:
+            inputs: Input arrays of shape (samples, time, features) or (time, features)
+            horizon: Forecast horizon shared by every input
+            quantiles: Optional list of quantiles to predict
+
+        Returns:
+            One prediction dict per input, in order
+        """
+        rows = [x.reshape(-1, *x.shape[-2:]) for x in inputs]
+        longest = max(r.shape[1] for r in rows)
+        total = sum(r.shape[0] for r in rows)
+        padded = np.zeros((total, longest, rows[0].shape[2]), dtype=np.float32)
+        lengths = np.empty(total, dtype=np.int64)
+        offsets = []
+        start = 0
+        for r in rows:
+            padded[start : start + r.shape[0], : r.shape[1]] = r
+            lengths[start : start + r.shape[0]] = r.shape[1]
+            offsets.append((start, start + r.shape[0]))
+            start += r.shape[0]
+
+        batch = self.model.predict_sync(
+            torch.from_numpy(padded).to(self.device),
+            horizon,
+            quantiles,
+            src_lengths=torch.from_numpy(lengths).to(self.device),
+        )
+        return split_rows(batch, offsets)
 
     def get_model_info(self) -> Dict[str, Any]:
         """
@@ -22,6 +22,7 @@ except Exception:
     xgb = None
 from optuna.samplers import TPESampler
 from app.core.services.ml.xgboost.exceptions import PredictionError, ValidationError
+from app.infrastructure.ml.micro_batcher import split_rows
 
 
 class XGBoostSymptomModel:
@@ -63,6 +64,11 @@ class XGBoostSymptomModel:
         self.feature_names = feature_names
         self.target_names = target_names
         self.models = {}  # Dictionary to store one model per target variable
+        # Single booster predicting every target at once (train(multi_output=True))
+        self.multi_output_model = None
+        self.nthread: Optional[int] = None
+        # target -> (booster the importance was computed from, gain importance)
+        self._importance_cache: Dict[str, Tuple[Any, Dict[str, float]]] = {}
 
         # Default parameters
         self.params = {
@@ -91,9 +97,13 @@ class XGBoostSymptomModel:
         try:
             model_data = joblib.load(model_path)
             self.models = model_data.get("models", {})
+            self.multi_output_model = model_data.get("multi_output_model")
             self.feature_names = model_data.get("feature_names")
             self.target_names = model_data.get("target_names")
             self.params = model_data.get("params", self.params)
+            # The boosters are fixed from here on; compute importance once
+            if self.models or self.multi_output_model is not None:
+                self.get_feature_importance()
             logging.info(f"Loaded XGBoost model from {model_path}")
         except Exception as e:
             logging.error(f"Error loading XGBoost model: {str(e)}")
@@ -108,6 +118,7 @@ class XGBoostSymptomModel:
         """
         model_data = {
             "models": self.models,
+            "multi_output_model": self.multi_output_model,
             "feature_names": self.feature_names,
             "target_names": self.target_names,
             "params": self.params,
@@ -191,6 +202,7 @@ class XGBoostSymptomModel:
         y_train: np.ndarray,
         optimize: bool = True,
         n_trials: int = 50,
+        multi_output: bool = False,
     ) -> Dict[str, Any]:
         """
         Train the XGBoost model.
@@ -200,6 +212,9 @@ class XGBoostSymptomModel:
             y_train: Training targets
             optimize: Whether to optimize hyperparameters
             n_trials: Number of optimization trials
+            multi_output: With several targets, train one multi-output booster
+                instead of one booster per target, so prediction needs a
+                single booster pass per horizon step
 
         Returns:
             Dictionary containing training results
@@ -236,13 +251,17 @@ class XGBoostSymptomModel:
                 self.params, dtrain, num_boost_round=self.params["n_estimators"]
             )
             self.models[self.target_names[0]] = model
-
-            # Calculate feature importance
-            importance = model.get_score(importance_type="gain")
-            training_results[self.target_names[0]] = {
-                "feature_importance": importance,
-                "params": self.params,
-            }
+        elif multi_output:
+            # All target variables in one booster; vector-leaf trees keep the
+            # per-step cost at one forest traversal for every target
+            dtrain = xgb.DMatrix(
+                X_train, label=y_train, feature_names=self.feature_names
+            )
+            params = {"multi_strategy": "multi_output_tree", **self.params}
+            self.multi_output_model = xgb.train(
+                params, dtrain, num_boost_round=self.params["n_estimators"]
+            )
+            self.models = {}
         else:
             # Multiple target variables
             for i, target_name in enumerate(self.target_names):
@@ -253,13 +272,14 @@ class XGBoostSymptomModel:
                     self.params, dtrain, num_boost_round=self.params["n_estimators"]
                 )
                 self.models[target_name] = model
+            self.multi_output_model = None
 
-                # Calculate feature importance
-                importance = model.get_score(importance_type="gain")
-                training_results[target_name] = {
-                    "feature_importance": importance,
-                    "params": self.params,
-                }
+        # Calculate feature importance (memoized for prediction)
+        for target_name, importance in self.get_feature_importance().items():
+            training_results[target_name] = {
+                "feature_importance": importance,
+                "params": self.params,
+            }
 
         return {
             "training_results": training_results,
@@ -268,10 +288,74 @@ class XGBoostSymptomModel:
             "params": self.params,
         }
 
+    def set_nthread(self, nthread: Optional[int]) -> None:
+        """
+        Limit the threads each booster uses for prediction.
+
+        Args:
+            nthread: Threads per prediction (None lets xgboost use all cores)
+        """
+        self.nthread = nthread
+        if nthread is None:
+            return
+        self.params["nthread"] = nthread
+        for model in self._boosters():
+            model.set_param({"nthread": nthread})
+
+    def _boosters(self) -> List[Any]:
+        """Return every trained booster."""
+        boosters = list(self.models.values())
+        if self.multi_output_model is not None:
+            boosters.append(self.multi_output_model)
+        return boosters
+
+    def _predict_rows(self, model: Any, rows: np.ndarray) -> np.ndarray:
+        """
+        Predict a block of rows with one booster.
+
+        Boosters predict in place from the (possibly strided) array without
+        building a DMatrix; other model objects fall back to a DMatrix.
+
+        Args:
+            model: Trained booster
+            rows: Feature rows
+
+        Returns:
+            Predictions, one row per input row
+        """
+        if xgb is not None and isinstance(model, xgb.Booster):
+            return model.inplace_predict(rows)
+        dmatrix = xgb.DMatrix(rows, feature_names=self.feature_names, nthread=self.nthread)
+        return model.predict(dmatrix)
+
     async def predict(self, X: np.ndarray, horizon: int) -> Dict[str, Any]:
         """
         Generate predictions for the given input data.
 
+        This runs on the calling thread; use predict_sync with an
+        InferenceExecutor to keep it off the event loop.
+
+        Args:
+            X: Input features
+            horizon: Forecast horizon
+
+        Returns:
+            Dictionary containing prediction results
+        """
+        return self.predict_sync(X, horizon)
+
+    def predict_sync(self, X: np.ndarray, horizon: int) -> Dict[str, Any]:
+        """
+        Generate predictions for the given input data (blocking).
+
+        Each target is forecast autoregressively: after every step the input
+        window shifts left by one feature and the prediction fills the last
+        one. Instead of rolling a copy and building a DMatrix per step, all
+        windows live in one preallocated ring buffer: target t owns a block
+        of rows, step h reads the strided view of columns h..h+features and
+        writes its prediction to the column just past it. A multi-output
+        booster predicts every target's block in a single pass per step.
+
         Args:
             X: Input features
             horizon: Forecast horizon
@@ -279,7 +363,7 @@ class XGBoostSymptomModel:
         Returns:
             Dictionary containing prediction results
         """
-        if not self.models:
+        if not self.models and self.multi_output_model is None:
             raise Exception("Model has not been trained or loaded")
 
         try:
@@ -289,82 +373,93 @@ class XGBoostSymptomModel:
                     f"Input has {X.shape[1]} features, but model expects {len(self.feature_names)}"
                 )
 
-            # Prepare DMatrix
-            dmatrix = xgb.DMatrix(X, feature_names=self.feature_names)
-
-            # Make predictions for each target
-            predictions = {}
-            feature_importance = {}
-
-            for target_name, model in self.models.items():
-                # Get predictions
-                pred = model.predict(dmatrix)
-                predictions[target_name] = pred
+            num_targets = len(self.target_names)
+            num_samples, width = X.shape[0], X.shape[1]
 
-                # Get feature importance
-                importance = model.get_score(importance_type="gain")
-                feature_importance[target_name] = importance
-
-            # For multi-step forecasting, we need to generate predictions for each step
-            # This is a simplified implementation - in practice, we would use a more sophisticated approach
-            multi_step_predictions = {}
-
-            for target_name in self.target_names:
-                # Initialize array for multi-step predictions
-                multi_step = np.zeros((X.shape[0], horizon))
-
-                # Use the last prediction as input for the next step (autoregressive)
-                current_input = X.copy()
+            # xgboost predicts in float32, so the buffer loses nothing
+            buffer = np.empty((num_targets * num_samples, width + horizon), dtype=np.float32)
+            for t in range(num_targets):
+                buffer[t * num_samples : (t + 1) * num_samples, :width] = X
 
+            if self.multi_output_model is not None:
+                # Row block t only needs output column t
+                diagonal = np.arange(num_targets)
                 for h in range(horizon):
-                    # Make prediction for current step
-                    dmatrix = xgb.DMatrix(
-                        current_input, feature_names=self.feature_names
-                    )
-                    step_pred = self.models[target_name].predict(dmatrix)
-
-                    # Store prediction
-                    multi_step[:, h] = step_pred
-
-                    # Update input for next step (simplified approach)
-                    # In practice, this would depend on the specific feature engineering
-                    current_input = np.roll(current_input, -1, axis=1)
-                    current_input[:, -1] = step_pred
-
-                multi_step_predictions[target_name] = multi_step
-
-            # Combine all predictions
-            combined_predictions = np.zeros(
-                (X.shape[0], horizon, len(self.target_names))
+                    step_pred = self._predict_rows(self.multi_output_model, buffer[:, h : h + width])
+                    step_pred = step_pred.reshape(num_targets, num_samples, num_targets)
+                    buffer[:, width + h] = step_pred[diagonal, :, diagonal].reshape(-1)
+            else:
+                for t, target_name in enumerate(self.target_names):
+                    rows = buffer[t * num_samples : (t + 1) * num_samples]
+                    model = self.models[target_name]
+                    for h in range(horizon):
+                        rows[:, width + h] = self._predict_rows(model, rows[:, h : h + width])
+
+            # (targets * samples, horizon) -> (samples, horizon, targets)
+            combined_predictions = (
+                buffer[:, width:]
+                .reshape(num_targets, num_samples, horizon)
+                .transpose(1, 2, 0)
+                .astype(np.float64)
             )
 
-            for i, target_name in enumerate(self.target_names):
-                combined_predictions[:, :, i] = multi_step_predictions[target_name]
-
             return {
                 "values": combined_predictions,
-                "feature_importance": feature_importance,
+                "feature_importance": self.get_feature_importance(),
                 "model_type": "xgboost",
             }
 
         except Exception as e:
             raise PredictionError(f"Error during XGBoost model inference: {str(e)}")
 
+    def predict_batch_sync(self, inputs: List[np.ndarray], horizon: int) -> List[Dict[str, Any]]:
+        """
+        Generate predictions for several requests in one pass (blocking).
+
+        Rows are predicted independently, so stacking the requests into one
+        DMatrix per step gives each the same result as predicting it alone.
+
+        Args:
+            inputs: Input feature arrays with matching trailing shapes
+            horizon: Forecast horizon shared by every input
+
+        Returns:
+            One prediction dict per input, in order
+        """
+        offsets = []
+        start = 0
+        for x in inputs:
+            offsets.append((start, start + x.shape[0]))
+            start += x.shape[0]
+        batch = self.predict_sync(np.concatenate(inputs, axis=0), horizon)
+        return split_rows(batch, offsets)
+
     def get_feature_importance(self) -> Dict[str, Dict[str, float]]:
         """
         Get feature importance for each target variable.
 
+        Importance is computed once per booster and reused until the booster
+        is replaced (by training or loading).
+
         Returns:
             Dictionary mapping target names to feature importance dictionaries
         """
-        if not self.models:
+        if not self.models and self.multi_output_model is None:
             raise Exception("Model has not been trained or loaded")
 
+        if self.multi_output_model is not None:
+            sources = {name: self.multi_output_model for name in self.target_names or []}
+        else:
+            sources = self.models
+
         feature_importance = {}
 
-        for target_name, model in self.models.items():
-            importance = model.get_score(importance_type="gain")
-            feature_importance[target_name] = importance
+        for target_name, model in sources.items():
+            cached = self._importance_cache.get(target_name)
+            if cached is None or cached[0] is not model:
+                cached = (model, model.get_score(importance_type="gain"))
+                self._importance_cache[target_name] = cached
+            feature_importance[target_name] = cached[1]
 
         return feature_importance
 
@@ -380,6 +475,7 @@ class XGBoostSymptomModel:
             "feature_names": self.feature_names,
             "target_names": self.target_names,
             "params": self.params,
-            "num_models": len(self.models),
+            "num_models": len(self._boosters()),
+            "multi_output": self.multi_output_model is not None,
             "timestamp": datetime.now(UTC).isoformat(),
         }
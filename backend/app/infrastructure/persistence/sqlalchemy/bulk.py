@@ -0,0 +1,72 @@
+# -*- coding: utf-8 -*-
+"""
+Bulk insert helpers for SQLAlchemy.
+
+Inserts many rows with executemany-style statements and lets the database
+skip rows whose key already exists (``INSERT ... ON CONFLICT DO NOTHING`` on
+PostgreSQL and SQLite, ``INSERT IGNORE`` on MySQL), so callers never read
+existing keys before writing.
+"""
+
+import logging
+from typing import Any, Dict, Sequence, Union
+
+from sqlalchemy import Table, insert, select
+from sqlalchemy.engine import Connection
+from sqlalchemy.orm import Session
+
+logger = logging.getLogger(__name__)
+
+# Rows per executemany call; bounds bound-parameter memory for very large batches
+BULK_INSERT_BATCH_SIZE = 10_000
+
+
+def insert_ignore_conflicts(
+    executor: Union[Session, Connection],
+    table: Table,
+    rows: Sequence[Dict[str, Any]],
+    key_column: str,
+    batch_size: int = BULK_INSERT_BATCH_SIZE,
+) -> None:
+    """
+    Insert rows, skipping any whose key already exists.
+
+    Args:
+        executor: Session or connection to execute on (not committed here)
+        table: Target table
+        rows: Row dictionaries keyed by column name, all with the same keys
+        key_column: Unique column identifying duplicates
+        batch_size: Rows per executemany call
+    """
+    if not rows:
+        return
+    bind = executor.get_bind() if isinstance(executor, Session) else executor
+    dialect = bind.dialect.name
+
+    if dialect == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert as dialect_insert
+    elif dialect == "sqlite":
+        from sqlalchemy.dialects.sqlite import insert as dialect_insert
+    else:
+        dialect_insert = None
+
+    for start in range(0, len(rows), batch_size):
+        batch = list(rows[start:start + batch_size])
+        if dialect_insert is not None:
+            statement = dialect_insert(table).on_conflict_do_nothing(index_elements=[key_column])
+        elif dialect in ("mysql", "mariadb"):
+            statement = insert(table).prefix_with("IGNORE")
+        else:
+            # No native upsert: read back only this batch's keys, never the whole table
+            key = table.c[key_column]
+            existing = set(executor.execute(
+                select(key).where(key.in_([row[key_column] for row in batch]))
+            ).scalars())
+            batch = [row for row in batch if row[key_column] not in existing]
+            if not batch:
+                continue
+            statement = insert(table)
+        executor.execute(statement, batch)
+
+    logger.debug(f"Bulk inserted up to {len(rows)} rows into {table.name} ({dialect})")
+
@@ -55,5 +55,9 @@ class AuditLog(Base):
     # Use JSONB for flexibility and potential querying
     details = Column(JSONB, nullable=True) 
 
+    # Hash chain written by the audit pipeline (SHA-256 hex of the previous and this entry)
+    previous_hash = Column(String(64), nullable=True)
+    entry_hash = Column(String(64), nullable=True, index=True)
+
     def __repr__(self):
         return f"<AuditLog(id={self.id}, timestamp='{self.timestamp}', event_type='{self.event_type}', user_id='{self.user_id}', action='{self.action}')>" 
\ No newline at end of file
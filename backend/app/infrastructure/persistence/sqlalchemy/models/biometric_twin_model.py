@@ -6,10 +6,9 @@ This module defines the database models for storing biometric twin data,
 including the core twin entity and its associated data points.
 """
 
-from datetime import datetime, , UTC
-from app.domain.utils.datetime_utils import UTC
+from datetime import datetime
 from typing import Dict, List, Optional, Any
-from sqlalchemy import Column, String, DateTime, Boolean, Float, ForeignKey, JSON, ARRAY
+from sqlalchemy import Column, String, DateTime, Boolean, Float, ForeignKey, Index, JSON, ARRAY
 from sqlalchemy.orm import relationship
 
 from app.infrastructure.persistence.sqlalchemy.config.database import Base
@@ -50,18 +49,26 @@ class BiometricDataPointModel(Base):
     
     This model represents individual biometric measurements associated with
     a biometric twin, storing the measurement value, metadata, and context.
+    Numeric measurements are also stored natively in ``value_numeric`` so
+    per-twin time-range scans can read numbers without parsing strings.
     """
     
     __tablename__ = "biometric_data_points"
+    __table_args__ = (
+        # Serves per-twin, per-type time-range scans (and twin_id lookups by prefix)
+        Index("ix_biometric_data_points_twin_type_time", "twin_id", "data_type", "timestamp"),
+    )
     
     data_id = Column(String, primary_key=True, index=True)
-    twin_id = Column(String, ForeignKey("biometric_twins.twin_id"), index=True, nullable=False)
+    twin_id = Column(String, ForeignKey("biometric_twins.twin_id"), nullable=False)
     data_type = Column(String, index=True, nullable=False)
     value = Column(String, nullable=False)
     value_type = Column(String, nullable=False)  # "number", "string", "json"
+    value_numeric = Column(Float, nullable=True)  # Set when value_type is "number"
     timestamp = Column(DateTime, nullable=False, index=True)
     source = Column(String, nullable=False, index=True)
-    metadata = Column(JSON, nullable=True)
+    # "metadata" is reserved on declarative models, so the attribute is renamed
+    data_metadata = Column("metadata", JSON, nullable=True)
     confidence = Column(Float, nullable=False, default=1.0)
     
     # Relationships
@@ -7,14 +7,15 @@ interface using SQLAlchemy ORM for database operations.
 """
 
 from datetime import datetime
-from typing import Dict, List, Optional, Set, Any, Union
+from typing import Dict, Iterable, List, Optional, Set, Any, Tuple, Union
 from uuid import UUID
 
-from sqlalchemy import and_, func, or_
+from sqlalchemy import and_, func, or_, select
 from sqlalchemy.orm import Session
 
 from app.domain.entities.digital_twin.biometric_twin import BiometricTwin, BiometricDataPoint
 from app.domain.repositories.biometric_twin_repository import BiometricTwinRepository
+from app.infrastructure.persistence.sqlalchemy.bulk import insert_ignore_conflicts
 from app.infrastructure.persistence.sqlalchemy.models.biometric_twin_model import (
     BiometricTwinModel, BiometricDataPointModel
 )
@@ -36,6 +37,9 @@ class SQLAlchemyBiometricTwinRepository(BiometricTwinRepository):
             session: SQLAlchemy database session
         """
         self.session = session
+        # Twin ID -> number of leading entity data points known to be stored.
+        # Data points are appended, so a save only inserts the points after it.
+        self._stored_point_counts: Dict[str, int] = {}
     
     def get_by_id(self, twin_id: UUID) -> Optional[BiometricTwin]:
         """
@@ -110,8 +114,9 @@ class SQLAlchemyBiometricTwinRepository(BiometricTwinRepository):
         # Refresh the model to get any database-generated values
         self.session.refresh(twin_model)
         
-        # Return the updated entity
-        return self._map_to_entity(twin_model)
+        # Return the updated entity; its points are all stored now, so the
+        # twin's history is not read back
+        return self._map_to_entity(twin_model, biometric_twin.data_points)
     
     def delete(self, twin_id: UUID) -> bool:
         """
@@ -134,6 +139,7 @@ class SQLAlchemyBiometricTwinRepository(BiometricTwinRepository):
         ).delete()
         
         self.session.commit()
+        self._stored_point_counts.pop(str(twin_id), None)
         
         return twin_deleted > 0
     
@@ -180,24 +186,83 @@ class SQLAlchemyBiometricTwinRepository(BiometricTwinRepository):
         """
         return self.session.query(func.count(BiometricTwinModel.twin_id)).scalar()
     
-    def _map_to_entity(self, model: BiometricTwinModel) -> BiometricTwin:
+    def add_data_points(self, twin_id: UUID, data_points: Iterable[BiometricDataPoint]) -> None:
+        """
+        Bulk insert data points for a twin, skipping ones already stored.
+        
+        Rows are written with executemany and duplicates are dropped by the
+        database on data_id, so the cost depends on the batch size rather
+        than on the twin's stored history. The caller commits.
+        
+        Args:
+            twin_id: The ID of the associated BiometricTwin
+            data_points: Data points to insert
+        """
+        rows = [self._data_point_row(data_point, twin_id) for data_point in data_points]
+        insert_ignore_conflicts(self.session, BiometricDataPointModel.__table__, rows, key_column="data_id")
+    
+    def get_numeric_series(
+        self,
+        twin_id: UUID,
+        data_type: str,
+        start_time: Optional[datetime] = None,
+        end_time: Optional[datetime] = None
+    ) -> Tuple[List[datetime], List[float]]:
+        """
+        Read numeric values of one data type for a twin, ordered by time.
+        
+        Scans the (twin_id, data_type, timestamp) index and reads the native
+        numeric column without materializing ORM objects.
+        
+        Args:
+            twin_id: The ID of the BiometricTwin
+            data_type: Type of biometric data
+            start_time: Inclusive lower bound on timestamp
+            end_time: Exclusive upper bound on timestamp
+            
+        Returns:
+            Tuple of (timestamps, values)
+        """
+        query = select(BiometricDataPointModel.timestamp, BiometricDataPointModel.value_numeric).where(
+            BiometricDataPointModel.twin_id == str(twin_id),
+            BiometricDataPointModel.data_type == data_type,
+            BiometricDataPointModel.value_numeric.is_not(None)
+        )
+        if start_time is not None:
+            query = query.where(BiometricDataPointModel.timestamp >= start_time)
+        if end_time is not None:
+            query = query.where(BiometricDataPointModel.timestamp < end_time)
+        rows = self.session.execute(query.order_by(BiometricDataPointModel.timestamp)).all()
+        return [row[0] for row in rows], [row[1] for row in rows]
+    
+    def _map_to_entity(
+        self,
+        model: BiometricTwinModel,
+        data_points: Optional[List[BiometricDataPoint]] = None
+    ) -> BiometricTwin:
         """
         Map a BiometricTwinModel to a BiometricTwin entity.
         
         Args:
             model: The database model to map
+            data_points: The twin's data points, if already known to be stored;
+                read from the database otherwise
             
         Returns:
             The corresponding domain entity
         """
-        # Get data points for this twin
-        data_point_models = self.session.query(BiometricDataPointModel).filter(
-            BiometricDataPointModel.twin_id == model.twin_id
-        ).all()
-        
-        # Map data points to entities
-        data_points = [self._map_data_point_to_entity(dp_model) 
-                      for dp_model in data_point_models]
+        if data_points is None:
+            # Get data points for this twin
+            data_point_models = self.session.query(BiometricDataPointModel).filter(
+                BiometricDataPointModel.twin_id == model.twin_id
+            ).all()
+            
+            # Map data points to entities
+            data_points = [self._map_data_point_to_entity(dp_model) 
+                          for dp_model in data_point_models]
+        else:
+            data_points = list(data_points)
+        self._stored_point_counts[model.twin_id] = len(data_points)
         
         # Create the BiometricTwin entity
         return BiometricTwin(
@@ -256,7 +321,7 @@ class SQLAlchemyBiometricTwinRepository(BiometricTwinRepository):
             value=self._deserialize_value(model.value, model.value_type),
             timestamp=model.timestamp,
             source=model.source,
-            metadata=model.metadata,
+            metadata=model.data_metadata,
             confidence=model.confidence,
             data_id=UUID(model.data_id)
         )
@@ -285,39 +350,58 @@ class SQLAlchemyBiometricTwinRepository(BiometricTwinRepository):
             value=value,
             value_type=value_type,
             timestamp=data_point.timestamp,
+            value_numeric=float(value) if value_type == "number" else None,
             source=data_point.source,
-            metadata=data_point.metadata,
+            data_metadata=data_point.metadata,
             confidence=data_point.confidence
         )
     
+    def _data_point_row(self, data_point: BiometricDataPoint, twin_id: UUID) -> Dict[str, Any]:
+        """
+        Map a BiometricDataPoint entity to a row for bulk insertion.
+        
+        Args:
+            data_point: The domain entity to map
+            twin_id: The ID of the associated BiometricTwin
+            
+        Returns:
+            Row dictionary keyed by column name
+        """
+        value, value_type = self._serialize_value(data_point.value)
+        
+        return {
+            "data_id": str(data_point.data_id),
+            "twin_id": str(twin_id),
+            "data_type": data_point.data_type,
+            "value": value,
+            "value_type": value_type,
+            "value_numeric": float(data_point.value) if value_type == "number" else None,
+            "timestamp": data_point.timestamp,
+            "source": data_point.source,
+            "metadata": data_point.metadata,
+            # Core inserts bypass the column default
+            "confidence": data_point.confidence if data_point.confidence is not None else 1.0
+        }
+    
     def _save_data_points(self, entity: BiometricTwin) -> None:
         """
-        Save all data points for a BiometricTwin.
+        Save the data points appended to a BiometricTwin since it was loaded or saved.
+        
+        Only points past the twin's stored count are sent, so the cost depends
+        on the new points rather than the twin's history. If the list has
+        shrunk, every point is sent and the database skips the stored ones.
+        Points removed from the entity are not deleted here, as that should be
+        handled explicitly.
         
         Args:
             entity: The BiometricTwin entity containing data points to save
         """
-        # Get existing data point IDs
-        existing_data_point_ids = set(
-            str(dp_id) for dp_id, in self.session.query(BiometricDataPointModel.data_id).filter(
-                BiometricDataPointModel.twin_id == str(entity.twin_id)
-            ).all()
-        )
-        
-        # Process each data point
-        for data_point in entity.data_points:
-            data_point_id = str(data_point.data_id)
-            
-            if data_point_id in existing_data_point_ids:
-                # Data point already exists, remove from set to track processed points
-                existing_data_point_ids.remove(data_point_id)
-            else:
-                # New data point, add to database
-                data_point_model = self._map_data_point_to_model(data_point, entity.twin_id)
-                self.session.add(data_point_model)
-        
-        # Any remaining IDs in the set are data points that were removed from the entity
-        # We don't delete them here as that should be handled explicitly
+        data_points = entity.data_points
+        stored = self._stored_point_counts.get(str(entity.twin_id), 0)
+        if stored > len(data_points):
+            stored = 0
+        # save() moves the count on once the points are committed
+        self.add_data_points(entity.twin_id, data_points[stored:])
     
     def _serialize_value(self, value: Any) -> tuple[str, str]:
         """
@@ -4,10 +4,12 @@ SQL Alchemy implementation of the user repository.
 This module provides a concrete implementation of the UserRepository interface
 using SQLAlchemy for database operations.
 """
-from typing import List, Optional
+import asyncio
+from typing import List, Optional, Set
 from uuid import UUID
 
 import sqlalchemy as sa
+from sqlalchemy import event
 from sqlalchemy.ext.asyncio import AsyncSession
 
 # Corrected import for password hashing function
@@ -15,6 +17,17 @@ from app.infrastructure.security.password.hashing import get_password_hash
 from app.domain.entities.user import User
 from app.domain.repositories.user_repository import UserRepository
 from app.infrastructure.models.user_model import UserModel
+from app.infrastructure.security.auth.principal_cache import invalidate_principals
+
+# Post-commit invalidations still running; held so they are not collected early
+_pending_invalidations: Set[asyncio.Task] = set()
+
+
+def _invalidate_principals_soon(subject: UUID) -> None:
+    """Schedule a principal invalidation from a synchronous session event."""
+    task = asyncio.get_running_loop().create_task(invalidate_principals(subject))
+    _pending_invalidations.add(task)
+    task.add_done_callback(_pending_invalidations.discard)
 
 
 class SqlAlchemyUserRepository(UserRepository):
@@ -129,6 +142,8 @@ class SqlAlchemyUserRepository(UserRepository):
         user_model.updated_at = user.updated_at
         
         await self.session.flush()
+        # Authenticated requests must not keep using the old roles or active flag
+        await self._invalidate_principals(user.id)
         
         return self._model_to_entity(user_model)
     
@@ -147,9 +162,29 @@ class SqlAlchemyUserRepository(UserRepository):
         )
         
         await self.session.flush()
+        await self._invalidate_principals(user_id)
         
         return result.rowcount > 0
     
+    async def _invalidate_principals(self, user_id: UUID) -> None:
+        """
+        Drop a user's cached principals now and again once the change commits.
+        
+        Until the caller commits, a concurrent request still reads the old
+        row and may cache its principal again; the post-commit invalidation
+        removes that entry.
+        
+        Args:
+            user_id: UUID of the changed user
+        """
+        await invalidate_principals(user_id)
+        event.listen(
+            self.session.sync_session,
+            "after_commit",
+            lambda _session: _invalidate_principals_soon(user_id),
+            once=True,
+        )
+    
     async def list_users(self, skip: int = 0, limit: int = 100) -> List[User]:
         """
         List users with pagination.
@@ -12,6 +12,10 @@ Features:
 - Tamper-evident logging (cryptographic signatures)
 - Log entry search and filtering capability
 - Support for exporting audit logs to HIPAA-compliant storage
+
+By default entries are handed to an AuditPipeline: the request thread only
+enqueues, and a background writer batches, hash-chains, fsyncs and
+optionally bulk-inserts them into the audit_logs table.
 """
 
 import datetime
@@ -24,6 +28,7 @@ import os
 
 # Use canonical config import
 from app.config.settings import get_settings
+from app.infrastructure.security.audit.pipeline import AuditPipeline, LoggerSink, SQLAlchemyAuditSink
 # REMOVED: settings = get_settings() - Defer loading
 logger = logging.getLogger(__name__) # Use standard logger
 
@@ -46,8 +51,10 @@ class AuditLogger:
         """
         # ADDED: Load settings within __init__
         settings = get_settings()
-        self.log_level = getattr(logging, settings.LOG_LEVEL.upper(), logging.INFO)
+        self.log_level = getattr(logging, settings.AUDIT_LOG_LEVEL.upper(), logging.INFO)
         self.audit_log_file = settings.AUDIT_LOG_FILE
+        self.external_audit_enabled = settings.EXTERNAL_AUDIT_ENABLED
+        self.pipeline: Optional[AuditPipeline] = None
         
         # Configure the audit logger
         self.logger = logging.getLogger(logger_name)
@@ -57,8 +64,16 @@ class AuditLogger:
         if self.logger.hasHandlers():
             self.logger.handlers.clear()
             
-        # Create a file handler
-        if self.audit_log_file:
+        if getattr(settings, "AUDIT_ASYNC_ENABLED", False):
+            # The pipeline writes the file itself, off the request thread
+            try:
+                self.pipeline = self._create_pipeline(settings)
+            except Exception as e:
+                logger.error(f"Failed to start audit pipeline, falling back to synchronous logging: {e}", exc_info=True)
+
+        if self.pipeline is not None:
+            logger.info(f"Audit logs will be written asynchronously to: {self.audit_log_file}")
+        elif self.audit_log_file:
             try:
                 # Ensure the directory exists
                 log_dir = os.path.dirname(self.audit_log_file)
@@ -95,6 +110,70 @@ class AuditLogger:
             self.logger.propagate = True 
             logger.error("AuditLogger failed to set up any handlers. Logs may be lost or appear in root logger.")
 
+    def _create_pipeline(self, settings: Any) -> AuditPipeline:
+        """
+        Build the asynchronous audit pipeline from settings.
+
+        Args:
+            settings: Application settings
+
+        Returns:
+            A running AuditPipeline
+        """
+        sinks: List[Any] = []
+        if getattr(settings, "AUDIT_CONSOLE_ECHO", True):
+            # Console echo happens on the writer thread, not the request thread
+            sinks.append(LoggerSink(self.logger))
+        if getattr(settings, "AUDIT_LOG_TO_DATABASE", False):
+            from app.infrastructure.persistence.sqlalchemy.database import get_database
+
+            rejected_file = f"{self.audit_log_file}.db-rejected" if self.audit_log_file else None
+            sinks.append(SQLAlchemyAuditSink(get_database().get_session, rejected_file=rejected_file))
+
+        return AuditPipeline(
+            log_file=self.audit_log_file or None,
+            sinks=sinks,
+            max_queue_size=getattr(settings, "AUDIT_QUEUE_SIZE", 10000),
+            batch_size=getattr(settings, "AUDIT_BATCH_SIZE", 500),
+            fsync_interval=getattr(settings, "AUDIT_FSYNC_INTERVAL_SECONDS", 1.0),
+            overflow_policy=getattr(settings, "AUDIT_OVERFLOW_POLICY", "block"),
+            spill_file=getattr(settings, "AUDIT_SPILL_FILE", None),
+        )
+
+    def _record(self, label: str, audit_entry: Dict[str, Any]) -> None:
+        """
+        Record an audit entry through the pipeline, or synchronously without one.
+
+        Args:
+            label: Prefix for synchronous log lines (e.g., "PHI_ACCESS")
+            audit_entry: The audit entry
+        """
+        if self.pipeline is not None:
+            self.pipeline.submit(audit_entry)
+        else:
+            self.logger.info(f"{label}: {json.dumps(audit_entry)}")
+
+        # If configured, also send to external audit service
+        if self.external_audit_enabled:
+            self._send_to_external_audit_service(audit_entry)
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """
+        Wait until all recorded entries are durably written.
+
+        Args:
+            timeout: Maximum seconds to wait
+
+        Returns:
+            True if everything was flushed within the timeout
+        """
+        return self.pipeline.flush(timeout) if self.pipeline is not None else True
+
+    def close(self) -> None:
+        """Flush and stop the audit pipeline."""
+        if self.pipeline is not None:
+            self.pipeline.close()
+
     def log_phi_access(
         self,
         user_id: str,
@@ -129,11 +208,7 @@ class AuditLogger:
         }
 
         # Log the audit entry
-        self.logger.info(f"PHI_ACCESS: {json.dumps(audit_entry)}")
-
-        # If configured, also send to external audit service
-        if settings.EXTERNAL_AUDIT_ENABLED:
-            self._send_to_external_audit_service(audit_entry)
+        self._record("PHI_ACCESS", audit_entry)
 
     def log_auth_event(
         self,
@@ -166,11 +241,7 @@ class AuditLogger:
         }
 
         # Log the audit entry
-        self.logger.info(f"AUTH_EVENT: {json.dumps(audit_entry)}")
-
-        # If configured, also send to external audit service
-        if settings.EXTERNAL_AUDIT_ENABLED:
-            self._send_to_external_audit_service(audit_entry)
+        self._record("AUTH_EVENT", audit_entry)
 
     def _send_to_external_audit_service(self, audit_entry: Dict[str, Any]) -> None:
         """
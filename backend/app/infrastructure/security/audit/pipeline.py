@@ -0,0 +1,664 @@
+# -*- coding: utf-8 -*-
+"""
+Asynchronous, Batched Audit Pipeline
+
+Moves audit serialization and I/O off the request path. Callers enqueue
+entry dictionaries on a bounded in-memory queue; a single background writer
+thread drains it in batches, appends each batch to the audit log file with
+one buffered write, fsyncs at a configurable interval and forwards the
+batch to additional sinks (console echo, bulk database insert).
+
+Tamper evidence: the writer hash-chains entries in the order they are
+written. Each JSON line carries ``prev_hash`` and ``hash`` where
+``hash = SHA-256(prev_hash || canonical JSON of the entry)``, so deleting,
+reordering or editing any line breaks every later hash. The chain resumes
+from the last line of an existing log file. When that file ends in lines
+written without a chain (an older log, or the synchronous fallback logger),
+the writer first appends an anchor entry that records the SHA-256 of every
+byte before it and restarts the chain from the genesis hash.
+``verify_chain`` checks a file.
+
+Back-pressure when the queue is full is configurable:
+
+- ``block``: the caller waits for space (no entry is ever lost)
+- ``spill``: the entry is appended to a spill file and the writer drains
+  the spill file into the chain once the queue empties
+
+While spilled entries wait to be drained, new entries are appended to the
+spill file behind them, so the chain keeps submission order. A batch the
+writer fails to write is spilled as well and retried.
+"""
+
+import atexit
+import hashlib
+import json
+import logging
+import os
+import queue
+import threading
+import time
+import uuid
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+GENESIS_HASH = "0" * 64
+OVERFLOW_BLOCK = "block"
+OVERFLOW_SPILL = "spill"
+CHAIN_ANCHOR_EVENT = "audit_chain_anchor"
+
+_STOP = object()
+# Bytes read from the end of an existing log to find the last chained line
+_TAIL_BYTES = 64 * 1024
+
+
+def canonical_json(entry: Dict[str, Any]) -> str:
+    """
+    Serialize an entry deterministically for hashing and storage.
+
+    Args:
+        entry: Audit entry
+
+    Returns:
+        Compact JSON with sorted keys
+    """
+    return json.dumps(entry, sort_keys=True, separators=(",", ":"), default=str)
+
+
+def chain_hash(previous_hash: str, body: str) -> str:
+    """
+    Compute the chained hash of one entry.
+
+    Args:
+        previous_hash: Hash of the preceding entry
+        body: Canonical JSON of the entry without chain fields
+
+    Returns:
+        Hex SHA-256 digest
+    """
+    return hashlib.sha256(f"{previous_hash}{body}".encode("utf-8")).hexdigest()
+
+
+def verify_chain(path: str) -> Optional[int]:
+    """
+    Verify the hash chain of an audit log file.
+
+    Lines without chain fields are valid only when a later anchor entry
+    covers them with the SHA-256 of every byte before it.
+
+    Args:
+        path: Audit log file written by AuditPipeline
+
+    Returns:
+        Zero-based line number of the first invalid entry, or None if the
+        whole file verifies
+    """
+    previous_hash = GENESIS_HASH
+    prefix = hashlib.sha256()
+    first_unanchored: Optional[int] = None
+    with open(path, "rb") as f:
+        for line_number, line in enumerate(f):
+            fields = _split_chain_fields(line)
+            if fields is None:
+                if first_unanchored is None:
+                    first_unanchored = line_number
+                prefix.update(line)
+                continue
+            claimed_previous, claimed_hash, entry = fields
+            if entry.get("event_type") == CHAIN_ANCHOR_EVENT:
+                expected_previous = GENESIS_HASH
+                valid = (entry.get("details") or {}).get("prefix_sha256") == prefix.hexdigest()
+            else:
+                expected_previous = previous_hash
+                valid = first_unanchored is None
+            if (
+                not valid
+                or claimed_previous != expected_previous
+                or chain_hash(expected_previous, canonical_json(entry)) != claimed_hash
+            ):
+                return line_number if first_unanchored is None else first_unanchored
+            previous_hash = claimed_hash
+            first_unanchored = None
+            prefix.update(line)
+    return first_unanchored
+
+
+class LoggerSink:
+    """Echo written audit entries to a standard logger from the writer thread."""
+
+    def __init__(self, target: logging.Logger, level: int = logging.INFO):
+        """
+        Initialize the sink.
+
+        Args:
+            target: Logger to emit entries on
+            level: Log level for each entry
+        """
+        self.target = target
+        self.level = level
+
+    def write_batch(self, entries: Sequence[Dict[str, Any]]) -> None:
+        """
+        Emit each entry as one log record.
+
+        Args:
+            entries: Chained audit entries
+        """
+        for entry in entries:
+            self.target.log(self.level, f"{entry.get('event_type', 'audit').upper()}: {canonical_json(entry)}")
+
+
+class SQLAlchemyAuditSink:
+    """
+    Persist written audit entries to the ``audit_logs`` table in bulk.
+
+    Each batch becomes one executemany INSERT and one commit. A batch that
+    keeps failing is inserted row by row so one bad row cannot discard the
+    rest; rows the database still refuses are appended to a rejects file
+    (JSON lines, chain fields included) for replay instead of being lost.
+    """
+
+    def __init__(
+        self,
+        session_factory: Callable[[], Any],
+        table: Any = None,
+        rejected_file: Optional[str] = None,
+        retries: int = 1,
+    ):
+        """
+        Initialize the sink.
+
+        Args:
+            session_factory: Callable returning a new SQLAlchemy Session
+            table: Target table (defaults to the AuditLog model's table)
+            rejected_file: JSON-lines file for entries the database refuses
+            retries: Extra attempts at the whole batch before inserting row by row
+        """
+        if table is None:
+            from app.infrastructure.persistence.sqlalchemy.models.audit_log import AuditLog
+
+            table = AuditLog.__table__
+        self.session_factory = session_factory
+        self.table = table
+        self.rejected_file = rejected_file
+        self.retries = max(0, retries)
+        self.rejected = 0
+
+    def write_batch(self, entries: Sequence[Dict[str, Any]]) -> None:
+        """
+        Insert a batch of entries.
+
+        Args:
+            entries: Chained audit entries
+
+        Raises:
+            RuntimeError: If rows were refused and there is no rejects file
+        """
+        rows = [self._row(entry) for entry in entries]
+        for attempt in range(self.retries + 1):
+            try:
+                self._insert(rows)
+                return
+            except Exception as e:
+                logger.warning(f"Audit batch insert failed (attempt {attempt + 1}): {e}")
+
+        # Isolate the rows the database refuses
+        refused = []
+        for entry, row in zip(entries, rows):
+            try:
+                self._insert([row])
+                continue
+            except Exception as e:
+                error = e
+            if row["user_id"] is not None:
+                # Usually the users foreign key: keep the row, with the principal in details
+                salvaged = {**row, "user_id": None, "details": {**row["details"], "user_id": str(row["user_id"])}}
+                try:
+                    self._insert([salvaged])
+                    continue
+                except Exception as e:
+                    error = e
+            logger.error(f"Audit entry {entry.get('hash')} refused by the database: {error}")
+            refused.append(entry)
+        if refused:
+            self._reject(refused)
+
+    def _insert(self, rows: List[Dict[str, Any]]) -> None:
+        """Insert rows in one transaction."""
+        from sqlalchemy import insert
+
+        session = self.session_factory()
+        try:
+            session.execute(insert(self.table), rows)
+            session.commit()
+        except Exception:
+            session.rollback()
+            raise
+        finally:
+            session.close()
+
+    def _reject(self, entries: List[Dict[str, Any]]) -> None:
+        """Append refused entries to the rejects file."""
+        self.rejected += len(entries)
+        if not self.rejected_file:
+            raise RuntimeError(f"{len(entries)} audit entries refused by the database and no rejects file is set")
+        with open(self.rejected_file, "a", encoding="utf-8") as f:
+            f.write("".join(canonical_json(entry) + "\n" for entry in entries))
+
+    @staticmethod
+    def _row(entry: Dict[str, Any]) -> Dict[str, Any]:
+        """Map an audit entry onto audit_logs columns."""
+        details = dict(entry.get("details") or {})
+        user_id = _as_uuid(entry.get("user_id"))
+        if user_id is None and entry.get("user_id") is not None:
+            # Non-UUID principals (service accounts, anonymous) are kept in details
+            details["user_id"] = entry["user_id"]
+        return {
+            "id": _as_uuid(entry.get("event_id")) or uuid.uuid4(),
+            "timestamp": datetime.fromisoformat(entry["timestamp"]),
+            "event_type": entry.get("event_type", "audit"),
+            "user_id": user_id,
+            "ip_address": entry.get("ip_address"),
+            "action": entry.get("action") or entry.get("auth_type") or "unknown",
+            "resource_type": entry.get("resource_type"),
+            "resource_id": entry.get("resource_id"),
+            "success": entry.get("success"),
+            "details": details,
+            "previous_hash": entry.get("prev_hash"),
+            "entry_hash": entry.get("hash"),
+        }
+
+
+class AuditPipeline:
+    """
+    Bounded queue plus background writer for audit entries.
+
+    ``submit`` only enqueues; serialization, hashing, file writes, fsync
+    and sink calls all happen on the writer thread.
+    """
+
+    def __init__(
+        self,
+        log_file: Optional[str] = None,
+        sinks: Optional[List[Any]] = None,
+        max_queue_size: int = 10000,
+        batch_size: int = 500,
+        flush_interval: float = 0.05,
+        fsync_interval: float = 1.0,
+        overflow_policy: str = OVERFLOW_BLOCK,
+        spill_file: Optional[str] = None,
+    ):
+        """
+        Initialize the pipeline and start the writer thread.
+
+        Args:
+            log_file: Append-only JSON-lines audit file (None to skip the file)
+            sinks: Objects with ``write_batch(entries)`` called for each batch
+            max_queue_size: Entries buffered in memory before back-pressure
+            batch_size: Maximum entries per write
+            flush_interval: Seconds the writer waits for more entries when idle
+            fsync_interval: Seconds between fsyncs of the log file (0 fsyncs every batch)
+            overflow_policy: "block" or "spill" when the queue is full
+            spill_file: Spill file path (defaults to ``<log_file>.spill``)
+
+        Raises:
+            ValueError: If the overflow policy is unknown or spilling has no file
+        """
+        if overflow_policy not in (OVERFLOW_BLOCK, OVERFLOW_SPILL):
+            raise ValueError(f"Unknown audit overflow policy: {overflow_policy}")
+        self.log_file = log_file
+        self.sinks = list(sinks or [])
+        self.batch_size = max(1, batch_size)
+        self.flush_interval = flush_interval
+        self.fsync_interval = fsync_interval
+        self.overflow_policy = overflow_policy
+        self.spill_file = spill_file or (f"{log_file}.spill" if log_file else None)
+        if overflow_policy == OVERFLOW_SPILL and not self.spill_file:
+            raise ValueError("The spill overflow policy requires a spill file")
+
+        self._queue: "queue.Queue[Any]" = queue.Queue(maxsize=max_queue_size)
+        self._spill_lock = threading.Lock()
+        self._spill_pending = bool(self.spill_file and os.path.exists(self.spill_file))
+        self._counter_lock = threading.Lock()
+        self._file = None
+        self._last_fsync = time.monotonic()
+        self._unsynced = False
+
+        self.submitted = 0
+        self.written = 0
+        self.spilled = 0
+        self.dropped = 0
+        self.batches = 0
+        self.sink_errors = 0
+        self.write_errors = 0
+        self._closed = False
+
+        self.previous_hash = GENESIS_HASH
+        if log_file:
+            directory = os.path.dirname(log_file)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            last_hash = _last_chain_hash(log_file)
+            self._file = open(log_file, "a", encoding="utf-8")
+            if last_hash is None:
+                self._anchor_chain()
+            else:
+                self.previous_hash = last_hash
+        self._thread = threading.Thread(target=self._run, name="audit-writer", daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+
+    def submit(self, entry: Dict[str, Any]) -> None:
+        """
+        Enqueue an audit entry for the writer.
+
+        Args:
+            entry: JSON-serializable audit entry; must not be mutated afterwards
+        """
+        with self._counter_lock:
+            self.submitted += 1
+        if not self._spill_pending:
+            try:
+                self._queue.put_nowait(entry)
+                return
+            except queue.Full:
+                pass
+            if self.overflow_policy == OVERFLOW_BLOCK:
+                self._queue.put(entry)
+                return
+        # Queue full, or older entries are still in the spill file: queue behind them
+        self._spill(self._serialize([entry]))
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """
+        Wait until everything submitted so far is written and fsynced.
+
+        Args:
+            timeout: Maximum seconds to wait
+
+        Returns:
+            True if the flush completed within the timeout
+        """
+        if self._closed:
+            return True
+        done = threading.Event()
+        self._queue.put(done)
+        return done.wait(timeout)
+
+    def close(self, timeout: Optional[float] = 10.0) -> None:
+        """
+        Drain the queue, stop the writer and close the log file.
+
+        Args:
+            timeout: Maximum seconds to wait for the writer
+        """
+        if self._closed:
+            return
+        self._closed = True
+        self._queue.put(_STOP)
+        self._thread.join(timeout)
+        try:
+            atexit.unregister(self.close)
+        except Exception:
+            pass
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Return pipeline counters.
+
+        Returns:
+            Dictionary of counters and the current queue depth
+        """
+        return {
+            "submitted": self.submitted,
+            "written": self.written,
+            "spilled": self.spilled,
+            "dropped": self.dropped,
+            "batches": self.batches,
+            "sink_errors": self.sink_errors,
+            "write_errors": self.write_errors,
+            "queue_depth": self._queue.qsize(),
+            "overflow_policy": self.overflow_policy,
+        }
+
+    def _run(self) -> None:
+        """Writer loop: collect a batch, write it, signal flush waiters."""
+        # Entries spilled before a restart are older than anything queued now
+        self._drain_spill()
+        stopping = False
+        while not stopping:
+            try:
+                item = self._queue.get(timeout=self.flush_interval)
+            except queue.Empty:
+                self._drain_spill()
+                self._sync(force=self._unsynced)
+                continue
+
+            batch: List[Dict[str, Any]] = []
+            waiters: List[threading.Event] = []
+            while True:
+                if item is _STOP:
+                    stopping = True
+                elif isinstance(item, threading.Event):
+                    waiters.append(item)
+                else:
+                    batch.append(item)
+                if stopping or len(batch) >= self.batch_size:
+                    break
+                try:
+                    item = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+
+            try:
+                self._write_or_spill(batch)
+                if waiters or stopping or self._queue.empty():
+                    self._drain_spill()
+                self._sync(force=bool(waiters) or stopping)
+            finally:
+                for waiter in waiters:
+                    waiter.set()
+
+        if self._file is not None:
+            self._file.close()
+
+    def _serialize(self, entries: Sequence[Any]) -> List[Tuple[Dict[str, Any], str]]:
+        """Pair entries with their canonical JSON, dropping any that cannot be serialized."""
+        serialized = []
+        for entry in entries:
+            try:
+                if not isinstance(entry, dict):
+                    raise TypeError(f"expected a dict, got {type(entry).__name__}")
+                serialized.append((entry, canonical_json(entry)))
+            except (TypeError, ValueError) as e:
+                event_type = entry.get("event_type") if isinstance(entry, dict) else type(entry).__name__
+                logger.error(f"Dropping unserializable audit entry ({event_type}): {e}")
+                with self._counter_lock:
+                    self.dropped += 1
+        return serialized
+
+    def _spill(self, serialized: List[Tuple[Dict[str, Any], str]]) -> None:
+        """Append serialized entries to the spill file for the writer to drain in order."""
+        with self._spill_lock:
+            with open(self.spill_file, "a", encoding="utf-8") as f:
+                f.write("".join(body + "\n" for _, body in serialized))
+            self._spill_pending = True
+            self.spilled += len(serialized)
+
+    def _write_or_spill(self, batch: List[Dict[str, Any]]) -> None:
+        """Write a batch; if that fails, spill it so the writer keeps running."""
+        batch = self._serialize(batch)
+        try:
+            self._write(batch)
+            return
+        except Exception as e:
+            self.write_errors += 1
+            logger.error(f"Failed to write {len(batch)} audit entries: {e}", exc_info=True)
+        if not self.spill_file:
+            logger.error(f"Lost {len(batch)} audit entries: no spill file configured")
+            return
+        try:
+            self._spill(batch)
+        except OSError as e:
+            logger.error(f"Lost {len(batch)} audit entries: failed to spill them: {e}")
+
+    def _drain_spill(self) -> None:
+        """Move spilled entries into the chain once the queue has room."""
+        if not self._spill_pending:
+            return
+        draining = f"{self.spill_file}.draining"
+        with self._spill_lock:
+            self._spill_pending = False
+            if not os.path.exists(draining):
+                try:
+                    os.replace(self.spill_file, draining)
+                except FileNotFoundError:
+                    return
+        try:
+            with open(draining, "r", encoding="utf-8") as f:
+                while True:
+                    lines = [line for line in (f.readline() for _ in range(self.batch_size)) if line]
+                    if not lines:
+                        break
+                    try:
+                        self._write(self._serialize(_parse_spilled(lines)))
+                    except Exception:
+                        # Keep only what is not in the chain yet, for the next attempt
+                        _replace_contents(draining, lines, f)
+                        raise
+            self._sync(force=True)
+            os.remove(draining)
+        except Exception as e:
+            self.write_errors += 1
+            logger.error(f"Failed to drain audit spill file: {e}")
+            with self._spill_lock:
+                self._spill_pending = True
+        with self._spill_lock:
+            if self.spill_file and os.path.exists(self.spill_file):
+                self._spill_pending = True
+
+    def _anchor_chain(self) -> None:
+        """Start a new chain after lines written without one, covering them by digest."""
+        prefix = hashlib.sha256()
+        last_byte = b"\n"
+        with open(self.log_file, "rb") as f:
+            for block in iter(lambda: f.read(1 << 20), b""):
+                prefix.update(block)
+                last_byte = block[-1:]
+        if last_byte != b"\n":
+            # Terminate a torn last line so the anchor starts on its own line
+            self._file.write("\n")
+            self._file.flush()
+            prefix.update(b"\n")
+        self.previous_hash = GENESIS_HASH
+        self._write(self._serialize([{
+            "event_id": str(uuid.uuid4()),
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "event_type": CHAIN_ANCHOR_EVENT,
+            "action": "chain_anchor",
+            "details": {"prefix_sha256": prefix.hexdigest()},
+        }]))
+        self._sync(force=True)
+
+    def _write(self, batch: List[Tuple[Dict[str, Any], str]]) -> None:
+        """Chain, write and forward one batch; a failed file write raises before the chain advances."""
+        if not batch:
+            return
+        chained = []
+        lines = []
+        previous_hash = self.previous_hash
+        for entry, body in batch:
+            entry_hash = chain_hash(previous_hash, body)
+            chain_fields = f'"prev_hash":"{previous_hash}","hash":"{entry_hash}"}}'
+            lines.append(f"{body[:-1]},{chain_fields}" if len(body) > 2 else "{" + chain_fields)
+            chained.append({**entry, "prev_hash": previous_hash, "hash": entry_hash})
+            previous_hash = entry_hash
+
+        if self._file is not None:
+            self._file.write("\n".join(lines) + "\n")
+            self._file.flush()
+            self._unsynced = True
+        self.previous_hash = previous_hash
+        self.written += len(lines)
+        self.batches += 1
+
+        for sink in self.sinks:
+            try:
+                sink.write_batch(chained)
+            except Exception as e:
+                self.sink_errors += 1
+                logger.error(f"Audit sink {type(sink).__name__} failed for {len(chained)} entries: {e}")
+
+    def _sync(self, force: bool = False) -> None:
+        """fsync the log file if the interval elapsed (or when forced)."""
+        if self._file is None or not self._unsynced:
+            return
+        now = time.monotonic()
+        if force or now - self._last_fsync >= self.fsync_interval:
+            try:
+                os.fsync(self._file.fileno())
+            except OSError as e:
+                logger.error(f"Failed to fsync audit log: {e}")
+            self._last_fsync = now
+            self._unsynced = False
+
+
+def _split_chain_fields(line: bytes) -> Optional[Tuple[str, str, Dict[str, Any]]]:
+    """Parse a log line into (prev_hash, hash, entry), or None if it is not chained."""
+    try:
+        entry = json.loads(line)
+        return entry.pop("prev_hash"), entry.pop("hash"), entry
+    except (ValueError, KeyError, AttributeError, TypeError):
+        return None
+
+
+def _parse_spilled(lines: List[str]) -> List[Dict[str, Any]]:
+    """Parse spill file lines, skipping unreadable ones."""
+    entries = []
+    for line in lines:
+        try:
+            entries.append(json.loads(line))
+        except ValueError:
+            logger.error("Skipping unreadable line in audit spill file")
+    return entries
+
+
+def _replace_contents(path: str, lines: List[str], rest: Any) -> None:
+    """Rewrite a file as the given lines followed by the unread part of an open file."""
+    with open(f"{path}.tmp", "w", encoding="utf-8") as out:
+        out.writelines(lines)
+        out.write(rest.read())
+    os.replace(f"{path}.tmp", path)
+
+
+def _last_chain_hash(path: str) -> Optional[str]:
+    """
+    Read the hash of the last line of an existing audit log.
+
+    Returns the genesis hash for a missing or empty log, and None when the
+    log ends in a line without a chain (it needs an anchor before new entries).
+    """
+    try:
+        with open(path, "rb") as f:
+            f.seek(0, os.SEEK_END)
+            size = f.tell()
+            f.seek(max(0, size - _TAIL_BYTES))
+            lines = f.read().splitlines()
+    except FileNotFoundError:
+        return GENESIS_HASH
+    for line in reversed(lines):
+        if not line.strip():
+            continue
+        fields = _split_chain_fields(line)
+        return fields[1] if fields is not None else None
+    return GENESIS_HASH
+
+
+def _as_uuid(value: Any) -> Optional[uuid.UUID]:
+    if isinstance(value, uuid.UUID):
+        return value
+    try:
+        return uuid.UUID(str(value))
+    except (TypeError, ValueError):
+        return None
@@ -0,0 +1,404 @@
+# -*- coding: utf-8 -*-
+"""
+Authenticated Principal Cache.
+
+Caches the result of authenticating a bearer token - the decoded
+TokenPayload plus the resolved user and its scopes - so repeat requests with
+the same token skip signature verification and the user lookup.
+
+Entries are keyed by a SHA-256 digest of the raw token (never the token
+itself) and live until the earlier of the token's ``exp`` and a short TTL,
+which bounds how long a role change made outside this process can go
+unnoticed.
+
+Revocations are explicit: ``revoke_token`` (logout) remembers the token's
+``jti`` until it expires and ``invalidate_subject`` (role change,
+deactivation) drops every cached principal of a user. With a Redis cache
+attached, revoked jtis are stored in Redis and both kinds of revocation are
+published on a pub/sub channel so every worker drops its local entries.
+"""
+
+import asyncio
+import hashlib
+import logging
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Dict, Optional, Set, Tuple
+
+from app.core.models.token_models import TokenPayload
+
+logger = logging.getLogger(__name__)
+
+REVOCATION_CHANNEL = "auth:principal:revoke"
+REVOKED_JTI_PREFIX = "auth:revoked:"
+
+# Seconds to wait before re-subscribing after the revocation listener fails
+_RESUBSCRIBE_DELAY_SECONDS = 1.0
+
+
+@dataclass(frozen=True)
+class CachedPrincipal:
+    """An authenticated token: its payload, resolved user and scopes."""
+
+    payload: TokenPayload
+    user: Any
+    scopes: Tuple[str, ...]
+
+    @property
+    def subject(self) -> str:
+        """User ID the token was issued to."""
+        return str(self.payload.sub)
+
+
+def token_digest(token: str) -> str:
+    """
+    Return the cache key for a raw bearer token.
+
+    Args:
+        token: Encoded JWT
+
+    Returns:
+        Hex SHA-256 digest of the token
+    """
+    return hashlib.sha256(token.encode("utf-8")).hexdigest()
+
+
+def _expiry_timestamp(value: Any) -> float:
+    """Convert a TokenPayload ``exp`` (datetime or epoch seconds) to epoch seconds."""
+    if isinstance(value, datetime):
+        return value.timestamp()
+    return float(value)
+
+
+class PrincipalCache:
+    """
+    Bounded LRU cache of authenticated principals.
+
+    Lookups are synchronous and never touch the network; only revocations
+    (and the revoked-jti check made after a cache miss) use Redis.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 10000,
+        ttl_seconds: float = 60.0,
+        redis_cache: Any = None,
+        channel: str = REVOCATION_CHANNEL,
+    ):
+        """
+        Initialize PrincipalCache.
+
+        Args:
+            max_entries: Maximum cached principals before LRU eviction
+            ttl_seconds: Upper bound on how long a principal is served from
+                memory, regardless of token lifetime
+            redis_cache: Optional RedisCache used to share revocations
+            channel: Pub/sub channel for revocation messages
+        """
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.redis_cache = redis_cache
+        self.channel = channel
+        self._entries: "OrderedDict[str, Tuple[CachedPrincipal, float]]" = OrderedDict()
+        self._by_subject: Dict[str, Set[str]] = {}
+        self._by_jti: Dict[str, str] = {}
+        # Revoked jti -> token expiry; a revoked token is rejected until it expires anyway
+        self._revoked: Dict[str, float] = {}
+        self._listener_task: Optional[asyncio.Task] = None
+        self._counters = {"hits": 0, "misses": 0, "evictions": 0, "expirations": 0, "invalidations": 0}
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, token: str) -> Optional[CachedPrincipal]:
+        """
+        Return the cached principal for a token, if still valid.
+
+        Args:
+            token: Encoded JWT
+
+        Returns:
+            The cached principal, or None on a miss
+        """
+        key = token_digest(token)
+        item = self._entries.get(key)
+        if item is None:
+            self._counters["misses"] += 1
+            return None
+        principal, expires_at = item
+        if time.time() >= expires_at:
+            self._remove(key)
+            self._counters["expirations"] += 1
+            self._counters["misses"] += 1
+            return None
+        self._entries.move_to_end(key)
+        self._counters["hits"] += 1
+        return principal
+
+    def put(self, token: str, principal: CachedPrincipal) -> None:
+        """
+        Cache the principal for a verified token.
+
+        Args:
+            token: Encoded JWT
+            principal: Authentication result for the token
+        """
+        now = time.time()
+        expires_at = min(_expiry_timestamp(principal.payload.exp), now + self.ttl_seconds)
+        jti = principal.payload.jti
+        if expires_at <= now or (jti is not None and jti in self._revoked):
+            return
+
+        key = token_digest(token)
+        self._remove(key)
+        self._entries[key] = (principal, expires_at)
+        self._by_subject.setdefault(principal.subject, set()).add(key)
+        if jti is not None:
+            self._by_jti[jti] = key
+        while len(self._entries) > self.max_entries:
+            oldest = next(iter(self._entries))
+            self._remove(oldest)
+            self._counters["evictions"] += 1
+
+    async def is_revoked(self, jti: Optional[str]) -> bool:
+        """
+        Check whether a token ID has been revoked.
+
+        Called after a cache miss, so the Redis round-trip (if any) is paid
+        once per token per worker rather than on every request.
+
+        Args:
+            jti: Token ID claim
+
+        Returns:
+            True if the token was revoked
+        """
+        if jti is None:
+            return False
+        expires_at = self._revoked.get(jti)
+        if expires_at is not None:
+            if time.time() < expires_at:
+                return True
+            del self._revoked[jti]
+        if self.redis_cache is None:
+            return False
+        try:
+            return bool(await self.redis_cache.exists(f"{REVOKED_JTI_PREFIX}{jti}"))
+        except Exception as e:
+            logger.warning(f"Failed to check token revocation in Redis: {str(e)}")
+            return False
+
+    async def revoke_token(self, jti: str, expires_at: Any) -> None:
+        """
+        Revoke a token (e.g., on logout) until it expires.
+
+        Args:
+            jti: Token ID claim
+            expires_at: Token ``exp`` claim (datetime or epoch seconds)
+        """
+        expiry = _expiry_timestamp(expires_at)
+        self._revoke_local(jti, expiry)
+        if self.redis_cache is None:
+            return
+        remaining = int(expiry - time.time()) + 1
+        try:
+            if remaining > 0:
+                await self.redis_cache.set(f"{REVOKED_JTI_PREFIX}{jti}", expiry, expiration=remaining)
+            await self._publish(f"jti:{jti}:{expiry}")
+        except Exception as e:
+            logger.warning(f"Failed to share token revocation through Redis: {str(e)}")
+
+    async def invalidate_subject(self, subject: Any) -> None:
+        """
+        Drop every cached principal of a user (role change, deactivation).
+
+        Args:
+            subject: User ID
+        """
+        self.invalidate_local(subject=str(subject))
+        try:
+            await self._publish(f"sub:{subject}")
+        except Exception as e:
+            logger.warning(f"Failed to publish principal invalidation for {subject}: {str(e)}")
+
+    def invalidate_local(self, subject: Optional[str] = None) -> None:
+        """
+        Drop one user's principals, or every principal, from this worker.
+
+        Args:
+            subject: User ID; None clears the whole cache
+        """
+        if subject is None:
+            keys = list(self._entries)
+        else:
+            keys = list(self._by_subject.get(subject, ()))
+        for key in keys:
+            self._remove(key)
+        self._counters["invalidations"] += len(keys)
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get cache counters.
+
+        Returns:
+            Entry count, hit/miss/eviction/expiration/invalidation counters,
+            revoked token count and hit ratio
+        """
+        lookups = self._counters["hits"] + self._counters["misses"]
+        return {
+            "entries": len(self._entries),
+            "revoked": len(self._revoked),
+            **self._counters,
+            "hit_ratio": self._counters["hits"] / lookups if lookups else 0.0,
+        }
+
+    async def start(self) -> None:
+        """Start listening for revocations published by other workers."""
+        if self.redis_cache is None or self._listener_task is not None:
+            return
+        await self.redis_cache.initialize()
+        client = getattr(self.redis_cache, "_client", None)
+        if hasattr(client, "pubsub"):
+            self._listener_task = asyncio.create_task(self._listen_for_revocations())
+
+    async def close(self) -> None:
+        """Stop the revocation listener and clear the cache."""
+        if self._listener_task is not None:
+            self._listener_task.cancel()
+            try:
+                await self._listener_task
+            except (asyncio.CancelledError, Exception):
+                pass
+            self._listener_task = None
+        self.invalidate_local()
+
+    def apply_revocation(self, message: str) -> None:
+        """
+        Apply a revocation message published by another worker.
+
+        Args:
+            message: "jti:<jti>:<expiry>" or "sub:<user id>"
+        """
+        kind, _, rest = message.partition(":")
+        if kind == "sub":
+            self.invalidate_local(subject=rest)
+        elif kind == "jti":
+            jti, _, expiry = rest.rpartition(":")
+            try:
+                self._revoke_local(jti, float(expiry))
+            except ValueError:
+                logger.warning(f"Ignoring malformed principal revocation: {message}")
+
+    def _revoke_local(self, jti: str, expiry: float) -> None:
+        """Remember a revoked jti and drop its cached principal."""
+        self._revoked[jti] = expiry
+        key = self._by_jti.get(jti)
+        if key is not None:
+            self._remove(key)
+            self._counters["invalidations"] += 1
+        now = time.time()
+        if len(self._revoked) > self.max_entries:
+            self._revoked = {j: e for j, e in self._revoked.items() if e > now}
+
+    def _remove(self, key: str) -> None:
+        """Remove an entry and its index references."""
+        item = self._entries.pop(key, None)
+        if item is None:
+            return
+        principal = item[0]
+        keys = self._by_subject.get(principal.subject)
+        if keys is not None:
+            keys.discard(key)
+            if not keys:
+                del self._by_subject[principal.subject]
+        if principal.payload.jti is not None and self._by_jti.get(principal.payload.jti) == key:
+            del self._by_jti[principal.payload.jti]
+
+    async def _publish(self, message: str) -> None:
+        """Announce a revocation to other workers."""
+        if self.redis_cache is None:
+            return
+        client = getattr(self.redis_cache, "_client", None)
+        if client is not None and hasattr(client, "publish"):
+            await client.publish(self.channel, message)
+
+    async def _listen_for_revocations(self) -> None:
+        """Apply revocations published by other workers until cancelled."""
+        client = self.redis_cache._client
+        while True:
+            pubsub = None
+            try:
+                pubsub = client.pubsub()
+                await pubsub.subscribe(self.channel)
+                async for message in pubsub.listen():
+                    if message.get("type") != "message":
+                        continue
+                    data = message["data"]
+                    if isinstance(data, bytes):
+                        data = data.decode("utf-8", errors="replace")
+                    self.apply_revocation(str(data))
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"Principal revocation listener failed, clearing cache: {str(e)}")
+            finally:
+                if pubsub is not None:
+                    try:
+                        await pubsub.aclose()
+                    except Exception:
+                        pass
+
+            # Revocations may have been missed while disconnected
+            self.invalidate_local()
+            await asyncio.sleep(_RESUBSCRIBE_DELAY_SECONDS)
+
+
+_principal_cache: Optional[PrincipalCache] = None
+
+
+def get_principal_cache() -> PrincipalCache:
+    """
+    Return the process-wide principal cache, configured from settings.
+
+    Logout and user-management code revoke through this instance so the
+    authentication middleware sees the change immediately.
+
+    Returns:
+        The shared PrincipalCache
+    """
+    global _principal_cache
+    if _principal_cache is None:
+        from app.config.settings import get_settings
+
+        settings = get_settings()
+        redis_cache = None
+        if settings.AUTH_PRINCIPAL_CACHE_SHARED:
+            from app.infrastructure.cache.redis_cache import RedisCache
+
+            redis_cache = RedisCache()
+        _principal_cache = PrincipalCache(
+            max_entries=settings.AUTH_PRINCIPAL_CACHE_SIZE,
+            ttl_seconds=settings.AUTH_PRINCIPAL_CACHE_TTL_SECONDS,
+            redis_cache=redis_cache,
+        )
+    return _principal_cache
+
+
+async def invalidate_principals(subject: Any) -> None:
+    """
+    Drop a user's cached principals in every worker.
+
+    Called by user management after a role change, deactivation or
+    deletion. Does nothing while the principal cache is disabled.
+
+    Args:
+        subject: User ID
+    """
+    if _principal_cache is None:
+        from app.config.settings import get_settings
+
+        if not get_settings().AUTH_PRINCIPAL_CACHE_ENABLED:
+            return
+    await get_principal_cache().invalidate_subject(subject)
@@ -147,6 +147,19 @@ class JWTService(JWTServiceInterface):
             # Catch PyJWT errors and Pydantic validation errors
             raise InvalidTokenError(f"Token validation failed: {e}") from e
 
+    async def verify_token(self, token: str) -> TokenPayload:
+        """
+        Verify a token's signature and claims and return its payload.
+
+        Alias of ``decode_token`` used by the authentication middleware and
+        dependencies.
+
+        Raises:
+            TokenExpiredError: If the token has expired.
+            InvalidTokenError: If the token is invalid or cannot be decoded.
+        """
+        return await self.decode_token(token)
+
 
 # Provider function
 def get_jwt_service(settings: Settings = Depends(get_settings)) -> JWTService:
@@ -0,0 +1,223 @@
+# -*- coding: utf-8 -*-
+"""
+Combined PHI Pattern Engine.
+
+Scanning every response string once per PHI pattern dominates sanitization
+cost. This engine folds all patterns into a single alternation ("gate") so a
+string is scanned once to find the earliest position at which *any* pattern
+can match. Strings without PHI (the overwhelming majority: keys, ids,
+timestamps, labels) are rejected after that single pass. For the rest, only
+patterns whose cheap literal prerequisites are present are run, starting from
+the gate position rather than from the beginning of the string.
+
+Because an alternation reports the leftmost position at which any
+alternative matches, no individual pattern can match before the gate
+position, so the engine yields exactly the same matches as running every
+pattern with ``finditer`` over the whole string.
+"""
+
+import logging
+import re
+from typing import (
+    Any, Callable, Dict, FrozenSet, Hashable, Iterator, List, Match, Optional, Pattern, Sequence, Tuple,
+)
+
+logger = logging.getLogger(__name__)
+
+_DIGIT = re.compile(r"\d")
+
+# Backreferences are numbered relative to the whole expression, so patterns
+# that use them cannot be embedded in the combined alternation.
+_BACKREFERENCE = re.compile(r"\\[1-9]|\(\?P=")
+
+_INLINE_FLAGS: Tuple[Tuple[int, str], ...] = (
+    (re.IGNORECASE, "i"),
+    (re.MULTILINE, "m"),
+    (re.DOTALL, "s"),
+    (re.VERBOSE, "x"),
+)
+
+# Upper bound on cached scan plans (one per profile and literal-feature combination)
+_MAX_CACHED_PLANS = 256
+
+
+class _EnginePattern:
+    """A compiled pattern plus the literal prerequisites used to prefilter it."""
+
+    __slots__ = ("key", "compiled", "requires_digit", "requires_any", "gateable", "source")
+
+    def __init__(
+        self,
+        key: Any,
+        compiled: Pattern,
+        requires_digit: bool = False,
+        requires_any: Sequence[str] = (),
+    ):
+        self.key = key
+        self.compiled = compiled
+        self.requires_digit = requires_digit
+        self.requires_any = tuple(requires_any)
+        self.source = _to_scoped_source(compiled)
+        self.gateable = self.source is not None
+
+    def applies_to(self, has_digit: bool, present: FrozenSet[str]) -> bool:
+        """Return False when the pattern provably cannot match the text."""
+        if self.requires_digit and not has_digit:
+            return False
+        if self.requires_any and present.isdisjoint(self.requires_any):
+            return False
+        return True
+
+
+def _to_scoped_source(compiled: Pattern) -> Optional[str]:
+    """
+    Rewrite a compiled pattern as a self-contained alternation branch.
+
+    Global flags become a scoped inline-flag group so each branch keeps its
+    own semantics inside the combined expression.
+
+    Returns:
+        The branch source, or None if the pattern cannot be safely embedded
+    """
+    if not isinstance(compiled.pattern, str) or _BACKREFERENCE.search(compiled.pattern):
+        return None
+
+    remaining = compiled.flags & ~re.UNICODE
+    letters = ""
+    for flag, letter in _INLINE_FLAGS:
+        if remaining & flag:
+            letters += letter
+            remaining &= ~flag
+    if remaining:
+        # ASCII/LOCALE/DEBUG etc. are not worth special-casing; scan separately
+        return None
+
+    source = f"(?{letters}:{compiled.pattern})" if letters else f"(?:{compiled.pattern})"
+    try:
+        # e.g. a leading global inline flag is invalid once wrapped in a group
+        re.compile(source)
+    except re.error:
+        return None
+    return source
+
+
+class CombinedPatternEngine:
+    """
+    Single-pass candidate finder over a fixed set of PHI patterns.
+
+    Patterns are registered in scan order; ``scan`` yields ``(key, match)``
+    pairs in exactly the order that iterating the patterns in that order and
+    calling ``finditer`` on each would produce.
+
+    Which patterns apply to a string depends only on the caller's profile
+    (e.g. sensitivity) and on which prefilter literals the string contains,
+    so the resulting scan plan (active patterns plus their combined gate) is
+    computed once per combination and reused.
+    """
+
+    def __init__(self) -> None:
+        """Initialize an empty engine."""
+        self._patterns: List[_EnginePattern] = []
+        self._literals: Tuple[str, ...] = ()
+        self._plans: Dict[Hashable, Tuple[Tuple[_EnginePattern, ...], Optional[Pattern]]] = {}
+
+    def add_pattern(
+        self,
+        key: Any,
+        compiled: Pattern,
+        requires_digit: bool = False,
+        requires_any: Sequence[str] = (),
+    ) -> None:
+        """
+        Register a compiled pattern.
+
+        Args:
+            key: Opaque value returned with each match (e.g. the pattern definition)
+            compiled: Compiled regular expression
+            requires_digit: The pattern can only match text containing a digit
+            requires_any: The pattern can only match text containing at least
+                one of these literal substrings
+        """
+        pattern = _EnginePattern(key, compiled, requires_digit, requires_any)
+        self._patterns.append(pattern)
+        self._literals = tuple(dict.fromkeys(self._literals + pattern.requires_any))
+        self._plans.clear()
+
+    def __len__(self) -> int:
+        return len(self._patterns)
+
+    def scan(
+        self,
+        text: str,
+        include: Optional[Callable[[Any], bool]] = None,
+        profile: Hashable = None,
+    ) -> Iterator[Tuple[Any, Match]]:
+        """
+        Yield every match of every applicable pattern.
+
+        Args:
+            text: Text to scan
+            include: Optional predicate on a pattern key restricting which
+                patterns are considered (e.g. those enabled by sensitivity)
+            profile: Hashable value that fully determines ``include``'s
+                answers; scan plans are cached per profile
+
+        Yields:
+            (key, match) tuples, grouped by pattern in registration order
+        """
+        if not text:
+            return
+
+        has_digit = _DIGIT.search(text) is not None
+        present = frozenset(literal for literal in self._literals if literal in text)
+        active, gate = self._get_plan(include, profile, has_digit, present)
+        if not active:
+            return
+
+        gate_start: Optional[int] = 0
+        if gate is not None:
+            first = gate.search(text)
+            gate_start = first.start() if first is not None else None
+
+        for pattern in active:
+            if pattern.gateable:
+                if gate_start is None:
+                    continue
+                start = gate_start
+            else:
+                start = 0
+            for match in pattern.compiled.finditer(text, start):
+                yield pattern.key, match
+
+    def _get_plan(
+        self,
+        include: Optional[Callable[[Any], bool]],
+        profile: Hashable,
+        has_digit: bool,
+        present: FrozenSet[str],
+    ) -> Tuple[Tuple[_EnginePattern, ...], Optional[Pattern]]:
+        """Return (and cache) the active patterns and combined gate for a scan."""
+        # Without a profile the predicate's answers are unknown, so don't cache
+        cacheable = include is None or profile is not None
+        plan_key = (profile, has_digit, present)
+        if cacheable and plan_key in self._plans:
+            return self._plans[plan_key]
+
+        active = tuple(
+            pattern for pattern in self._patterns
+            if (include is None or include(pattern.key)) and pattern.applies_to(has_digit, present)
+        )
+        branches = [pattern.source for pattern in active if pattern.gateable]
+        gate: Optional[Pattern] = None
+        if branches:
+            try:
+                gate = re.compile("|".join(branches))
+            except re.error as e:
+                logger.warning(f"Could not build combined PHI pattern gate: {e}")
+                gate = None
+
+        if cacheable:
+            if len(self._plans) >= _MAX_CACHED_PLANS:
+                self._plans.clear()
+            self._plans[plan_key] = (active, gate)
+        return active, gate
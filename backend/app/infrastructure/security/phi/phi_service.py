@@ -9,11 +9,14 @@ It consolidates logic from various previous implementations.
 
 import re
 import logging
+from bisect import bisect_left
 from enum import Enum, auto
 from typing import Any, Dict, List, Optional, Pattern, Set, Union, Tuple
 from datetime import date, datetime, timezone # Added timezone
 import uuid # For potential anonymous value generation
 
+from app.infrastructure.security.phi.pattern_engine import CombinedPatternEngine
+
 logger = logging.getLogger(__name__)
 
 class PHIType(Enum):
@@ -64,11 +67,14 @@ class PHIService:
 
     # --- Core Pattern Definitions (Combined & Prioritized) ---
     # Priority: Higher number = matched first in overlaps. Type maps to PHIType enum.
+    # Optional prefilter hints used by the combined engine (must be necessary conditions):
+    #   requires_digit: pattern cannot match text without a digit
+    #   requires_any: pattern cannot match text lacking all of these literals
     # Adapted from enhanced_phi_detector.py, phi_sanitizer.py, phi_sanitizer_from_utils.py
     _PATTERNS_DEFINITIONS: List[Dict[str, Any]] = [
         # High Priority Identifiers
         {
-            "name": "SSN", "type": PHIType.SSN, "priority": 10,
+            "name": "SSN", "type": PHIType.SSN, "priority": 10, "requires_digit": True,
             "pattern": r'(?:'
                        r'\b\d{3}[-\s.]\d{2}[-\s.]\d{4}\b|' # Standard SSN with delimiters
                        r'\b\d{9}\b(?=\D|$)|\b' # SSN without delimiters (ensure not part of longer number)
@@ -80,7 +86,7 @@ class PHIService:
             "flags": re.IGNORECASE
         },
         {
-            "name": "Phone", "type": PHIType.PHONE, "priority": 10,
+            "name": "Phone", "type": PHIType.PHONE, "priority": 10, "requires_digit": True,
             # Avoids matching numbers within words, allows optional country code, various delimiters
             "pattern": r'(?<!\w)(?:(?:\+\d{1,3}[\s.-]?)?(?:\(?\d{3}\)?[\s.-]?\d{3}[\s.-]?\d{4}))(?!\w|\d)',
             "flags": re.IGNORECASE
@@ -92,17 +98,17 @@ class PHIService:
         },
         # Medium Priority
         {
-            "name": "Address", "type": PHIType.ADDRESS, "priority": 9,
+            "name": "Address", "type": PHIType.ADDRESS, "priority": 9, "requires_digit": True,
             # Requires number, street name, common suffix. Avoids trailing numbers (like zip).
             "pattern": r'\b\d{1,6}\s+(?:[A-Za-z0-9\s.,-]+?)\b(?:Avenue|Lane|Road|Boulevard|Drive|Street|Ave|Ln|Rd|Blvd|Dr|St|Court|Ct|Place|Pl|Circle|Cir)\b\.?(?!\s*\d)',
             "flags": re.IGNORECASE
         },
         {
-            "name": "Credit Card", "type": PHIType.CREDIT_CARD, "priority": 8,
+            "name": "Credit Card", "type": PHIType.CREDIT_CARD, "priority": 8, "requires_digit": True,
             "pattern": r'\b(?:4[0-9]{3}[\s-]?[0-9]{4}[\s-]?[0-9]{4}[\s-]?[0-9]{4}|5[1-5][0-9]{2}[\s-]?[0-9]{4}[\s-]?[0-9]{4}[\s-]?[0-9]{4}|3[47][0-9]{2}[\s-]?[0-9]{6}[\s-]?[0-9]{5}|6(?:011|5[0-9]{2})[\s-]?[0-9]{4}[\s-]?[0-9]{4}[\s-]?[0-9]{4})\b'
         },
         {
-            "name": "Email", "type": PHIType.EMAIL, "priority": 8,
+            "name": "Email", "type": PHIType.EMAIL, "priority": 8, "requires_any": ("@",),
             "pattern": r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b'
         },
         {
@@ -111,7 +117,7 @@ class PHIService:
              "flags": re.IGNORECASE
         },
          {
-            "name": "Financial Account", "type": PHIType.ACCOUNT_NUMBER, "priority": 7,
+            "name": "Financial Account", "type": PHIType.ACCOUNT_NUMBER, "priority": 7, "requires_digit": True,
             "pattern": r'\b(?:Account|Acct)\s*(?:Number|No|#)?[:\s]*\d{6,16}\b',
              "flags": re.IGNORECASE
         },
@@ -123,7 +129,7 @@ class PHIService:
         },
         # Lower Priority / Context-Dependent
         {
-            "name": "DOB", "type": PHIType.DOB, "priority": 6,
+            "name": "DOB", "type": PHIType.DOB, "priority": 6, "requires_digit": True,
              "pattern": r'(?:'
                         r'\b(?:(?:dob|date of birth|birth date|birthdate|born on|born|birth)(?: is|:| =|: =|\s)\s*)?' # Context words
                         r'["\']?'
@@ -138,7 +144,7 @@ class PHIService:
             "flags": re.IGNORECASE
         },
          {
-            "name": "Age", "type": PHIType.AGE, "priority": 5,
+            "name": "Age", "type": PHIType.AGE, "priority": 5, "requires_digit": True,
             # Detect ages over 89, or explicit age mentions
             "pattern": r'\b(?:age|aged)\s+(?:9\d|[1-9]\d{2,})\b|\b(?:9\d|[1-9]\d{2,})\s+years?(?:\s+old)?\b',
             "flags": re.IGNORECASE
@@ -152,17 +158,17 @@ class PHIService:
             "pattern": r'\b(?:(?:[A-Z][a-z\'-]+){1,3}\s+(?:[A-Z][a-z\'-]+){1,3}|(?:Dr|Mr|Mrs|Ms)\.?\s+[A-Z][a-z\'-]+(?:\s+[A-Z][a-z\'-]+)?)\b'
         },
          {
-            "name": "Date", "type": PHIType.DATE, "priority": 3, "context_dependent": True,
+            "name": "Date", "type": PHIType.DATE, "priority": 3, "context_dependent": True, "requires_digit": True,
             # Generic date patterns, rely heavily on context
              "pattern": r'\b(?:\d{1,2}[-/\\.]\d{1,2}[-/\\.]\d{2,4}|\d{4}[-/\\.]\d{1,2}[-/\\.]\d{1,2})\b',
              "flags": re.IGNORECASE
         },
         {
-            "name": "IP Address", "type": PHIType.IP_ADDRESS, "priority": 5,
+            "name": "IP Address", "type": PHIType.IP_ADDRESS, "priority": 5, "requires_digit": True, "requires_any": (".",),
             "pattern": r'\b((?:[0-9]{1,3}\.){3}[0-9]{1,3})\b' # Basic IPv4
         },
          {
-            "name": "URL", "type": PHIType.URL, "priority": 2, "context_dependent": True,
+            "name": "URL", "type": PHIType.URL, "priority": 2, "context_dependent": True, "requires_any": (":", "."),
              # Basic URL pattern, context needed to see if it contains identifiers
             "pattern": r'\b(?:https?://|www\.)[^\s/$.?#].[^\s]*\b',
              "flags": re.IGNORECASE
@@ -191,12 +197,34 @@ class PHIService:
         'method_parameters': r'def\s+\w+\([^)]*\b(?:ssn|dob|birth_date|email|phone)\b\s*=\s*["\'].*?["\'][^)]*\)',
     }
     
+    # Literal prerequisites for the code context patterns (combined engine prefilter)
+    _CODE_CONTEXT_REQUIRES: Dict[str, Tuple[str, ...]] = {
+        'variable_assignment': ('=',),
+        'dict_assignment': (':',),
+        'comments': ('#', '//', '/*'),
+        'multiline_strings': ('"""', "'''"),
+        'method_parameters': ('=',),
+    }
+    
     # Compiled patterns stored for efficiency (Instance attributes)
     _compiled_patterns: List[Dict[str, Any]]
     _compiled_code_patterns: Dict[str, Pattern]
+    _engine: CombinedPatternEngine
+
+    def __init__(
+        self,
+        custom_patterns_definitions: Optional[List[Dict[str, Any]]] = None,
+        use_combined_engine: bool = True,
+    ):
+        """
+        Initialize the PHI service, compiling patterns.
 
-    def __init__(self, custom_patterns_definitions: Optional[List[Dict[str, Any]]] = None):
-        """Initialize the PHI service, compiling patterns."""
+        Args:
+            custom_patterns_definitions: Extra pattern definitions to merge with the base set
+            use_combined_engine: Scan with the single-pass combined engine (default).
+                If False, every pattern is run separately over each string.
+        """
+        self.use_combined_engine = use_combined_engine
         self._compile_patterns(custom_patterns_definitions)
         logger.info(f"PHIService initialized with {len(self._compiled_patterns)} base patterns.")
 
@@ -235,6 +263,25 @@ class PHIService:
              except re.error as e:
                  logger.error(f"Invalid code context regex pattern for '{name}': {pattern_str}. Error: {e}")
 
+        # Single alternation over the context keywords: one scan instead of one per keyword
+        self._context_keyword_pattern = re.compile(
+            "|".join(re.escape(keyword) for keyword in sorted(self._CONTEXT_KEYWORDS))
+        )
+
+        # Register patterns with the combined engine in the same order detect_phi scans them
+        self._engine = CombinedPatternEngine()
+        for name, compiled in self._compiled_code_patterns.items():
+            self._engine.add_pattern(
+                name, compiled, requires_any=self._CODE_CONTEXT_REQUIRES.get(name, ())
+            )
+        for p_info in self._compiled_patterns:
+            self._engine.add_pattern(
+                p_info,
+                p_info["compiled"],
+                requires_digit=p_info.get("requires_digit", False),
+                requires_any=p_info.get("requires_any", ()),
+            )
+
     # --- Detection Methods ---
 
     def contains_phi(self, text: str, sensitivity: str = DEFAULT_SENSITIVITY) -> bool:
@@ -266,50 +313,90 @@ class PHIService:
         if not text or not isinstance(text, str):
              return []
 
-        matches_found = []
-        text_length = len(text)
         has_context = self._has_medical_context(text)
 
+        # 1-2. Collect candidate matches from code context and standard patterns
+        if self.use_combined_engine:
+            matches_found = self._collect_matches_combined(text, sensitivity, has_context)
+        else:
+            matches_found = self._collect_matches_sequential(text, sensitivity, has_context)
+
+        # 3. Resolve overlaps
+        resolved_matches = self._resolve_overlaps(matches_found)
+
+        # 4. Format output
+        return [(m["phi_type"], m["matched_text"], m["start"], m["end"]) for m in resolved_matches]
+
+    def _collect_matches_sequential(self, text: str, sensitivity: str, has_context: bool) -> List[Dict[str, Any]]:
+        """Run every pattern separately over the text (reference engine)."""
+        matches_found = []
+
         # 1. Check code context patterns (highest priority)
         for name, compiled_pattern in self._compiled_code_patterns.items():
              for match in compiled_pattern.finditer(text):
-                 start, end = match.start(), match.end()
-                 # Heuristic mapping to PHIType based on pattern name/content
-                 phi_type = self._map_code_context_to_phi_type(name, match.group(0))
-                 matches_found.append({
-                     "start": start, "end": end, "phi_type": phi_type,
-                     "matched_text": match.group(0), "priority": 11, # Assign highest priority
-                     "length": end - start, "source": f"code_context:{name}"
-                 })
+                 matches_found.append(self._code_context_match(name, match))
 
         # 2. Check standard patterns based on sensitivity
         for p_info in self._compiled_patterns:
-            p_type = p_info["type"]
-            p_priority = p_info.get("priority", 0)
-            p_context_dependent = p_info.get("context_dependent", False)
-            p_compiled = p_info["compiled"]
-
-            should_check = self._should_check_pattern(p_priority, p_context_dependent, sensitivity, has_context)
-
-            if should_check:
-                 for match in p_compiled.finditer(text):
-                      start, end = max(0, match.start()), min(text_length, match.end())
-                      if start < end:
-                           # Apply additional filters if necessary (e.g., for names without context)
-                           if self._is_false_positive(p_type, match.group(0), has_context, sensitivity):
-                                continue
-
-                           matches_found.append({
-                               "start": start, "end": end, "phi_type": p_type,
-                               "matched_text": match.group(0), "priority": p_priority,
-                               "length": end - start, "source": f"pattern:{p_info['name']}"
-                           })
+            if self._should_check_pattern_info(p_info, sensitivity, has_context):
+                 for match in p_info["compiled"].finditer(text):
+                      entry = self._pattern_match(p_info, match, text, sensitivity, has_context)
+                      if entry is not None:
+                           matches_found.append(entry)
 
-        # 3. Resolve overlaps
-        resolved_matches = self._resolve_overlaps(matches_found)
+        return matches_found
 
-        # 4. Format output
-        return [(m["phi_type"], m["matched_text"], m["start"], m["end"]) for m in resolved_matches]
+    def _collect_matches_combined(self, text: str, sensitivity: str, has_context: bool) -> List[Dict[str, Any]]:
+        """Collect the same matches as the sequential engine with a single gating pass."""
+        matches_found = []
+
+        def include(key: Any) -> bool:
+            # Code context patterns are keyed by name and always checked
+            return isinstance(key, str) or self._should_check_pattern_info(key, sensitivity, has_context)
+
+        # include() depends only on sensitivity and context, so plans are cached per pair
+        for key, match in self._engine.scan(text, include, profile=(sensitivity, has_context)):
+            if isinstance(key, str):
+                matches_found.append(self._code_context_match(key, match))
+            else:
+                entry = self._pattern_match(key, match, text, sensitivity, has_context)
+                if entry is not None:
+                    matches_found.append(entry)
+
+        return matches_found
+
+    def _should_check_pattern_info(self, p_info: Dict[str, Any], sensitivity: str, has_context: bool) -> bool:
+        """Apply _should_check_pattern to a compiled pattern definition."""
+        return self._should_check_pattern(
+            p_info.get("priority", 0), p_info.get("context_dependent", False), sensitivity, has_context
+        )
+
+    def _code_context_match(self, name: str, match: Any) -> Dict[str, Any]:
+        """Build a match entry for a code context pattern."""
+        start, end = match.start(), match.end()
+        # Heuristic mapping to PHIType based on pattern name/content
+        phi_type = self._map_code_context_to_phi_type(name, match.group(0))
+        return {
+            "start": start, "end": end, "phi_type": phi_type,
+            "matched_text": match.group(0), "priority": 11, # Assign highest priority
+            "length": end - start, "source": f"code_context:{name}"
+        }
+
+    def _pattern_match(
+        self, p_info: Dict[str, Any], match: Any, text: str, sensitivity: str, has_context: bool
+    ) -> Optional[Dict[str, Any]]:
+        """Build a match entry for a standard pattern, or None if it is filtered out."""
+        start, end = max(0, match.start()), min(len(text), match.end())
+        if start >= end:
+            return None
+        # Apply additional filters if necessary (e.g., for names without context)
+        if self._is_false_positive(p_info["type"], match.group(0), has_context, sensitivity):
+            return None
+        return {
+            "start": start, "end": end, "phi_type": p_info["type"],
+            "matched_text": match.group(0), "priority": p_info.get("priority", 0),
+            "length": end - start, "source": f"pattern:{p_info['name']}"
+        }
 
     # --- Sanitization Methods ---
 
@@ -483,8 +570,7 @@ class PHIService:
         """Check if text contains keywords indicating a medical context."""
         if not text or not isinstance(text, str):
              return False
-        text_lower = text.lower()
-        return any(keyword in text_lower for keyword in self._CONTEXT_KEYWORDS)
+        return self._context_keyword_pattern.search(text.lower()) is not None
 
     def _contains_phi_in_code_context(self, text: str) -> bool:
         """Check if text matches any code-specific PHI patterns."""
@@ -500,21 +586,26 @@ class PHIService:
         # Sort by priority (desc), then length (desc), then start index (asc)
         matches.sort(key=lambda m: (m.get("priority", 0), m.get("length", 0), -m["start"]), reverse=True)
 
-        text_length = max(m["end"] for m in matches) if matches else 0
-        covered = [False] * text_length # Track covered character indices
+        # Accepted intervals are disjoint, so kept sorted by start their ends are
+        # sorted too: a candidate overlaps iff the nearest accepted interval
+        # starting before its end also ends after its start.
+        covered_starts: List[int] = []
+        covered_ends: List[int] = []
         final_matches = []
 
         for match in matches:
             start, end = match["start"], match["end"]
-            # Check if any part of this match interval is already covered by a higher priority match
-            is_overlapped = any(covered[i] for i in range(start, end))
-
-            if not is_overlapped:
-                # Mark this interval as covered
-                for i in range(start, end):
-                    if i < text_length: # Boundary check
-                         covered[i] = True
-                final_matches.append(match)
+            if start >= end:
+                final_matches.append(match) # Empty interval cannot overlap anything
+                continue
+
+            index = bisect_left(covered_starts, end)
+            if index > 0 and covered_ends[index - 1] > start:
+                continue # Overlaps a higher priority match
+
+            covered_starts.insert(index, start)
+            covered_ends.insert(index, end)
+            final_matches.append(match)
 
         # Return sorted by original start position for sequential processing if needed elsewhere
         return sorted(final_matches, key=lambda m: m['start'])
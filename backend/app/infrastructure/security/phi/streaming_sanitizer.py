@@ -0,0 +1,193 @@
+# -*- coding: utf-8 -*-
+"""
+Streaming JSON PHI Sanitizer.
+
+This module provides an incremental JSON tokenizer that redacts PHI from the
+string tokens of a JSON document while it is still being streamed. Only the
+string token currently being read is held in memory; structural characters,
+numbers, booleans and nulls are forwarded untouched as soon as they arrive.
+"""
+
+import json
+import logging
+import re
+from typing import AsyncIterable, AsyncIterator, Dict, Optional
+
+from app.infrastructure.security.phi.phi_service import PHIService
+
+logger = logging.getLogger(__name__)
+
+# Inside a JSON string only an unescaped quote or a backslash changes state.
+# Both are ASCII, so they can never appear inside a multi-byte UTF-8 sequence
+# and chunk boundaries are always safe to split on.
+_STRING_DELIMITERS = re.compile(rb'["\\]')
+_BACKSLASH = 0x5C
+
+# Object keys and enum-like values repeat constantly in large payloads; short
+# tokens are memoized per stream so each distinct one is scanned only once.
+_MEMO_MAX_TOKEN_BYTES = 64
+_MEMO_MAX_ENTRIES = 4096
+
+
+class StreamingJSONSanitizer:
+    """
+    Incremental, chunk-by-chunk PHI sanitizer for JSON byte streams.
+
+    Every JSON string token (object keys included, matching the behaviour of
+    ``PHIService.sanitize`` on a parsed document) is decoded, passed through
+    ``PHIService.sanitize`` and re-encoded. Unchanged strings are forwarded
+    byte-for-byte, so only redacted tokens are re-serialized.
+    """
+
+    def __init__(
+        self,
+        phi_service: PHIService,
+        sensitivity: str = "high",
+        replacement: Optional[str] = None,
+    ):
+        """
+        Initialize the streaming sanitizer.
+
+        Args:
+            phi_service: PHI service used to sanitize each string token
+            sensitivity: Detection sensitivity passed to the PHI service
+            replacement: Optional replacement template (must contain {phi_type})
+        """
+        self.phi_service = phi_service
+        self.sensitivity = sensitivity
+        self.replacement = replacement
+        self._in_string = False
+        self._pending_escape = False
+        self._string_buffer = bytearray()
+        self._memo: Dict[bytes, bytes] = {}
+        self.max_buffered_bytes = 0
+
+    def feed(self, chunk: bytes) -> bytes:
+        """
+        Consume the next chunk of the JSON document.
+
+        Args:
+            chunk: Raw bytes of the document, split at any position
+
+        Returns:
+            Sanitized bytes that are ready to be forwarded downstream
+        """
+        output = bytearray()
+        position = 0
+        length = len(chunk)
+
+        while position < length:
+            if not self._in_string:
+                quote = chunk.find(b'"', position)
+                if quote == -1:
+                    output += chunk[position:]
+                    break
+                output += chunk[position:quote]
+                self._in_string = True
+                position = quote + 1
+                continue
+
+            if self._pending_escape:
+                # The escaped character may be the first byte of a new chunk
+                self._string_buffer.append(chunk[position])
+                self._pending_escape = False
+                position += 1
+                continue
+
+            match = _STRING_DELIMITERS.search(chunk, position)
+            if match is None:
+                self._string_buffer += chunk[position:]
+                break
+
+            index = match.start()
+            if chunk[index] == _BACKSLASH:
+                self._string_buffer += chunk[position:index + 1]
+                self._pending_escape = True
+                position = index + 1
+                continue
+
+            self._string_buffer += chunk[position:index]
+            output += self._sanitize_token(bytes(self._string_buffer))
+            self._string_buffer.clear()
+            self._in_string = False
+            position = index + 1
+
+        return bytes(output)
+
+    def close(self) -> bytes:
+        """
+        Flush any remaining state at the end of the stream.
+
+        A well-formed document leaves nothing behind. A truncated document may
+        end inside a string; that tail is still sanitized before being emitted
+        so that a malformed body cannot leak PHI.
+
+        Returns:
+            Remaining sanitized bytes
+        """
+        if not self._in_string:
+            return b""
+
+        logger.warning("JSON stream ended inside a string token; sanitizing unterminated tail")
+        tail = bytes(self._string_buffer).decode("utf-8", errors="replace")
+        self._string_buffer.clear()
+        self._in_string = False
+        self._pending_escape = False
+        sanitized = self.phi_service.sanitize(tail, self.sensitivity, self.replacement)
+        return b'"' + sanitized.encode("utf-8")
+
+    async def sanitize_stream(self, chunks: AsyncIterable[bytes]) -> AsyncIterator[bytes]:
+        """
+        Sanitize an asynchronous stream of JSON chunks.
+
+        Args:
+            chunks: Async iterable yielding raw body chunks
+
+        Yields:
+            Non-empty sanitized chunks
+        """
+        async for chunk in chunks:
+            if isinstance(chunk, str):
+                chunk = chunk.encode("utf-8")
+            sanitized = self.feed(chunk)
+            if sanitized:
+                yield sanitized
+
+        remainder = self.close()
+        if remainder:
+            yield remainder
+
+    def _sanitize_token(self, raw: bytes) -> bytes:
+        """
+        Sanitize a single complete JSON string token.
+
+        Args:
+            raw: Token contents without the surrounding quotes
+
+        Returns:
+            The quoted token, re-encoded only if sanitization changed it
+        """
+        if len(raw) > self.max_buffered_bytes:
+            self.max_buffered_bytes = len(raw)
+
+        memoizable = len(raw) <= _MEMO_MAX_TOKEN_BYTES
+        if memoizable:
+            cached = self._memo.get(raw)
+            if cached is not None:
+                return cached
+
+        try:
+            value = json.loads(b'"' + raw + b'"')
+        except ValueError:
+            # Invalid escapes: fall back to a lossy decode so PHI is still redacted
+            value = raw.decode("utf-8", errors="replace")
+
+        sanitized = self.phi_service.sanitize(value, self.sensitivity, self.replacement)
+        if sanitized == value:
+            token = b'"' + raw + b'"'
+        else:
+            token = json.dumps(sanitized).encode("utf-8")
+
+        if memoizable and len(self._memo) < _MEMO_MAX_ENTRIES:
+            self._memo[raw] = token
+        return token
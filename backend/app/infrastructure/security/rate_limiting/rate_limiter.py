@@ -7,6 +7,7 @@ It implements configurable rate limiting with burst capacity and supports multip
 """
 
 import logging
+import math
 import time
 from datetime import datetime
 from enum import Enum
@@ -30,6 +31,15 @@ class RateLimitType(str, Enum):
     API_KEY = "api_key"
 
 
+class RateLimitAlgorithm(str, Enum):
+    """Enumeration of rate limiting algorithms."""
+    
+    # Token bucket refilled in full at the start of each fixed window
+    FIXED_WINDOW = "fixed_window"
+    # Generic Cell Rate Algorithm: smooth refill, equivalent to a sliding window
+    GCRA = "gcra"
+
+
 class RateLimitConfig:
     """Configuration for a specific rate limit type."""
     
@@ -38,6 +48,7 @@ class RateLimitConfig:
         requests_per_period: int,
         period_seconds: int,
         burst_capacity: int = 0,
+        algorithm: RateLimitAlgorithm = RateLimitAlgorithm.FIXED_WINDOW,
     ):
         """
         Initialize rate limit configuration.
@@ -46,10 +57,64 @@ class RateLimitConfig:
             requests_per_period: Number of requests allowed per period
             period_seconds: Period length in seconds
             burst_capacity: Additional requests allowed for burst (default: 0)
+            algorithm: Algorithm used by the atomic Redis implementation
         """
         self.requests_per_period = requests_per_period
         self.period_seconds = period_seconds
         self.burst_capacity = burst_capacity
+        self.algorithm = algorithm
+
+
+# Both scripts read the Redis server clock, so every worker shares one
+# time source however far the clocks of the application hosts drift. Writing
+# after TIME relies on effects replication (the default since Redis 5).
+_SERVER_NOW_MS = """
+local clock = redis.call('TIME')
+local now = tonumber(clock[1]) * 1000 + math.floor(tonumber(clock[2]) / 1000)
+"""
+
+# Atomic fixed-window token bucket.
+# KEYS[1]: bucket hash; ARGV: capacity, period_ms
+# Returns {limited, remaining, reset_at_ms, retry_after_ms}
+FIXED_WINDOW_SCRIPT = _SERVER_NOW_MS + """
+local capacity = tonumber(ARGV[1])
+local period = tonumber(ARGV[2])
+local bucket = redis.call('HMGET', KEYS[1], 'remaining', 'reset_at')
+local remaining = tonumber(bucket[1])
+local reset_at = tonumber(bucket[2])
+if remaining == nil or reset_at == nil or now >= reset_at then
+    remaining = capacity
+    reset_at = now - (now % period) + period
+end
+if remaining <= 0 then
+    return {1, 0, reset_at, reset_at - now}
+end
+remaining = remaining - 1
+redis.call('HSET', KEYS[1], 'remaining', remaining, 'reset_at', reset_at)
+redis.call('PEXPIRE', KEYS[1], period * 2)
+return {0, remaining, reset_at, 0}
+"""
+
+# Atomic GCRA. The key stores the theoretical arrival time (TAT) in ms.
+# KEYS[1]: TAT key; ARGV: capacity, period_ms, requests_per_period
+# Returns {limited, remaining, reset_at_ms, retry_after_ms}
+GCRA_SCRIPT = _SERVER_NOW_MS + """
+local capacity = tonumber(ARGV[1])
+local period = tonumber(ARGV[2])
+local interval = period / tonumber(ARGV[3])
+local tolerance = interval * capacity
+local tat = tonumber(redis.call('GET', KEYS[1]))
+if tat == nil or tat < now then
+    tat = now
+end
+local new_tat = tat + interval
+local allow_at = new_tat - tolerance
+if now < allow_at then
+    return {1, 0, math.ceil(tat), math.ceil(allow_at - now)}
+end
+redis.call('SET', KEYS[1], tostring(new_tat), 'PX', math.ceil(new_tat - now))
+return {0, math.floor((now - allow_at) / interval), math.ceil(new_tat), 0}
+"""
 
 
 class DistributedRateLimiter:
@@ -62,6 +127,10 @@ class DistributedRateLimiter:
     - Configurable limits by request type and identifier
     - Multiple identifier options (IP, user ID, API key)
     - Graceful fallback to permissive mode if Redis is unavailable
+    
+    By default each check runs as a single server-side Lua script (EVALSHA)
+    that refills, decrements and sets the TTL atomically in one round-trip,
+    using the fixed-window or GCRA algorithm configured per RateLimitType.
     """
     
     # Default rate limit configurations
@@ -93,15 +162,19 @@ class DistributedRateLimiter:
         ),
     }
     
-    def __init__(self, cache_service: RedisCache = None):
+    def __init__(self, cache_service: RedisCache = None, atomic: bool = True):
         """
         Initialize the rate limiter.
         
         Args:
             cache_service: Redis cache service. If not provided, a new one is created.
+            atomic: Use the single round-trip Lua implementation when the cache
+                supports scripting. If False, buckets are read and written with
+                separate commands.
         """
         self.cache = cache_service or RedisCache()
         self.configs = self.DEFAULT_CONFIGS.copy()
+        self.atomic = atomic
     
     def configure(self, limit_type: RateLimitType, config: RateLimitConfig) -> None:
         """
@@ -113,6 +186,45 @@ class DistributedRateLimiter:
         """
         self.configs[limit_type] = config
     
+    def _rate_limit_key(
+        self,
+        identifier: str,
+        limit_type: RateLimitType,
+        user_id: Optional[str] = None,
+    ) -> str:
+        """Build the base cache key for an identifier and limit type."""
+        # Create a key that includes both identifier and limit type
+        # If user_id is provided, include it for more granular limiting
+        rate_limit_key = f"rate_limit:{limit_type}:{identifier}"
+        if user_id:
+            rate_limit_key = f"{rate_limit_key}:{user_id}"
+        return rate_limit_key
+    
+    async def reset(
+        self,
+        identifier: str,
+        limit_type: RateLimitType = RateLimitType.DEFAULT,
+        user_id: Optional[str] = None,
+    ) -> int:
+        """
+        Clear the rate limit state for an identifier.
+        
+        Removes the buckets of every implementation (read-modify-write,
+        fixed window and GCRA) with a single command.
+        
+        Args:
+            identifier: Primary identifier (usually IP address)
+            limit_type: Type of rate limit to reset
+            user_id: Optional user ID used when the limit was applied
+            
+        Returns:
+            Number of keys removed
+        """
+        rate_limit_key = self._rate_limit_key(identifier, limit_type, user_id)
+        return await self.cache.delete_many(
+            [rate_limit_key, f"{rate_limit_key}:fixed", f"{rate_limit_key}:gcra"]
+        )
+    
     async def is_rate_limited(
         self,
         identifier: str,
@@ -149,49 +261,29 @@ class DistributedRateLimiter:
         # Get the appropriate configuration
         config = self.configs.get(limit_type, self.configs[RateLimitType.DEFAULT])
         
-        # Create a key that includes both identifier and limit type
-        # If user_id is provided, include it for more granular limiting
-        rate_limit_key = f"rate_limit:{limit_type}:{identifier}"
-        if user_id:
-            rate_limit_key = f"{rate_limit_key}:{user_id}"
+        rate_limit_key = self._rate_limit_key(identifier, limit_type, user_id)
+        
+        if self._use_atomic_path():
+            try:
+                return await self._check_atomic(
+                    rate_limit_key, config, identifier, limit_type, user_id
+                )
+            except Exception as e:
+                # If something goes wrong, log and don't rate limit
+                logger.error(f"Error in atomic rate limiter: {str(e)}")
+                return False, {"allowed": True, "reason": f"Error: {str(e)}"}
         
         now = time.time()
         window_start_time = int(now / config.period_seconds) * config.period_seconds
         
         # Implement token bucket algorithm
         try:
-            # Check if we have a bucket for this key
-            exists = await self.cache.exists(rate_limit_key)
-            
-            if not exists:
-                # Create a new bucket with max tokens minus 1 (for current request)
-                total_tokens = config.requests_per_period + config.burst_capacity
-                remaining = total_tokens - 1
-                
-                # Store bucket information
-                await self.cache.set(
-                    key=rate_limit_key,
-                    value={
-                        "remaining": remaining,
-                        "reset_at": window_start_time + config.period_seconds,
-                        "last_request": now,
-                    },
-                    expiration=config.period_seconds * 2,  # Use expiration instead of ttl
-                )
-                
-                # Not rate limited
-                rate_limit_info = {
-                    "remaining": remaining,
-                    "limit": total_tokens,
-                    "reset_at": window_start_time + config.period_seconds,
-                }
-                return False, rate_limit_info
-            
-            # Get current bucket information
+            # Read the bucket; a missing key reads as None
             bucket = await self.cache.get(rate_limit_key)
+            
             if not bucket:
-                # Bucket exists but is empty (race condition or expired)
-                # Create a new one
+                # No bucket yet (or it expired): create one with max tokens
+                # minus 1 for the current request
                 total_tokens = config.requests_per_period + config.burst_capacity
                 remaining = total_tokens - 1
                 
@@ -281,6 +373,68 @@ class DistributedRateLimiter:
             logger.error(f"Error in rate limiter: {str(e)}")
             return False, {"allowed": True, "reason": f"Error: {str(e)}"}
     
+    def _use_atomic_path(self) -> bool:
+        """Check whether the atomic Lua implementation can be used."""
+        if not self.atomic:
+            return False
+        supports_scripts = getattr(self.cache, "supports_scripts", None)
+        return callable(supports_scripts) and supports_scripts() is True
+    
+    async def _check_atomic(
+        self,
+        rate_limit_key: str,
+        config: RateLimitConfig,
+        identifier: str,
+        limit_type: RateLimitType,
+        user_id: Optional[str],
+    ) -> Tuple[bool, Dict[str, Union[int, float, str]]]:
+        """
+        Check and consume a token with a single atomic script invocation.
+        
+        The scripts take the current time from the Redis server.
+        
+        Args:
+            rate_limit_key: Base key for this identifier and limit type
+            config: Rate limit configuration
+            identifier: Primary identifier (for logging)
+            limit_type: Type of rate limit (for logging)
+            user_id: Optional user ID (for logging)
+            
+        Returns:
+            Tuple[bool, Dict]: (is_limited, rate_limit_info)
+        """
+        total_tokens = config.requests_per_period + config.burst_capacity
+        period_ms = config.period_seconds * 1000
+        
+        # Separate keys per algorithm; buckets written by the non-atomic path are JSON strings
+        if config.algorithm == RateLimitAlgorithm.GCRA:
+            limited, remaining, reset_at_ms, retry_after_ms = await self.cache.eval_script(
+                GCRA_SCRIPT,
+                keys=[f"{rate_limit_key}:gcra"],
+                args=[total_tokens, period_ms, config.requests_per_period],
+            )
+        else:
+            limited, remaining, reset_at_ms, retry_after_ms = await self.cache.eval_script(
+                FIXED_WINDOW_SCRIPT,
+                keys=[f"{rate_limit_key}:fixed"],
+                args=[total_tokens, period_ms],
+            )
+        
+        rate_limit_info: Dict[str, Union[int, float, str]] = {
+            "remaining": int(remaining),
+            "limit": total_tokens,
+            "reset_at": int(reset_at_ms) / 1000.0,
+        }
+        if not int(limited):
+            return False, rate_limit_info
+        
+        rate_limit_info["retry_after"] = max(1, math.ceil(int(retry_after_ms) / 1000.0))
+        logger.warning(
+            f"Rate limit exceeded for {identifier} "
+            f"(type: {limit_type.value}, user_id: {user_id})"
+        )
+        return True, rate_limit_info
+    
     async def apply_rate_limit_headers(
         self, response: Response, rate_limit_info: Dict[str, Union[int, float, str]]
     ) -> None:
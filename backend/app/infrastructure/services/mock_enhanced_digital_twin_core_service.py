@@ -49,6 +49,7 @@ from app.domain.entities.knowledge_graph import (
     TemporalKnowledgeGraph, BayesianBeliefNetwork, KnowledgeGraphNode, KnowledgeGraphEdge,
     NodeType, EdgeType
 )
+from app.infrastructure.ml.bayesian import JunctionTreeInference
 
 
 logger = logging.getLogger(__name__)
@@ -1514,7 +1515,7 @@ class MockEnhancedDigitalTwinCoreService(EnhancedDigitalTwinCoreService):
     def _initialize_belief_network(self, patient_id: UUID, initial_data: Dict) -> BayesianBeliefNetwork:
         """Initialize a Bayesian belief network for a patient."""
         # Create a new belief network
-        network = BayesianBeliefNetwork(patient_id=patient_id)
+        network = BayesianBeliefNetwork(patient_id=patient_id, inference=JunctionTreeInference())
         
         # Add some standard variables
         network.add_variable(
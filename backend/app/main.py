@@ -48,6 +48,8 @@ from typing import Callable, Awaitable
 # Import service provider functions needed for middleware instantiation
 from app.presentation.dependencies.auth import get_authentication_service
 from app.infrastructure.security.jwt.jwt_service import get_jwt_service
+from app.infrastructure.security.auth.principal_cache import get_principal_cache
+from app.infrastructure.ml.inference_executor import get_inference_executor
 
 # Remove direct imports of handlers/repos if not needed elsewhere in main
 # from app.infrastructure.security.password.password_handler import PasswordHandler
@@ -85,12 +87,24 @@ async def lifespan(app: FastAPI):
         logger.warning("Temporarily skipped db_instance.create_all() in lifespan for testing.")
         pass # Keep the if block valid
     
+    # Listen for principal revocations published by other workers
+    principal_cache = get_principal_cache() if get_settings().AUTH_PRINCIPAL_CACHE_ENABLED else None
+    if principal_cache is not None:
+        try:
+            await principal_cache.start()
+        except Exception as e:
+            logger.error(f"Failed to subscribe to principal revocations: {e}", exc_info=True)
+    
     # Yield control to the application
     logger.info("ASGI lifespan startup complete.")
     yield
     
     # Shutdown events
     logger.info("ASGI lifespan shutdown starting.")
+    if principal_cache is not None:
+        await principal_cache.close()
+    # Stop the model worker pools; calls still running finish in the background
+    get_inference_executor().shutdown(wait=False)
     # Close database connections
     await db_instance.dispose()
     logger.info("ASGI lifespan shutdown complete.")
@@ -11,7 +11,7 @@ from typing import Callable, AsyncGenerator
 from fastapi import Depends
 
 from app.application.interfaces.services.cache_service import CacheService
-from app.infrastructure.cache.redis_cache import RedisCache
+from app.infrastructure.cache.tiered_cache import TieredCache
 
 
 # Singleton cache instance
@@ -22,8 +22,8 @@ async def get_cache_service() -> AsyncGenerator[CacheService, None]:
     """
     Provide a cache service instance.
     
-    This dependency creates and initializes a Redis cache service
-    for caching in API routes.
+    This dependency creates and initializes a Redis cache service with an
+    in-process L1 tier for hot keys, for caching in API routes.
     
     Yields:
         Cache service instance
@@ -31,7 +31,7 @@ async def get_cache_service() -> AsyncGenerator[CacheService, None]:
     global _redis_cache
     
     if _redis_cache is None:
-        _redis_cache = RedisCache()
+        _redis_cache = TieredCache()
         
     # Initialize if needed
     await _redis_cache.initialize()
@@ -10,7 +10,9 @@ from datetime import datetime
 from enum import Enum
 from typing import Any, Dict, List, Optional, Union
 
-from pydantic import BaseModel, Field, field_validator, model_validator
+from pydantic import BaseModel, ConfigDict, Field, field_validator, model_validator
+
+from app.core.services.ml.pat.actigraphy_data import ActigraphyArray
 
 
 class AnalysisType(str, Enum):
@@ -78,18 +80,13 @@ class DeviceInfo(BaseModel):
 
 # Request Models
 
-class AnalyzeActigraphyRequest(BaseModel):
-    """Request to analyze actigraphy data."""
+class AnalyzeActigraphyMetadata(BaseModel):
+    """Fields of an analyze request other than the readings."""
     
     patient_id: str = Field(
         ...,
         description="Unique identifier for the patient"
     )
-    readings: List[AccelerometerReading] = Field(
-        ...,
-        description="List of accelerometer readings",
-        min_length=1
-    )
     start_time: str = Field(
         ...,
         description="ISO-8601 formatted start time of the recording",
@@ -116,7 +113,7 @@ class AnalyzeActigraphyRequest(BaseModel):
     )
     
     @model_validator(mode="after")
-    def validate_times(self) -> "AnalyzeActigraphyRequest":
+    def validate_times(self) -> "AnalyzeActigraphyMetadata":
         """Validate that end_time is after start_time."""
         # Normalize trailing Z only, to avoid doubling offsets
         start_str = self.start_time[:-1] if self.start_time.endswith("Z") else self.start_time
@@ -130,18 +127,34 @@ class AnalyzeActigraphyRequest(BaseModel):
         return self
 
 
-class GetActigraphyEmbeddingsRequest(BaseModel):
-    """Request to generate embeddings from actigraphy data."""
+class AnalyzeActigraphyRequest(AnalyzeActigraphyMetadata):
+    """Request to analyze actigraphy data."""
     
-    patient_id: str = Field(
-        ...,
-        description="Unique identifier for the patient"
-    )
     readings: List[AccelerometerReading] = Field(
         ...,
         description="List of accelerometer readings",
         min_length=1
     )
+
+
+class AnalyzeActigraphyUpload(AnalyzeActigraphyMetadata):
+    """Analyze request decoded from a binary upload; readings stay columnar."""
+    
+    model_config = ConfigDict(arbitrary_types_allowed=True)
+    
+    readings: ActigraphyArray = Field(
+        ...,
+        description="Validated columnar accelerometer readings"
+    )
+
+
+class ActigraphyEmbeddingsMetadata(BaseModel):
+    """Fields of an embeddings request other than the readings."""
+    
+    patient_id: str = Field(
+        ...,
+        description="Unique identifier for the patient"
+    )
     start_time: str = Field(
         ...,
         description="ISO-8601 formatted start time of the recording",
@@ -159,7 +172,7 @@ class GetActigraphyEmbeddingsRequest(BaseModel):
     )
     
     @model_validator(mode="after")
-    def validate_times(self) -> "GetActigraphyEmbeddingsRequest":
+    def validate_times(self) -> "ActigraphyEmbeddingsMetadata":
         """Validate that end_time is after start_time."""
         # Normalize trailing Z only
         start_str = self.start_time[:-1] if self.start_time.endswith("Z") else self.start_time
@@ -173,6 +186,27 @@ class GetActigraphyEmbeddingsRequest(BaseModel):
         return self
 
 
+class GetActigraphyEmbeddingsRequest(ActigraphyEmbeddingsMetadata):
+    """Request to generate embeddings from actigraphy data."""
+    
+    readings: List[AccelerometerReading] = Field(
+        ...,
+        description="List of accelerometer readings",
+        min_length=1
+    )
+
+
+class ActigraphyEmbeddingsUpload(ActigraphyEmbeddingsMetadata):
+    """Embeddings request decoded from a binary upload; readings stay columnar."""
+    
+    model_config = ConfigDict(arbitrary_types_allowed=True)
+    
+    readings: ActigraphyArray = Field(
+        ...,
+        description="Validated columnar accelerometer readings"
+    )
+
+
 class IntegrateWithDigitalTwinRequest(BaseModel):
     """Request to integrate actigraphy analysis with a digital twin profile."""
     
@@ -3,31 +3,89 @@ Actigraphy request validation dependencies.
 
 Provides reusable dependencies to validate and parse actigraphy API payloads
 using Pydantic models, decoupling schema validation from endpoint logic.
+
+Besides JSON, the analyze and embeddings endpoints accept compact binary
+uploads selected by Content-Type. Their readings are validated with
+whole-array checks and handed to the PAT service as an ``ActigraphyArray``
+instead of one Pydantic object per sample.
 """
+from typing import Any, Callable, Dict, Optional, Tuple
+
 from fastapi import Request, HTTPException, status
 from pydantic import ValidationError as PydanticValidationError
 
+from app.core.services.ml.pat.actigraphy_data import (
+    ActigraphyArray,
+    unpack_arrow_ipc,
+    unpack_npz,
+    unpack_upload,
+)
+from app.core.services.ml.pat.exceptions import ValidationError as PATValidationError
 from app.presentation.api.schemas.actigraphy import (
+    ActigraphyEmbeddingsUpload,
     AnalyzeActigraphyRequest,
+    AnalyzeActigraphyUpload,
     GetActigraphyEmbeddingsRequest,
 )
 
+# Binary upload content types and their decoders
+ACTIGRAPHY_BINARY_CONTENT_TYPE = "application/vnd.novamind.actigraphy"
+NPZ_CONTENT_TYPE = "application/x-npz"
+ARROW_STREAM_CONTENT_TYPE = "application/vnd.apache.arrow.stream"
+
+_BINARY_DECODERS: Dict[str, Callable[[bytes], Tuple[Dict[str, Any], ActigraphyArray]]] = {
+    ACTIGRAPHY_BINARY_CONTENT_TYPE: unpack_upload,
+    NPZ_CONTENT_TYPE: unpack_npz,
+    ARROW_STREAM_CONTENT_TYPE: unpack_arrow_ipc,
+}
+
+
+async def _read_binary_upload(request: Request) -> Optional[Dict[str, Any]]:
+    """
+    Decode and validate a binary upload if the request carries one.
+
+    Returns:
+        Request fields with ``readings`` as an ActigraphyArray, or None for
+        non-binary (JSON) requests
+    """
+    content_type = request.headers.get("content-type", "").split(";")[0].strip().lower()
+    decoder = _BINARY_DECODERS.get(content_type)
+    if decoder is None:
+        return None
+
+    body = await request.body()
+    try:
+        metadata, readings = decoder(body)
+        readings.validate()
+    except PATValidationError as exc:
+        field = exc.details.get("field") or "readings"
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=[{"loc": ["body", field], "msg": exc.message, "type": "value_error"}]
+        )
+    metadata.pop("readings", None)
+    return {**metadata, "readings": readings}
+
 
 async def validate_analyze_actigraphy_request(
     request: Request
 ) -> AnalyzeActigraphyRequest:
     """
     Dependency to parse and validate analyze actigraphy request payload.
+    Binary uploads return an AnalyzeActigraphyUpload with columnar readings.
     Raises HTTPException 422 if validation fails.
     """
+    upload = await _read_binary_upload(request)
     try:
+        if upload is not None:
+            return AnalyzeActigraphyUpload.model_validate(upload)
         payload = await request.json()
         return AnalyzeActigraphyRequest.parse_obj(payload)
     except PydanticValidationError as exc:
-        # Return validation errors in HTTPException detail
+        # Return validation errors in HTTPException detail (binary readings are not echoed)
         raise HTTPException(
             status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
-            detail=exc.errors()
+            detail=exc.errors(include_input=upload is None)
         )
 
 
@@ -36,13 +94,17 @@ async def validate_get_actigraphy_embeddings_request(
 ) -> GetActigraphyEmbeddingsRequest:
     """
     Dependency to parse and validate get actigraphy embeddings request payload.
+    Binary uploads return an ActigraphyEmbeddingsUpload with columnar readings.
     Raises HTTPException 422 if validation fails.
     """
+    upload = await _read_binary_upload(request)
     try:
+        if upload is not None:
+            return ActigraphyEmbeddingsUpload.model_validate(upload)
         payload = await request.json()
         return GetActigraphyEmbeddingsRequest.parse_obj(payload)
     except PydanticValidationError as exc:
         raise HTTPException(
             status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
-            detail=exc.errors()
-        )
\ No newline at end of file
+            detail=exc.errors(include_input=upload is None)
+        )
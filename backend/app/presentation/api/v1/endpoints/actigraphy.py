@@ -32,6 +32,7 @@ from app.presentation.api.v1.dependencies.actigraphy import (
 from typing import Dict, Any # Import Dict and Any for type hinting
 
 # Assuming core/services paths remain stable or adjust if moved
+from app.core.services.ml.pat.actigraphy_data import ActigraphyArray
 from app.core.services.ml.pat import (
     AnalysisError,
     AuthorizationError,
@@ -67,6 +68,19 @@ def _normalize_analysis_type(value: Any) -> str:  # noqa: ANN401
         return str(value.value)
     return str(value)
 
+
+def _service_readings(readings: Any) -> Any:  # noqa: ANN401
+    """Return readings in the form the PAT service accepts.
+
+    Binary uploads already carry a validated ``ActigraphyArray`` (a view over
+    the request body) and are passed through untouched; JSON readings are
+    converted to plain dictionaries.
+    """
+
+    if isinstance(readings, ActigraphyArray):
+        return readings
+    return [r.dict() for r in readings]
+
 # Security might be handled by middleware or dependencies now, review if needed
 # security = HTTPBearer()
 
@@ -152,7 +166,7 @@ async def analyze_actigraphy(
             f"analysis_types={[t.value for t in payload.analysis_types]}"
         )
         # Prepare inputs for service
-        readings_list = [r.dict() for r in payload.readings]
+        readings_list = _service_readings(payload.readings)
         types_list = [t.value for t in payload.analysis_types]
         # Perform analysis via PAT service
         result = pat_service.analyze_actigraphy(
@@ -274,7 +288,7 @@ async def get_actigraphy_embeddings(
             f"Generating actigraphy embeddings: readings_count={len(payload.readings)}"
         )
         # Prepare inputs for service
-        readings_list = [r.dict() for r in payload.readings]
+        readings_list = _service_readings(payload.readings)
         # Generate embeddings via PAT service
         result = pat_service.get_actigraphy_embeddings(
             patient_id=payload.patient_id,
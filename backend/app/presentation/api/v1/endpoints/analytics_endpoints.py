@@ -40,6 +40,11 @@ CACHE_TTL = {
     "patient_risk_stratification": 60 * 10,  # 10 minutes
 }
 
+# Job status entries outlive their results by this many seconds
+JOB_STATUS_GRACE = 60 * 10  # 10 minutes
+# Failed job status entries are kept for this many seconds
+JOB_ERROR_TTL = 60 * 10  # 10 minutes
+
 # Define the dependency using get_service directly
 # We CANNOT import AnalyticsService here at module level
 AnalyticsServiceDep = Depends(get_service("app.domain.services.analytics_service.AnalyticsService"))
@@ -109,6 +114,37 @@ async def get_patient_treatment_outcomes(
         "check_url": f"/api/v1/analytics/status/{cache_key}"
     }
 
+async def _store_job_result(
+    cache_service: RedisCache,
+    cache_key: str,
+    results: Any,
+    ttl: int
+) -> bool:
+    """
+    Store a background job's result and its completed status together.
+    
+    Both keys are written in a single round-trip; the status entry outlives
+    the result by JOB_STATUS_GRACE seconds.
+    
+    Args:
+        cache_service: Cache service
+        cache_key: Cache key of the result
+        results: Job result
+        ttl: Result TTL in seconds
+        
+    Returns:
+        True if both keys were stored
+    """
+    status_key = f"status:{cache_key}"
+    return await cache_service.set_many(
+        {
+            cache_key: results,
+            status_key: {"status": "completed", "data": results},
+        },
+        expirations={cache_key: ttl, status_key: ttl + JOB_STATUS_GRACE},
+    )
+
+
 # The background task needs the correct type hint for the service
 async def _process_treatment_outcomes(
     analytics_service: Any, # Keep correct type here
@@ -137,27 +173,14 @@ async def _process_treatment_outcomes(
             end_date=end_date
         )
         
-        # Store in cache
-        await cache_service.set(
-            key=cache_key,
-            value=results,
-            ttl=CACHE_TTL["patient_treatment_outcomes"]
-        )
-        
-        # Also store as status
-        status_key = f"status:{cache_key}"
-        await cache_service.set(
-            key=status_key,
-            value={"status": "completed", "data": results},
-            ttl=CACHE_TTL["patient_treatment_outcomes"] + 60 * 10  # Add 10 minutes to status TTL
-        )
+        # Store the result and its status in one round-trip
+        await _store_job_result(cache_service, cache_key, results, CACHE_TTL["patient_treatment_outcomes"])
     except Exception as e:
         # Store error in status
-        status_key = f"status:{cache_key}"
         await cache_service.set(
-            key=status_key,
+            key=f"status:{cache_key}",
             value={"status": "error", "message": str(e)},
-            ttl=60 * 10  # Store error for 10 minutes
+            expiration=JOB_ERROR_TTL
         )
 
 
@@ -266,27 +289,14 @@ async def _process_practice_metrics(
             provider_id=provider_id
         )
         
-        # Store in cache
-        await cache_service.set(
-            key=cache_key,
-            value=results,
-            ttl=CACHE_TTL["practice_metrics"]
-        )
-        
-        # Also store as status
-        status_key = f"status:{cache_key}"
-        await cache_service.set(
-            key=status_key,
-            value={"status": "completed", "data": results},
-            ttl=CACHE_TTL["practice_metrics"] + 60 * 10  # Add 10 minutes to status TTL
-        )
+        # Store the result and its status in one round-trip
+        await _store_job_result(cache_service, cache_key, results, CACHE_TTL["practice_metrics"])
     except Exception as e:
         # Store error in status
-        status_key = f"status:{cache_key}"
         await cache_service.set(
-            key=status_key,
+            key=f"status:{cache_key}",
             value={"status": "error", "message": str(e)},
-            ttl=60 * 10  # Store error for 10 minutes
+            expiration=JOB_ERROR_TTL
         )
 
 
@@ -334,7 +344,7 @@ async def get_diagnosis_distribution(
     await cache_service.set(
         key=cache_key,
         value=results,
-        ttl=CACHE_TTL["diagnosis_distribution"]
+        expiration=CACHE_TTL["diagnosis_distribution"]
     )
     
     return results
@@ -431,27 +441,14 @@ async def _process_medication_effectiveness(
             end_date=end_date
         )
         
-        # Store in cache
-        await cache_service.set(
-            key=cache_key,
-            value=results,
-            ttl=CACHE_TTL["medication_effectiveness"]
-        )
-        
-        # Also store as status
-        status_key = f"status:{cache_key}"
-        await cache_service.set(
-            key=status_key,
-            value={"status": "completed", "data": results},
-            ttl=CACHE_TTL["medication_effectiveness"] + 60 * 10  # Add 10 minutes to status TTL
-        )
+        # Store the result and its status in one round-trip
+        await _store_job_result(cache_service, cache_key, results, CACHE_TTL["medication_effectiveness"])
     except Exception as e:
         # Store error in status
-        status_key = f"status:{cache_key}"
         await cache_service.set(
-            key=status_key,
+            key=f"status:{cache_key}",
             value={"status": "error", "message": str(e)},
-            ttl=60 * 10  # Store error for 10 minutes
+            expiration=JOB_ERROR_TTL
         )
 
 
@@ -545,27 +542,14 @@ async def _process_treatment_comparison(
             end_date=end_date
         )
         
-        # Store in cache
-        await cache_service.set(
-            key=cache_key,
-            value=results,
-            ttl=CACHE_TTL["treatment_comparison"]
-        )
-        
-        # Also store as status
-        status_key = f"status:{cache_key}"
-        await cache_service.set(
-            key=status_key,
-            value={"status": "completed", "data": results},
-            ttl=CACHE_TTL["treatment_comparison"] + 60 * 10  # Add 10 minutes to status TTL
-        )
+        # Store the result and its status in one round-trip
+        await _store_job_result(cache_service, cache_key, results, CACHE_TTL["treatment_comparison"])
     except Exception as e:
         # Store error in status
-        status_key = f"status:{cache_key}"
         await cache_service.set(
-            key=status_key,
+            key=f"status:{cache_key}",
             value={"status": "error", "message": str(e)},
-            ttl=60 * 10  # Store error for 10 minutes
+            expiration=JOB_ERROR_TTL
         )
 
 
@@ -600,7 +584,7 @@ async def get_patient_risk_stratification(
     await cache_service.set(
         key=cache_key,
         value=results,
-        ttl=CACHE_TTL["patient_risk_stratification"]
+        expiration=CACHE_TTL["patient_risk_stratification"]
     )
     
     return results
\ No newline at end of file
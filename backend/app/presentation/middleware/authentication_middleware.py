@@ -17,9 +17,11 @@ from starlette.authentication import AuthCredentials, UnauthenticatedUser
 
 # Domain Exceptions
 from app.domain.exceptions import InvalidTokenError, TokenExpiredError, MissingTokenError, AuthenticationError, EntityNotFoundError
+from app.core.exceptions.jwt_exceptions import JWTError
 
 # Consolidated services
 from app.infrastructure.security.auth.authentication_service import AuthenticationService
+from app.infrastructure.security.auth.principal_cache import CachedPrincipal, PrincipalCache, get_principal_cache
 from app.infrastructure.models.user_model import UserModel
 from app.infrastructure.security.jwt.jwt_service import JWTService, TokenPayload
 
@@ -43,6 +45,7 @@ class AuthenticationMiddleware(BaseHTTPMiddleware):
         auth_service: AuthenticationService, # Inject AuthenticationService
         jwt_service: JWTService,           # Inject JWTService
         public_paths: Optional[Set[str]] = None,
+        principal_cache: Optional[PrincipalCache] = None,
     ):
         super().__init__(app)
         self.auth_service = auth_service # Store injected service
@@ -52,6 +55,10 @@ class AuthenticationMiddleware(BaseHTTPMiddleware):
         ml_path = f"{get_settings().API_V1_STR}/mentallama"
         xgb_path = f"{get_settings().API_V1_STR}/ml/xgboost"
         self.public_paths = base_paths | {ml_path, xgb_path}
+        # Verified tokens are served from memory until they expire or are revoked
+        if principal_cache is None and getattr(get_settings(), "AUTH_PRINCIPAL_CACHE_ENABLED", False):
+            principal_cache = get_principal_cache()
+        self.principal_cache = principal_cache
         logger.info(f"AuthenticationMiddleware initialized (using constructor injection). Public paths: {self.public_paths}.")
 
     # Remove Depends from dispatch
@@ -100,25 +107,17 @@ class AuthenticationMiddleware(BaseHTTPMiddleware):
 
         # Use stored service instances
         try:
-            # Use self.jwt_service and self.auth_service
-            token_data: TokenPayload = await self.jwt_service.verify_token(token)
-            user: Optional[UserModel] = await self.auth_service.get_user_by_id(str(token_data.sub))
+            principal = self.principal_cache.get(token) if self.principal_cache is not None else None
+            if principal is None:
+                principal = await self._authenticate(token)
+                if self.principal_cache is not None:
+                    self.principal_cache.put(token, principal)
 
-            if not user:
-                logger.warning(f"User not found for token subject: {token_data.sub}")
-                raise EntityNotFoundError(f"User {token_data.sub} not found.")
+            request.state.user = principal.user
+            request.state.auth = AuthCredentials(scopes=list(principal.scopes))
+            logger.debug(f"User {principal.subject} authenticated successfully.")
 
-            if not user.is_active:
-                 logger.warning(f"Authentication attempt by inactive user: {token_data.sub}")
-                 raise AuthenticationError("User account is inactive.")
-
-            request.state.user = user
-            user_roles = getattr(user, 'roles', [])
-            scopes = [str(role) for role in user_roles]
-            request.state.auth = AuthCredentials(scopes=scopes)
-            logger.debug(f"User {user.id} authenticated successfully.")
-
-        except (InvalidTokenError, AuthenticationError, EntityNotFoundError, TokenExpiredError, MissingTokenError) as e:
+        except (InvalidTokenError, AuthenticationError, EntityNotFoundError, TokenExpiredError, MissingTokenError, JWTError) as e:
             logger.warning(f"Authentication failed: {e} for path {current_path}")
             status_code = status.HTTP_401_UNAUTHORIZED
             detail = str(e)
@@ -141,3 +140,37 @@ class AuthenticationMiddleware(BaseHTTPMiddleware):
 
         response = await call_next(request)
         return response
+
+    async def _authenticate(self, token: str) -> CachedPrincipal:
+        """
+        Verify a token and resolve its user (the uncached path).
+
+        Args:
+            token: Encoded bearer token
+
+        Returns:
+            The authenticated principal
+
+        Raises:
+            InvalidTokenError: If the token is invalid or has been revoked
+            EntityNotFoundError: If the token's user does not exist
+            AuthenticationError: If the user is inactive
+        """
+        token_data: TokenPayload = await self.jwt_service.verify_token(token)
+        if self.principal_cache is not None and await self.principal_cache.is_revoked(token_data.jti):
+            logger.warning(f"Revoked token presented for subject: {token_data.sub}")
+            raise InvalidTokenError("Token has been revoked.")
+
+        user: Optional[UserModel] = await self.auth_service.get_user_by_id(str(token_data.sub))
+
+        if not user:
+            logger.warning(f"User not found for token subject: {token_data.sub}")
+            raise EntityNotFoundError(f"User {token_data.sub} not found.")
+
+        if not user.is_active:
+             logger.warning(f"Authentication attempt by inactive user: {token_data.sub}")
+             raise AuthenticationError("User account is inactive.")
+
+        user_roles = getattr(user, 'roles', [])
+        scopes = tuple(str(role) for role in user_roles)
+        return CachedPrincipal(payload=token_data, user=user, scopes=scopes)
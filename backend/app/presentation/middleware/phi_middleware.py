@@ -9,7 +9,7 @@ ensuring HIPAA compliance at the API layer.
 
 import json
 import logging
-from typing import Any, Callable, Dict, List, Optional, Set, Union, Awaitable
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional, Set, Union, Awaitable
 
 from starlette.middleware.base import BaseHTTPMiddleware, RequestResponseEndpoint
 from starlette.responses import Response, StreamingResponse
@@ -20,6 +20,7 @@ from fastapi import FastAPI, HTTPException
 # Import the canonical PHIService instead of PHIDetector
 # from app.infrastructure.security.phi.detector import PHIDetector
 from app.infrastructure.security.phi.phi_service import PHIService, PHIType
+from app.infrastructure.security.phi.streaming_sanitizer import StreamingJSONSanitizer
 
 
 logger = logging.getLogger(__name__)
@@ -43,6 +44,7 @@ class PHIMiddleware(BaseHTTPMiddleware):
         exclude_paths: Optional[List[str]] = None,
         whitelist_patterns: Optional[Dict[str, List[str]]] = None,
         audit_mode: bool = False,
+        streaming: bool = False,
     ):
         """
         Initialize the PHI middleware.
@@ -55,6 +57,8 @@ class PHIMiddleware(BaseHTTPMiddleware):
             exclude_paths: List of path prefixes to exclude from PHI scanning
             whitelist_patterns: Dict mapping paths to patterns that are allowed
             audit_mode: If True, only log potential PHI without redacting
+            streaming: If True, sanitize streamed JSON responses chunk by chunk
+                instead of buffering and re-encoding the whole body
         """
         super().__init__(app)
         # Use PHIService instance
@@ -64,6 +68,7 @@ class PHIMiddleware(BaseHTTPMiddleware):
         self.exclude_paths = set(exclude_paths or [])
         self.whitelist_patterns = whitelist_patterns or {}
         self.audit_mode = audit_mode
+        self.streaming = streaming
         
     async def dispatch(
         self, request: Request, call_next: Callable[[Request], Awaitable[Response]]
@@ -196,6 +201,10 @@ class PHIMiddleware(BaseHTTPMiddleware):
             # logger.debug(f"[PHIMiddleware._sanitize_response] Skipping sanitization for path {path} or status {response.status_code}")
             return response
 
+        # Streaming mode: forward sanitized chunks without materializing the body
+        if self.streaming and hasattr(response, "body_iterator"):
+            return await self._sanitize_streaming_response(response, path)
+
         # Get whitelisted patterns for the current path (currently unused but kept for future)
         # whitelist = self.whitelist_patterns.get(path, set())
 
@@ -282,12 +291,85 @@ class PHIMiddleware(BaseHTTPMiddleware):
             # This might leak PHI in edge cases but prevents total failure.
             return response
 
+    async def _sanitize_streaming_response(self, response: Response, path: str) -> Response:
+        """
+        Sanitize a streaming JSON response incrementally.
+
+        String tokens are redacted as they arrive and sanitized chunks are
+        forwarded immediately, so peak memory is bounded by the largest single
+        string in the payload rather than by the size of the whole body.
+
+        Args:
+            response: Response exposing a body_iterator
+            path: The request path
+
+        Returns:
+            A StreamingResponse yielding sanitized chunks
+        """
+        body_iterator = response.body_iterator.__aiter__()
+        media_type = response.media_type or response.headers.get("content-type")
+        first_chunk: Optional[bytes] = None
+
+        # Peek at the first chunk to guess the media type, mirroring the buffered path
+        if media_type is None:
+            try:
+                first_chunk = await body_iterator.__anext__()
+            except StopAsyncIteration:
+                first_chunk = b""
+            if isinstance(first_chunk, str):
+                first_chunk = first_chunk.encode("utf-8")
+            if first_chunk.lstrip().startswith(b"{"):
+                media_type = "application/json"
+
+        async def original_chunks() -> AsyncIterator[bytes]:
+            if first_chunk:
+                yield first_chunk
+            async for chunk in body_iterator:
+                yield chunk
+
+        if not (media_type and "application/json" in media_type):
+            if first_chunk is None:
+                return response
+            return StreamingResponse(
+                content=original_chunks(),
+                status_code=response.status_code,
+                headers=dict(response.headers),
+                media_type=media_type,
+                background=response.background,
+            )
+
+        sanitizer = StreamingJSONSanitizer(self.phi_service, sensitivity="high")
+
+        async def sanitized_chunks() -> AsyncIterator[bytes]:
+            try:
+                async for chunk in sanitizer.sanitize_stream(original_chunks()):
+                    yield chunk
+            except Exception as e:
+                # Headers are already sent, so we cannot fall back to the original
+                # body here; abort the stream rather than forward unsanitized data.
+                logger.exception(f"Error during streaming JSON sanitization for path {path}: {e}")
+                raise
+
+        # Sanitization changes the body length, so the original header is invalid
+        headers = {
+            key: value for key, value in response.headers.items()
+            if key.lower() != "content-length"
+        }
+        return StreamingResponse(
+            content=sanitized_chunks(),
+            status_code=response.status_code,
+            headers=headers,
+            media_type=media_type,
+            background=response.background,
+        )
+
 
 def add_phi_middleware(
     app: FastAPI,
     exclude_paths: Optional[List[str]] = None,
     whitelist_patterns: Optional[Dict[str, List[str]]] = None,
     audit_mode: bool = False,
+    streaming: bool = False,
 ) -> None:
     """
     Adds the PHIMiddleware to the FastAPI application.
@@ -297,6 +379,7 @@ def add_phi_middleware(
         exclude_paths: List of path prefixes to exclude from PHI scanning.
         whitelist_patterns: Dict mapping paths to patterns that are allowed.
         audit_mode: If True, only log potential PHI without redacting.
+        streaming: If True, sanitize JSON responses incrementally as they stream.
     """
     # Instantiate the PHI service (could eventually use dependency injection)
     phi_service = PHIService()
@@ -308,5 +391,6 @@ def add_phi_middleware(
         exclude_paths=exclude_paths,
         whitelist_patterns=whitelist_patterns,
         audit_mode=audit_mode,
+        streaming=streaming,
     )
     logger.info("PHI Middleware added.")
@@ -0,0 +1,165 @@
+# -*- coding: utf-8 -*-
+"""
+Integration tests for binary actigraphy uploads.
+
+Posts framed binary and npz payloads to the analyze and embeddings endpoints
+and checks that the PAT service receives columnar readings.
+"""
+
+import io
+import json
+from typing import Any, Dict
+
+import numpy as np
+import pytest
+from fastapi import FastAPI, status
+from fastapi.testclient import TestClient
+
+from app.core.services.ml.pat.actigraphy_data import READING_DTYPE, ActigraphyArray, pack_upload
+from app.core.services.ml.pat.mock import MockPATService
+from app.presentation.api.v1.dependencies.actigraphy import (
+    ACTIGRAPHY_BINARY_CONTENT_TYPE,
+    NPZ_CONTENT_TYPE,
+)
+
+START_NS = 1_740_816_000 * 1_000_000_000  # 2025-03-01T08:00:00Z
+AUTH = {"Authorization": "Bearer test-token"}
+
+ANALYZE_METADATA: Dict[str, Any] = {
+    "patient_id": "test-patient-1",
+    "start_time": "2025-03-01T08:00:00Z",
+    "end_time": "2025-03-01T09:00:00Z",
+    "sampling_rate_hz": 30.0,
+    "device_info": {"device_type": "smartwatch", "model": "versa-3"},
+    "analysis_types": ["sleep_quality", "activity_levels"],
+}
+EMBEDDINGS_METADATA = {key: ANALYZE_METADATA[key] for key in
+                       ("patient_id", "start_time", "end_time", "sampling_rate_hz")}
+
+
+def _records(count: int = 300) -> np.ndarray:
+    records = np.zeros(count, dtype=READING_DTYPE)
+    records["timestamp_ns"] = START_NS + np.arange(count) * 33_333_333
+    records["x"] = 0.25
+    records["y"] = -0.5
+    records["z"] = 1.0
+    return records
+
+
+@pytest.fixture
+def received() -> Dict[str, Any]:
+    """Readings object seen by the PAT service."""
+    return {}
+
+
+@pytest.fixture
+def client(received: Dict[str, Any]) -> TestClient:
+    """TestClient for the actigraphy router alone, with a recording mock PAT service."""
+    from app.presentation.api.dependencies.auth import get_current_user
+    from app.presentation.api.v1.endpoints.actigraphy import get_pat_service, router
+
+    service = MockPATService()
+    service.initialize({"mock_delay_ms": 0})
+    for name in ("analyze_actigraphy", "get_actigraphy_embeddings"):
+        original = getattr(service, name)
+
+        def recording(*args, _original=original, **kwargs):
+            received["readings"] = kwargs["readings"]
+            return _original(*args, **kwargs)
+
+        setattr(service, name, recording)
+
+    # Mount the router on a bare app so the upload path is tested without the
+    # application's authentication middleware
+    app = FastAPI()
+    app.include_router(router, prefix="/api/v1/actigraphy")
+    app.dependency_overrides[get_pat_service] = lambda: service
+    app.dependency_overrides[get_current_user] = lambda: {"id": "test-patient-1", "roles": ["clinician"]}
+    return TestClient(app)
+
+
+class TestBinaryActigraphyUpload:
+    """Tests for the binary content types on the actigraphy endpoints."""
+
+    def test_analyze_framed_upload(self, client: TestClient, received: Dict[str, Any]):
+        """Test that a framed upload reaches the service as an ActigraphyArray."""
+        response = client.post(
+            "/api/v1/actigraphy/analyze",
+            content=pack_upload(ANALYZE_METADATA, _records()),
+            headers={**AUTH, "Content-Type": ACTIGRAPHY_BINARY_CONTENT_TYPE},
+        )
+
+        assert response.status_code == status.HTTP_200_OK, response.text
+        data = response.json()
+        assert data["data_summary"]["readings_count"] == 300
+        readings = received["readings"]
+        assert isinstance(readings, ActigraphyArray)
+        assert np.array_equal(readings.timestamps_ns, _records()["timestamp_ns"])
+        assert np.array_equal(readings.values, np.tile([0.25, -0.5, 1.0], (300, 1)))
+
+    def test_embeddings_npz_upload(self, client: TestClient, received: Dict[str, Any]):
+        """Test that npz uploads are accepted by the embeddings endpoint."""
+        buffer = io.BytesIO()
+        np.savez(buffer, readings=_records(50), metadata=np.array(json.dumps(EMBEDDINGS_METADATA)))
+
+        response = client.post(
+            "/api/v1/actigraphy/embeddings",
+            content=buffer.getvalue(),
+            headers={**AUTH, "Content-Type": NPZ_CONTENT_TYPE},
+        )
+
+        assert response.status_code == status.HTTP_201_CREATED, response.text
+        assert response.json()["data_summary"]["readings_count"] == 50
+        assert isinstance(received["readings"], ActigraphyArray)
+        assert np.array_equal(received["readings"].timestamps_ns, _records(50)["timestamp_ns"])
+
+    def test_invalid_readings_rejected(self, client: TestClient, received: Dict[str, Any]):
+        """Test that vectorized validation failures return 422 without calling the service."""
+        records = _records()
+        records["x"][120] = np.nan
+
+        response = client.post(
+            "/api/v1/actigraphy/analyze",
+            content=pack_upload(ANALYZE_METADATA, records),
+            headers={**AUTH, "Content-Type": ACTIGRAPHY_BINARY_CONTENT_TYPE},
+        )
+
+        assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+        assert "Reading 120" in response.json()["detail"][0]["msg"]
+        assert "readings" not in received
+
+    def test_invalid_metadata_rejected(self, client: TestClient):
+        """Test that header fields go through the Pydantic request model."""
+        metadata = {**ANALYZE_METADATA, "sampling_rate_hz": -1}
+
+        response = client.post(
+            "/api/v1/actigraphy/analyze",
+            content=pack_upload(metadata, _records()),
+            headers={**AUTH, "Content-Type": ACTIGRAPHY_BINARY_CONTENT_TYPE},
+        )
+
+        assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+
+    @pytest.mark.parametrize(
+        "content_type,body",
+        [
+            (ACTIGRAPHY_BINARY_CONTENT_TYPE, b"XXXX" + pack_upload(ANALYZE_METADATA, _records())[4:]),
+            (ACTIGRAPHY_BINARY_CONTENT_TYPE, pack_upload(ANALYZE_METADATA, _records())[:10]),
+            (ACTIGRAPHY_BINARY_CONTENT_TYPE, pack_upload(ANALYZE_METADATA, _records())[:-3]),
+            (NPZ_CONTENT_TYPE, b"not an npz archive"),
+        ],
+        ids=["bad-magic", "truncated-header", "partial-record", "unreadable-npz"],
+    )
+    def test_malformed_payload_rejected(
+        self, client: TestClient, received: Dict[str, Any], content_type: str, body: bytes
+    ):
+        """Test that undecodable payloads return 422 without calling the service."""
+        response = client.post(
+            "/api/v1/actigraphy/analyze",
+            content=body,
+            headers={**AUTH, "Content-Type": content_type},
+        )
+
+        assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+        assert response.json()["detail"][0]["type"] == "value_error"
+        assert "readings" not in received
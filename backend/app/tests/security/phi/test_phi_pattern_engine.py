@@ -0,0 +1,122 @@
+# -*- coding: utf-8 -*-
+"""
+Equivalence tests for the combined single-pass PHI detection engine.
+
+The combined engine must produce exactly the same detections as running every
+pattern separately, for every sensitivity level.
+"""
+
+import random
+import re
+
+import pytest
+
+from app.infrastructure.security.phi.pattern_engine import CombinedPatternEngine
+from app.infrastructure.security.phi.phi_service import PHIService
+
+
+FRAGMENTS = [
+    "Patient John Smith", "SSN: 123-45-6789", "ssn=123456789", "call 555-123-4567",
+    "(555) 987-6543", "+1 555.123.4567", "MRN: AB123456", "Medical Record Number: 98765432",
+    "Patient ID 7788-99", "123 Main Street", "42 Oak Ave.", "4111 1111 1111 1111",
+    "5500-0000-0000-0004", "jane.doe@example.com", "Policy Number: POL-12345",
+    "Insurance ID XYZ98765", "Account Number 1234567890", "Acct# 99887766",
+    "Driver's License D1234567", "DOB: 01/02/1980", "born on March 3rd, 1975",
+    "1980-12-31", "12 Dec 1999", "aged 93", "101 years old", "Dr. Jane Doe",
+    "Mrs. Brown", "Monday", "visited the clinic on 3/4/21", "https://example.com/p?id=42",
+    "www.hospital.org/records", "192.168.0.1", "diagnosis: anxiety", "prescribed sertraline",
+    'ssn = "123-45-6789"', "'dob': '1980-01-01'", "# patient John Smith 123-45-6789",
+    '"""Docstring with SSN 123-45-6789 inside"""', "def f(ssn='123-45-6789'):",
+    "phone: 555-000-1111", "{\"email\": \"a@b.co\"}", "status ok", "heart_rate", "timestamp",
+    "2025-03-01T00:00:00Z", "0.98", "resting", "café Ünïcödé ☃", "ſsn 123-45-6789",
+    "", " ", "\n", "\t", "12345", "987654321", "A", "Bb Cc", "x=1", "key: value",
+]
+
+
+def _corpus(size: int = 600, seed: int = 1234):
+    rng = random.Random(seed)
+    corpus = list(FRAGMENTS)
+    for _ in range(size):
+        parts = rng.sample(FRAGMENTS, rng.randint(1, 5))
+        separator = rng.choice([" ", ", ", "\n", "; ", " and ", ""])
+        corpus.append(separator.join(parts))
+    return corpus
+
+
+@pytest.mark.standalone()
+class TestCombinedPatternEngine:
+    """Tests for CombinedPatternEngine and its integration in PHIService."""
+
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.combined = PHIService()
+        self.sequential = PHIService(use_combined_engine=False)
+
+    @pytest.mark.parametrize("sensitivity", ["low", "medium", "high"])
+    def test_detections_match_sequential_engine(self, sensitivity):
+        """Test that both engines return identical detections on the corpus."""
+        for text in _corpus():
+            assert self.combined.detect_phi(text, sensitivity) == \
+                self.sequential.detect_phi(text, sensitivity), text
+
+    def test_sanitize_matches_sequential_engine(self):
+        """Test that sanitized output is identical for both engines."""
+        for text in _corpus(size=200, seed=99):
+            assert self.combined.sanitize(text, "high") == self.sequential.sanitize(text, "high")
+
+    def test_custom_patterns_are_scanned(self):
+        """Test that custom definitions without prefilter hints still match."""
+        custom = [{"name": "Study ID", "type": None, "priority": 12, "pattern": r"\bSTUDY-\d{4}\b"}]
+        combined = PHIService(custom_patterns_definitions=custom)
+        sequential = PHIService(custom_patterns_definitions=custom, use_combined_engine=False)
+
+        text = "Enrolled in STUDY-2024; contact jane.doe@example.com"
+
+        assert combined.detect_phi(text, "high") == sequential.detect_phi(text, "high")
+        assert any(match[1] == "STUDY-2024" for match in combined.detect_phi(text, "high"))
+
+    def test_engine_yields_finditer_order(self):
+        """Test that scan yields matches grouped by pattern in registration order."""
+        engine = CombinedPatternEngine()
+        digits = re.compile(r"\d+")
+        words = re.compile(r"[a-z]+", re.IGNORECASE)
+        engine.add_pattern("digits", digits, requires_digit=True)
+        engine.add_pattern("words", words)
+
+        text = "abc 12 DEF 345"
+        expected = [("digits", m.group(0)) for m in digits.finditer(text)] + \
+                   [("words", m.group(0)) for m in words.finditer(text)]
+
+        assert [(key, m.group(0)) for key, m in engine.scan(text)] == expected
+
+    def test_backreference_patterns_bypass_gate(self):
+        """Test that patterns with backreferences are scanned on their own."""
+        engine = CombinedPatternEngine()
+        engine.add_pattern("repeat", re.compile(r"(ab)\1"))
+
+        assert [m.group(0) for _, m in engine.scan("xxabab")] == ["abab"]
+
+    def test_resolve_overlaps_matches_character_coverage(self):
+        """Test the interval sweep against a per-character coverage reference."""
+        rng = random.Random(7)
+
+        def reference(matches):
+            ordered = sorted(matches, key=lambda m: (m["priority"], m["length"], -m["start"]),
+                             reverse=True)
+            covered = set()
+            kept = []
+            for m in ordered:
+                span = set(range(m["start"], m["end"]))
+                if not span & covered:
+                    covered |= span
+                    kept.append(m)
+            return sorted(kept, key=lambda m: m["start"])
+
+        for _ in range(300):
+            matches = []
+            for _ in range(rng.randint(1, 12)):
+                start = rng.randint(0, 40)
+                end = start + rng.randint(0, 8)
+                matches.append({"start": start, "end": end, "length": end - start,
+                                "priority": rng.randint(1, 4)})
+            assert self.combined._resolve_overlaps(list(matches)) == reference(list(matches))
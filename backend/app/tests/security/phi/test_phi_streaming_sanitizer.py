@@ -0,0 +1,141 @@
+# -*- coding: utf-8 -*-
+"""
+Tests for the streaming JSON PHI sanitizer and the PHI middleware streaming mode.
+
+These tests verify that incremental, chunk-by-chunk sanitization produces the
+same document as the buffered json.loads/sanitize/json.dumps path regardless of
+where the chunk boundaries fall.
+"""
+
+import json
+from typing import AsyncIterator, List
+from unittest.mock import MagicMock
+
+import pytest
+from starlette.responses import StreamingResponse
+
+from app.infrastructure.security.phi.phi_service import PHIService
+from app.infrastructure.security.phi.streaming_sanitizer import StreamingJSONSanitizer
+from app.presentation.middleware.phi_middleware import PHIMiddleware
+
+
+PAYLOAD = {
+    "patient": {"name": "John Smith", "ssn": "123-45-6789"},
+    "contact": {"email": "john.smith@example.com", "phone": "555-123-4567"},
+    "notes": ["Quote \"inside\" string", "café ☃ unicode", "back\\slash"],
+    "readings": [{"x": 0.1, "y": -2.5e-3, "valid": True, "tag": None}],
+    "status": "ok",
+}
+
+
+def _split(data: bytes, size: int) -> List[bytes]:
+    return [data[i:i + size] for i in range(0, len(data), size)]
+
+
+async def _iterate(chunks: List[bytes]) -> AsyncIterator[bytes]:
+    for chunk in chunks:
+        yield chunk
+
+
+@pytest.mark.standalone()
+class TestStreamingJSONSanitizer:
+    """Tests for StreamingJSONSanitizer."""
+
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.phi_service = PHIService()
+        self.body = json.dumps(PAYLOAD).encode("utf-8")
+        self.expected = self.phi_service.sanitize(PAYLOAD, sensitivity="high")
+
+    def _run(self, chunks: List[bytes]) -> bytes:
+        sanitizer = StreamingJSONSanitizer(self.phi_service, sensitivity="high")
+        output = b"".join(sanitizer.feed(chunk) for chunk in chunks)
+        return output + sanitizer.close()
+
+    @pytest.mark.parametrize("chunk_size", [1, 2, 3, 7, 64, 100000])
+    def test_matches_buffered_sanitization(self, chunk_size):
+        """Test that any chunking yields the same result as the buffered path."""
+        result = self._run(_split(self.body, chunk_size))
+
+        assert json.loads(result) == self.expected
+
+    def test_phi_is_redacted(self):
+        """Test that PHI in string values is replaced."""
+        result = json.loads(self._run(_split(self.body, 5)))
+
+        assert "123-45-6789" not in json.dumps(result)
+        assert "john.smith@example.com" not in json.dumps(result)
+        assert result["status"] == "ok"
+
+    def test_unchanged_tokens_are_forwarded_verbatim(self):
+        """Test that documents without PHI pass through byte-for-byte."""
+        body = b'{"status": "ok", "values": [1, 2.5, true, null], "note": "a\\"b"}'
+
+        assert self._run(_split(body, 3)) == body
+
+    def test_truncated_string_is_still_sanitized(self):
+        """Test that an unterminated trailing string does not leak PHI."""
+        result = self._run([b'{"ssn": "123-45-', b'6789'])
+
+        assert b"123-45-6789" not in result
+
+    @pytest.mark.asyncio
+    async def test_sanitize_stream(self):
+        """Test the async iterator interface."""
+        sanitizer = StreamingJSONSanitizer(self.phi_service, sensitivity="high")
+
+        chunks = [c async for c in sanitizer.sanitize_stream(_iterate(_split(self.body, 11)))]
+
+        assert all(chunks)
+        assert json.loads(b"".join(chunks)) == self.expected
+
+
+@pytest.mark.standalone()
+class TestPHIMiddlewareStreaming:
+    """Tests for the PHI middleware streaming mode."""
+
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.phi_service = PHIService()
+        self.middleware = PHIMiddleware(MagicMock(), phi_service=self.phi_service, streaming=True)
+        self.body = json.dumps(PAYLOAD).encode("utf-8")
+
+    async def _read(self, response) -> bytes:
+        return b"".join([chunk async for chunk in response.body_iterator])
+
+    @pytest.mark.asyncio
+    async def test_streaming_json_response_is_sanitized(self):
+        """Test that streamed JSON is sanitized without a content-length header."""
+        response = StreamingResponse(
+            _iterate(_split(self.body, 16)),
+            headers={"content-length": str(len(self.body))},
+            media_type="application/json",
+        )
+
+        result = await self.middleware._sanitize_response(response, "/api/v1/actigraphy")
+
+        assert isinstance(result, StreamingResponse)
+        assert "content-length" not in result.headers
+        body = await self._read(result)
+        assert json.loads(body) == self.phi_service.sanitize(PAYLOAD, sensitivity="high")
+
+    @pytest.mark.asyncio
+    async def test_media_type_is_guessed_from_first_chunk(self):
+        """Test that untyped streams starting with an object are treated as JSON."""
+        response = StreamingResponse(_iterate(_split(self.body, 16)))
+        response.media_type = None
+        del response.headers["content-type"]
+
+        result = await self.middleware._sanitize_response(response, "/api/v1/actigraphy")
+
+        assert b"123-45-6789" not in await self._read(result)
+
+    @pytest.mark.asyncio
+    async def test_non_json_stream_is_untouched(self):
+        """Test that non-JSON streams are passed through."""
+        html = [b"<html>SSN: ", b"123-45-6789</html>"]
+        response = StreamingResponse(_iterate(html), media_type="text/html")
+
+        result = await self.middleware._sanitize_response(response, "/api/v1/page")
+
+        assert await self._read(result) == b"".join(html)
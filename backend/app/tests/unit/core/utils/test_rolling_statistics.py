@@ -0,0 +1,133 @@
+# -*- coding: utf-8 -*-
+"""
+Unit tests for the rolling statistics utilities.
+"""
+
+import numpy as np
+import pytest
+
+from app.core.utils.rolling_statistics import (
+    OnlineAnomalyDetector,
+    detect_anomalies,
+    rolling_mean_std,
+    sliding_sequences,
+)
+
+
+def _legacy_anomalies(data, window_size, threshold):
+    """The previous per-index window loop."""
+    anomalies = np.zeros(len(data), dtype=bool)
+    for i in range(len(data) - window_size):
+        window = data[i : i + window_size]
+        window_std = np.std(window)
+        if window_std == 0:
+            continue
+        if abs((data[i + window_size] - np.mean(window)) / window_std) > threshold:
+            anomalies[i + window_size] = True
+    return anomalies
+
+
+def _series(seed, n=5000):
+    """Noisy heart-rate-like series with spikes and a flat stretch."""
+    rng = np.random.default_rng(seed)
+    data = 70 + 5 * np.sin(np.arange(n) / 50) + rng.normal(0, 1, n)
+    data[rng.choice(n, 40, replace=False)] += rng.choice([-15, 15], 40)
+    data[1000:1100] = 72.0
+    return data
+
+
+@pytest.mark.standalone()
+class TestRollingStatistics:
+    """Tests for the cumulative-sum rolling statistics and anomaly detection."""
+
+    @pytest.mark.parametrize("window_size", [1, 5, 10, 60])
+    def test_rolling_mean_std_matches_windows(self, window_size):
+        """Test every window's mean and std against np.mean/np.std."""
+        data = _series(0, n=800) * 1000  # large offset stresses the sums of squares
+
+        means, stds = rolling_mean_std(data, window_size)
+
+        windows = np.lib.stride_tricks.sliding_window_view(data, window_size)
+        np.testing.assert_allclose(means, windows.mean(axis=1), rtol=1e-12)
+        np.testing.assert_allclose(stds, windows.std(axis=1), rtol=1e-6, atol=1e-6)
+        assert np.all(stds[(np.ptp(windows, axis=1) == 0)] == 0)
+
+    def test_long_trending_series_keeps_precision(self):
+        """Test a 1M-sample linear trend, where globally centred sums lose the window spread."""
+        rng = np.random.default_rng(5)
+        data = np.arange(1_000_000, dtype=float) + rng.normal(0, 1, 1_000_000)
+
+        means, stds = rolling_mean_std(data, 10)
+
+        windows = np.lib.stride_tricks.sliding_window_view(data, 10)
+        np.testing.assert_allclose(means, windows.mean(axis=1), rtol=1e-12)
+        np.testing.assert_allclose(stds, windows.std(axis=1), rtol=1e-6)
+        expected = np.zeros(len(data), dtype=bool)
+        expected[10:] = np.abs(data[10:] - windows.mean(axis=1)[:-1]) / windows.std(axis=1)[:-1] > 2.0
+        assert np.array_equal(detect_anomalies(data, 10, 2.0), expected)
+
+    @pytest.mark.parametrize("window_size,threshold", [(10, 3.0), (30, 2.5), (3, 1.5)])
+    def test_detect_anomalies_matches_legacy_loop(self, window_size, threshold):
+        """Test flags against the previous loop, including constant windows."""
+        data = _series(1)
+
+        flags = detect_anomalies(data, window_size, threshold)
+
+        np.testing.assert_array_equal(flags, _legacy_anomalies(data, window_size, threshold))
+        assert flags.any()
+        assert not flags[1000 + window_size:1100].any()
+
+    def test_missing_values_only_affect_their_windows(self):
+        """Test that NaNs suppress windows containing them and nothing else."""
+        data = _series(2, n=1000)
+        data[[100, 500]] = np.nan
+
+        flags = detect_anomalies(data, 10, 3.0)
+
+        np.testing.assert_array_equal(flags, _legacy_anomalies(data, 10, 3.0))
+        assert flags[600:].any()
+
+    def test_short_series(self):
+        """Test series no longer than the window."""
+        assert not detect_anomalies(np.ones(5), 10).any()
+        means, stds = rolling_mean_std(np.arange(3.0), 5)
+        assert means.size == stds.size == 0
+
+    def test_online_detector_matches_batch(self):
+        """Test that arbitrary chunking gives the same flags as one batch call."""
+        data = _series(3)
+        detector = OnlineAnomalyDetector(window_size=20, threshold=3.0)
+        rng = np.random.default_rng(4)
+        cuts = np.sort(rng.choice(np.arange(1, len(data)), 60, replace=False))
+
+        flags = np.concatenate([detector.update(chunk) for chunk in np.split(data, cuts)])
+
+        np.testing.assert_array_equal(flags, detect_anomalies(data, 20, 3.0))
+        detector.reset()
+        assert not detector.update(data[:20]).any()
+
+
+@pytest.mark.standalone()
+class TestSlidingSequences:
+    """Tests for zero-copy sequence creation."""
+
+    def test_matches_copied_slices(self):
+        """Test shapes and contents against stacking slices, and that no copy is made."""
+        data = np.arange(60, dtype=float).reshape(20, 3)
+
+        X, y = sliding_sequences(data, 5, target_column=2)
+
+        expected = np.array([data[i : i + 5] for i in range(15)])
+        np.testing.assert_array_equal(X, expected)
+        np.testing.assert_array_equal(y, data[5:, 2])
+        assert np.shares_memory(X, data)
+        assert not X.flags.writeable
+
+    def test_one_dimensional_and_short_series(self):
+        """Test 1D input, a missing target column and series shorter than a sequence."""
+        X, y = sliding_sequences(np.arange(10.0), 4)
+        assert X.shape == (6, 4) and y is None
+        np.testing.assert_array_equal(X[2], [2.0, 3.0, 4.0, 5.0])
+
+        X, y = sliding_sequences(np.zeros((3, 2)), 5, target_column=0)
+        assert X.shape == (0, 5, 2) and y is None
@@ -0,0 +1,193 @@
+# -*- coding: utf-8 -*-
+"""
+Unit tests for the indexed TemporalKnowledgeGraph.
+"""
+
+import random
+from datetime import datetime, timedelta
+from uuid import uuid4
+
+import pytest
+
+from app.domain.entities.knowledge_graph import (
+    EdgeType,
+    KnowledgeGraphEdge,
+    KnowledgeGraphNode,
+    NodeType,
+    TemporalKnowledgeGraph,
+)
+
+START = datetime(2025, 1, 1)
+
+
+def _node(label, node_type, minutes=0):
+    node = KnowledgeGraphNode.create(label, node_type)
+    node.created_at = START + timedelta(minutes=minutes)
+    return node
+
+
+def _edge(source, target, edge_type, minutes=0, confidence=1.0):
+    edge = KnowledgeGraphEdge.create(source.id, target.id, edge_type, confidence=confidence)
+    edge.created_at = START + timedelta(minutes=minutes)
+    return edge
+
+
+def _random_graph(seed, nodes=60, edges=150):
+    """Random graph whose CAUSES/PRECEDES edges only point forward (a DAG)."""
+    rng = random.Random(seed)
+    graph = TemporalKnowledgeGraph(patient_id=uuid4())
+    members = [_node(f"n{i}", rng.choice(list(NodeType)), rng.randrange(600)) for i in range(nodes)]
+    for node in members:
+        graph.add_node(node)
+    for _ in range(edges):
+        a, b = sorted(rng.sample(range(nodes), 2))
+        graph.add_edge(_edge(members[a], members[b], rng.choice(list(EdgeType)), rng.randrange(600),
+                             rng.random()))
+    return graph
+
+
+def _legacy_chains(edges):
+    """The previous DFS from every edge."""
+    adjacency = {}
+    for edge in edges:
+        adjacency.setdefault(edge.source_id, []).append(edge)
+    chains = []
+
+    def dfs(edge, chain):
+        chain.append(edge)
+        if edge.target_id not in adjacency:
+            if len(chain) >= 2:
+                chains.append(chain.copy())
+        else:
+            for next_edge in adjacency[edge.target_id]:
+                dfs(next_edge, chain)
+        chain.pop()
+
+    for edge in edges:
+        dfs(edge, [])
+    return chains
+
+
+@pytest.mark.standalone()
+class TestTemporalKnowledgeGraphIndexes:
+    """Tests that indexed queries agree with full scans."""
+
+    def test_type_and_neighbor_queries_match_scans(self):
+        """Test type buckets and adjacency against scanning nodes and edges."""
+        graph = _random_graph(1)
+
+        for node_type in NodeType:
+            assert graph.get_nodes_by_type(node_type) == [
+                n for n in graph.nodes.values() if n.node_type == node_type]
+        for edge_type in EdgeType:
+            assert graph.get_edges_by_type(edge_type) == [
+                e for e in graph.edges.values() if e.edge_type == edge_type]
+        for node_id in graph.nodes:
+            expected = {}
+            for edge in graph.edges.values():
+                if edge.source_id == node_id:
+                    expected.setdefault(edge.edge_type, []).append(graph.nodes[edge.target_id])
+            for edge in graph.edges.values():
+                if edge.target_id == node_id:
+                    expected.setdefault(f"reverse_{edge.edge_type.value}", []).append(graph.nodes[edge.source_id])
+            assert graph.get_node_neighbors(node_id) == expected
+
+    def test_temporal_subgraph_matches_scan(self):
+        """Test the bisect range against filtering every node and edge."""
+        graph = _random_graph(2)
+        start, end = START + timedelta(minutes=100), START + timedelta(minutes=400)
+
+        subgraph = graph.get_temporal_subgraph(start, end)
+
+        nodes = {i for i, n in graph.nodes.items() if start <= n.created_at <= end}
+        edges = {i for i, e in graph.edges.items()
+                 if start <= e.created_at <= end and e.source_id in nodes and e.target_id in nodes}
+        assert set(subgraph.nodes) == nodes
+        assert set(subgraph.edges) == edges
+        assert subgraph.get_edges_by_type(EdgeType.CAUSES) == [
+            e for e in subgraph.edges.values() if e.edge_type == EdgeType.CAUSES]
+
+    def test_replacing_nodes_and_edges_keeps_indexes_consistent(self):
+        """Test that re-adding an ID with a new type or time moves it in the indexes."""
+        graph = TemporalKnowledgeGraph(patient_id=uuid4())
+        a, b, c = _node("a", NodeType.SYMPTOM), _node("b", NodeType.SYMPTOM), _node("c", NodeType.DIAGNOSIS)
+        for node in (a, b, c):
+            graph.add_node(node)
+        edge = _edge(a, b, EdgeType.CAUSES)
+        graph.add_edge(edge)
+
+        graph.add_node(KnowledgeGraphNode(id=b.id, label="b", node_type=NodeType.BEHAVIOR,
+                                          created_at=START + timedelta(days=2)))
+        graph.add_edge(KnowledgeGraphEdge(id=edge.id, source_id=a.id, target_id=c.id,
+                                          edge_type=EdgeType.PRECEDES, created_at=START))
+
+        assert [n.label for n in graph.get_nodes_by_type(NodeType.SYMPTOM)] == ["a"]
+        assert graph.get_edges_by_type(EdgeType.CAUSES) == []
+        assert graph.get_node_neighbors(a.id) == {EdgeType.PRECEDES: [graph.nodes[c.id]]}
+        assert graph.get_node_neighbors(b.id) == {}
+        assert set(graph.get_temporal_subgraph(START, START + timedelta(days=1)).nodes) == {a.id, c.id}
+
+    def test_constructor_contents_are_indexed(self):
+        """Test that nodes and edges passed to the constructor are queryable."""
+        a, b = _node("a", NodeType.MEDICATION), _node("b", NodeType.SYMPTOM)
+        edge = _edge(a, b, EdgeType.ALLEVIATES)
+
+        graph = TemporalKnowledgeGraph(patient_id=uuid4(), nodes={a.id: a, b.id: b}, edges={edge.id: edge})
+
+        assert graph.get_node_neighbors(a.id) == {EdgeType.ALLEVIATES: [b]}
+        assert graph.get_nodes_by_type(NodeType.MEDICATION) == [a]
+
+
+@pytest.mark.standalone()
+class TestTemporalKnowledgeGraphPatterns:
+    """Tests for memoized chain extraction and grouped symptom clusters."""
+
+    @pytest.mark.parametrize("seed", [3, 4, 5])
+    def test_chains_match_dfs_from_every_edge(self, seed):
+        """Test memoized chains against the previous DFS, order included."""
+        graph = _random_graph(seed, nodes=30, edges=80)
+
+        for edge_type in (EdgeType.CAUSES, EdgeType.PRECEDES, EdgeType.AFFECTS):
+            edges = graph.get_edges_by_type(edge_type)
+            assert graph._extract_chains(edges) == _legacy_chains(edges)
+
+        expected = [
+            {"type": pattern_type,
+             "nodes": [graph.nodes[e.source_id].label for e in chain] + [graph.nodes[chain[-1].target_id].label],
+             "confidence": min(e.confidence for e in chain)}
+            for pattern_type, edge_type in (("causal_chain", EdgeType.CAUSES),
+                                            ("temporal_sequence", EdgeType.PRECEDES))
+            for chain in _legacy_chains(graph.get_edges_by_type(edge_type))
+        ]
+        assert [p for p in graph.extract_patterns() if p["type"] != "symptom_cluster"] == expected
+
+    def test_cycles_terminate(self):
+        """Test that a causal cycle ends chains instead of recursing forever."""
+        graph = TemporalKnowledgeGraph(patient_id=uuid4())
+        a, b, c = (_node(label, NodeType.BEHAVIOR) for label in "abc")
+        for node in (a, b, c):
+            graph.add_node(node)
+        for source, target in ((a, b), (b, c), (c, a)):
+            graph.add_edge(_edge(source, target, EdgeType.CAUSES))
+
+        chains = graph._extract_chains(graph.get_edges_by_type(EdgeType.CAUSES))
+
+        assert chains
+        assert all(len(chain) == len({edge.id for edge in chain}) for chain in chains)
+        assert [graph.nodes[e.source_id].label for e in chains[0]] + ["a"] == ["a", "b", "c", "a"]
+
+    def test_symptom_clusters(self):
+        """Test that diagnoses with at least three symptoms form clusters."""
+        graph = TemporalKnowledgeGraph(patient_id=uuid4())
+        depression, anxiety = _node("depression", NodeType.DIAGNOSIS), _node("anxiety", NodeType.DIAGNOSIS)
+        symptoms = [_node(label, NodeType.SYMPTOM) for label in ("insomnia", "fatigue", "anhedonia", "worry")]
+        for node in (depression, anxiety, *symptoms):
+            graph.add_node(node)
+        for symptom, confidence in zip(symptoms[:3], (0.9, 0.6, 0.8)):
+            graph.add_edge(_edge(symptom, depression, EdgeType.HAS_SYMPTOM, confidence=confidence))
+        graph.add_edge(_edge(symptoms[3], anxiety, EdgeType.HAS_SYMPTOM))
+
+        clusters = [p for p in graph.extract_patterns() if p["type"] == "symptom_cluster"]
+
+        assert clusters == [{"type": "symptom_cluster", "diagnosis": "depression",
+                             "symptoms": ["insomnia", "fatigue", "anhedonia"], "confidence": 0.6}]
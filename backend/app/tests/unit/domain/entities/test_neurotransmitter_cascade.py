@@ -0,0 +1,108 @@
+# -*- coding: utf-8 -*-
+"""
+Unit tests for the matrix-based neurotransmitter cascade simulator.
+"""
+
+import asyncio
+import uuid
+from unittest.mock import AsyncMock
+
+import numpy as np
+import pytest
+
+from app.application.services.temporal_neurotransmitter_service import TemporalNeurotransmitterService
+from app.domain.entities.digital_twin_enums import BrainRegion, Neurotransmitter
+from app.domain.entities.neurotransmitter_cascade import DEFAULT_REGION_CONNECTIVITY, CascadeSimulator
+from app.domain.entities.temporal_neurotransmitter_mapping import TemporalNeurotransmitterMapping
+
+
+def _legacy_cascade(starting_region, initial_level, time_steps, connectivity=DEFAULT_REGION_CONNECTIVITY):
+    """The previous per-region, per-source Python loop."""
+    result = {region: [0.0] * time_steps for region in BrainRegion}
+    result[starting_region][0] = initial_level
+    for t in range(1, time_steps):
+        for target_region in BrainRegion:
+            result[target_region][t] = result[target_region][t - 1] * 0.8
+            for source_region, connections in connectivity.items():
+                if target_region in connections and result[source_region][t - 1] > 0.01:
+                    result[target_region][t] += result[source_region][t - 1] * connections[target_region] * 0.4
+            result[target_region][t] = max(0.0, min(1.0, result[target_region][t]))
+    return result
+
+
+@pytest.mark.standalone()
+class TestCascadeSimulator:
+    """Tests that matrix steps reproduce the loop and batch correctly."""
+
+    @pytest.mark.parametrize("region", [BrainRegion.AMYGDALA, BrainRegion.RAPHE_NUCLEI, BrainRegion.PITUITARY])
+    def test_matches_legacy_loop(self, region):
+        """Test every region and step against the previous loop, including clipping."""
+        mapping = TemporalNeurotransmitterMapping()
+
+        result = mapping._predict_temporal_cascade(region, Neurotransmitter.SEROTONIN, 0.9, 25)
+
+        expected = _legacy_cascade(region, 0.9, 25)
+        assert set(result) == set(BrainRegion)
+        for r in BrainRegion:
+            assert result[r] == pytest.approx(expected[r], abs=1e-12)
+        assert max(max(levels) for levels in result.values()) == 1.0
+
+    def test_batch_matches_single_runs(self):
+        """Test that one batched call equals one call per starting condition."""
+        simulator = CascadeSimulator()
+        starts = [{BrainRegion.AMYGDALA: 0.8}, {BrainRegion.HIPPOCAMPUS: 0.3, BrainRegion.THALAMUS: 0.6}, {}]
+
+        batch = simulator.simulate(simulator.initial_levels(starts), 12)
+
+        assert batch.shape == (3, 12, len(BrainRegion))
+        for row, initial in enumerate(simulator.initial_levels(starts)):
+            np.testing.assert_allclose(batch[row], simulator.simulate(initial, 12), atol=1e-12)
+        assert not batch[2].any()
+
+    def test_mapping_connectivity_is_used_and_cached(self):
+        """Test that custom connectivity replaces the default and rebuilds the matrix once."""
+        mapping = TemporalNeurotransmitterMapping()
+        mapping.brain_region_connectivity = {BrainRegion.AMYGDALA: {BrainRegion.THALAMUS: 1.0}}
+
+        first = mapping._cascade_simulator()
+        result = mapping.predict_cascade_effect(
+            BrainRegion.AMYGDALA, Neurotransmitter.DOPAMINE, initial_level=0.5, time_steps=3)
+
+        assert mapping._cascade_simulator() is first
+        assert result[BrainRegion.THALAMUS] == pytest.approx([0.0, 0.2, 0.32])
+        assert result[BrainRegion.HIPPOCAMPUS] == [0.0, 0.0, 0.0]
+
+        mapping.brain_region_connectivity[BrainRegion.AMYGDALA][BrainRegion.HIPPOCAMPUS] = 0.5
+        assert mapping._cascade_simulator() is not first
+
+    def test_treatment_response_records_regional_cascade(self):
+        """Test that every simulated response carries its regional peaks."""
+        mapping = TemporalNeurotransmitterMapping()
+        patient_id = uuid.uuid4()
+
+        sequences = mapping.simulate_treatment_response(
+            brain_region=BrainRegion.RAPHE_NUCLEI,
+            target_neurotransmitter=Neurotransmitter.SEROTONIN,
+            treatment_effect=0.6,
+            patient_id=patient_id,
+        )
+
+        primary = sequences[Neurotransmitter.SEROTONIN]
+        assert primary.patient_id == patient_id
+        assert primary.metadata["regional_cascade"][BrainRegion.RAPHE_NUCLEI.value] == pytest.approx(0.6)
+        assert BrainRegion.HIPPOCAMPUS.value in primary.metadata["regional_cascade"]
+        assert all("regional_cascade" in s.metadata for s in sequences.values())
+
+    def test_service_cascade_visualization(self):
+        """Test the service's cascade visualization on the simulated cascade."""
+        service = TemporalNeurotransmitterService(sequence_repository=AsyncMock())
+
+        viz = asyncio.run(service.get_cascade_visualization(
+            patient_id=uuid.uuid4(),
+            starting_region=BrainRegion.AMYGDALA,
+            neurotransmitter=Neurotransmitter.SEROTONIN,
+            time_steps=6,
+        ))
+
+        assert len(viz["time_steps"]) == 6
+        assert viz["time_steps"][0]["regions"].get(BrainRegion.AMYGDALA.value, 0.8) == pytest.approx(0.8)
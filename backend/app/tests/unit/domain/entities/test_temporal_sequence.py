@@ -0,0 +1,120 @@
+# -*- coding: utf-8 -*-
+"""
+Tests for the array-backed TemporalSequence lookups.
+"""
+
+import uuid
+from datetime import datetime, timedelta
+
+import numpy as np
+import pytest
+
+from app.domain.entities.temporal_sequence import InterpolationMethod, TemporalSequence, to_epoch_us
+from app.domain.utils.datetime_utils import UTC
+
+START = datetime(2025, 3, 1, 8, 0, tzinfo=UTC)
+
+
+def _sequence(offsets_hours, values) -> TemporalSequence:
+    return TemporalSequence(
+        sequence_id=uuid.uuid4(),
+        feature_names=["serotonin", "dopamine"],
+        timestamps=[START + timedelta(hours=h) for h in offsets_hours],
+        values=values,
+        patient_id=uuid.uuid4(),
+    )
+
+
+@pytest.mark.standalone()
+class TestTemporalSequenceLookups:
+    """Tests for binary-search and batch lookups."""
+
+    def test_get_value_at_exact_and_interpolated(self):
+        """Test exact matches, linear/nearest interpolation and out-of-range lookups."""
+        sequence = _sequence([0, 2, 4], [[0.0, 1.0], [2.0, 3.0], [4.0, 5.0]])
+
+        assert sequence.get_value_at(START + timedelta(hours=2)) == 2.0
+        assert sequence.get_value_at(START + timedelta(hours=1), feature_index=1) == pytest.approx(2.0)
+        assert sequence.get_value_at(START + timedelta(hours=3.5), interpolation=InterpolationMethod.NEAREST) == 4.0
+        assert sequence.get_value_at(START + timedelta(hours=1), interpolation=InterpolationMethod.NONE) is None
+        assert sequence.get_value_at(START + timedelta(hours=5)) is None
+
+    def test_unordered_timestamps_use_time_neighbours(self):
+        """Test that lookups use the closest points in time, not list position."""
+        sequence = _sequence([4, 0, 2], [[4.0, 0.0], [0.0, 0.0], [2.0, 0.0]])
+
+        assert sequence.get_value_at(START + timedelta(hours=3)) == pytest.approx(3.0)
+        assert sequence.index_of(START + timedelta(hours=2)) == 2
+        assert sequence.nearest_index(START + timedelta(hours=0.9)) == 1
+
+    def test_values_at_matches_get_value_at(self):
+        """Test that batch lookups agree with scalar lookups for every method."""
+        rng = np.random.default_rng(0)
+        offsets = np.sort(rng.choice(200, size=40, replace=False)).tolist()
+        sequence = _sequence(offsets, rng.normal(size=(40, 2)).tolist())
+        queries = [START + timedelta(hours=h) for h in np.arange(-2, 202, 0.75)]
+
+        for method in InterpolationMethod:
+            batch = sequence.values_at(queries, interpolation=method)
+            for row, query in zip(batch, queries):
+                for feature in range(2):
+                    expected = sequence.get_value_at(query, feature_index=feature, interpolation=method)
+                    if expected is None:
+                        assert np.isnan(row[feature])
+                    else:
+                        assert row[feature] == pytest.approx(expected)
+
+    def test_values_at_accepts_epoch_microseconds(self):
+        """Test single-feature batch lookups with epoch-microsecond input."""
+        sequence = _sequence([0, 1], [[0.0, 10.0], [1.0, 20.0]])
+        queries = np.array([to_epoch_us(START + timedelta(minutes=m)) for m in (0, 15, 30)])
+
+        assert sequence.values_at(queries, feature_index=1).tolist() == [10.0, 12.5, 15.0]
+
+
+@pytest.mark.standalone()
+class TestTemporalSequenceArrays:
+    """Tests for the column arrays and the list compatibility layer."""
+
+    def test_list_api_round_trips(self):
+        """Test that list-based properties return the original timestamps and values."""
+        timestamps = [START + timedelta(hours=h) for h in range(3)]
+        sequence = _sequence(range(3), [[1, 2], [3, 4], [5, 6]])
+
+        assert sequence.timestamps == timestamps
+        assert sequence.values == [[1.0, 2.0], [3.0, 4.0], [5.0, 6.0]]
+
+    def test_to_numpy_arrays_are_read_only_views(self):
+        """Test that ML arrays share memory with the sequence and cannot modify it."""
+        sequence = _sequence(range(4), np.arange(8.0).reshape(4, 2).tolist())
+
+        X, y = sequence.to_numpy_arrays()
+        _, values = sequence.to_arrays()
+
+        assert np.shares_memory(X, values) and np.shares_memory(y, values)
+        assert np.array_equal(y[0], [2.0, 3.0])
+        with pytest.raises(ValueError):
+            X[0, 0] = 1.0
+
+    def test_extract_subsequence_is_a_view(self):
+        """Test that subsequences share arrays and keep their timestamps."""
+        sequence = _sequence(range(6), np.arange(12.0).reshape(6, 2).tolist())
+
+        subsequence = sequence.extract_subsequence(2, 5)
+
+        assert np.shares_memory(subsequence.to_arrays()[1], sequence.to_arrays()[1])
+        assert subsequence.timestamps == sequence.timestamps[2:5]
+        assert subsequence.get_value_at(START + timedelta(hours=3.5)) == pytest.approx(7.0)
+
+    def test_array_input_materializes_utc_timestamps(self):
+        """Test that array-constructed sequences expose UTC datetimes."""
+        timestamps_us = np.array([to_epoch_us(START), to_epoch_us(START + timedelta(hours=1))])
+        sequence = TemporalSequence(
+            sequence_id=uuid.uuid4(),
+            timestamps=timestamps_us,
+            values=np.array([0.5, 0.7]),
+            patient_id=uuid.uuid4(),
+        )
+
+        assert sequence.timestamps == [START, START + timedelta(hours=1)]
+        assert sequence.values == [[0.5], [0.7]]
@@ -0,0 +1,206 @@
+# -*- coding: utf-8 -*-
+"""
+Unit tests for the interval-indexed appointment availability engine.
+"""
+
+import random
+from datetime import datetime, timedelta
+from unittest.mock import MagicMock
+from uuid import uuid4
+
+import pytest
+
+from app.domain.entities.appointment import Appointment, AppointmentStatus, AppointmentType
+from app.domain.exceptions import AppointmentConflictError
+from app.domain.services.appointment_availability import AppointmentAvailabilityEngine
+from app.domain.services.appointment_service import AppointmentService
+
+PROVIDER = "provider-1"
+DAY = datetime(2030, 1, 7)
+
+
+class FakeAppointmentRepository:
+    """In-memory repository that honours the provider/date range query."""
+
+    def __init__(self, appointments=()):
+        self.appointments = list(appointments)
+        self.calls = []
+
+    def get_by_provider_id(self, provider_id, start, end, status=None):
+        self.calls.append((start, end))
+        return [
+            a for a in self.appointments
+            if str(a.provider_id) == str(provider_id) and a.start_time < end and a.end_time > start
+        ]
+
+    def save(self, appointment):
+        self.appointments = [a for a in self.appointments if a.id != appointment.id] + [appointment]
+        return appointment
+
+
+def _appointment(start, minutes=60, status=AppointmentStatus.SCHEDULED, provider=PROVIDER):
+    return Appointment(
+        id=uuid4(),
+        patient_id=uuid4(),
+        provider_id=provider,
+        start_time=start,
+        end_time=start + timedelta(minutes=minutes),
+        appointment_type=AppointmentType.FOLLOW_UP,
+        status=status,
+    )
+
+
+def _legacy_conflict(appointments, start, end, buffer):
+    """The previous scan over the provider's appointments."""
+    for a in appointments:
+        if a.status in (AppointmentStatus.CANCELLED, AppointmentStatus.NO_SHOW):
+            continue
+        if a.start_time < end + buffer and a.end_time > start - buffer:
+            return True
+    return False
+
+
+@pytest.mark.standalone()
+class TestAppointmentAvailabilityEngine:
+    """Tests for indexed conflict, count and free-slot queries."""
+
+    def test_conflicts_match_linear_scan(self):
+        """Test randomized overlap queries against the previous linear scan."""
+        rng = random.Random(3)
+        appointments = [
+            _appointment(DAY + timedelta(minutes=rng.randrange(0, 3 * 24 * 60, 5)),
+                         minutes=rng.choice([15, 30, 60, 240]),
+                         status=rng.choice(list(AppointmentStatus)))
+            for _ in range(150)
+        ]
+        engine = AppointmentAvailabilityEngine(FakeAppointmentRepository(appointments), buffer_minutes=10)
+
+        for _ in range(500):
+            start = DAY + timedelta(minutes=rng.randrange(0, 3 * 24 * 60, 5))
+            end = start + timedelta(minutes=rng.choice([10, 45, 90]))
+            found = engine.find_conflict(PROVIDER, start, end) is not None
+            assert found == _legacy_conflict(appointments, start, end, timedelta(minutes=10))
+
+    def test_buffer_edges(self):
+        """Test that touching the buffer boundary is not a conflict."""
+        existing = _appointment(DAY.replace(hour=10))
+        engine = AppointmentAvailabilityEngine(FakeAppointmentRepository([existing]), buffer_minutes=15)
+
+        assert engine.find_conflict(PROVIDER, DAY.replace(hour=11, minute=15), DAY.replace(hour=12)) is None
+        assert engine.find_conflict(PROVIDER, DAY.replace(hour=11, minute=14), DAY.replace(hour=12)) is not None
+        assert engine.find_conflict(PROVIDER, DAY.replace(hour=8, minute=45), DAY.replace(hour=9, minute=45)) is None
+        assert engine.find_conflict(PROVIDER, DAY.replace(hour=11), DAY.replace(hour=12),
+                                    exclude_appointment_id=existing.id) is None
+
+    def test_overnight_appointment_from_previous_day_conflicts(self):
+        """Test that an appointment starting the day before is still seen."""
+        overnight = _appointment(DAY - timedelta(hours=2), minutes=240)
+        engine = AppointmentAvailabilityEngine(FakeAppointmentRepository([overnight]), buffer_minutes=0)
+
+        assert engine.find_conflict(PROVIDER, DAY.replace(hour=1), DAY.replace(hour=2)) is not None
+
+    def test_one_repository_query_per_provider_and_day(self):
+        """Test that repeated checks on a loaded day do not hit the repository."""
+        repository = FakeAppointmentRepository([_appointment(DAY.replace(hour=9))])
+        engine = AppointmentAvailabilityEngine(repository)
+
+        for hour in range(10, 17):
+            engine.find_conflict(PROVIDER, DAY.replace(hour=hour), DAY.replace(hour=hour, minute=30))
+            engine.count_for_day(PROVIDER, DAY.replace(hour=hour))
+
+        assert len(repository.calls) == 1
+
+    def test_stale_days_are_reloaded(self):
+        """Test that a loaded day is re-read once it is older than max_age_seconds."""
+        repository = FakeAppointmentRepository()
+        engine = AppointmentAvailabilityEngine(repository, max_age_seconds=0)
+        engine.count_for_day(PROVIDER, DAY)
+        repository.appointments.append(_appointment(DAY.replace(hour=9)))
+
+        assert engine.count_for_day(PROVIDER, DAY) == 1
+
+    def test_record_tracks_saves_and_cancellations(self):
+        """Test that recorded bookings count and cancelled ones are released."""
+        engine = AppointmentAvailabilityEngine(FakeAppointmentRepository())
+        booked = _appointment(DAY.replace(hour=9))
+        engine.count_for_day(PROVIDER, DAY)
+
+        engine.record(booked)
+        assert engine.count_for_day(PROVIDER, DAY) == 1
+        assert engine.find_conflict(PROVIDER, DAY.replace(hour=9), DAY.replace(hour=10)) is not None
+
+        booked.reschedule(DAY.replace(hour=14))
+        engine.record(booked)
+        assert engine.find_conflict(PROVIDER, DAY.replace(hour=9), DAY.replace(hour=10)) is None
+
+        booked.update_status(AppointmentStatus.CANCELLED)
+        engine.record(booked)
+        assert engine.count_for_day(PROVIDER, DAY) == 0
+
+    def test_free_slots_respect_buffers_grid_and_daily_limit(self):
+        """Test free-slot search around bookings and over a full day."""
+        repository = FakeAppointmentRepository([
+            _appointment(DAY.replace(hour=10)),
+            _appointment(DAY.replace(hour=13), minutes=30),
+            *[_appointment(DAY + timedelta(days=1, hours=8 + h), minutes=30) for h in range(3)],
+        ])
+        engine = AppointmentAvailabilityEngine(repository, buffer_minutes=15)
+
+        slots = engine.find_free_slots(PROVIDER, DAY.replace(hour=8), DAY.replace(hour=16), 60, step_minutes=30)
+
+        assert [start.strftime("%H:%M") for start, _ in slots] == [
+            "08:00", "08:30", "11:30", "14:00", "14:30", "15:00",
+        ]
+        for start, end in slots:
+            assert engine.find_conflict(PROVIDER, start, end) is None
+
+        two_days = engine.find_free_slots(PROVIDER, DAY.replace(hour=8), DAY + timedelta(days=1, hours=16),
+                                          60, max_per_day=3)
+        assert {start.date() for start, _ in two_days} == {DAY.date()}
+        assert len(repository.calls) == 2
+
+    def test_provider_lock_rereads_the_booking_range(self):
+        """Test that a booking made by another process is seen under the lock despite a fresh cache."""
+        repository = FakeAppointmentRepository()
+        engine = AppointmentAvailabilityEngine(repository, max_age_seconds=3600)
+        assert engine.count_for_day(PROVIDER, DAY) == 0
+        repository.appointments.append(_appointment(DAY.replace(hour=9)))
+
+        assert engine.count_for_day(PROVIDER, DAY) == 0
+        with engine.provider_lock(PROVIDER, DAY.replace(hour=9), DAY.replace(hour=10)):
+            assert engine.find_conflict(PROVIDER, DAY.replace(hour=9), DAY.replace(hour=10)) is not None
+            assert engine.count_for_day(PROVIDER, DAY) == 1
+
+    def test_schedules_and_loaded_days_are_bounded(self):
+        """Test that idle providers are evicted and old days forgotten."""
+        repository = FakeAppointmentRepository([_appointment(DAY + timedelta(days=d, hours=9)) for d in range(10)])
+        engine = AppointmentAvailabilityEngine(repository, max_providers=2, max_loaded_days=3)
+
+        for day in range(10):
+            engine.count_for_day(PROVIDER, DAY + timedelta(days=day))
+        schedule = engine._schedule(PROVIDER)
+        assert len(schedule.loaded_days) <= 3 and len(schedule) <= 3
+        assert engine.count_for_day(PROVIDER, DAY) == 1
+        wide = engine.find_free_slots(PROVIDER, DAY, DAY + timedelta(days=10), 60, max_per_day=1)
+        assert wide == []
+
+        with engine.provider_lock(PROVIDER):
+            for other in ("provider-2", "provider-3", "provider-4"):
+                engine.count_for_day(other, DAY)
+            assert len(engine._schedules) == 2
+            assert engine._schedule(PROVIDER) is schedule
+
+
+@pytest.mark.standalone()
+def test_services_in_different_workers_cannot_double_book():
+    """Test that a second worker with a cached, now stale, schedule rejects the taken slot."""
+    repository = FakeAppointmentRepository()
+    people = MagicMock()
+    workers = [AppointmentService(repository, people, people) for _ in range(2)]
+    for worker in workers:
+        assert worker.find_available_slots(PROVIDER, DAY.replace(hour=9), DAY.replace(hour=12))
+
+    workers[0].create_appointment(uuid4(), PROVIDER, DAY.replace(hour=10))
+
+    with pytest.raises(AppointmentConflictError):
+        workers[1].create_appointment(uuid4(), PROVIDER, DAY.replace(hour=10))
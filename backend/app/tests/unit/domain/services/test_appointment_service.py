@@ -31,8 +31,8 @@ from app.domain.entities.appointment import (
 
 @pytest.fixture
 def future_datetime():
-    """Fixture for a future datetime."""
-    return datetime.now() + timedelta(days=1)
+    """Fixture for a future datetime (tomorrow morning, so test bookings stay on one day)."""
+    return (datetime.now() + timedelta(days=1)).replace(hour=8, minute=0, second=0, microsecond=0)
 
 @pytest.fixture
 def appointment_repository():
@@ -0,0 +1,185 @@
+# -*- coding: utf-8 -*-
+"""
+Unit tests for compiled, indexed rule dispatch in BiometricEventProcessor.
+"""
+
+import math
+import random
+from datetime import datetime
+from uuid import UUID, uuid4
+
+import numpy as np
+import pytest
+
+from app.domain.entities.biometric_twin import BiometricDataPoint
+from app.domain.exceptions import ValidationError
+from app.domain.services.biometric_event_processor import (
+    AlertPriority,
+    AlertRule,
+    BiometricEventProcessor,
+    CompiledAlertRule,
+    _ThresholdGroup,
+)
+from app.domain.utils.datetime_utils import UTC
+
+CLINICIAN_ID = UUID("00000000-0000-0000-0000-000000000001")
+PATIENTS = [UUID(int=i + 1) for i in range(3)]
+DATA_TYPES = ["heart_rate", "hrv", "steps"]
+OPERATORS = [">", ">=", "<", "<=", "==", "=", "!="]
+
+
+def _rule(rule_id, condition, patient_id=None):
+    return AlertRule(
+        rule_id=rule_id,
+        name=rule_id,
+        description="",
+        priority=AlertPriority.WARNING,
+        condition=condition,
+        created_by=CLINICIAN_ID,
+        patient_id=patient_id,
+    )
+
+
+def _point(patient_id, data_type, value):
+    return BiometricDataPoint(
+        data_id=str(uuid4()),
+        patient_id=patient_id,
+        data_type=data_type,
+        value=value,
+        timestamp=datetime.now(UTC),
+        source="apple_watch",
+    )
+
+
+def _random_rules(rng, count):
+    rules = []
+    for i in range(count):
+        condition = {
+            "data_type": rng.choice(DATA_TYPES),
+            "operator": rng.choice(OPERATORS),
+            "threshold": float(rng.randint(50, 110)),
+        }
+        if i % 10 == 0:
+            condition.update({"context_operator": ">", "context_threshold": 5.0})
+        if i % 17 == 0:
+            condition["context_key"] = "medication_change"
+        rules.append(_rule(f"rule-{i}", condition, rng.choice(PATIENTS + [None, None])))
+    return rules
+
+
+def _fired(alerts):
+    return [(alert.data_point.data_id, alert.rule_id) for alert in alerts]
+
+
+@pytest.mark.standalone()
+class TestCompiledRules:
+    """Tests that compiled predicates agree with AlertRule.evaluate."""
+
+    @pytest.mark.parametrize("operator_name", OPERATORS)
+    def test_threshold_operators(self, operator_name):
+        """Test every operator at, above and below the threshold."""
+        rule = _rule("r", {"data_type": "heart_rate", "operator": operator_name, "threshold": 100})
+        predicate = rule.compile()
+        for value in (99.0, 100.0, 101.0):
+            assert predicate(value, {}) == rule.evaluate(_point(PATIENTS[0], "heart_rate", value), {})
+
+    def test_context_conditions(self):
+        """Test context-key and reading-difference conditions."""
+        rule = _rule("r", {"data_type": "heart_rate", "operator": ">", "threshold": 100,
+                           "context_key": "medication_change", "context_operator": ">=",
+                           "context_threshold": 10})
+        predicate = rule.compile()
+        point = _point(PATIENTS[0], "heart_rate", 90.0)
+        for context in ({}, {"medication_change": "ssri"}, {"medication_change": None},
+                        {"previous_reading": 75.0}, {"previous_reading": 85.0}):
+            assert predicate(point.value, context) == rule.evaluate(point, context)
+        assert rule.threshold_condition() is None
+
+    def test_unknown_operator_raises_when_evaluated(self):
+        """Test that an unknown operator is still reported as a ValidationError."""
+        predicate = _rule("r", {"data_type": "heart_rate", "operator": "~", "threshold": 1}).compile()
+
+        with pytest.raises(ValidationError):
+            predicate(1.0, {})
+
+    @pytest.mark.parametrize("operator_name", OPERATORS)
+    def test_threshold_group_matches_elementwise_comparison(self, operator_name):
+        """Test binary-search matching against a brute-force comparison, NaN included."""
+        rng = random.Random(operator_name)
+        rules = [
+            CompiledAlertRule(_rule(f"r{i}", {"data_type": "hrv", "operator": operator_name,
+                                              "threshold": float(rng.randint(0, 20))}), i)
+            for i in range(40)
+        ]
+        group = _ThresholdGroup(operator_name, rules)
+        values = np.array([rng.randint(-2, 22) for _ in range(30)] + [math.nan], dtype=np.float64)
+
+        rows, columns = group.match(values)
+
+        found = {(row, group.rules[column].sequence) for row, column in zip(rows.tolist(), columns.tolist())}
+        expected = {
+            (row, compiled.sequence)
+            for row, value in enumerate(values.tolist())
+            for compiled in rules
+            if compiled.predicate(value, {})
+        }
+        assert found == expected
+
+
+@pytest.mark.standalone()
+class TestIndexedDispatch:
+    """Tests for bucketed single-point and batch dispatch."""
+
+    def test_batch_matches_sequential_processing(self):
+        """Test that process_data_points fires the same alerts in the same order."""
+        rng = random.Random(7)
+        rules = _random_rules(rng, 300)
+        points = [_point(rng.choice(PATIENTS), rng.choice(DATA_TYPES), float(rng.randint(40, 120)))
+                  for _ in range(400)]
+
+        sequential, batched = BiometricEventProcessor(), BiometricEventProcessor()
+        for processor in (sequential, batched):
+            for rule in rules:
+                processor.add_rule(rule)
+            processor.patient_context[PATIENTS[0]] = {"medication_change": "ssri"}
+            processor.patient_context[PATIENTS[1]] = {"previous_reading": 80.0}
+
+        expected = [alert for point in points for alert in sequential.process_data_point(point)]
+        assert _fired(batched.process_data_points(points)) == _fired(expected)
+        assert expected
+
+    def test_large_bucket_single_point_matches_rule_order(self):
+        """Test that vectorized single-point matching keeps insertion order."""
+        processor = BiometricEventProcessor()
+        thresholds = list(range(100, 40, -1))
+        for i, threshold in enumerate(thresholds):
+            processor.add_rule(_rule(f"rule-{i}", {"data_type": "heart_rate", "operator": "<",
+                                                   "threshold": threshold}))
+
+        alerts = processor.process_data_point(_point(PATIENTS[0], "heart_rate", 70.0))
+
+        assert [alert.rule_id for alert in alerts] == [f"rule-{i}" for i, t in enumerate(thresholds) if 70.0 < t]
+
+    def test_patient_buckets_inactive_and_removed_rules(self):
+        """Test that only the patient's own and global rules fire, and only while active."""
+        processor = BiometricEventProcessor()
+        condition = {"data_type": "heart_rate", "operator": ">", "threshold": 100}
+        processor.add_rule(_rule("global", dict(condition)))
+        processor.add_rule(_rule("own", dict(condition), PATIENTS[0]))
+        processor.add_rule(_rule("other", dict(condition), PATIENTS[1]))
+        processor.add_rule(_rule("paused", dict(condition)))
+        processor.rules["paused"].is_active = False
+
+        point = _point(PATIENTS[0], "heart_rate", 120.0)
+        assert [alert.rule_id for alert in processor.process_data_point(point)] == ["global", "own"]
+
+        processor.remove_rule("global")
+        assert [alert.rule_id for alert in processor.process_data_points([point])] == ["own"]
+
+    def test_batch_rejects_points_without_patient(self):
+        """Test that a batch with an unattributed point is rejected before processing."""
+        processor = BiometricEventProcessor()
+
+        with pytest.raises(ValidationError):
+            processor.process_data_points([_point(PATIENTS[0], "hrv", 50.0), _point(None, "hrv", 50.0)])
+        assert processor.patient_context == {}
@@ -0,0 +1,215 @@
+# -*- coding: utf-8 -*-
+"""
+Unit tests for batched/pipelined RedisCache operations and cache serializers.
+"""
+
+import pytest
+
+fakeredis = pytest.importorskip("fakeredis")
+
+from app.infrastructure.cache.redis_cache import InMemoryFallback, RedisCache
+from app.infrastructure.cache.serializers import (
+    CacheSerializer,
+    JSONSerializer,
+    MsgpackSerializer,
+    OrjsonSerializer,
+    get_serializer,
+)
+from app.infrastructure.cache.tiered_cache import L1CachePolicy, TieredCache
+
+
+class CountingFakeRedis(fakeredis.FakeAsyncRedis):
+    """Fake Redis client that counts commands and pipeline round-trips."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.commands = []
+        self.pipelines = 0
+
+    async def execute_command(self, *args, **options):
+        self.commands.append(args[0])
+        return await super().execute_command(*args, **options)
+
+    def pipeline(self, *args, **kwargs):
+        self.pipelines += 1
+        return super().pipeline(*args, **kwargs)
+
+
+SAMPLE = {"patient_count": 12, "scores": [1.5, 2.5], "labels": {"a": "b"}}
+
+
+def _cache(serializer=None, cache_class=RedisCache, **kwargs):
+    cache = cache_class(redis_url="redis://fake:6379/0", serializer=serializer, **kwargs)
+    binary = get_serializer(serializer).binary
+    cache._client = CountingFakeRedis(decode_responses=not binary)
+    return cache
+
+
+@pytest.mark.venv_only()
+class TestBatchOperations:
+    """Tests for get_many/set_many/delete_many and pipelines."""
+
+    @pytest.mark.asyncio
+    async def test_set_many_and_get_many_single_round_trip(self):
+        """Test that batch reads and writes use one pipeline each."""
+        cache = _cache()
+
+        assert await cache.set_many({"a": SAMPLE, "b": "plain", "c": 3}) is True
+        values = await cache.get_many(["a", "b", "c", "missing"])
+
+        assert values == {"a": SAMPLE, "b": "plain", "c": 3, "missing": None}
+        assert cache._client.pipelines == 2
+        assert cache._client.commands == []
+
+    @pytest.mark.asyncio
+    async def test_set_many_per_key_ttl(self):
+        """Test that per-key expirations override the shared expiration."""
+        cache = _cache()
+
+        await cache.set_many(
+            {"result": SAMPLE, "status": {"status": "completed"}, "forever": 1},
+            expiration=100,
+            expirations={"status": 700, "forever": None},
+        )
+
+        assert await cache.ttl("result") == 100
+        assert await cache.ttl("status") == 700
+        assert await cache.ttl("forever") == -1
+
+    @pytest.mark.asyncio
+    async def test_delete_many(self):
+        """Test that delete_many removes keys with a single DEL."""
+        cache = _cache()
+        await cache.set_many({"a": 1, "b": 2})
+
+        assert await cache.delete_many(["a", "b", "c"]) == 2
+        assert await cache.get_many(["a", "b"]) == {"a": None, "b": None}
+
+    @pytest.mark.asyncio
+    async def test_pipeline_results_in_order(self):
+        """Test that mixed pipeline commands return decoded results in order."""
+        cache = _cache()
+
+        async with cache.pipeline() as pipe:
+            pipe.set("doc", SAMPLE, expiration=60)
+            pipe.increment("counter")
+            pipe.get("doc")
+            pipe.exists("doc")
+            pipe.delete("doc", "counter")
+
+        assert pipe.results == [True, 1, SAMPLE, True, 2]
+
+    @pytest.mark.asyncio
+    async def test_pipeline_discarded_on_error(self):
+        """Test that nothing is sent when the pipeline block raises."""
+        cache = _cache()
+
+        with pytest.raises(RuntimeError):
+            async with cache.pipeline() as pipe:
+                pipe.set("doc", SAMPLE)
+                raise RuntimeError("abort")
+
+        assert await cache.exists("doc") is False
+
+    @pytest.mark.asyncio
+    async def test_in_memory_fallback_executes_sequentially(self):
+        """Test that batch operations work on the in-memory fallback."""
+        cache = RedisCache(redis_url="redis://fake:6379/0")
+        cache._client = InMemoryFallback()
+
+        assert await cache.set_many({"a": "1", "b": "2"}) is True
+        assert await cache.delete_many(["a", "b"]) == 2
+
+    @pytest.mark.asyncio
+    async def test_tiered_get_many_serves_l1_hits(self):
+        """Test that TieredCache only fetches L1 misses from Redis."""
+        cache = _cache(cache_class=TieredCache, policies=[L1CachePolicy("hot:", ttl_seconds=60)],
+                       invalidation=None)
+        await cache.set_many({"hot:a": 1, "hot:b": 2, "cold:c": 3})
+        await cache.get("hot:a")
+        cache._client.commands.clear()
+        cache._client.pipelines = 0
+
+        assert await cache.get_many(["hot:a", "hot:b", "cold:c"]) == {"hot:a": 1, "hot:b": 2, "cold:c": 3}
+        assert cache._client.pipelines == 1
+        assert cache.stats()["hits"] == 1
+
+    @pytest.mark.asyncio
+    async def test_tiered_batch_writes_invalidate_l1(self):
+        """Test that set_many and pipelines drop stale L1 entries."""
+        cache = _cache(cache_class=TieredCache, policies=[L1CachePolicy("hot:", ttl_seconds=60)],
+                       invalidation=None)
+        await cache.set("hot:a", "old")
+        assert await cache.get("hot:a") == "old"
+
+        await cache.set_many({"hot:a": "new"})
+        assert await cache.get("hot:a") == "new"
+
+        async with cache.pipeline() as pipe:
+            pipe.delete("hot:a")
+        assert await cache.get("hot:a") is None
+
+
+@pytest.mark.venv_only()
+class TestSerializers:
+    """Tests for the pluggable cache serializers."""
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("name", ["json", "orjson", "msgpack"])
+    async def test_round_trip(self, name):
+        """Test that values survive a set/get through each serializer."""
+        if name == "orjson":
+            pytest.importorskip("orjson")
+        if name == "msgpack":
+            pytest.importorskip("msgpack")
+        cache = _cache(name)
+
+        await cache.set("doc", SAMPLE)
+        await cache.set_many({"text": "hello", "number": 7})
+
+        assert await cache.get("doc") == SAMPLE
+        assert await cache.get_many(["text", "number"]) == {"text": "hello", "number": 7}
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("name", ["json", "orjson", "msgpack"])
+    async def test_counters_bypass_serializer(self, name):
+        """Test that INCR-written counters read back as ints with every serializer."""
+        if name != "json":
+            pytest.importorskip(name)
+        cache = _cache(name)
+        for _ in range(5):
+            await cache.increment("counter")
+
+        async with cache.pipeline() as pipe:
+            pipe.get_counter("counter")
+            pipe.get_counter("missing")
+
+        assert await cache.get_counter("counter") == 5
+        assert pipe.results == [5, 0]
+
+    def test_serializer_base_is_abstract(self):
+        """Test that serializers must implement dumps and loads."""
+        with pytest.raises(TypeError):
+            CacheSerializer()
+
+    def test_orjson_is_wire_compatible_with_json(self):
+        """Test that orjson and json read each other's output."""
+        pytest.importorskip("orjson")
+        orjson_serializer = OrjsonSerializer()
+        json_serializer = JSONSerializer()
+
+        assert json_serializer.loads(orjson_serializer.dumps(SAMPLE)) == SAMPLE
+        assert orjson_serializer.loads(json_serializer.dumps(SAMPLE)) == SAMPLE
+        assert orjson_serializer.loads("not json") == "not json"
+
+    def test_msgpack_is_smaller(self):
+        """Test that msgpack payloads are smaller than JSON for numeric data."""
+        pytest.importorskip("msgpack")
+        payload = {"series": [{"day": d, "value": d * 0.5} for d in range(100)]}
+
+        assert len(MsgpackSerializer().dumps(payload)) < len(JSONSerializer().dumps(payload))
+
+    def test_unknown_serializer(self):
+        """Test that unknown serializer names are rejected."""
+        with pytest.raises(ValueError):
+            get_serializer("pickle")
@@ -0,0 +1,229 @@
+# -*- coding: utf-8 -*-
+"""
+Unit tests for the content-addressed result store.
+"""
+
+import asyncio
+import os
+import threading
+import time
+
+import numpy as np
+import pytest
+
+from app.infrastructure.cache import result_store
+from app.infrastructure.cache.redis_cache import RedisCache
+from app.infrastructure.cache.result_store import (
+    FileResultStore,
+    RedisResultStore,
+    ResultStore,
+    SQLiteResultStore,
+    content_digest,
+    create_result_store,
+)
+
+RESULT = {"sleep_efficiency": 0.82, "stages": [0.2, 0.5, 0.3], "notes": "stable"}
+
+
+def _key(i: int) -> str:
+    return content_digest([np.full(4, i, dtype=np.float32)], analysis_type="sleep_quality")
+
+
+@pytest.mark.standalone()
+class TestContentDigest:
+    """Tests for content_digest."""
+
+    def test_stable_and_layout_independent(self):
+        """Test that equal data hashes equally, contiguous or not."""
+        records = np.arange(60, dtype=np.float32).reshape(20, 3)
+        strided = np.lib.stride_tricks.as_strided(
+            np.arange(80, dtype=np.float32), shape=(20, 3), strides=(16, 4)
+        )
+        expected = np.ascontiguousarray(strided)
+
+        assert content_digest([records], model_size="medium") == content_digest([records], model_size="medium")
+        assert content_digest([strided]) == content_digest([expected])
+        assert len(content_digest([records])) == 64
+
+    def test_parameters_dtype_and_shape_change_key(self):
+        """Test that every result-affecting input changes the digest."""
+        data = np.arange(12, dtype=np.float32)
+        base = content_digest([data], model_size="medium", analysis_type="sleep_quality", model_version="1")
+
+        assert base != content_digest([data], model_size="large", analysis_type="sleep_quality", model_version="1")
+        assert base != content_digest([data], model_size="medium", analysis_type="sleep_quality", model_version="2")
+        assert base != content_digest([data.astype(np.float64)], model_size="medium",
+                                      analysis_type="sleep_quality", model_version="1")
+        assert base != content_digest([data.reshape(4, 3)], model_size="medium",
+                                      analysis_type="sleep_quality", model_version="1")
+
+
+@pytest.mark.standalone()
+class TestFileResultStore:
+    """Tests for the file-backed store."""
+
+    @pytest.mark.asyncio
+    async def test_round_trip_without_temp_files(self, tmp_path):
+        """Test that results are stored atomically and read back."""
+        store = FileResultStore(str(tmp_path))
+        key = _key(1)
+
+        assert await store.get(key) is None
+        await store.set(key, RESULT)
+
+        assert await store.get(key) == RESULT
+        files = [name for _, _, names in os.walk(tmp_path) for name in names]
+        assert files == [f"{key}.json"]
+        assert store.stats()["hits"] == 1
+
+    @pytest.mark.asyncio
+    async def test_expired_entries_are_misses(self, tmp_path, monkeypatch):
+        """Test that entries older than max_age are dropped on read."""
+        store = FileResultStore(str(tmp_path), max_age_seconds=60)
+        key = _key(2)
+        await store.set(key, RESULT)
+        now = result_store.time.time()
+
+        monkeypatch.setattr(result_store.time, "time", lambda: now + 120)
+
+        assert await store.get(key) is None
+        assert not os.path.exists(store._path(key))
+
+    @pytest.mark.asyncio
+    async def test_size_eviction_keeps_recently_used(self, tmp_path):
+        """Test that the least recently used files are evicted past max_bytes."""
+        store = FileResultStore(str(tmp_path))
+        keys = [_key(i) for i in range(12)]
+        start = result_store.time.time() - 100
+        for i, key in enumerate(keys):
+            await store.set(key, RESULT)
+            os.utime(store._path(key), (start + i, start + i))
+        # Touch the oldest entry so it becomes the most recently used
+        await store.get(keys[0])
+        store.max_bytes = 1000
+        await store.set(_key(99), RESULT)
+
+        stored = {name[:-5] for _, _, names in os.walk(tmp_path) for name in names}
+        total = sum(os.path.getsize(store._path(k)) for k in stored)
+        assert total <= 1000
+        assert keys[0] in stored
+        assert keys[1] not in stored
+        assert store.stats()["evictions"] > 0
+
+    @pytest.mark.asyncio
+    async def test_corrupt_file_is_discarded(self, tmp_path):
+        """Test that unreadable files are treated as misses and removed."""
+        store = FileResultStore(str(tmp_path))
+        key = _key(3)
+        os.makedirs(os.path.dirname(store._path(key)))
+        with open(store._path(key), "w") as f:
+            f.write('{"created_at": 1')
+
+        assert await store.get(key) is None
+        assert not os.path.exists(store._path(key))
+
+
+@pytest.mark.standalone()
+class TestSQLiteResultStore:
+    """Tests for the SQLite-backed store."""
+
+    @pytest.mark.asyncio
+    async def test_shared_between_instances(self, tmp_path):
+        """Test that two workers opening the same database share results."""
+        path = str(tmp_path / "results.sqlite3")
+        writer = SQLiteResultStore(path)
+        reader = SQLiteResultStore(path)
+
+        await writer.set(_key(1), RESULT)
+
+        assert await reader.get(_key(1)) == RESULT
+        writer.close()
+        reader.close()
+
+    @pytest.mark.asyncio
+    async def test_age_and_size_eviction(self, tmp_path, monkeypatch):
+        """Test that expired rows and least recently accessed rows are evicted."""
+        store = SQLiteResultStore(str(tmp_path / "results.sqlite3"), max_bytes=400, max_age_seconds=60)
+        now = result_store.time.time()
+        clock = iter(range(1000))
+        monkeypatch.setattr(result_store.time, "time", lambda: now + next(clock))
+
+        for i in range(8):
+            await store.set(_key(i), RESULT)
+        await store.get(_key(7))
+
+        remaining = [i for i in range(8) if await store.get(_key(i)) is not None]
+        assert store._total_bytes() <= 400
+        assert 7 in remaining and 0 not in remaining
+
+        monkeypatch.setattr(result_store.time, "time", lambda: now + 10_000)
+        assert await store.get(_key(7)) is None
+        store.close()
+
+
+@pytest.mark.standalone()
+@pytest.mark.asyncio
+@pytest.mark.parametrize("backend", ["file", "sqlite"])
+async def test_local_backends_do_io_off_the_event_loop(tmp_path, backend):
+    """Test that slow disk reads and writes run in worker threads while the loop keeps running."""
+    store = create_result_store(backend, str(tmp_path))
+    loop_thread = threading.get_ident()
+    io_threads = set()
+
+    def slow(method):
+        def wrapper(*args):
+            io_threads.add(threading.get_ident())
+            time.sleep(0.1)
+            return method(*args)
+        return wrapper
+
+    store._get, store._set = slow(store._get), slow(store._set)
+    ticks = 0
+
+    async def heartbeat():
+        nonlocal ticks
+        while True:
+            await asyncio.sleep(0.005)
+            ticks += 1
+
+    monitor = asyncio.ensure_future(heartbeat())
+    await store.set(_key(1), RESULT)
+    assert await store.get(_key(1)) == RESULT
+    monitor.cancel()
+
+    assert loop_thread not in io_threads
+    assert ticks >= 10
+    if backend == "sqlite":
+        store.close()
+
+
+@pytest.mark.venv_only()
+class TestRedisResultStore:
+    """Tests for the Redis-backed store."""
+
+    @pytest.mark.asyncio
+    async def test_round_trip_with_ttl(self):
+        """Test that results are shared through Redis with a TTL."""
+        fakeredis = pytest.importorskip("fakeredis")
+        cache = RedisCache(redis_url="redis://fake:6379/0")
+        cache._client = fakeredis.FakeAsyncRedis(decode_responses=True)
+        store = RedisResultStore(cache, max_age_seconds=3600, prefix="pat:result:")
+
+        await store.set(_key(1), RESULT)
+
+        assert await store.get(_key(1)) == RESULT
+        assert 0 < await cache.ttl(f"pat:result:{_key(1)}") <= 3600
+
+
+@pytest.mark.standalone()
+def test_create_result_store(tmp_path):
+    """Test backend selection from configuration."""
+    assert create_result_store("none", str(tmp_path)) is None
+    assert isinstance(create_result_store("file", str(tmp_path)), FileResultStore)
+    sqlite_store = create_result_store("sqlite", str(tmp_path))
+    assert isinstance(sqlite_store, SQLiteResultStore)
+    sqlite_store.close()
+    with pytest.raises(ValueError):
+        create_result_store("memcached", str(tmp_path))
+    with pytest.raises(TypeError):
+        ResultStore()
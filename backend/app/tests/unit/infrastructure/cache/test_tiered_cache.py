@@ -0,0 +1,178 @@
+# -*- coding: utf-8 -*-
+"""
+Unit tests for the two-tier (in-process L1 + Redis) cache.
+
+Runs against fakeredis so that round-trips and pub/sub invalidation between
+two cache instances sharing one server can be observed.
+"""
+
+import asyncio
+from unittest.mock import patch
+
+import pytest
+
+fakeredis = pytest.importorskip("fakeredis")
+
+from app.infrastructure.cache.tiered_cache import L1CachePolicy, TieredCache
+
+
+class CountingFakeRedis(fakeredis.FakeAsyncRedis):
+    """Fake Redis client that counts commands sent to the server."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.commands = []
+
+    async def execute_command(self, *args, **options):
+        self.commands.append(args[0])
+        return await super().execute_command(*args, **options)
+
+
+@pytest.fixture
+def server():
+    """Create a fake Redis server shared by several clients."""
+    return fakeredis.FakeServer()
+
+
+def _cache(server, policies=None, invalidation=None):
+    cache = TieredCache(
+        redis_url="redis://fake:6379/0",
+        policies=policies if policies is not None else [L1CachePolicy("hot:", ttl_seconds=60)],
+        invalidation=invalidation,
+    )
+    cache._client = CountingFakeRedis(server=server, decode_responses=True)
+    return cache
+
+
+@pytest.mark.venv_only()
+class TestTieredCache:
+    """Tests for TieredCache."""
+
+    @pytest.mark.asyncio
+    async def test_hot_key_served_from_memory(self, server):
+        """Test that repeated reads of a policy key hit Redis once."""
+        cache = _cache(server)
+        await cache.set("hot:model", {"version": 3})
+        cache._client.commands.clear()
+
+        for _ in range(5):
+            assert await cache.get("hot:model") == {"version": 3}
+
+        assert cache._client.commands == ["GET"]
+        stats = cache.stats()
+        assert (stats["hits"], stats["misses"]) == (4, 1)
+
+    @pytest.mark.asyncio
+    async def test_keys_without_policy_bypass_l1(self, server):
+        """Test that keys outside every prefix always go to Redis."""
+        cache = _cache(server)
+        await cache.set("ratelimit:ip", {"remaining": 1})
+        cache._client.commands.clear()
+
+        await cache.get("ratelimit:ip")
+        await cache.get("ratelimit:ip")
+
+        assert cache._client.commands == ["GET", "GET"]
+        assert cache.stats()["misses"] == 0
+
+    @pytest.mark.asyncio
+    async def test_unshared_values_are_independent_copies(self, server):
+        """Test that callers cannot corrupt L1 entries by mutating results."""
+        cache = _cache(server)
+        await cache.set("hot:data", {"items": [1]})
+
+        (await cache.get("hot:data"))["items"].append(2)
+
+        assert await cache.get("hot:data") == {"items": [1]}
+
+    @pytest.mark.asyncio
+    async def test_local_write_invalidates(self, server):
+        """Test that set, increment and delete drop the L1 entry."""
+        cache = _cache(server)
+        await cache.set("hot:counter", 1)
+        assert await cache.get("hot:counter") == 1
+
+        await cache.increment("hot:counter")
+        assert await cache.get("hot:counter") == 2
+
+        await cache.delete("hot:counter")
+        assert await cache.get("hot:counter") is None
+
+    @pytest.mark.asyncio
+    async def test_ttl_expiry(self, server):
+        """Test that entries older than the policy TTL are re-read."""
+        cache = _cache(server, policies=[L1CachePolicy("hot:", ttl_seconds=5)])
+        await cache.set("hot:key", "v1")
+
+        with patch("app.infrastructure.cache.tiered_cache.time.monotonic") as clock:
+            clock.return_value = 100.0
+            await cache.get("hot:key")
+            # Another service writes directly to Redis
+            await cache._client.set("hot:key", "v2")
+            clock.return_value = 104.0
+            assert await cache.get("hot:key") == "v1"
+            clock.return_value = 105.5
+            assert await cache.get("hot:key") == "v2"
+
+        assert cache.stats()["expirations"] == 1
+
+    @pytest.mark.asyncio
+    async def test_lru_eviction_by_bytes(self, server):
+        """Test that the byte budget evicts least recently used entries."""
+        policy = L1CachePolicy("hot:", ttl_seconds=60, max_bytes=3 * (128 + 10 + 6))
+        cache = _cache(server, policies=[policy])
+        for name in ("a", "b", "c", "d"):
+            await cache.set(f"hot:{name}", "x" * 10)
+
+        await cache.get("hot:a")
+        await cache.get("hot:b")
+        await cache.get("hot:a")  # b is now least recently used
+        await cache.get("hot:c")
+        await cache.get("hot:d")
+
+        stats = cache.stats()
+        assert stats["evictions"] == 1
+        assert stats["entries"] == 3
+        assert stats["size_bytes"] <= policy.max_bytes
+        cache._client.commands.clear()
+        await cache.get("hot:b")
+        assert cache._client.commands == ["GET"]
+
+    @pytest.mark.asyncio
+    async def test_longest_prefix_policy_wins(self, server):
+        """Test that the most specific policy handles a key."""
+        cache = _cache(server, policies=[
+            L1CachePolicy("hot:", ttl_seconds=60),
+            L1CachePolicy("hot:status:", ttl_seconds=1),
+        ])
+        await cache.set("hot:status:job", "running")
+        await cache.get("hot:status:job")
+
+        assert cache.stats()["prefixes"]["hot:status:"]["entries"] == 1
+        assert cache.stats()["prefixes"]["hot:"]["entries"] == 0
+
+    @pytest.mark.asyncio
+    async def test_pubsub_invalidation_between_workers(self, server):
+        """Test that a write in one worker invalidates another worker's L1."""
+        writer = _cache(server, invalidation="pubsub")
+        reader = _cache(server, invalidation="pubsub")
+        await writer.initialize()
+        await reader.initialize()
+        try:
+            await asyncio.sleep(0.05)  # let the listeners subscribe
+            await writer.set("hot:status", "pending")
+            await asyncio.sleep(0.05)
+            assert await reader.get("hot:status") == "pending"
+            assert reader.stats()["entries"] == 1
+
+            await writer.set("hot:status", "done")
+
+            for _ in range(50):
+                if await reader.get("hot:status") == "done":
+                    break
+                await asyncio.sleep(0.01)
+            assert await reader.get("hot:status") == "done"
+            assert reader.stats()["invalidations"] >= 1
+        finally:
+            await writer.close()
+            await reader.close()
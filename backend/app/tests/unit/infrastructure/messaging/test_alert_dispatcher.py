@@ -0,0 +1,290 @@
+# -*- coding: utf-8 -*-
+"""
+Tests for the asynchronous biometric alert dispatcher, using in-process fake
+email and SMS providers.
+"""
+
+import asyncio
+import threading
+import time
+from datetime import datetime
+from uuid import UUID
+
+import pytest
+
+from app.domain.entities.biometric_twin import BiometricDataPoint
+from app.domain.services.biometric_event_processor import (
+    AlertPriority,
+    AlertRule,
+    BiometricEventProcessor,
+    EmailAlertObserver,
+    SMSAlertObserver,
+)
+from app.domain.utils.datetime_utils import UTC
+from app.infrastructure.messaging.alert_dispatcher import (
+    SUPPRESSED_DUPLICATES_KEY,
+    AlertDispatcher,
+    ChannelPolicy,
+)
+
+PATIENT_ID = UUID("12345678-1234-5678-1234-567812345678")
+CLINICIAN_ID = UUID("00000000-0000-0000-0000-000000000001")
+
+
+class FakeEmailService:
+    """Email provider that blocks for a fixed time per message."""
+
+    def __init__(self, delay: float = 0.0):
+        self.delay = delay
+        self.sent = []
+        self.lock = threading.Lock()
+
+    def send_email(self, recipient, subject, body):
+        time.sleep(self.delay)
+        with self.lock:
+            self.sent.append((recipient, subject, body))
+
+
+class FakeSMSService:
+    """SMS provider that fails a configurable number of times first."""
+
+    def __init__(self, failures: int = 0):
+        self.failures = failures
+        self.sent = []
+
+    def send_sms(self, recipient, message):
+        if self.failures:
+            self.failures -= 1
+            raise ConnectionError("SMS gateway timeout")
+        self.sent.append((recipient, message))
+
+
+def _processor(*observers, rules=1):
+    processor = BiometricEventProcessor()
+    for i in range(rules):
+        processor.add_rule(AlertRule(
+            rule_id=f"rule-{i}",
+            name=f"High Heart Rate {i}",
+            description="",
+            priority=AlertPriority.URGENT,
+            condition={"data_type": "heart_rate", "operator": ">", "threshold": 100.0},
+            created_by=CLINICIAN_ID,
+        ))
+    for observer in observers:
+        processor.register_observer(observer, [AlertPriority.URGENT])
+    return processor
+
+
+def _point(value=120.0):
+    return BiometricDataPoint(
+        data_id="dp-1", patient_id=PATIENT_ID, data_type="heart_rate", value=value,
+        timestamp=datetime.now(UTC), source="apple_watch",
+    )
+
+
+FAST_RETRY = ChannelPolicy(max_retries=3, backoff_base_seconds=0.001)
+
+
+@pytest.mark.standalone()
+class TestAlertDispatcher:
+    """Tests for queued fan-out, retries, coalescing and rate limits."""
+
+    def test_ingestion_does_not_wait_for_slow_provider(self):
+        """Test that processing returns before a slow email is sent."""
+        email = FakeEmailService(delay=0.3)
+        processor = _processor(EmailAlertObserver(email))
+
+        async def scenario():
+            dispatcher = AlertDispatcher()
+            await dispatcher.start()
+            processor.attach_dispatcher(dispatcher)
+            started = time.perf_counter()
+            alerts = processor.process_data_point(_point())
+            elapsed = time.perf_counter() - started
+            assert email.sent == []
+            await dispatcher.stop()
+            return alerts, elapsed
+
+        alerts, elapsed = asyncio.run(scenario())
+
+        assert len(alerts) == 1
+        assert elapsed < 0.1
+        assert len(email.sent) == 1
+
+    def test_channel_workers_deliver_concurrently(self):
+        """Test that a channel's worker pool overlaps slow deliveries."""
+        email = FakeEmailService(delay=0.1)
+        processor = _processor(EmailAlertObserver(email), rules=4)
+
+        async def scenario():
+            dispatcher = AlertDispatcher(policies={"email": ChannelPolicy(concurrency=4)})
+            await dispatcher.start()
+            processor.attach_dispatcher(dispatcher)
+            started = time.perf_counter()
+            processor.process_data_point(_point())
+            await dispatcher.drain()
+            elapsed = time.perf_counter() - started
+            await dispatcher.stop()
+            return elapsed
+
+        assert asyncio.run(scenario()) < 0.3
+        assert len(email.sent) == 4
+
+    def test_failed_delivery_is_retried(self):
+        """Test that transient provider errors are retried with backoff."""
+        sms = FakeSMSService(failures=2)
+        processor = _processor(SMSAlertObserver(sms))
+
+        async def scenario():
+            dispatcher = AlertDispatcher(policies={"sms": FAST_RETRY})
+            await dispatcher.start()
+            processor.attach_dispatcher(dispatcher)
+            processor.process_data_point(_point())
+            await dispatcher.drain()
+            stats = dispatcher.stats()
+            await dispatcher.stop()
+            return stats
+
+        stats = asyncio.run(scenario())
+
+        assert len(sms.sent) == 1
+        assert stats["channels"]["sms"]["retries"] == 2
+        assert stats["channels"]["sms"]["delivered"] == 1
+
+    def test_exhausted_retries_are_counted_and_other_channels_unaffected(self):
+        """Test that a dead channel does not block delivery on another."""
+        sms = FakeSMSService(failures=100)
+        email = FakeEmailService()
+        processor = _processor(SMSAlertObserver(sms), EmailAlertObserver(email))
+
+        async def scenario():
+            dispatcher = AlertDispatcher(policies={"sms": FAST_RETRY})
+            await dispatcher.start()
+            processor.attach_dispatcher(dispatcher)
+            processor.process_data_point(_point())
+            await dispatcher.drain()
+            stats = dispatcher.stats()
+            await dispatcher.stop()
+            return stats
+
+        stats = asyncio.run(scenario())
+
+        assert stats["channels"]["sms"]["failed"] == 1
+        assert len(email.sent) == 1
+
+    def test_repeated_alerts_are_coalesced(self):
+        """Test that duplicates within the window are suppressed and reported."""
+        email = FakeEmailService()
+        processor = _processor(EmailAlertObserver(email))
+
+        async def scenario():
+            dispatcher = AlertDispatcher(dedup_window_seconds=0.2)
+            await dispatcher.start()
+            processor.attach_dispatcher(dispatcher)
+            for _ in range(5):
+                processor.process_data_point(_point())
+            await asyncio.sleep(0.25)
+            later = processor.process_data_point(_point())
+            await dispatcher.drain()
+            stats = dispatcher.stats()
+            await dispatcher.stop()
+            return later, stats
+
+        later, stats = asyncio.run(scenario())
+
+        assert len(email.sent) == 2
+        assert stats["coalesced"] == 4
+        assert later[0].context[SUPPRESSED_DUPLICATES_KEY] == 4
+
+    def test_channel_rate_limit(self):
+        """Test that a channel never exceeds its configured rate."""
+        email = FakeEmailService()
+        processor = _processor(EmailAlertObserver(email), rules=5)
+
+        async def scenario():
+            policy = ChannelPolicy(concurrency=5, rate_per_second=20, burst=1)
+            dispatcher = AlertDispatcher(policies={"email": policy})
+            await dispatcher.start()
+            processor.attach_dispatcher(dispatcher)
+            started = time.perf_counter()
+            processor.process_data_point(_point())
+            await dispatcher.drain()
+            elapsed = time.perf_counter() - started
+            await dispatcher.stop()
+            return elapsed
+
+        assert asyncio.run(scenario()) >= 0.18
+        assert len(email.sent) == 5
+
+    def test_submit_from_worker_thread(self):
+        """Test that alerts raised off the event loop thread are delivered."""
+        email = FakeEmailService()
+        processor = _processor(EmailAlertObserver(email))
+
+        async def scenario():
+            dispatcher = AlertDispatcher()
+            await dispatcher.start()
+            processor.attach_dispatcher(dispatcher)
+            await asyncio.to_thread(processor.process_data_point, _point())
+            await asyncio.sleep(0.05)
+            await dispatcher.stop()
+
+        asyncio.run(scenario())
+
+        assert len(email.sent) == 1
+
+    def test_not_running_falls_back_to_inline_notification(self):
+        """Test that observers are still notified when the dispatcher is stopped."""
+        email = FakeEmailService()
+        processor = _processor(EmailAlertObserver(email))
+        processor.attach_dispatcher(AlertDispatcher())
+
+        processor.process_data_point(_point())
+
+        assert len(email.sent) == 1
+
+    def test_full_channel_falls_back_to_inline_notification(self):
+        """Test that an alert a full channel cannot take is delivered inline, never dropped."""
+        email = FakeEmailService(delay=0.05)
+        processor = _processor(EmailAlertObserver(email), rules=3)
+
+        async def scenario():
+            policy = ChannelPolicy(concurrency=1, queue_size=1)
+            dispatcher = AlertDispatcher(policies={"email": policy}, dedup_window_seconds=0)
+            await dispatcher.start()
+            processor.attach_dispatcher(dispatcher)
+            processor.process_data_point(_point())
+            inline = len(email.sent)
+            await dispatcher.drain()
+            stats = dispatcher.stats()
+            await dispatcher.stop()
+            return inline, stats
+
+        inline, stats = asyncio.run(scenario())
+
+        # One alert fits the queue; the other two are delivered inline by the processor
+        assert inline == 2
+        assert len(email.sent) == 3
+        assert stats["rejected"] == 2
+        assert stats["channels"]["email"]["enqueued"] == 1
+
+    def test_queue_slots_are_released_as_workers_take_alerts(self):
+        """Test that a drained channel accepts alerts again."""
+        email = FakeEmailService()
+        observer = EmailAlertObserver(email)
+
+        async def scenario():
+            dispatcher = AlertDispatcher(policies={"email": ChannelPolicy(queue_size=1)}, dedup_window_seconds=0)
+            await dispatcher.start()
+            accepted = []
+            for _ in range(3):
+                accepted.append(dispatcher.submit(processor_alert, [observer]))
+                await dispatcher.drain()
+            await dispatcher.stop()
+            return accepted
+
+        processor_alert = _processor(observer).process_data_point(_point())[0]
+        email.sent.clear()
+
+        assert asyncio.run(scenario()) == [True, True, True]
+        assert len(email.sent) == 3
@@ -0,0 +1,173 @@
+# -*- coding: utf-8 -*-
+"""
+Unit tests for exact junction-tree inference on BayesianBeliefNetwork.
+"""
+
+import itertools
+import random
+from uuid import uuid4
+
+import numpy as np
+import pytest
+
+from app.domain.entities.knowledge_graph import BayesianBeliefNetwork
+from app.infrastructure.ml.bayesian import JunctionTreeInference
+
+
+def _random_network(seed, variables=8, max_parents=3, coverage=1.0):
+    """Random DAG with random CPTs; ``coverage`` is the share of defined configurations."""
+    rng = random.Random(seed)
+    network = BayesianBeliefNetwork(patient_id=uuid4(), inference=JunctionTreeInference())
+    names = [f"v{i}" for i in range(variables)]
+    for name in names:
+        network.add_variable(name, [f"s{k}" for k in range(rng.randint(2, 3))])
+    for i, name in enumerate(names[1:], 1):
+        for parent in rng.sample(names[:i], min(i, rng.randint(0, max_parents))):
+            network.add_dependency(name, parent)
+    for name in names:
+        parents = network.variables[name]["parents"]
+        for values in itertools.product(*(network.variables[p]["states"] for p in parents)):
+            if rng.random() < coverage:
+                weights = [rng.random() + 0.05 for _ in network.variables[name]["states"]]
+                network.set_conditional_probability(
+                    name, dict(zip(parents, values)),
+                    {s: w / sum(weights) for s, w in zip(network.variables[name]["states"], weights)})
+    return network
+
+
+def _enumerate(network, evidence):
+    """Posteriors by summing the full joint distribution."""
+    names = list(network.variables)
+    totals = {name: dict.fromkeys(network.variables[name]["states"], 0.0) for name in names}
+    for values in itertools.product(*(network.variables[n]["states"] for n in names)):
+        assignment = dict(zip(names, values))
+        if any(assignment[var] != value for var, value in evidence.items()):
+            continue
+        probability = 1.0
+        for name in names:
+            parents = network.variables[name]["parents"]
+            config = network._parent_config_to_string({p: assignment[p] for p in parents})
+            table = network.conditional_probabilities.get(name, {})
+            if config in table:
+                probability *= table[config].get(assignment[name], 0.0)
+            else:
+                probability /= len(network.variables[name]["states"])
+        for name in names:
+            totals[name][assignment[name]] += probability
+    return {name: {s: p / sum(dist.values()) for s, p in dist.items()} for name, dist in totals.items()}
+
+
+def _assert_beliefs_equal(actual, expected):
+    assert set(actual) == set(expected)
+    for name, distribution in expected.items():
+        assert actual[name] == pytest.approx(distribution, abs=1e-9)
+
+
+@pytest.mark.standalone()
+class TestBayesianBeliefNetworkInference:
+    """Tests that junction-tree posteriors match brute-force enumeration."""
+
+    @pytest.mark.parametrize("seed", [0, 1, 2, 3])
+    def test_posteriors_match_enumeration(self, seed):
+        """Test every variable's posterior under random evidence."""
+        network = _random_network(seed, coverage=0.8)
+        rng = random.Random(seed)
+        evidence = {name: rng.choice(network.variables[name]["states"])
+                    for name in rng.sample(list(network.variables), 3)}
+
+        network.update_beliefs(evidence)
+
+        _assert_beliefs_equal(network.get_belief_state(), _enumerate(network, evidence))
+
+    def test_evidence_propagates_to_parents(self):
+        """Test that observing a child updates its parent (diagnostic reasoning)."""
+        network = BayesianBeliefNetwork(patient_id=uuid4(), inference=JunctionTreeInference())
+        network.add_variable("mood", ["low", "high"])
+        network.add_variable("sleep", ["poor", "good"])
+        network.add_dependency("sleep", "mood")
+        network.set_conditional_probability("mood", {}, {"low": 0.3, "high": 0.7})
+        network.set_conditional_probability("sleep", {"mood": "low"}, {"poor": 0.8, "good": 0.2})
+        network.set_conditional_probability("sleep", {"mood": "high"}, {"poor": 0.1, "good": 0.9})
+
+        network.update_beliefs({"sleep": "poor"})
+        beliefs = network.get_belief_state()
+
+        assert beliefs["sleep"] == {"poor": 1.0, "good": 0.0}
+        assert beliefs["mood"]["low"] == pytest.approx(0.24 / 0.31)
+
+    def test_incremental_evidence_matches_fresh_network(self):
+        """Test that evidence added (then changed) between queries gives exact posteriors."""
+        network = _random_network(4, variables=9)
+        names = list(network.variables)
+        evidence = {}
+        network.get_belief_state()
+
+        for name in (names[8], names[2], names[5]):
+            evidence[name] = network.variables[name]["states"][-1]
+            network.update_beliefs({name: evidence[name]})
+            _assert_beliefs_equal(network.get_belief_state(), _enumerate(network, evidence))
+
+        evidence[names[2]] = network.variables[names[2]]["states"][0]
+        network.update_beliefs({names[2]: evidence[names[2]]})
+        _assert_beliefs_equal(network.get_belief_state(), _enumerate(network, evidence))
+
+        del network.evidence[names[8]]
+        del evidence[names[8]]
+        _assert_beliefs_equal(network.get_belief_state(), _enumerate(network, evidence))
+
+    def test_table_and_structure_changes_invalidate_caches(self):
+        """Test that editing CPTs or dependencies after a query is reflected."""
+        network = _random_network(5, variables=5)
+        network.get_belief_state()
+        first = list(network.variables)[0]
+        network.set_conditional_probability(
+            first, {p: network.variables[p]["states"][0] for p in network.variables[first]["parents"]},
+            {s: (1.0 if i == 0 else 0.0) for i, s in enumerate(network.variables[first]["states"])})
+        _assert_beliefs_equal(network.get_belief_state(), _enumerate(network, {}))
+
+        network.add_variable("extra", ["a", "b"])
+        network.add_dependency("extra", first)
+        _assert_beliefs_equal(network.get_belief_state(), _enumerate(network, {}))
+
+    def test_batch_matches_individual_queries(self):
+        """Test batched evidence sets against one query each, leaving evidence untouched."""
+        network = _random_network(6)
+        rng = random.Random(6)
+        evidence_sets = [
+            {name: rng.choice(network.variables[name]["states"])
+             for name in rng.sample(list(network.variables), rng.randint(0, 3))}
+            for _ in range(12)
+        ]
+
+        batch = network.get_belief_states(evidence_sets)
+
+        assert network.evidence == {}
+        for beliefs, evidence in zip(batch, evidence_sets):
+            _assert_beliefs_equal(beliefs, _enumerate(network, evidence))
+
+    def test_impossible_evidence_and_validation(self):
+        """Test zero-probability evidence and invalid inputs."""
+        network = BayesianBeliefNetwork(patient_id=uuid4(), inference=JunctionTreeInference())
+        network.add_variable("a", ["x", "y"])
+        network.add_variable("b", ["x", "y"])
+        network.add_dependency("b", "a")
+        network.set_conditional_probability("b", {"a": "x"}, {"x": 1.0, "y": 0.0})
+
+        [beliefs] = network.get_belief_states([{"a": "x", "b": "y"}])
+        assert np.allclose(list(beliefs["a"].values()), 0.0)
+
+        with pytest.raises(ValueError):
+            network.update_beliefs({"a": "z"})
+        with pytest.raises(ValueError):
+            network.set_conditional_probability("a", {}, {"z": 1.0})
+
+    def test_engine_attached_after_building(self):
+        """Test that an engine compiles a network built without one, and that none refuses queries."""
+        network = _random_network(7, variables=5)
+        network.inference = None
+        with pytest.raises(ValueError):
+            network.get_belief_state()
+
+        network.inference = JunctionTreeInference()
+        network.update_beliefs({"v0": network.variables["v0"]["states"][0]})
+        _assert_beliefs_equal(network.get_belief_state(), _enumerate(network, network.evidence))
@@ -0,0 +1,133 @@
+# -*- coding: utf-8 -*-
+"""
+Unit tests for the vectorized lag correlation engine.
+"""
+
+import asyncio
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from app.infrastructure.ml.biometric_correlation.lag_correlation import (
+    effective_max_lag,
+    lag_correlation_batch,
+    lag_correlation_tensor,
+)
+from app.infrastructure.ml.biometric_correlation.model_service import BiometricCorrelationService
+
+
+def _series(seed, days=120, features=4, indicators=3, lag=3):
+    """Random series where indicator 0 follows feature 1 after ``lag`` days."""
+    rng = np.random.default_rng(seed)
+    biometric = rng.normal(size=(days, features))
+    mental = rng.normal(size=(days, indicators))
+    mental[lag:, 0] += 2.0 * biometric[:-lag, 1]
+    return biometric, mental
+
+
+def _reference(biometric, mental, max_lag):
+    """The previous per-cell np.corrcoef loop, pairwise-complete via pandas."""
+    days = biometric.shape[0]
+    result = np.empty((biometric.shape[1], mental.shape[1], max_lag + 1))
+    for i in range(biometric.shape[1]):
+        for j in range(mental.shape[1]):
+            for lag in range(max_lag + 1):
+                x = pd.Series(biometric[:days - lag, i])
+                y = pd.Series(mental[lag:, j])
+                result[i, j, lag] = x.corr(y)
+    return result
+
+
+@pytest.mark.standalone()
+class TestLagCorrelationEngine:
+    """Tests for the lag-correlation tensor and the cross-patient batch."""
+
+    @pytest.mark.parametrize("method", ["fft", "direct"])
+    def test_matches_per_cell_corrcoef(self, method):
+        """Test every cell against np.corrcoef on the lagged slices."""
+        biometric, mental = _series(0)
+
+        tensor = lag_correlation_tensor(biometric, mental, 10, method=method)
+
+        for i in range(biometric.shape[1]):
+            for j in range(mental.shape[1]):
+                for lag in range(11):
+                    expected = np.corrcoef(biometric[:120 - lag, i], mental[lag:, j])[0, 1]
+                    assert tensor[i, j, lag] == pytest.approx(expected, abs=1e-9)
+        assert int(np.argmax(np.abs(tensor[1, 0]))) == 3
+
+    @pytest.mark.parametrize("method", ["fft", "direct"])
+    def test_missing_values_are_masked_pairwise(self, method):
+        """Test NaN handling against pandas' pairwise-complete correlation."""
+        biometric, mental = _series(1)
+        rng = np.random.default_rng(2)
+        biometric[rng.random(biometric.shape) < 0.15] = np.nan
+        mental[rng.random(mental.shape) < 0.15] = np.nan
+
+        tensor = lag_correlation_tensor(biometric, mental, 7, method=method)
+
+        np.testing.assert_allclose(tensor, _reference(biometric, mental, 7), atol=1e-9)
+
+    def test_constant_and_empty_series_are_undefined(self):
+        """Test that constant or fully missing columns give NaN, not noise."""
+        biometric, mental = _series(3, days=30)
+        biometric[:, 0] = 72.0
+        mental[:, 2] = np.nan
+
+        tensor = lag_correlation_tensor(biometric, mental, 5)
+
+        assert np.isnan(tensor[0]).all()
+        assert np.isnan(tensor[:, 2]).all()
+        assert not np.isnan(tensor[1:, :2]).any()
+
+    def test_batch_matches_individual_patients(self):
+        """Test that batching patients of different lengths changes nothing."""
+        patients = [_series(seed, days=days) for seed, days in ((4, 90), (5, 120), (6, 60))]
+
+        batch = lag_correlation_batch(patients, 6)
+
+        for tensor, (biometric, mental) in zip(batch, patients):
+            np.testing.assert_allclose(tensor, lag_correlation_tensor(biometric, mental, 6), atol=1e-9)
+
+    def test_effective_max_lag(self):
+        """Test that short series clamp the lag to half their length."""
+        assert effective_max_lag(100, 7) == 7
+        assert effective_max_lag(6, 7) == 3
+
+
+@pytest.mark.standalone()
+class TestServiceLagCorrelations:
+    """Tests for the service's lag correlation results."""
+
+    @pytest.fixture
+    def service(self, tmp_path):
+        return BiometricCorrelationService(
+            model_dir=str(tmp_path),
+            biometric_features=["heart_rate", "hrv", "sleep_duration", "steps"],
+            mental_health_indicators=["anxiety_level", "mood_score", "stress_level"],
+        )
+
+    def test_lag_results_shape_and_optimal_lag(self, service):
+        """Test the per-feature, per-indicator results and optimal lag."""
+        biometric, mental = _series(7)
+
+        result = asyncio.run(service._calculate_lag_correlations(biometric, mental, max_lag=7))
+
+        assert result["max_lag"] == 7
+        cell = result["lag_results"]["hrv"]["anxiety_level"]
+        assert len(cell["lag_correlations"]) == 8
+        assert cell["optimal_lag"] == 3
+        assert cell["optimal_correlation"] == pytest.approx(cell["lag_correlations"][3])
+
+    def test_population_lag_correlations(self, service):
+        """Test per-patient and pooled results for a group of patients."""
+        patients = {f"patient-{seed}": _series(seed) for seed in range(5)}
+
+        result = asyncio.run(service.calculate_population_lag_correlations(patients, max_lag=5))
+
+        assert set(result["patients"]) == set(patients)
+        pooled = result["population"]["hrv"]["anxiety_level"]
+        assert pooled["optimal_lag"] == 3
+        assert pooled["optimal_correlation"] > 0.7
+        assert result["patients_per_cell"][1][0][3] == 5
@@ -0,0 +1,114 @@
+# -*- coding: utf-8 -*-
+"""
+Unit tests for incremental (encoder-cached) and padded batch decoding in
+MultiHorizonTransformer.
+"""
+
+import numpy as np
+import pytest
+
+torch = pytest.importorskip("torch")
+
+from app.infrastructure.ml.symptom_forecasting.transformer_model import (  # noqa: E402
+    MultiHeadAttention,
+    MultiHorizonTransformer,
+)
+
+
+@pytest.fixture
+def model():
+    """Small randomly initialised transformer (input and output dims match for feedback)."""
+    torch.manual_seed(0)
+    model = MultiHorizonTransformer(
+        input_dim=4,
+        output_dim=4,
+        d_model=32,
+        num_heads=4,
+        num_encoder_layers=2,
+        num_decoder_layers=3,
+        d_ff=64,
+        dropout=0.1,
+    )
+    # The positional encoding starts at zero; randomise it so positions matter
+    torch.nn.init.normal_(model.positional_encoding, std=0.5)
+    return model.eval()
+
+
+@pytest.mark.standalone()
+class TestIncrementalDecoding:
+    """Tests that cached decoding reproduces the full-recompute path."""
+
+    def test_self_attention_cache_matches_causal_attention(self):
+        """Test that appending one position at a time equals masked attention over all."""
+        torch.manual_seed(1)
+        attention = MultiHeadAttention(16, 4).eval()
+        x = torch.randn(2, 6, 16)
+        mask = torch.tril(torch.ones(6, 6)).view(1, 1, 6, 6)
+
+        with torch.no_grad():
+            full = attention(x, x, x, mask)
+            cache = {}
+            steps = [attention(x[:, i : i + 1], x[:, i : i + 1], x[:, i : i + 1], cache=cache) for i in range(6)]
+
+        torch.testing.assert_close(torch.cat(steps, dim=1), full, rtol=1e-5, atol=1e-5)
+        assert cache["key"].shape == (2, 4, 6, 4)
+
+    def test_static_cache_projects_memory_once(self):
+        """Test that static_kv attention reuses the projected memory."""
+        attention = MultiHeadAttention(16, 4).eval()
+        memory = torch.randn(2, 9, 16)
+        cache = {}
+
+        with torch.no_grad():
+            attention(torch.randn(2, 1, 16), memory, memory, cache=cache, static_kv=True)
+            projected = cache["key"]
+            attention(torch.randn(2, 1, 16), memory, memory, cache=cache, static_kv=True)
+
+        assert cache["key"] is projected
+        assert projected.shape == (2, 4, 9, 4)
+
+    def test_decode_step_matches_full_decode(self, model):
+        """Test every decoded position against decode over the whole target."""
+        src = torch.randn(3, 12, 4)
+        tgt = torch.randn(3, 5, 4)
+
+        with torch.no_grad():
+            src_mask, tgt_mask = model.create_masks(src, tgt)
+            memory = model.encode(src, src_mask)
+            full = model.decode(tgt, memory, src_mask, tgt_mask)
+            cache = model.init_decoder_cache()
+            steps = [model.decode_step(tgt[:, i : i + 1], i, memory, cache, src_mask) for i in range(5)]
+
+        torch.testing.assert_close(torch.cat(steps, dim=1), full, rtol=1e-5, atol=1e-5)
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("horizon", [1, 7, 30])
+    async def test_predict_matches_uncached_path(self, model, horizon):
+        """Test that cached and full-recompute predictions agree at every horizon step."""
+        history = torch.randn(2, 20, 4)
+
+        cached = await model.predict(history, horizon)
+        uncached = await model.predict(history, horizon, use_cache=False)
+
+        assert cached["values"].shape == (2, horizon, 4)
+        np.testing.assert_allclose(cached["values"], uncached["values"], rtol=1e-4, atol=1e-5)
+        for q in model.quantiles:
+            np.testing.assert_allclose(
+                cached["all_quantiles"][q], uncached["all_quantiles"][q], rtol=1e-4, atol=1e-5
+            )
+        assert not model.training
+
+    @pytest.mark.parametrize("use_cache", [True, False])
+    def test_padded_batch_matches_individual_rows(self, model, use_cache):
+        """Test that right-padded rows with src_lengths forecast as they would alone."""
+        lengths = [7, 12, 9]
+        rows = [torch.randn(1, n, 4) for n in lengths]
+        padded = torch.zeros(3, 12, 4)
+        for i, row in enumerate(rows):
+            padded[i, : lengths[i]] = row[0]
+
+        batch = model.predict_sync(padded, 5, use_cache=use_cache, src_lengths=torch.tensor(lengths))
+
+        for i, row in enumerate(rows):
+            alone = model.predict_sync(row, 5, use_cache=use_cache)
+            np.testing.assert_allclose(batch["values"][i : i + 1], alone["values"], rtol=1e-4, atol=1e-5)
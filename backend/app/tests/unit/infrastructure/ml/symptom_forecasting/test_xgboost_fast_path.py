@@ -0,0 +1,90 @@
+# -*- coding: utf-8 -*-
+"""
+Unit tests for the ring-buffer, in-place multi-step prediction path of
+XGBoostSymptomModel, against the previous DMatrix + np.roll loop.
+"""
+
+import numpy as np
+import pytest
+
+xgb = pytest.importorskip("xgboost")
+
+from app.infrastructure.ml.symptom_forecasting.xgboost_model import XGBoostSymptomModel  # noqa: E402
+
+
+def _legacy_forecast(boosters, feature_names, X, horizon):
+    """The previous per-step DMatrix + np.roll loop; boosters[t] returns target t."""
+    values = np.zeros((X.shape[0], horizon, len(boosters)))
+    for t, predict in enumerate(boosters):
+        current_input = X.copy()
+        for h in range(horizon):
+            step_pred = predict(xgb.DMatrix(current_input, feature_names=feature_names))
+            values[:, h, t] = step_pred
+            current_input = np.roll(current_input, -1, axis=1)
+            current_input[:, -1] = step_pred
+    return values
+
+
+@pytest.fixture
+def training_data():
+    rng = np.random.default_rng(0)
+    X = rng.normal(size=(400, 10))
+    y = X[:, :3] + rng.normal(scale=0.1, size=(400, 3))
+    return X, y, rng.normal(size=(16, 10))
+
+
+@pytest.mark.standalone()
+class TestXGBoostFastPath:
+    """Tests for in-place ring-buffer prediction and memoized importance."""
+
+    def test_per_target_boosters_match_legacy_loop(self, training_data):
+        """Test per-target boosters against the copy-and-roll loop."""
+        X, y, X_test = training_data
+        model = XGBoostSymptomModel(n_estimators=20)
+        model.train(X, y, optimize=False)
+
+        result = model.predict_sync(X_test, 12)
+
+        boosters = [model.models[name].predict for name in model.target_names]
+        expected = _legacy_forecast(boosters, model.feature_names, X_test, 12)
+        np.testing.assert_array_equal(result["values"], expected)
+        assert result["values"].shape == (16, 12, 3)
+
+    def test_multi_output_booster_matches_legacy_loop(self, training_data):
+        """Test one multi-output booster pass per step against per-target loops."""
+        X, y, X_test = training_data
+        model = XGBoostSymptomModel(n_estimators=20)
+        model.train(X, y, optimize=False, multi_output=True)
+
+        result = model.predict_sync(X_test, 12)
+
+        booster = model.multi_output_model
+        boosters = [lambda d, t=t: booster.predict(d)[:, t] for t in range(3)]
+        expected = _legacy_forecast(boosters, model.feature_names, X_test, 12)
+        np.testing.assert_array_equal(result["values"], expected)
+        assert model.models == {}
+        assert set(result["feature_importance"]) == set(model.target_names)
+
+    def test_feature_importance_is_memoized(self, training_data):
+        """Test that importance is computed once per booster and refreshed on retraining."""
+        X, y, X_test = training_data
+        model = XGBoostSymptomModel(n_estimators=5)
+        model.train(X, y[:, 0], optimize=False)
+        booster = model.models["target"]
+        calls = []
+        original = booster.get_score
+
+        def counting_get_score(**kwargs):
+            calls.append(kwargs)
+            return original(**kwargs)
+
+        booster.get_score = counting_get_score
+        model._importance_cache.clear()
+
+        for _ in range(3):
+            model.predict_sync(X_test, 2)
+        assert len(calls) == 1
+
+        model.train(X, y[:, 0], optimize=False)
+        assert model.get_feature_importance()["target"] is not None
+        assert model._importance_cache["target"][0] is model.models["target"]
@@ -0,0 +1,369 @@
+# -*- coding: utf-8 -*-
+"""
+Tests for the local MentaLLaMA generation worker: continuous batching,
+streaming, cancellation, back-pressure and event-loop responsiveness.
+"""
+
+import asyncio
+import time
+
+import pytest
+
+from app.core.exceptions import InferenceQueueFullError
+from app.infrastructure.ml.mentallama.generation_worker import GenerationWorker, SamplingParams
+from app.infrastructure.ml.mentallama.model_loader import MentaLLaMAModelLoader
+
+EOS = 0
+
+
+class CharTokenizer:
+    """One token per character; EOS is token 0."""
+
+    eos_token_id = EOS
+    pad_token_id = EOS
+
+    def encode(self, text):
+        return [ord(c) for c in text]
+
+    def decode(self, ids, skip_special_tokens=True):
+        return "".join(chr(i) for i in ids if i != EOS)
+
+
+class ScriptedModel:
+    """Step function that spells out a fixed reply per prompt, then EOS."""
+
+    def __init__(self, replies, delay=0.0):
+        self.replies = replies
+        self.delay = delay
+        self.prompt_lengths = {}
+        self.batches = []
+
+    def __call__(self, keys, token_ids, params):
+        self.batches.append(list(keys))
+        time.sleep(self.delay)
+        next_ids = []
+        for key, ids in zip(keys, token_ids):
+            n = self.prompt_lengths.setdefault(key, len(ids))
+            prompt = "".join(chr(i) for i in ids[:n])
+            reply = self.replies.get(prompt, "ok")
+            done = len(ids) - n
+            next_ids.append(ord(reply[done]) if done < len(reply) else EOS)
+        return next_ids
+
+
+def make_worker(model, **kwargs):
+    return GenerationWorker(model, CharTokenizer(), eos_token_ids=[EOS], **kwargs)
+
+
+@pytest.mark.standalone()
+class TestGenerationWorker:
+    """Tests for the dedicated generation thread."""
+
+    @pytest.mark.asyncio
+    async def test_concurrent_prompts_share_decode_steps(self):
+        """Test that concurrent prompts are decoded together and get their own text."""
+        model = ScriptedModel({"a": "first reply", "b": "second", "c": "third one"})
+        worker = make_worker(model)
+        try:
+            results = await asyncio.gather(*(worker.generate(p) for p in "abc"))
+        finally:
+            worker.shutdown()
+
+        assert [r.text for r in results] == ["first reply", "second", "third one"]
+        assert [r.completion_tokens for r in results] == [11, 6, 9]
+        assert all(r.prompt_tokens == 1 and r.finish_reason == "stop" for r in results)
+        assert max(len(batch) for batch in model.batches) == 3
+        assert worker.stats()["completed"] == 3 and worker.stats()["pending"] == 0
+
+    @pytest.mark.asyncio
+    async def test_late_prompt_joins_running_batch(self):
+        """Test that a prompt submitted mid-generation joins before the first one finishes."""
+        model = ScriptedModel({"long": "x" * 40, "short": "yy"}, delay=0.002)
+        worker = make_worker(model)
+        try:
+            first = asyncio.ensure_future(worker.generate("long"))
+            await asyncio.sleep(0.02)
+            second = await worker.generate("short")
+            assert not first.done()
+            assert (await first).text == "x" * 40
+        finally:
+            worker.shutdown()
+
+        assert second.text == "yy"
+        assert any(len(batch) == 2 for batch in model.batches)
+
+    @pytest.mark.asyncio
+    async def test_stream_yields_chunks_and_truncates_at_stop_sequence(self):
+        """Test streaming, stop sequences and that no part of a stop sequence is streamed."""
+        worker = make_worker(ScriptedModel({"q": "answer END trailing"}))
+        try:
+            stream = worker.stream("q", SamplingParams(stop_sequences=("END",)))
+            chunks = [chunk async for chunk in stream]
+        finally:
+            worker.shutdown()
+
+        assert len(chunks) > 1
+        assert "".join(chunks) == "answer "
+        assert stream.finish_reason == "stop"
+
+    @pytest.mark.asyncio
+    async def test_max_new_tokens(self):
+        """Test that generation stops at max_new_tokens."""
+        worker = make_worker(ScriptedModel({"q": "abcdefgh"}))
+        try:
+            result = await worker.generate("q", SamplingParams(max_new_tokens=3))
+        finally:
+            worker.shutdown()
+
+        assert result.text == "abc" and result.finish_reason == "length"
+
+    @pytest.mark.asyncio
+    async def test_closing_stream_cancels_generation(self):
+        """Test that a disconnected reader frees its slot and stops being decoded."""
+        model = ScriptedModel({"q": "z" * 1000}, delay=0.001)
+        worker = make_worker(model)
+        try:
+            stream = worker.stream("q")
+            async for _ in stream:
+                break
+            await stream.aclose()
+            for _ in range(100):
+                if worker.stats()["pending"] == 0:
+                    break
+                await asyncio.sleep(0.01)
+            steps = len(model.batches)
+            await asyncio.sleep(0.05)
+        finally:
+            worker.shutdown()
+
+        assert worker.stats()["cancelled"] == 1
+        assert len(model.batches) == steps < 1000
+
+    @pytest.mark.asyncio
+    async def test_cancelled_reader_task_cancels_generation(self):
+        """Test that cancelling the task reading a stream (client disconnect) cancels it."""
+        worker = make_worker(ScriptedModel({"q": "z" * 1000}, delay=0.001))
+        try:
+            task = asyncio.ensure_future(worker.generate("q"))
+            await asyncio.sleep(0.02)
+            task.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await task
+            for _ in range(100):
+                if worker.stats()["pending"] == 0:
+                    break
+                await asyncio.sleep(0.01)
+        finally:
+            worker.shutdown()
+
+        assert worker.stats()["cancelled"] == 1
+
+    @pytest.mark.asyncio
+    async def test_rejects_prompts_beyond_batch_and_queue(self):
+        """Test back-pressure once max_batch_size + queue_size prompts are in flight."""
+        worker = make_worker(ScriptedModel({}, delay=0.01), max_batch_size=1, queue_size=1)
+        try:
+            streams = [worker.stream("a"), worker.stream("b")]
+            with pytest.raises(InferenceQueueFullError):
+                worker.stream("c")
+            for stream in streams:
+                await stream.aclose()
+        finally:
+            worker.shutdown()
+
+        assert worker.stats()["rejected"] == 1
+
+    @pytest.mark.asyncio
+    async def test_step_failure_reaches_every_reader(self):
+        """Test that a failing step raises to all sequences in the batch."""
+
+        def broken(keys, token_ids, params):
+            raise RuntimeError("model crashed")
+
+        worker = make_worker(broken)
+        try:
+            outcomes = await asyncio.gather(*(worker.generate(p) for p in "ab"), return_exceptions=True)
+        finally:
+            worker.shutdown()
+
+        assert all(isinstance(o, RuntimeError) for o in outcomes)
+        assert worker.stats()["pending"] == 0
+
+    @pytest.mark.asyncio
+    async def test_decode_failure_fails_only_its_sequence(self):
+        """Test that a tokenizer error ends that stream and the rest of the batch carries on."""
+
+        class FussyTokenizer(CharTokenizer):
+            def decode(self, ids, skip_special_tokens=True):
+                if "!" in super().decode(ids):
+                    raise UnicodeDecodeError("utf-8", b"!", 0, 1, "bad byte")
+                return super().decode(ids)
+
+        worker = GenerationWorker(ScriptedModel({"a": "fine", "b": "no!"}), FussyTokenizer(), eos_token_ids=[EOS])
+        try:
+            outcomes = await asyncio.gather(*(worker.generate(p) for p in "ab"), return_exceptions=True)
+            again = await worker.generate("a")
+        finally:
+            worker.shutdown()
+
+        assert outcomes[0].text == "fine" and isinstance(outcomes[1], UnicodeDecodeError)
+        assert again.text == "fine"
+        assert worker.stats()["failed"] == 1 and worker.stats()["pending"] == 0
+
+    @pytest.mark.asyncio
+    async def test_step_with_wrong_token_count_fails_batch(self):
+        """Test that a step returning fewer tokens than sequences fails them instead of dropping one."""
+
+        def short(keys, token_ids, params):
+            return [ord("x")] * (len(keys) - 1)
+
+        worker = make_worker(short)
+        try:
+            outcomes = await asyncio.gather(*(worker.generate(p) for p in "ab"), return_exceptions=True)
+        finally:
+            worker.shutdown()
+
+        assert all(isinstance(o, ValueError) for o in outcomes)
+        assert worker.stats()["pending"] == 0
+
+    @pytest.mark.asyncio
+    async def test_failing_reset_does_not_stop_worker(self):
+        """Test that an error freeing step state is logged and generation continues."""
+
+        class StatefulModel(ScriptedModel):
+            def reset(self):
+                raise RuntimeError("cache already freed")
+
+        worker = make_worker(StatefulModel({"a": "one", "b": "two"}))
+        try:
+            first = await worker.generate("a")
+            second = await worker.generate("b")
+        finally:
+            worker.shutdown()
+
+        assert (first.text, second.text) == ("one", "two")
+
+    @pytest.mark.asyncio
+    async def test_crashed_thread_fails_streams_and_restarts(self):
+        """Test that readers are released if the decode loop dies, and a new thread takes over."""
+        worker = make_worker(ScriptedModel({"a": "one"}))
+        advance = worker._advance_or_fail
+        calls = []
+
+        def crash_once(sequence, token_id):
+            calls.append(token_id)
+            if len(calls) == 1:
+                raise RuntimeError("loop bug")
+            return advance(sequence, token_id)
+
+        worker._advance_or_fail = crash_once
+        try:
+            with pytest.raises(RuntimeError, match="loop bug"):
+                await asyncio.wait_for(worker.generate("a"), timeout=5)
+            result = await asyncio.wait_for(worker.generate("a"), timeout=5)
+        finally:
+            worker.shutdown()
+
+        assert result.text == "one"
+        assert worker.stats()["pending"] == 0
+
+    @pytest.mark.asyncio
+    async def test_event_loop_stays_responsive(self):
+        """Test that the loop keeps running short tasks while generation blocks its thread."""
+        worker = make_worker(ScriptedModel({"q": "w" * 20}, delay=0.01))
+        loop = asyncio.get_running_loop()
+        lags = []
+
+        async def heartbeat():
+            while not generation.done():
+                started = loop.time()
+                await asyncio.sleep(0.005)
+                lags.append(loop.time() - started - 0.005)
+
+        try:
+            generation = asyncio.ensure_future(worker.generate("q"))
+            await asyncio.gather(generation, heartbeat())
+        finally:
+            worker.shutdown()
+
+        assert len(lags) > 10
+        assert max(lags) < 0.1
+
+
+@pytest.mark.standalone()
+class TestModelLoaderLocalGeneration:
+    """Tests for MentaLLaMAModelLoader's local generation through the worker."""
+
+    @pytest.fixture
+    def loader(self):
+        loader = MentaLLaMAModelLoader(
+            model_name="stub", endpoint_url="http://localhost", api_key="test", inference_mode="local"
+        )
+        model = ScriptedModel({})
+        loader.generation_worker = make_worker(model)
+        loader.model = model
+        loader.tokenizer = CharTokenizer()
+        yield loader
+        if loader.generation_worker is not None:
+            loader.generation_worker.shutdown()
+
+    @pytest.mark.asyncio
+    async def test_generate_text(self, loader):
+        """Test the response dict of a local generation."""
+        loader.model.replies = {"<s>[INST] hello [/INST]": "Hi, how are you feeling?"}
+
+        result = await loader.generate_text("hello")
+
+        assert result["text"] == "Hi, how are you feeling?"
+        assert result["completion_tokens"] == 24
+        assert result["prompt_tokens"] == len("<s>[INST] hello [/INST]")
+        assert result["safety_triggered"] is False
+
+    @pytest.mark.asyncio
+    async def test_stream_text_withholds_filtered_content(self, loader):
+        """Test that streamed text stops before a safety pattern is revealed."""
+        loader.model.replies = {"<s>[INST] hello [/INST]": "You should never harm others, ever."}
+
+        chunks = [chunk async for chunk in loader.stream_text("hello")]
+
+        assert "harm" not in "".join(chunks)
+        assert chunks[-1].startswith("I apologize")
+
+    @pytest.mark.asyncio
+    async def test_stream_text(self, loader):
+        """Test that unfiltered streamed chunks add up to the whole reply."""
+        loader.model.replies = {"<s>[INST] hello [/INST]": "Sleep has improved this week."}
+
+        chunks = [chunk async for chunk in loader.stream_text("hello")]
+
+        assert "".join(chunks) == "Sleep has improved this week."
+
+
+@pytest.mark.standalone()
+def test_causal_lm_stepper_matches_generate():
+    """Test batched, cached greedy decoding against model.generate on a tiny GPT-2."""
+    torch = pytest.importorskip("torch")
+    transformers = pytest.importorskip("transformers")
+    from app.infrastructure.ml.mentallama.generation_worker import CausalLMStepper
+
+    torch.manual_seed(0)
+    config = transformers.GPT2Config(vocab_size=64, n_positions=64, n_embd=32, n_layer=2, n_head=2)
+    model = transformers.GPT2LMHeadModel(config).eval()
+    stepper = CausalLMStepper(model, pad_token_id=0)
+    prompts = [[5, 9, 13], [7, 3, 22, 40, 41, 2], [11]]
+    params = [SamplingParams(temperature=0.0)] * 3
+
+    sequences = [list(p) for p in prompts]
+    for step in range(8):
+        # Drop the second sequence halfway to force a re-prefill of the others
+        keys = [0, 1, 2] if step < 4 else [0, 2]
+        batch = [sequences[k] for k in keys]
+        for k, token in zip(keys, stepper(keys, batch, params[: len(keys)])):
+            sequences[k].append(token)
+
+    for k, prompt in enumerate(prompts):
+        steps = 4 if k == 1 else 8
+        expected = model.generate(
+            torch.tensor([prompt]), max_new_tokens=steps, min_new_tokens=steps, do_sample=False, pad_token_id=0
+        )
+        assert sequences[k] == expected[0].tolist()
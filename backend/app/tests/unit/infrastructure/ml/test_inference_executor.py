@@ -0,0 +1,206 @@
+# -*- coding: utf-8 -*-
+"""
+Tests for the per-family inference executor, using blocking fake models.
+"""
+
+import asyncio
+import threading
+import time
+from types import SimpleNamespace
+from unittest.mock import AsyncMock
+from uuid import uuid4
+
+import numpy as np
+import pytest
+from fastapi import FastAPI
+
+from app.core.exceptions.ml_exceptions import InferenceQueueFullError, InferenceTimeoutError
+from app.infrastructure.ml.inference_executor import (
+    FamilyPolicy,
+    InferenceExecutor,
+    policies_from_settings,
+)
+
+
+class BlockingModel:
+    """Model whose predict holds the calling thread for a fixed time."""
+
+    def __init__(self, delay: float):
+        self.delay = delay
+        self.active = 0
+        self.peak = 0
+        self.threads = set()
+        self.lock = threading.Lock()
+
+    def predict_sync(self, value):
+        with self.lock:
+            self.active += 1
+            self.peak = max(self.peak, self.active)
+            self.threads.add(threading.current_thread().name)
+        time.sleep(self.delay)
+        with self.lock:
+            self.active -= 1
+        return value * 2
+
+
+async def _max_loop_lag(stop: asyncio.Event, interval: float = 0.005) -> float:
+    """Sample how late the event loop wakes up until stop is set."""
+    worst = 0.0
+    loop = asyncio.get_running_loop()
+    while not stop.is_set():
+        started = loop.time()
+        await asyncio.sleep(interval)
+        worst = max(worst, loop.time() - started - interval)
+    return worst
+
+
+@pytest.fixture
+def executor():
+    executor = InferenceExecutor(
+        {
+            "torch": FamilyPolicy(workers=2, queue_size=4, timeout_seconds=5.0),
+            "xgboost": FamilyPolicy(workers=1, queue_size=4, timeout_seconds=5.0),
+        }
+    )
+    yield executor
+    executor.shutdown()
+
+
+@pytest.mark.standalone()
+class TestInferenceExecutor:
+    """Tests for offloading, concurrency limits, admission and timeouts."""
+
+    @pytest.mark.asyncio
+    async def test_families_overlap_and_loop_stays_responsive(self, executor):
+        """Test that two families run at the same time without blocking the loop."""
+        transformer, xgboost = BlockingModel(0.2), BlockingModel(0.2)
+        stop = asyncio.Event()
+        lag = asyncio.create_task(_max_loop_lag(stop))
+
+        started = time.perf_counter()
+        results = await asyncio.gather(
+            executor.run("torch", transformer.predict_sync, 1),
+            executor.run("xgboost", xgboost.predict_sync, 2),
+        )
+        elapsed = time.perf_counter() - started
+        stop.set()
+
+        assert results == [2, 4]
+        assert elapsed < 0.35
+        assert await lag < 0.1
+        assert all(name.startswith("inference-torch") for name in transformer.threads)
+
+    @pytest.mark.asyncio
+    async def test_concurrency_limit_per_family(self):
+        """Test that max_concurrency caps simultaneous calls below the worker count."""
+        executor = InferenceExecutor({"torch": FamilyPolicy(workers=4, max_concurrency=2, queue_size=10)})
+        model = BlockingModel(0.05)
+
+        results = await asyncio.gather(*(executor.run("torch", model.predict_sync, i) for i in range(8)))
+        executor.shutdown()
+
+        assert results == [i * 2 for i in range(8)]
+        assert model.peak == 2
+
+    @pytest.mark.asyncio
+    async def test_full_queue_rejects(self, executor):
+        """Test that calls beyond workers plus queue are rejected, not queued."""
+        model = BlockingModel(0.1)
+
+        outcomes = await asyncio.gather(
+            *(executor.run("xgboost", model.predict_sync, i) for i in range(7)), return_exceptions=True
+        )
+
+        rejected = [o for o in outcomes if isinstance(o, InferenceQueueFullError)]
+        assert len(rejected) == 2  # 1 running + 4 queued admitted
+        assert executor.stats()["xgboost"]["rejected"] == 2
+        assert executor.stats()["xgboost"]["completed"] == 5
+
+    @pytest.mark.asyncio
+    async def test_timeout_keeps_slot_until_worker_finishes(self, executor):
+        """Test that a timed-out call raises but still holds its slot while running."""
+        model = BlockingModel(0.3)
+
+        with pytest.raises(InferenceTimeoutError):
+            await executor.run("xgboost", model.predict_sync, 1, timeout=0.05)
+
+        started = time.perf_counter()
+        assert await executor.run("xgboost", model.predict_sync, 2) == 4
+        assert time.perf_counter() - started > 0.2
+        assert model.peak == 1
+        assert executor.stats()["xgboost"]["timed_out"] == 1
+
+    @pytest.mark.asyncio
+    async def test_errors_propagate(self, executor):
+        """Test that exceptions from the model reach the caller."""
+
+        def failing():
+            raise ValueError("bad input")
+
+        with pytest.raises(ValueError, match="bad input"):
+            await executor.run("torch", failing)
+        assert executor.stats()["torch"]["failed"] == 1
+
+    def test_policies_from_settings(self):
+        """Test pool sizing from InferenceSettings."""
+
+        class Settings:
+            torch_workers = 2
+            torch_threads = 0
+            xgboost_workers = 3
+            xgboost_nthread = 1
+            queue_size = 16
+            timeout_seconds = 10.0
+
+        policies = policies_from_settings(Settings(), cpu_count=8)
+
+        assert policies["torch"].workers == 2
+        assert policies["torch"].initargs == (4,)
+        assert policies["xgboost"].workers == 3
+        assert policies["xgboost"].queue_size == 16
+
+
+@pytest.mark.standalone()
+class TestBackPressureSurfaces:
+    """Tests that rejections and timeouts reach callers as themselves."""
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize(
+        "error", [InferenceQueueFullError("torch", 4), InferenceTimeoutError("xgboost", 5.0)]
+    )
+    async def test_forecast_service_reraises_back_pressure(self, error):
+        """Test that the forecasting service does not wrap back-pressure in a generic error."""
+        model_service = pytest.importorskip("app.infrastructure.ml.symptom_forecasting.model_service")
+        service = model_service.SymptomForecastingService.__new__(model_service.SymptomForecastingService)
+        service.feature_names = ["anxiety"]
+
+        async def preprocess(patient_id, data):
+            return np.zeros((10, 1))
+
+        async def overloaded(model_input, horizon):
+            raise error
+
+        service.preprocess_patient_data = preprocess
+        service._predict_transformer = service._predict_xgboost = overloaded
+
+        with pytest.raises(type(error)):
+            await service.forecast_symptoms(uuid4(), {})
+        with pytest.raises(type(error)):
+            await service.evaluate_treatment_impact(uuid4(), {}, [])
+
+    def test_lifespan_shuts_down_shared_executor(self, monkeypatch):
+        """Test that app shutdown stops the shared worker pools."""
+        from app import main
+
+        executor = InferenceExecutor({"torch": FamilyPolicy()})
+        assert asyncio.run(executor.run("torch", abs, -3)) == 3
+        monkeypatch.setattr(main, "get_inference_executor", lambda: executor)
+        monkeypatch.setattr(main, "get_db_instance", lambda: SimpleNamespace(dispose=AsyncMock()))
+
+        async def scenario():
+            async with main.lifespan(FastAPI()):
+                assert executor.stats()["torch"]["completed"] == 1
+
+        asyncio.run(scenario())
+
+        assert executor.stats() == {}
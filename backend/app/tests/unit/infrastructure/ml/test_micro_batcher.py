@@ -0,0 +1,114 @@
+# -*- coding: utf-8 -*-
+"""
+Tests for the dynamic micro-batcher used in front of the forecasting models.
+"""
+
+import asyncio
+
+import numpy as np
+import pytest
+
+from app.infrastructure.ml.micro_batcher import MicroBatcher, length_bucket, split_rows
+
+
+class RecordingModel:
+    """Batch function that doubles each item and records the batches it saw."""
+
+    def __init__(self, delay: float = 0.0, fail: bool = False):
+        self.delay = delay
+        self.fail = fail
+        self.batches = []
+
+    async def __call__(self, key, items):
+        self.batches.append((key, list(items)))
+        await asyncio.sleep(self.delay)
+        if self.fail:
+            raise RuntimeError("model crashed")
+        return [item * 2 for item in items]
+
+
+@pytest.mark.standalone()
+class TestMicroBatcher:
+    """Tests for batching, bucketing, scattering and failure handling."""
+
+    @pytest.mark.asyncio
+    async def test_concurrent_callers_share_one_batch(self):
+        """Test that callers within the wait window get one call and their own results."""
+        model = RecordingModel()
+        batcher = MicroBatcher(model, max_batch_size=100, max_wait_ms=20)
+
+        results = await asyncio.gather(*(batcher.submit(i) for i in range(10)))
+
+        assert results == [i * 2 for i in range(10)]
+        assert len(model.batches) == 1
+        assert batcher.stats()["mean_batch_size"] == 10
+
+    @pytest.mark.asyncio
+    async def test_max_batch_size_flushes_early(self):
+        """Test that a full batch runs without waiting for the timer."""
+        model = RecordingModel()
+        batcher = MicroBatcher(model, max_batch_size=4, max_wait_ms=10_000)
+
+        results = await asyncio.wait_for(asyncio.gather(*(batcher.submit(i) for i in range(8))), 1.0)
+
+        assert results == [i * 2 for i in range(8)]
+        assert [len(items) for _, items in model.batches] == [4, 4]
+
+    @pytest.mark.asyncio
+    async def test_buckets_are_batched_separately(self):
+        """Test that items are only batched with items of the same bucket."""
+        model = RecordingModel()
+        batcher = MicroBatcher(model, max_wait_ms=5, bucket_key=lambda item: item % 2)
+
+        results = await asyncio.gather(*(batcher.submit(i) for i in range(6)))
+
+        assert results == [0, 2, 4, 6, 8, 10]
+        assert sorted((key, items) for key, items in model.batches) == [(0, [0, 2, 4]), (1, [1, 3, 5])]
+
+    @pytest.mark.asyncio
+    async def test_late_arrivals_start_a_new_batch(self):
+        """Test that items arriving while a batch runs go into the next batch."""
+        model = RecordingModel(delay=0.05)
+        batcher = MicroBatcher(model, max_wait_ms=1)
+
+        first = asyncio.ensure_future(batcher.submit(1))
+        await asyncio.sleep(0.02)
+        second = await batcher.submit(2)
+
+        assert await first == 2 and second == 4
+        assert [items for _, items in model.batches] == [[1], [2]]
+
+    @pytest.mark.asyncio
+    async def test_failure_reaches_every_caller(self):
+        """Test that a failed batch raises to all of its callers."""
+        batcher = MicroBatcher(RecordingModel(fail=True), max_wait_ms=5)
+
+        outcomes = await asyncio.gather(*(batcher.submit(i) for i in range(3)), return_exceptions=True)
+
+        assert all(isinstance(o, RuntimeError) for o in outcomes)
+        assert batcher.stats()["failed_batches"] == 1
+
+
+@pytest.mark.standalone()
+def test_length_bucket():
+    """Test rounding lengths up to bucket boundaries."""
+    assert [length_bucket(n, 16) for n in (1, 16, 17, 90)] == [16, 16, 32, 96]
+    assert length_bucket(37, 1) == 37
+
+
+@pytest.mark.standalone()
+def test_split_rows():
+    """Test scattering nested prediction dicts by row ranges."""
+    batch = {
+        "values": np.arange(12).reshape(3, 4),
+        "intervals": {"lower": np.zeros((3, 4)), "upper": np.ones((3, 4))},
+        "feature_importance": {"anxiety": {"sleep": 0.4}},
+        "model_type": "xgboost",
+    }
+
+    first, rest = split_rows(batch, [(0, 1), (1, 3)])
+
+    np.testing.assert_array_equal(first["values"], [[0, 1, 2, 3]])
+    assert rest["intervals"]["upper"].shape == (2, 4)
+    assert rest["feature_importance"] == {"anxiety": {"sleep": 0.4}}
+    assert first["model_type"] == "xgboost"
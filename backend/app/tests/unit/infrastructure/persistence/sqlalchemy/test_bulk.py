@@ -0,0 +1,91 @@
+# -*- coding: utf-8 -*-
+"""
+Unit tests for bulk inserts of biometric data points.
+"""
+
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import create_engine, event, select, text
+from sqlalchemy.orm import Session
+
+from app.infrastructure.persistence.sqlalchemy.bulk import insert_ignore_conflicts
+from app.infrastructure.persistence.sqlalchemy.models.biometric_twin_model import BiometricDataPointModel
+
+TABLE = BiometricDataPointModel.__table__
+START = datetime(2025, 3, 1, 8, 0)
+
+
+def _rows(ids, twin_id="twin-1", data_type="heart_rate"):
+    return [
+        {
+            "data_id": f"dp-{i}",
+            "twin_id": twin_id,
+            "data_type": data_type,
+            "value": str(60.0 + i),
+            "value_type": "number",
+            "value_numeric": 60.0 + i,
+            "timestamp": START + timedelta(minutes=i),
+            "source": "apple_watch",
+            "metadata": {"position": "sitting"},
+            "confidence": 1.0,
+        }
+        for i in ids
+    ]
+
+
+@pytest.fixture
+def session():
+    """Session on an in-memory SQLite database with the data points table."""
+    engine = create_engine("sqlite://")
+    TABLE.create(engine)
+    with Session(engine) as session:
+        yield session
+
+
+@pytest.mark.standalone()
+class TestInsertIgnoreConflicts:
+    """Tests for insert_ignore_conflicts on the data points table."""
+
+    def test_duplicates_are_skipped_without_reading_keys(self, session):
+        """Test that re-sent points are ignored and no SELECT is issued."""
+        statements = []
+        event.listen(session.get_bind(), "before_cursor_execute",
+                     lambda conn, cursor, statement, *args: statements.append(statement))
+
+        insert_ignore_conflicts(session, TABLE, _rows(range(5)), key_column="data_id")
+        insert_ignore_conflicts(session, TABLE, _rows(range(3, 8)), key_column="data_id", batch_size=2)
+        session.commit()
+        issued = list(statements)
+
+        assert session.execute(select(TABLE.c.data_id).order_by(TABLE.c.timestamp)).scalars().all() == [
+            f"dp-{i}" for i in range(8)
+        ]
+        assert all(statement.lstrip().upper().startswith("INSERT") for statement in issued)
+
+    def test_metadata_column_and_numeric_values(self, session):
+        """Test that the renamed metadata attribute and native numbers round-trip."""
+        insert_ignore_conflicts(session, TABLE, _rows([1]), key_column="data_id")
+
+        model = session.get(BiometricDataPointModel, "dp-1")
+
+        assert model.data_metadata == {"position": "sitting"}
+        assert model.value_numeric == 61.0
+
+    def test_composite_index_serves_range_scans(self, session):
+        """Test that per-twin, per-type time-range queries use the composite index."""
+        insert_ignore_conflicts(session, TABLE, _rows(range(20)) + _rows(range(20, 30), data_type="steps"),
+                                key_column="data_id")
+        query = select(TABLE.c.timestamp, TABLE.c.value_numeric).where(
+            TABLE.c.twin_id == "twin-1",
+            TABLE.c.data_type == "heart_rate",
+            TABLE.c.timestamp >= START + timedelta(minutes=5),
+        )
+
+        plan = " ".join(str(row) for row in session.execute(text(
+            "EXPLAIN QUERY PLAN SELECT timestamp, value_numeric FROM biometric_data_points "
+            "WHERE twin_id = 'twin-1' AND data_type = 'heart_rate' AND timestamp >= '2025-03-01 08:05:00'"
+        )))
+
+        assert len(session.execute(query).all()) == 15
+        assert "ix_biometric_data_points_twin_type_time" in plan
@@ -0,0 +1,265 @@
+# -*- coding: utf-8 -*-
+"""
+Unit tests for the asynchronous audit pipeline.
+"""
+
+import json
+import threading
+import uuid
+
+import pytest
+from sqlalchemy import (
+    JSON, Boolean, Column, DateTime, ForeignKey, MetaData, String, Table, Uuid, create_engine, event, select,
+)
+from sqlalchemy.orm import Session
+
+from app.config.settings import get_settings
+from app.infrastructure.security.audit import AuditLogger
+from app.infrastructure.security.audit.pipeline import (
+    GENESIS_HASH,
+    OVERFLOW_SPILL,
+    AuditPipeline,
+    SQLAlchemyAuditSink,
+    verify_chain,
+)
+
+
+def _entry(i: int) -> dict:
+    return {
+        "event_id": str(uuid.uuid4()),
+        "timestamp": "2025-03-01T08:00:00+00:00",
+        "event_type": "phi_access",
+        "user_id": f"user-{i}",
+        "action": "view",
+        "resource_type": "patient",
+        "resource_id": f"patient-{i}",
+        "details": {"i": i},
+    }
+
+
+def _lines(path) -> list:
+    with open(path, encoding="utf-8") as f:
+        return [json.loads(line) for line in f]
+
+
+class BlockingSink:
+    """Sink that holds the writer until released."""
+
+    def __init__(self):
+        self.release = threading.Event()
+        self.entries = []
+
+    def write_batch(self, entries):
+        self.release.wait(5)
+        self.entries.extend(entries)
+
+
+@pytest.mark.standalone()
+class TestAuditPipeline:
+    """Tests for batching, chaining and back-pressure."""
+
+    def test_entries_are_batched_and_chained(self, tmp_path):
+        """Test that a burst is written in few batches with a valid hash chain."""
+        path = tmp_path / "audit.log"
+        pipeline = AuditPipeline(str(path), batch_size=100)
+
+        for i in range(250):
+            pipeline.submit(_entry(i))
+        assert pipeline.flush(timeout=5)
+        pipeline.close()
+
+        lines = _lines(path)
+        assert [line["details"]["i"] for line in lines] == list(range(250))
+        assert lines[0]["prev_hash"] == GENESIS_HASH
+        assert verify_chain(str(path)) is None
+        assert pipeline.stats()["batches"] < 250
+
+    def test_tampering_breaks_the_chain(self, tmp_path):
+        """Test that editing an entry is detected at that line."""
+        path = tmp_path / "audit.log"
+        pipeline = AuditPipeline(str(path))
+        for i in range(5):
+            pipeline.submit(_entry(i))
+        pipeline.close()
+
+        lines = path.read_text(encoding="utf-8").splitlines()
+        lines[2] = lines[2].replace('"action":"view"', '"action":"edit"')
+        path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+
+        assert verify_chain(str(path)) == 2
+
+    def test_chain_resumes_after_restart(self, tmp_path):
+        """Test that a new pipeline continues the chain of an existing file."""
+        path = tmp_path / "audit.log"
+        for start in (0, 3):
+            pipeline = AuditPipeline(str(path))
+            for i in range(start, start + 3):
+                pipeline.submit(_entry(i))
+            pipeline.close()
+
+        assert len(_lines(path)) == 6
+        assert verify_chain(str(path)) is None
+
+    def test_spill_policy_keeps_every_entry(self, tmp_path):
+        """Test that overflow spills to disk and is drained into the chain."""
+        path = tmp_path / "audit.log"
+        sink = BlockingSink()
+        pipeline = AuditPipeline(str(path), sinks=[sink], max_queue_size=5, batch_size=1,
+                                 overflow_policy=OVERFLOW_SPILL)
+
+        for i in range(50):
+            pipeline.submit(_entry(i))
+        assert pipeline.stats()["spilled"] > 0
+        sink.release.set()
+        assert pipeline.flush(timeout=5)
+        pipeline.close()
+
+        assert [line["details"]["i"] for line in _lines(path)] == list(range(50))
+        assert verify_chain(str(path)) is None
+        assert not (tmp_path / "audit.log.spill").exists()
+
+    def test_sink_failure_does_not_stop_the_writer(self, tmp_path):
+        """Test that a failing sink is counted and the file is still written."""
+        class FailingSink:
+            def write_batch(self, entries):
+                raise RuntimeError("database unavailable")
+
+        path = tmp_path / "audit.log"
+        pipeline = AuditPipeline(str(path), sinks=[FailingSink()])
+        pipeline.submit(_entry(1))
+        pipeline.close()
+
+        assert len(_lines(path)) == 1
+        assert pipeline.stats()["sink_errors"] == 1
+
+    def test_write_failure_spills_batch_and_keeps_writer_alive(self, tmp_path):
+        """Test that a failed write is retried from the spill file and bad entries are dropped."""
+        class BrokenOnce:
+            def __init__(self, target):
+                self.target = target
+                self.failures = 1
+
+            def write(self, data):
+                if self.failures:
+                    self.failures -= 1
+                    raise OSError("disk full")
+                return self.target.write(data)
+
+            def __getattr__(self, name):
+                return getattr(self.target, name)
+
+        path = tmp_path / "audit.log"
+        pipeline = AuditPipeline(str(path))
+        pipeline._file = BrokenOnce(pipeline._file)
+        circular = _entry(99)
+        circular["details"]["self"] = circular
+
+        for entry in (_entry(0), circular, _entry(1)):
+            pipeline.submit(entry)
+        assert pipeline.flush(timeout=5)
+        pipeline.submit(_entry(2))
+        assert pipeline.flush(timeout=5)
+        pipeline.close()
+
+        assert [line["details"]["i"] for line in _lines(path)] == [0, 1, 2]
+        assert verify_chain(str(path)) is None
+        assert pipeline.stats()["write_errors"] == 1 and pipeline.stats()["dropped"] == 1
+
+    def test_unchained_lines_are_anchored(self, tmp_path):
+        """Test that a log with pre-chain lines gets an anchor that covers them."""
+        path = tmp_path / "audit.log"
+        path.write_text("2025-03-01 08:00:00 - hipaa_audit - INFO - PHI_ACCESS: {}\n{\"torn\": ", encoding="utf-8")
+        assert verify_chain(str(path)) == 0
+
+        pipeline = AuditPipeline(str(path))
+        for i in range(3):
+            pipeline.submit(_entry(i))
+        pipeline.close()
+
+        assert verify_chain(str(path)) is None
+        lines = path.read_text(encoding="utf-8").splitlines()
+        assert json.loads(lines[2])["event_type"] == "audit_chain_anchor"
+        lines[0] = lines[0].replace("PHI_ACCESS", "LOGIN")
+        path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+        assert verify_chain(str(path)) == 0
+
+
+def _audit_table(tmp_path, foreign_keys=False):
+    """Engine and audit_logs-shaped table on SQLite, user_id referencing a users table."""
+    engine = create_engine(f"sqlite:///{tmp_path / 'audit.db'}")
+    if foreign_keys:
+        event.listen(engine, "connect", lambda connection, record: connection.execute("PRAGMA foreign_keys=ON"))
+    metadata = MetaData()
+    Table("users", metadata, Column("id", Uuid, primary_key=True))
+    table = Table(
+        "audit_logs", metadata,
+        Column("id", Uuid, primary_key=True), Column("timestamp", DateTime(timezone=True)),
+        Column("event_type", String), Column("user_id", Uuid, ForeignKey("users.id")),
+        Column("ip_address", String), Column("action", String), Column("resource_type", String),
+        Column("resource_id", String), Column("success", Boolean), Column("details", JSON),
+        Column("previous_hash", String), Column("entry_hash", String),
+    )
+    metadata.create_all(engine)
+    return engine, table
+
+
+@pytest.mark.standalone()
+def test_sqlalchemy_sink_bulk_inserts(tmp_path):
+    """Test that batches are inserted into an audit_logs-shaped table."""
+    engine, table = _audit_table(tmp_path)
+    pipeline = AuditPipeline(str(tmp_path / "audit.log"),
+                             sinks=[SQLAlchemyAuditSink(lambda: Session(engine), table=table)])
+
+    for i in range(20):
+        pipeline.submit(_entry(i))
+    pipeline.close()
+
+    with Session(engine) as session:
+        rows = session.execute(select(table.c.details, table.c.entry_hash)).all()
+    assert len(rows) == 20
+    assert rows[0].details["user_id"] == "user-0"
+    assert rows[-1].entry_hash == _lines(tmp_path / "audit.log")[-1]["hash"]
+
+
+@pytest.mark.standalone()
+def test_sqlalchemy_sink_keeps_batch_when_rows_fail(tmp_path):
+    """Test that a foreign-key failure is salvaged and a refused row is spilled, not the batch lost."""
+    engine, table = _audit_table(tmp_path, foreign_keys=True)
+    rejected = tmp_path / "audit.db-rejected"
+    sink = SQLAlchemyAuditSink(lambda: Session(engine), table=table, rejected_file=str(rejected))
+    pipeline = AuditPipeline(str(tmp_path / "audit.log"), sinks=[sink])
+    entries = [_entry(i) for i in range(5)]
+    entries[1]["user_id"] = str(uuid.uuid4())  # not in users
+    entries[3]["event_id"] = entries[2]["event_id"]  # primary key clash
+
+    for entry in entries:
+        pipeline.submit(entry)
+    pipeline.close()
+
+    chain = _lines(tmp_path / "audit.log")
+    with Session(engine) as session:
+        rows = session.execute(select(table.c.entry_hash, table.c.user_id, table.c.details)).all()
+    stored = {row.entry_hash: row for row in rows}
+    assert set(stored) == {chain[i]["hash"] for i in (0, 1, 2, 4)}
+    assert stored[chain[1]["hash"]].user_id is None
+    assert stored[chain[1]["hash"]].details["user_id"] == entries[1]["user_id"]
+    assert [entry["hash"] for entry in _lines(rejected)] == [chain[3]["hash"]]
+    assert sink.rejected == 1 and pipeline.stats()["sink_errors"] == 0
+
+
+@pytest.mark.standalone()
+def test_audit_logger_uses_pipeline(tmp_path, monkeypatch):
+    """Test that AuditLogger records PHI access through the pipeline."""
+    settings = get_settings()
+    monkeypatch.setattr(settings, "AUDIT_LOG_FILE", str(tmp_path / "audit.log"))
+    monkeypatch.setattr(settings, "AUDIT_ASYNC_ENABLED", True)
+    audit_logger = AuditLogger("test_audit_pipeline")
+
+    audit_logger.log_phi_access("user-1", "view", "patient", "patient-1")
+    audit_logger.log_auth_event("login", "user-1", success=True)
+    assert audit_logger.flush(timeout=5)
+    audit_logger.close()
+
+    lines = _lines(tmp_path / "audit.log")
+    assert [line["event_type"] for line in lines] == ["phi_access", "auth_event"]
+    assert verify_chain(str(tmp_path / "audit.log")) is None
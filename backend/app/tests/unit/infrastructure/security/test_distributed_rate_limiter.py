@@ -0,0 +1,177 @@
+"""
+Unit tests for the atomic (Lua script) implementation of DistributedRateLimiter.
+
+These tests run against fakeredis with Lua support, so they exercise the real
+scripts without an external Redis server.
+"""
+
+import asyncio
+import time
+from unittest.mock import patch
+
+import pytest
+
+fakeredis = pytest.importorskip("fakeredis")
+pytest.importorskip("lupa")
+
+from app.infrastructure.cache.redis_cache import RedisCache
+from app.infrastructure.security.rate_limiting.rate_limiter import (
+    DistributedRateLimiter,
+    RateLimitAlgorithm,
+    RateLimitConfig,
+    RateLimitType,
+)
+
+
+class CountingFakeRedis(fakeredis.FakeAsyncRedis):
+    """Fake Redis client that counts commands sent to the server."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.commands = []
+
+    async def execute_command(self, *args, **options):
+        self.commands.append(args[0])
+        return await super().execute_command(*args, **options)
+
+
+@pytest.fixture
+def fake_client():
+    """Create a counting fake Redis client."""
+    return CountingFakeRedis(decode_responses=True, max_connections=512)
+
+
+@pytest.fixture
+def cache(fake_client):
+    """Create a RedisCache bound to the fake client."""
+    cache = RedisCache(redis_url="redis://fake:6379/0")
+    cache._client = fake_client
+    return cache
+
+
+def _limiter(cache, algorithm, requests=5, burst=0, atomic=True):
+    limiter = DistributedRateLimiter(cache_service=cache, atomic=atomic)
+    limiter.configure(
+        RateLimitType.DEFAULT,
+        RateLimitConfig(requests_per_period=requests, period_seconds=60,
+                        burst_capacity=burst, algorithm=algorithm),
+    )
+    return limiter
+
+
+@pytest.mark.venv_only()
+class TestAtomicRateLimiter:
+    """Tests for the single round-trip Lua implementation."""
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("algorithm", list(RateLimitAlgorithm))
+    async def test_allows_capacity_then_limits(self, cache, algorithm):
+        """Test that exactly requests + burst requests are admitted."""
+        limiter = _limiter(cache, algorithm, requests=5, burst=2)
+
+        results = [await limiter.is_rate_limited("ip:1.2.3.4") for _ in range(8)]
+
+        assert [limited for limited, _ in results] == [False] * 7 + [True]
+        assert [info["remaining"] for _, info in results[:7]] == [6, 5, 4, 3, 2, 1, 0]
+        assert results[-1][1]["retry_after"] >= 1
+        assert results[0][1]["limit"] == 7
+
+    @pytest.mark.asyncio
+    async def test_single_round_trip_per_request(self, cache, fake_client):
+        """Test that a warm check costs exactly one EVALSHA."""
+        limiter = _limiter(cache, RateLimitAlgorithm.FIXED_WINDOW)
+        await limiter.is_rate_limited("ip:warmup")
+        fake_client.commands.clear()
+
+        for _ in range(10):
+            await limiter.is_rate_limited("ip:1.2.3.4")
+
+        assert fake_client.commands == ["EVALSHA"] * 10
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("algorithm", list(RateLimitAlgorithm))
+    async def test_no_over_admission_under_concurrency(self, cache, algorithm):
+        """Test that concurrent requests never exceed the limit."""
+        limiter = _limiter(cache, algorithm, requests=50)
+
+        results = await asyncio.gather(
+            *(limiter.is_rate_limited("ip:9.9.9.9") for _ in range(200))
+        )
+
+        assert sum(1 for limited, _ in results if not limited) == 50
+
+    @pytest.mark.asyncio
+    async def test_gcra_refills_smoothly(self, cache):
+        """Test that GCRA admits one request per emission interval after a burst."""
+        limiter = _limiter(cache, RateLimitAlgorithm.GCRA, requests=6)  # one every 10s
+        start = 1_700_000_000.0
+
+        with patch("fakeredis.commands_mixins.server_mixin.time.time") as clock:
+            clock.return_value = start
+            for _ in range(6):
+                assert (await limiter.is_rate_limited("ip:5.5.5.5"))[0] is False
+            limited, info = await limiter.is_rate_limited("ip:5.5.5.5")
+            assert limited is True
+            assert info["retry_after"] == 10
+
+            clock.return_value = start + 10
+            assert (await limiter.is_rate_limited("ip:5.5.5.5"))[0] is False
+            assert (await limiter.is_rate_limited("ip:5.5.5.5"))[0] is True
+
+    @pytest.mark.asyncio
+    async def test_fixed_window_resets_at_boundary(self, cache):
+        """Test that the fixed window refills at the next window start."""
+        limiter = _limiter(cache, RateLimitAlgorithm.FIXED_WINDOW, requests=2)
+        start = 1_700_000_040.0  # window [1_700_000_040, 1_700_000_100)
+
+        with patch("fakeredis.commands_mixins.server_mixin.time.time") as clock:
+            clock.return_value = start
+            await limiter.is_rate_limited("ip:7.7.7.7")
+            await limiter.is_rate_limited("ip:7.7.7.7")
+            limited, info = await limiter.is_rate_limited("ip:7.7.7.7")
+            assert limited is True
+            assert info["reset_at"] == 1_700_000_100.0
+
+            clock.return_value = 1_700_000_100.0
+            assert (await limiter.is_rate_limited("ip:7.7.7.7"))[0] is False
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("algorithm", list(RateLimitAlgorithm))
+    async def test_ignores_application_clock(self, cache, algorithm):
+        """Test that a skewed worker clock does not move the window or refill tokens."""
+        limiter = _limiter(cache, algorithm, requests=1)
+        server_now = time.time()
+
+        with patch("app.infrastructure.security.rate_limiting.rate_limiter.time") as worker_clock:
+            worker_clock.time.return_value = server_now + 3600
+            limited, info = await limiter.is_rate_limited("ip:8.8.8.8")
+            assert limited is False
+            assert info["reset_at"] <= server_now + 61
+
+            worker_clock.time.return_value = server_now + 7200
+            assert (await limiter.is_rate_limited("ip:8.8.8.8"))[0] is True
+
+    @pytest.mark.asyncio
+    async def test_non_atomic_mode_uses_separate_commands(self, cache, fake_client):
+        """Test that atomic=False keeps the read-modify-write implementation."""
+        limiter = _limiter(cache, RateLimitAlgorithm.FIXED_WINDOW, atomic=False)
+        await limiter.is_rate_limited("ip:1.1.1.1")
+        fake_client.commands.clear()
+
+        await limiter.is_rate_limited("ip:1.1.1.1")
+
+        assert "EVALSHA" not in fake_client.commands
+        # The bucket is read with a single GET, then written back
+        assert fake_client.commands == ["GET", "SET"]
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("atomic", [True, False])
+    async def test_reset_clears_bucket(self, cache, atomic):
+        """Test that reset restores the full allowance."""
+        limiter = _limiter(cache, RateLimitAlgorithm.FIXED_WINDOW, requests=1, atomic=atomic)
+        await limiter.is_rate_limited("ip:3.3.3.3")
+        assert (await limiter.is_rate_limited("ip:3.3.3.3"))[0] is True
+
+        assert await limiter.reset("ip:3.3.3.3") == 1
+
+        assert (await limiter.is_rate_limited("ip:3.3.3.3"))[0] is False
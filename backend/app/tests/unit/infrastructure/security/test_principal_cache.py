@@ -0,0 +1,245 @@
+# -*- coding: utf-8 -*-
+"""
+Unit tests for the authenticated principal cache and its use in
+AuthenticationMiddleware.
+"""
+
+import asyncio
+import time
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock
+from uuid import uuid4
+
+import pytest
+from fastapi import FastAPI, Request
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import Session
+
+from app.core.models.token_models import TokenPayload
+from app.infrastructure.cache.redis_cache import RedisCache
+from app.infrastructure.repositories.user_repository import SqlAlchemyUserRepository
+from app.infrastructure.security.auth import principal_cache
+from app.infrastructure.security.auth.principal_cache import CachedPrincipal, PrincipalCache
+from app.presentation.middleware import authentication_middleware
+from app.presentation.middleware.authentication_middleware import AuthenticationMiddleware
+
+
+def _principal(subject="user-1", jti="jti-1", expires_in=3600.0):
+    now = datetime.now(timezone.utc)
+    payload = TokenPayload(sub=subject, jti=jti, iat=now, exp=now + timedelta(seconds=expires_in))
+    return CachedPrincipal(payload=payload, user=SimpleNamespace(id=subject), scopes=("clinician",))
+
+
+@pytest.mark.standalone()
+class TestPrincipalCache:
+    """Tests for lookups, bounds and revocation."""
+
+    def test_hit_after_put_and_stats(self):
+        """Test that a stored principal is served and counted."""
+        cache = PrincipalCache()
+        assert cache.get("token-a") is None
+        cache.put("token-a", _principal())
+
+        assert cache.get("token-a").subject == "user-1"
+        stats = cache.stats()
+        assert (stats["hits"], stats["misses"], stats["hit_ratio"]) == (1, 1, 0.5)
+
+    def test_entry_expires_with_token(self):
+        """Test that an entry never outlives the token's exp claim."""
+        cache = PrincipalCache(ttl_seconds=3600)
+        cache.put("token-a", _principal(expires_in=0.05))
+        time.sleep(0.1)
+
+        assert cache.get("token-a") is None
+        assert cache.stats()["expirations"] == 1
+
+    def test_lru_bound(self):
+        """Test that the least recently used principal is evicted."""
+        cache = PrincipalCache(max_entries=2)
+        cache.put("token-a", _principal(jti="a"))
+        cache.put("token-b", _principal(jti="b"))
+        cache.get("token-a")
+        cache.put("token-c", _principal(jti="c"))
+
+        assert cache.get("token-b") is None
+        assert cache.get("token-a") is not None
+        assert cache.stats()["evictions"] == 1
+
+    def test_revoke_token_and_invalidate_subject(self):
+        """Test logout and role-change invalidation."""
+        cache = PrincipalCache()
+        principal = _principal(jti="a")
+        cache.put("token-a", principal)
+        cache.put("token-b", _principal(jti="b"))
+        cache.put("token-c", _principal(subject="user-2", jti="c"))
+
+        asyncio.run(cache.revoke_token("a", principal.payload.exp))
+        assert cache.get("token-a") is None
+        assert asyncio.run(cache.is_revoked("a"))
+        cache.put("token-a", principal)
+        assert cache.get("token-a") is None
+
+        asyncio.run(cache.invalidate_subject("user-1"))
+        assert cache.get("token-b") is None
+        assert cache.get("token-c") is not None
+
+    def test_revocation_messages_from_other_workers(self):
+        """Test that published revocation messages are applied locally."""
+        cache = PrincipalCache()
+        cache.put("token-a", _principal(jti="a"))
+        cache.put("token-c", _principal(subject="user-2", jti="c"))
+
+        cache.apply_revocation(f"jti:a:{time.time() + 60}")
+        cache.apply_revocation("sub:user-2")
+
+        assert len(cache) == 0
+        assert asyncio.run(cache.is_revoked("a"))
+
+    def test_revoked_jti_shared_through_redis(self):
+        """Test that a token revoked by one worker is rejected by another."""
+        fakeredis = pytest.importorskip("fakeredis")
+        server = fakeredis.FakeServer()
+
+        def _cache():
+            redis_cache = RedisCache(redis_url="redis://fake:6379/0")
+            redis_cache._client = fakeredis.FakeAsyncRedis(server=server, decode_responses=True)
+            return PrincipalCache(redis_cache=redis_cache)
+
+        first, second = _cache(), _cache()
+        asyncio.run(first.revoke_token("a", time.time() + 60))
+
+        assert asyncio.run(second.is_revoked("a"))
+        assert not asyncio.run(second.is_revoked("b"))
+
+
+@pytest.mark.standalone()
+def test_middleware_serves_repeat_requests_from_cache(monkeypatch):
+    """Test that steady-state requests skip verification and the user lookup."""
+    monkeypatch.setattr(authentication_middleware.get_settings(), "TESTING", False)
+    principal = _principal(jti="a")
+    jwt_service = AsyncMock()
+    jwt_service.verify_token.return_value = principal.payload
+    auth_service = AsyncMock()
+    auth_service.get_user_by_id.return_value = SimpleNamespace(id="user-1", is_active=True, roles=["clinician"])
+    cache = PrincipalCache()
+
+    app = FastAPI()
+    app.add_middleware(AuthenticationMiddleware, auth_service=auth_service, jwt_service=jwt_service,
+                       principal_cache=cache)
+
+    @app.get("/protected")
+    async def protected(request: Request):
+        return {"user": request.state.user.id, "scopes": request.state.auth.scopes}
+
+    client = TestClient(app)
+    headers = {"Authorization": "Bearer token-a"}
+    for _ in range(3):
+        response = client.get("/protected", headers=headers)
+        assert response.json() == {"user": "user-1", "scopes": ["clinician"]}
+    assert jwt_service.verify_token.await_count == 1
+    assert auth_service.get_user_by_id.await_count == 1
+
+    asyncio.run(cache.invalidate_subject("user-1"))
+    client.get("/protected", headers=headers)
+    assert auth_service.get_user_by_id.await_count == 2
+
+    asyncio.run(cache.revoke_token("a", principal.payload.exp))
+    assert client.get("/protected", headers=headers).status_code == 401
+
+
+def _user_repository(user_id):
+    model = SimpleNamespace(id=user_id, email="a@example.com", first_name="A", last_name="B",
+                            hashed_password="x", is_active=True, roles=["clinician"],
+                            created_at=None, updated_at=None)
+    result = MagicMock(rowcount=1)
+    result.scalars.return_value.first.return_value = model
+    session = MagicMock(flush=AsyncMock(), execute=AsyncMock(return_value=result),
+                        sync_session=Session())
+    return SqlAlchemyUserRepository(session), model
+
+
+@pytest.mark.standalone()
+def test_user_update_and_delete_invalidate_cached_principals(monkeypatch):
+    """Test that changing or deleting a user drops their principals from the shared cache."""
+    cache = PrincipalCache()
+    monkeypatch.setattr(principal_cache, "_principal_cache", cache)
+    user_id = uuid4()
+    repository, model = _user_repository(user_id)
+
+    cache.put("token-a", _principal(subject=str(user_id), jti="a"))
+    cache.put("token-b", _principal(subject="user-2", jti="b"))
+    user = SimpleNamespace(**{**vars(model), "is_active": False})
+    asyncio.run(repository.update(user))
+    assert cache.get("token-a") is None
+    assert cache.get("token-b") is not None
+
+    cache.put("token-a", _principal(subject=str(user_id), jti="a"))
+    asyncio.run(repository.delete(user_id))
+    assert cache.get("token-a") is None
+
+
+@pytest.mark.standalone()
+def test_principal_recached_before_commit_is_dropped_after_commit(monkeypatch):
+    """Test that a principal cached between flush and commit does not outlive the commit."""
+    cache = PrincipalCache()
+    monkeypatch.setattr(principal_cache, "_principal_cache", cache)
+    user_id = uuid4()
+    repository, model = _user_repository(user_id)
+    user = SimpleNamespace(**{**vars(model), "is_active": False})
+
+    async def update_then_commit():
+        await repository.update(user)
+        # A concurrent request still reads the uncommitted row and caches it again
+        cache.put("token-a", _principal(subject=str(user_id), jti="a"))
+        await asyncio.sleep(0)
+        assert cache.get("token-a") is not None
+
+        repository.session.sync_session.commit()
+        await asyncio.sleep(0)
+        assert cache.get("token-a") is None
+
+        # The listener fires once; later commits leave new logins alone
+        cache.put("token-a", _principal(subject=str(user_id), jti="a"))
+        repository.session.sync_session.commit()
+        await asyncio.sleep(0)
+        assert cache.get("token-a") is not None
+
+    asyncio.run(update_then_commit())
+
+
+@pytest.mark.standalone()
+def test_lifespan_starts_revocation_listener(monkeypatch):
+    """Test that the app lifespan subscribes to revocations from other workers and stops on shutdown."""
+    fakeredis = pytest.importorskip("fakeredis")
+    from app import main
+
+    server = fakeredis.FakeServer()
+
+    def _cache():
+        redis_cache = RedisCache(redis_url="redis://fake:6379/0")
+        redis_cache._client = fakeredis.FakeAsyncRedis(server=server, decode_responses=True)
+        return PrincipalCache(redis_cache=redis_cache)
+
+    listener, publisher = _cache(), _cache()
+    monkeypatch.setattr(main, "get_principal_cache", lambda: listener)
+    monkeypatch.setattr(main, "get_db_instance", lambda: SimpleNamespace(dispose=AsyncMock()))
+    monkeypatch.setattr(main.get_settings(), "AUTH_PRINCIPAL_CACHE_ENABLED", True)
+
+    async def scenario():
+        async with main.lifespan(FastAPI()):
+            client = listener.redis_cache._client
+            for _ in range(100):
+                if (await client.pubsub_numsub(listener.channel))[0][1]:
+                    break
+                await asyncio.sleep(0.01)
+            listener.put("token-a", _principal(jti="a"))
+            await publisher.invalidate_subject("user-1")
+            for _ in range(100):
+                if not len(listener):
+                    break
+                await asyncio.sleep(0.01)
+            assert len(listener) == 0
+        assert listener._listener_task is None
+
+    asyncio.run(scenario())
@@ -451,22 +451,20 @@ class TestBackgroundProcessingFunctions:
         # Verify analytics service was called with correct parameters
         mock_analytics_service.get_patient_treatment_outcomes.assert_called_once_with(patient_id=patient_id, start_date=start_date, end_date=end_date)
 
-        # Verify results were cached properly
-        assert mock_cache_service.set.call_count == 2  # Main result and status
-
-        # Check main result cache
-        main_cache_call = mock_cache_service.set.call_args_list[0]
-        assert main_cache_call.kwargs["key"] == cache_key
-        assert main_cache_call.kwargs["value"] == expected_result 
-
-        # Check status cache
-        status_cache_call = mock_cache_service.set.call_args_list[1]
-        assert status_cache_call.kwargs["key"] == f"status:{cache_key}"
-        status_value = status_cache_call.kwargs["value"] 
+        # Verify result and status were cached in a single batch
+        mock_cache_service.set_many.assert_called_once()
+        items = mock_cache_service.set_many.call_args.args[0]
+        assert items[cache_key] == expected_result
+
+        status_value = items[f"status:{cache_key}"]
         assert isinstance(status_value, dict)
         assert status_value["status"] == "completed"
         assert status_value["data"] == expected_result
 
+        # Status outlives the result
+        expirations = mock_cache_service.set_many.call_args.kwargs["expirations"]
+        assert expirations[f"status:{cache_key}"] > expirations[cache_key]
+
     @pytest.mark.asyncio
     async def test_process_treatment_outcomes_error(self, mock_analytics_service, mock_cache_service):
         """Test error handling in treatment outcomes processing."""
@@ -508,7 +506,9 @@ class TestBackgroundProcessingFunctions:
         # Verify analytics service was called with correct parameters
         mock_analytics_service.get_practice_metrics.assert_called_once_with(start_date=start_date, end_date=end_date, provider_id=provider_id)
 
-        # Verify results were cached
-        assert mock_cache_service.set.call_count == 2  # Main result and status
+        # Verify result and status were cached in a single batch
+        mock_cache_service.set_many.assert_called_once()
+        items = mock_cache_service.set_many.call_args.args[0]
+        assert set(items) == {cache_key, f"status:{cache_key}"}
 
         # Add similar tests for _process_medication_effectiveness and _process_treatment_comparison
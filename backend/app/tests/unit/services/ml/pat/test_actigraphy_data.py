@@ -0,0 +1,239 @@
+# -*- coding: utf-8 -*-
+"""
+Unit tests for the columnar actigraphy ingestion path.
+"""
+
+import io
+import json
+from datetime import datetime, timedelta, timezone
+
+import numpy as np
+import pytest
+
+from app.core.services.ml.pat.actigraphy_data import (
+    READING_DTYPE,
+    ActigraphyArray,
+    pack_upload,
+    parse_timestamps,
+    unpack_npz,
+    unpack_upload,
+)
+from app.core.services.ml.pat.exceptions import ValidationError
+
+START = datetime(2025, 3, 1, 8, 0, tzinfo=timezone.utc)
+START_NS = int(START.timestamp()) * 1_000_000_000
+
+
+def _records(count: int, step_seconds: float = 0.1):
+    return [
+        {
+            "timestamp": (START + timedelta(seconds=i * step_seconds)).isoformat(),
+            "x": 0.1 * i,
+            "y": 1.0,
+            "z": -0.5 * i,
+        }
+        for i in range(count)
+    ]
+
+
+def _packed(count: int, rate: float) -> bytes:
+    records = np.zeros(count, dtype=READING_DTYPE)
+    records["timestamp_ns"] = START_NS + np.round(np.arange(count) * 1e9 / rate).astype(np.int64)
+    records["x"] = np.sin(np.arange(count) / rate)
+    records["y"] = 1.0
+    records["z"] = np.arange(count, dtype=np.float32)
+    return records.tobytes()
+
+
+@pytest.mark.standalone()
+class TestActigraphyArray:
+    """Tests for ActigraphyArray constructors and resampling."""
+
+    def test_from_records_matches_scalar_parsing(self):
+        """Test that vectorized parsing matches per-reading parsing."""
+        readings = _records(50)
+        readings[3]["timestamp"] = "2025-03-01T09:00:00.300000+01:00"  # same instant, offset form
+
+        data = ActigraphyArray.from_records(readings)
+
+        expected_ns = [
+            round(datetime.fromisoformat(r["timestamp"]).timestamp() * 1e6) * 1000 for r in readings
+        ]
+        assert data.timestamps_ns.tolist() == expected_ns
+        assert np.array_equal(data.values, [[r["x"], r["y"], r["z"]] for r in readings])
+
+    def test_naive_and_epoch_timestamps(self):
+        """Test that naive ISO strings are UTC and numbers are epoch seconds."""
+        assert parse_timestamps(["2025-03-01T08:00:00"]).tolist() == [START_NS]
+        assert parse_timestamps([START.timestamp() + 0.5]).tolist() == [START_NS + 500_000_000]
+
+    def test_from_buffer_is_zero_copy_view(self):
+        """Test that packed buffers are wrapped, not parsed per reading."""
+        payload = _packed(10, rate=30.0)
+
+        data = ActigraphyArray.from_buffer(payload)
+
+        assert len(data) == 10
+        assert data.timestamps_ns.base is not None
+        assert np.shares_memory(data.timestamps_ns, np.frombuffer(payload, dtype=np.uint8))
+        assert data.values[:, 2].tolist() == list(range(10))
+
+    def test_from_buffer_rejects_partial_record(self):
+        """Test that truncated buffers are rejected."""
+        with pytest.raises(ValidationError):
+            ActigraphyArray.from_buffer(_packed(3, rate=30.0)[:-1])
+
+    def test_malformed_records_raise_validation_error(self):
+        """Test that missing fields and non-numeric values are reported."""
+        with pytest.raises(ValidationError):
+            ActigraphyArray.from_records([{"timestamp": START.isoformat(), "x": 1, "y": 2}])
+        with pytest.raises(ValidationError):
+            ActigraphyArray.from_records([{"timestamp": "yesterday", "x": 1, "y": 2, "z": 3}])
+
+    def test_resample_identity_at_native_rate(self):
+        """Test that data already on the grid is returned unchanged."""
+        data = ActigraphyArray.from_buffer(_packed(300, rate=30.0))
+
+        resampled = data.resample(sampling_rate=30.0, window_size=10)
+
+        assert resampled.shape == (300, 3)
+        assert np.allclose(resampled, data.values, atol=1e-6)
+
+    def test_resample_downsample_averages_bins(self):
+        """Test that denser input is box-filtered per grid interval."""
+        values = np.tile([[0.0, 0.0, 0.0], [2.0, 2.0, 2.0]], (30, 1))
+        timestamps = START_NS + np.arange(60) * 100_000_000  # 10 Hz
+        data = ActigraphyArray(values, timestamps)
+
+        resampled = data.resample(sampling_rate=1.0, window_size=6)
+
+        # Alternating 0/2 samples average to 1 instead of aliasing to 0 or 2
+        assert np.allclose(resampled, 1.0)
+
+    def test_resample_upsample_interpolates_in_time(self):
+        """Test that sparse, irregular readings are linearly interpolated."""
+        timestamps = START_NS + np.array([0, 1000, 2500], dtype=np.int64) * 1_000_000
+        values = np.array([[0.0, 0, 0], [1.0, 0, 0], [2.5, 0, 0]])
+        data = ActigraphyArray(values, timestamps)
+
+        resampled = data.resample(sampling_rate=2.0, window_size=3)
+
+        assert np.allclose(resampled[:, 0], [0.0, 0.5, 1.0, 1.5, 2.0, 2.5])
+
+    def test_resample_sorts_unordered_readings(self):
+        """Test that out-of-order readings are placed by timestamp."""
+        timestamps = START_NS + np.array([2, 0, 1], dtype=np.int64) * 1_000_000_000
+        data = ActigraphyArray(np.array([[2.0, 0, 0], [0.0, 0, 0], [1.0, 0, 0]]), timestamps)
+
+        assert data.resample(sampling_rate=1.0, window_size=3)[:, 0].tolist() == [0.0, 1.0, 2.0]
+
+    def test_resample_without_timestamps_stretches_evenly(self):
+        """Test the index-based path for plain arrays."""
+        data = ActigraphyArray(np.array([[0.0, 0, 0], [3.0, 0, 0]]))
+
+        assert data.resample(sampling_rate=1.0, window_size=4)[:, 0].tolist() == [0.0, 1.0, 2.0, 3.0]
+
+    def test_from_any_dispatch(self):
+        """Test that every supported input type is accepted."""
+        packed = _packed(5, rate=1.0)
+        records = np.frombuffer(packed, dtype=READING_DTYPE)
+
+        for source in (packed, records, _records(5), records[["x", "y", "z"]].copy()):
+            assert len(ActigraphyArray.from_any(source)) == 5
+        with pytest.raises(ValidationError):
+            ActigraphyArray.from_any({"x": 1})
+
+    def test_duration_seconds(self):
+        """Test the span from timestamps, and from the sampling rate without them."""
+        assert ActigraphyArray.from_records(_records(11, step_seconds=0.5)).duration_seconds(30.0) == 5.0
+        assert ActigraphyArray(np.zeros((31, 3))).duration_seconds(30.0) == 1.0
+        assert ActigraphyArray(np.zeros((1, 3))).duration_seconds(30.0) == 0.0
+
+    def test_aws_backend_accepts_both_contracts(self):
+        """Test that the AWS PAT backend summarises records and columnar readings alike."""
+        aws = pytest.importorskip("app.core.services.ml.pat.aws")
+        service = aws.AWSPATService.__new__(aws.AWSPATService)
+        records = _records(11, step_seconds=0.5)
+
+        summaries = [
+            service.analyze_actigraphy("p1", readings, "", "", 2.0, {}, ["sleep"])["data_summary"]
+            for readings in (records, ActigraphyArray.from_records(records))
+        ]
+
+        assert summaries[0] == summaries[1]
+        assert summaries[0]["readings_count"] == 11 and summaries[0]["duration_seconds"] == 5.0
+
+
+METADATA = {"patient_id": "patient-1", "sampling_rate_hz": 30.0}
+
+
+@pytest.mark.standalone()
+class TestActigraphyUploads:
+    """Tests for vectorized validation and the binary upload encodings."""
+
+    def test_buffer_values_are_a_view(self):
+        """Test that x/y/z are viewed as an (n, 3) block without copying."""
+        payload = _packed(4, rate=30.0)
+
+        data = ActigraphyArray.from_buffer(payload)
+
+        assert np.shares_memory(data.values, np.frombuffer(payload, dtype=np.uint8))
+        assert not data.values.flags.writeable
+
+    def test_validate_accepts_clean_readings(self):
+        """Test that in-range, increasing readings pass."""
+        data = ActigraphyArray.from_buffer(_packed(100, rate=30.0))
+
+        assert data.validate(max_abs_value=200.0) is data
+
+    @pytest.mark.parametrize("bad_value", [np.nan, np.inf, 50.0])
+    def test_validate_rejects_bad_values(self, bad_value):
+        """Test that non-finite and out-of-range values name the first bad reading."""
+        values = np.zeros((10, 3))
+        values[7, 1] = bad_value
+        data = ActigraphyArray(values, START_NS + np.arange(10))
+
+        with pytest.raises(ValidationError) as exc_info:
+            data.validate()
+
+        assert exc_info.value.details["index"] == 7
+
+    def test_validate_rejects_non_monotonic_timestamps(self):
+        """Test that repeated or backwards timestamps are rejected."""
+        data = ActigraphyArray(np.zeros((4, 3)), START_NS + np.array([0, 1, 1, 2]))
+
+        with pytest.raises(ValidationError) as exc_info:
+            data.validate()
+
+        assert exc_info.value.details["field"] == "timestamps"
+        assert exc_info.value.details["index"] == 2
+
+    def test_framed_upload_round_trip(self):
+        """Test that framed uploads decode to a zero-copy view of the body."""
+        records = np.frombuffer(_packed(25, rate=30.0), dtype=READING_DTYPE)
+        body = pack_upload(METADATA, records)
+
+        metadata, data = unpack_upload(body)
+
+        assert metadata == METADATA
+        assert np.array_equal(data.timestamps_ns, records["timestamp_ns"])
+        assert np.shares_memory(data.values, np.frombuffer(body, dtype=np.uint8))
+
+    def test_framed_upload_rejects_bad_frames(self):
+        """Test that wrong magic, truncation and partial records are rejected."""
+        body = pack_upload(METADATA, np.frombuffer(_packed(2, rate=30.0), dtype=READING_DTYPE))
+
+        for broken in (b"XXXX" + body[4:], body[:10], body[:-3]):
+            with pytest.raises(ValidationError):
+                unpack_upload(broken)
+
+    def test_npz_upload(self):
+        """Test that npz archives with records and metadata decode."""
+        records = np.frombuffer(_packed(5, rate=30.0), dtype=READING_DTYPE)
+        buffer = io.BytesIO()
+        np.savez(buffer, readings=records, metadata=np.array(json.dumps(METADATA)))
+
+        metadata, data = unpack_npz(buffer.getvalue())
+
+        assert metadata == METADATA
+        assert len(data) == 5
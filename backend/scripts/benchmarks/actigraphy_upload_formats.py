@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+"""
+Actigraphy upload decoding benchmark: JSON + Pydantic vs. binary formats.
+
+Decodes and validates the same analyze request as it would arrive at
+/actigraphy/analyze in each supported encoding:
+  - JSON body validated into AnalyzeActigraphyRequest (one model per reading)
+  - framed binary (application/vnd.novamind.actigraphy), zero-copy + vectorized checks
+  - npz archive (application/x-npz)
+
+and reports payload size, decode+validate time and peak traced allocations.
+
+Requires: numpy, pydantic
+
+Usage:
+    python scripts/benchmarks/actigraphy_upload_formats.py --hours 1,6 --rate 30
+"""
+
+import argparse
+import io
+import json
+import time
+import tracemalloc
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, Dict, List
+
+from common import print_table  # noqa: E402  (sets sys.path)
+
+import numpy as np
+
+from app.core.services.ml.pat.actigraphy_data import READING_DTYPE, pack_upload, unpack_npz, unpack_upload
+from app.presentation.api.schemas.actigraphy import AnalyzeActigraphyRequest, AnalyzeActigraphyUpload
+
+START = datetime(2025, 3, 1, 8, tzinfo=timezone.utc)
+START_NS = int(START.timestamp()) * 1_000_000_000
+
+
+def _metadata(hours: float, rate: float) -> Dict[str, Any]:
+    return {
+        "patient_id": "bench-patient",
+        "start_time": START.isoformat(),
+        "end_time": (START + timedelta(hours=hours)).isoformat(),
+        "sampling_rate_hz": rate,
+        "device_info": {"device_type": "smartwatch", "model": "bench"},
+        "analysis_types": ["sleep_quality", "activity_levels"],
+    }
+
+
+def _records(count: int, rate: float) -> np.ndarray:
+    rng = np.random.default_rng(0)
+    records = np.empty(count, dtype=READING_DTYPE)
+    records["timestamp_ns"] = START_NS + np.round(np.arange(count) * 1e9 / rate).astype(np.int64)
+    for axis in ("x", "y", "z"):
+        records[axis] = rng.normal(scale=0.5, size=count)
+    return records
+
+
+def _json_body(metadata: Dict[str, Any], records: np.ndarray) -> bytes:
+    timestamps = records["timestamp_ns"].astype("datetime64[ns]").astype("datetime64[ms]").astype(str)
+    readings = [
+        {"timestamp": f"{ts}Z", "x": float(x), "y": float(y), "z": float(z)}
+        for ts, x, y, z in zip(timestamps, records["x"], records["y"], records["z"])
+    ]
+    return json.dumps({**metadata, "readings": readings}).encode("utf-8")
+
+
+def _npz_body(metadata: Dict[str, Any], records: np.ndarray) -> bytes:
+    buffer = io.BytesIO()
+    np.savez(buffer, readings=records, metadata=np.array(json.dumps(metadata)))
+    return buffer.getvalue()
+
+
+def decode_json(body: bytes) -> Any:
+    """The existing request path: json.loads + Pydantic model per reading."""
+    return AnalyzeActigraphyRequest.model_validate(json.loads(body))
+
+
+def decode_binary(unpack: Callable) -> Callable[[bytes], Any]:
+    """Binary request path: decode, vectorized validation, metadata model."""
+    def decode(body: bytes) -> Any:
+        metadata, readings = unpack(body)
+        return AnalyzeActigraphyUpload.model_validate({**metadata, "readings": readings.validate()})
+    return decode
+
+
+def _measure(fmt: str, hours: float, body: bytes, decode: Callable[[bytes], Any]) -> Dict[str, object]:
+    tracemalloc.start()
+    started = time.perf_counter()
+    request = decode(body)
+    elapsed = time.perf_counter() - started
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {
+        "window": f"{hours:g}h",
+        "format": fmt,
+        "readings": len(request.readings),
+        "payload_mb": len(body) / 2**20,
+        "decode_s": elapsed,
+        "peak_alloc_mb": peak / 2**20,
+    }
+
+
+def run_window(hours: float, rate: float, max_json_readings: int) -> List[Dict[str, object]]:
+    """Benchmark every encoding for one window length."""
+    count = int(hours * 3600 * rate)
+    metadata = _metadata(hours, rate)
+    records = _records(count, rate)
+    rows = []
+    if count <= max_json_readings:
+        rows.append(_measure("json + pydantic", hours, _json_body(metadata, records), decode_json))
+    rows.append(_measure("framed binary", hours, pack_upload(metadata, records), decode_binary(unpack_upload)))
+    rows.append(_measure("npz", hours, _npz_body(metadata, records), decode_binary(unpack_npz)))
+    return rows
+
+
+def main() -> None:
+    """Parse arguments and run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--hours", default="1,6", help="Comma-separated window lengths in hours")
+    parser.add_argument("--rate", type=float, default=30.0, help="Sampling rate in Hz")
+    parser.add_argument("--max-json-readings", type=int, default=1_000_000,
+                        help="Largest window encoded as JSON")
+    args = parser.parse_args()
+
+    rows = []
+    for hours in (float(h) for h in args.hours.split(",")):
+        rows.extend(run_window(hours, args.rate, args.max_json_readings))
+    print_table(f"Actigraphy upload decode + validation ({args.rate:g} Hz)", rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,199 @@
+#!/usr/bin/env python3
+"""
+Appointment scheduling benchmark: per-booking day scans vs. the interval index.
+
+Many providers take bookings concurrently against an in-memory repository
+that adds a fixed latency to every query, with:
+  - legacy: the previous checks (two day queries and a linear scan per booking,
+    no per-provider serialization)
+  - indexed: AppointmentService on the availability engine
+
+Reports booking latency, repository queries, double bookings left behind, and
+the cost of a week-long free-slot search.
+
+Usage:
+    python scripts/benchmarks/appointment_availability.py --providers 200 --bookings 40
+"""
+
+import argparse
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from typing import Dict, List
+from uuid import UUID
+
+from common import print_table, summarize  # noqa: E402  (sets sys.path)
+
+from app.domain.entities.appointment import Appointment, AppointmentStatus, AppointmentType
+from app.domain.exceptions import ValidationError
+from app.domain.services.appointment_service import AppointmentService
+
+WEEK_START = datetime(2030, 1, 7)
+INACTIVE = (AppointmentStatus.CANCELLED, AppointmentStatus.NO_SHOW)
+
+
+class SlowAppointmentRepository:
+    """In-memory appointment store with a fixed per-query latency."""
+
+    def __init__(self, latency_seconds: float):
+        self.latency_seconds = latency_seconds
+        self.by_provider: Dict[str, List[Appointment]] = {}
+        self.lock = threading.Lock()
+        self.queries = 0
+
+    def get_by_provider_id(self, provider_id, start, end, status=None):
+        time.sleep(self.latency_seconds)
+        with self.lock:
+            self.queries += 1
+            appointments = list(self.by_provider.get(str(provider_id), ()))
+        return [a for a in appointments if a.start_time < end and a.end_time > start]
+
+    def save(self, appointment):
+        with self.lock:
+            self.by_provider.setdefault(str(appointment.provider_id), []).append(appointment)
+        return appointment
+
+
+class AlwaysFound:
+    """Patient/provider repository stub."""
+
+    def get_by_id(self, entity_id):
+        return {"id": entity_id}
+
+
+class LegacyAppointmentService(AppointmentService):
+    """AppointmentService with the previous scan-based checks and no provider lock."""
+
+    def create_appointment(self, patient_id, provider_id, start_time, end_time=None, **kwargs):
+        end_time = end_time or start_time + timedelta(minutes=self.default_appointment_duration)
+        self._check_for_conflicts(provider_id, start_time, end_time)
+        self._check_daily_appointment_limit(provider_id, start_time)
+        appointment = Appointment(patient_id=patient_id, provider_id=provider_id, start_time=start_time,
+                                  end_time=end_time, appointment_type=AppointmentType.FOLLOW_UP)
+        return self.appointment_repository.save(appointment)
+
+    def _check_for_conflicts(self, provider_id, start_time, end_time, exclude_appointment_id=None):
+        day_start = datetime(start_time.year, start_time.month, start_time.day)
+        appointments = self.appointment_repository.get_by_provider_id(
+            provider_id, day_start, day_start + timedelta(days=1))
+        buffer = timedelta(minutes=self.buffer_between_appointments)
+        for appointment in appointments:
+            if appointment.status in INACTIVE:
+                continue
+            if appointment.start_time < end_time + buffer and appointment.end_time > start_time - buffer:
+                raise ValidationError("conflict")
+
+    def _check_daily_appointment_limit(self, provider_id, date):
+        day_start = datetime(date.year, date.month, date.day)
+        appointments = self.appointment_repository.get_by_provider_id(
+            provider_id, day_start, day_start + timedelta(days=1))
+        if sum(1 for a in appointments if a.status not in INACTIVE) >= self.max_appointments_per_day:
+            raise ValidationError("daily limit")
+
+
+def legacy_free_slots(service: AppointmentService, provider_id, start, end, duration) -> int:
+    """Free-slot search the previous way: one conflict check per candidate slot."""
+    found = 0
+    cursor = start
+    while cursor + timedelta(minutes=duration) <= end:
+        try:
+            service._check_for_conflicts(provider_id, cursor, cursor + timedelta(minutes=duration))
+            found += 1
+        except ValidationError:
+            pass
+        cursor += timedelta(minutes=duration)
+    return found
+
+
+def double_booked(repository: SlowAppointmentRepository, buffer_minutes: int) -> int:
+    """Count appointments that overlap another one for the same provider."""
+    buffer = timedelta(minutes=buffer_minutes)
+    overlaps = 0
+    for appointments in repository.by_provider.values():
+        ordered = sorted(appointments, key=lambda a: a.start_time)
+        for previous, current in zip(ordered, ordered[1:]):
+            if current.start_time < previous.end_time + buffer:
+                overlaps += 1
+    return overlaps
+
+
+def run(mode: str, args: argparse.Namespace) -> Dict[str, object]:
+    """Book concurrently for every provider and summarize."""
+    repository = SlowAppointmentRepository(args.latency_ms / 1000.0)
+    service_class = LegacyAppointmentService if mode == "legacy" else AppointmentService
+    service = service_class(repository, AlwaysFound(), AlwaysFound(), default_appointment_duration=30,
+                            max_appointments_per_day=args.max_per_day, buffer_between_appointments=10)
+    providers = [UUID(int=i + 1) for i in range(args.providers)]
+    rng = random.Random(args.seed)
+    requests = [
+        (provider, WEEK_START + timedelta(days=rng.randrange(5), hours=8, minutes=rng.randrange(0, 9 * 60, 15)))
+        for provider in providers for _ in range(args.bookings)
+    ]
+    rng.shuffle(requests)
+    latencies: List[float] = []
+    outcomes = {"booked": 0, "rejected": 0}
+    lock = threading.Lock()
+
+    def book(request):
+        provider, start = request
+        started = time.perf_counter()
+        try:
+            service.create_appointment(UUID(int=0), provider, start)
+            outcome = "booked"
+        except ValidationError:
+            outcome = "rejected"
+        elapsed = time.perf_counter() - started
+        with lock:
+            latencies.append(elapsed)
+            outcomes[outcome] += 1
+
+    queries_before = repository.queries
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.workers) as pool:
+        list(pool.map(book, requests))
+    elapsed = time.perf_counter() - started
+    booking_queries = repository.queries - queries_before
+
+    queries_before = repository.queries
+    slots_started = time.perf_counter()
+    week_end = WEEK_START + timedelta(days=5)
+    for provider in providers[:args.slot_providers]:
+        if mode == "legacy":
+            legacy_free_slots(service, provider, WEEK_START, week_end, 30)
+        else:
+            service.find_available_slots(provider, WEEK_START, week_end, 30)
+    slots_ms = (time.perf_counter() - slots_started) * 1000 / args.slot_providers
+
+    return {
+        "mode": mode,
+        "bookings_per_s": int(len(requests) / elapsed),
+        **summarize(latencies),
+        **outcomes,
+        "queries": booking_queries,
+        "double_booked": double_booked(repository, 10),
+        "slot_search_ms": slots_ms,
+        "slot_queries": repository.queries - queries_before,
+    }
+
+
+def main() -> None:
+    """Parse arguments and run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--providers", type=int, default=200, help="Providers booked concurrently")
+    parser.add_argument("--bookings", type=int, default=40, help="Booking attempts per provider")
+    parser.add_argument("--max-per-day", type=int, default=8, help="Provider daily appointment limit")
+    parser.add_argument("--workers", type=int, default=32, help="Concurrent booking threads")
+    parser.add_argument("--latency-ms", type=float, default=1.0, help="Simulated repository query latency")
+    parser.add_argument("--slot-providers", type=int, default=20, help="Providers searched for free slots")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rows = [run(mode, args) for mode in ("legacy", "indexed")]
+    print_table(f"Appointment booking: {args.providers} providers x {args.bookings} attempts, "
+                f"{args.workers} threads, {args.latency_ms} ms per query", rows)
+
+
+if __name__ == "__main__":
+    main()
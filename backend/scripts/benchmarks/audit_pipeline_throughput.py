@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+Audit logging benchmark: synchronous FileHandler vs. the asynchronous pipeline.
+
+Records PHI access events through AuditLogger.log_phi_access from several
+request threads with:
+  - sync: the FileHandler path (formatted and written on the calling thread)
+  - sync_fsync: the same, fsyncing every entry (the durable equivalent)
+  - pipeline: AuditPipeline (queued, batched and hash-chained on a writer
+    thread, fsynced on an interval)
+
+and reports entries/sec and the latency each call adds to the request thread.
+
+Usage:
+    python scripts/benchmarks/audit_pipeline_throughput.py --entries 20000 --threads 1,8
+"""
+
+import argparse
+import logging
+import os
+import tempfile
+import threading
+import time
+from typing import Dict, List
+
+from common import print_table, summarize  # noqa: E402  (sets sys.path)
+
+from app.config.settings import get_settings
+from app.infrastructure.security.audit import AuditLogger
+
+
+class FsyncFileHandler(logging.FileHandler):
+    """FileHandler that fsyncs after every record."""
+
+    def emit(self, record: logging.LogRecord) -> None:
+        super().emit(record)
+        self.flush()
+        os.fsync(self.stream.fileno())
+
+
+def _make_logger(mode: str, path: str) -> AuditLogger:
+    settings = get_settings()
+    settings.AUDIT_LOG_FILE = path
+    settings.AUDIT_ASYNC_ENABLED = mode == "pipeline"
+    settings.AUDIT_CONSOLE_ECHO = False
+    settings.EXTERNAL_AUDIT_ENABLED = False
+    audit_logger = AuditLogger(f"audit_bench_{mode}")
+
+    # Keep the console out of the measurement for every mode
+    for handler in list(audit_logger.logger.handlers):
+        if type(handler) is logging.StreamHandler:
+            audit_logger.logger.removeHandler(handler)
+    if mode == "sync_fsync":
+        for handler in list(audit_logger.logger.handlers):
+            if isinstance(handler, logging.FileHandler):
+                audit_logger.logger.removeHandler(handler)
+                handler.close()
+                durable = FsyncFileHandler(path)
+                durable.setFormatter(handler.formatter)
+                audit_logger.logger.addHandler(durable)
+    return audit_logger
+
+
+def run(mode: str, entries: int, threads: int) -> Dict[str, object]:
+    """Record ``entries`` events split across ``threads`` request threads."""
+    with tempfile.TemporaryDirectory() as directory:
+        audit_logger = _make_logger(mode, os.path.join(directory, "audit.log"))
+        per_thread = entries // threads
+        latencies: List[List[float]] = [[] for _ in range(threads)]
+
+        def worker(index: int) -> None:
+            samples = latencies[index]
+            for i in range(per_thread):
+                started = time.perf_counter()
+                audit_logger.log_phi_access(f"user-{index}", "view", "patient", f"patient-{i}",
+                                            details={"field": "diagnosis"})
+                samples.append(time.perf_counter() - started)
+
+        workers = [threading.Thread(target=worker, args=(i,)) for i in range(threads)]
+        started = time.perf_counter()
+        for thread in workers:
+            thread.start()
+        for thread in workers:
+            thread.join()
+        submitted = time.perf_counter() - started
+        audit_logger.flush(timeout=60)
+        durable = time.perf_counter() - started
+        audit_logger.close()
+        for handler in list(audit_logger.logger.handlers):
+            audit_logger.logger.removeHandler(handler)
+            handler.close()
+
+    stats = summarize([sample for samples in latencies for sample in samples])
+    total = per_thread * threads
+    return {
+        "mode": mode,
+        "threads": threads,
+        "entries": total,
+        "submit_per_s": int(total / submitted),
+        "durable_per_s": int(total / durable),
+        "call_p50_ms": stats["p50_ms"],
+        "call_p99_ms": stats["p99_ms"],
+    }
+
+
+def main() -> None:
+    """Parse arguments and run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--entries", type=int, default=20000, help="Audit entries per run")
+    parser.add_argument("--threads", default="1,8", help="Comma-separated request thread counts")
+    parser.add_argument("--modes", default="sync,sync_fsync,pipeline", help="Comma-separated modes")
+    args = parser.parse_args()
+
+    rows = [
+        run(mode, args.entries, int(threads))
+        for threads in args.threads.split(",")
+        for mode in args.modes.split(",")
+    ]
+    print_table("Audit logging throughput", rows)
+
+
+if __name__ == "__main__":
+    main()
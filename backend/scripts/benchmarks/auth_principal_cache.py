@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+Authentication middleware benchmark: per-request verification vs. principal cache.
+
+Drives AuthenticationMiddleware.dispatch directly (no HTTP stack) with real
+HS256 tokens from JWTService and a user lookup that sleeps for a simulated
+database round-trip, with:
+  - uncached: verify the signature and look up the user on every request
+  - cached: PrincipalCache in front of both
+
+Requests cycle through a pool of distinct tokens, so the cached run includes
+one miss per token.
+
+Usage:
+    python scripts/benchmarks/auth_principal_cache.py --requests 5000 --tokens 100 --db-latency-ms 1.0
+"""
+
+import argparse
+import asyncio
+import time
+from types import SimpleNamespace
+from typing import Dict, List, Optional
+from uuid import uuid4
+
+from common import print_table, summarize  # noqa: E402  (sets sys.path)
+
+from starlette.requests import Request
+from starlette.responses import Response
+
+from app.config.settings import get_settings
+from app.infrastructure.security.auth.principal_cache import PrincipalCache
+from app.infrastructure.security.jwt.jwt_service import JWTService
+from app.presentation.middleware.authentication_middleware import AuthenticationMiddleware
+
+
+class SimulatedUserLookup:
+    """Stands in for AuthenticationService.get_user_by_id with a fixed DB latency."""
+
+    def __init__(self, latency_seconds: float):
+        self.latency_seconds = latency_seconds
+        self.calls = 0
+
+    async def get_user_by_id(self, user_id: str):
+        self.calls += 1
+        if self.latency_seconds:
+            await asyncio.sleep(self.latency_seconds)
+        return SimpleNamespace(id=user_id, is_active=True, roles=["clinician"])
+
+
+def _request(token: str) -> Request:
+    return Request({
+        "type": "http",
+        "method": "GET",
+        "path": "/api/v1/patients",
+        "headers": [(b"authorization", f"Bearer {token}".encode())],
+        "query_string": b"",
+    })
+
+
+async def _call_next(request: Request) -> Response:
+    return Response(status_code=200)
+
+
+async def run(mode: str, requests: int, tokens: List[str], latency: float) -> Dict[str, object]:
+    """Dispatch ``requests`` authenticated requests through the middleware."""
+    cache: Optional[PrincipalCache] = PrincipalCache() if mode == "cached" else None
+    lookup = SimulatedUserLookup(latency)
+    middleware = AuthenticationMiddleware(
+        app=None,
+        auth_service=lookup,
+        jwt_service=JWTService(settings=get_settings()),
+        principal_cache=cache,
+    )
+    if cache is None:
+        middleware.principal_cache = None
+
+    samples = []
+    for i in range(requests):
+        request = _request(tokens[i % len(tokens)])
+        started = time.perf_counter()
+        response = await middleware.dispatch(request, _call_next)
+        samples.append(time.perf_counter() - started)
+        assert response.status_code == 200, response.body
+
+    row: Dict[str, object] = {"mode": mode, "requests": requests, "tokens": len(tokens), "db_lookups": lookup.calls}
+    row.update(summarize(samples))
+    row["hit_ratio"] = cache.stats()["hit_ratio"] if cache is not None else "-"
+    return row
+
+
+async def main_async(args: argparse.Namespace) -> None:
+    settings = get_settings()
+    settings.TESTING = False
+    jwt_service = JWTService(settings=settings)
+    tokens = [await jwt_service.create_access_token(subject=str(uuid4())) for _ in range(args.tokens)]
+    latency = args.db_latency_ms / 1000.0
+    rows = [await run(mode, args.requests, tokens, latency) for mode in ("uncached", "cached")]
+    print_table("AuthenticationMiddleware overhead per request", rows)
+
+
+def main() -> None:
+    """Parse arguments and run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=5000, help="Requests per mode")
+    parser.add_argument("--tokens", type=int, default=100, help="Distinct tokens (users) in rotation")
+    parser.add_argument("--db-latency-ms", type=float, default=1.0, help="Simulated user lookup latency")
+    args = parser.parse_args()
+    asyncio.run(main_async(args))
+
+
+if __name__ == "__main__":
+    main()
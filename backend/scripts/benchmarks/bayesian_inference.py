@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+Bayesian belief network benchmark: full recompilation vs. cached junction tree.
+
+Builds a random BayesianBeliefNetwork and times, per belief-state query:
+  - recompile: a fresh network per query (compile + calibrate every time)
+  - calibrate: cached junction tree, evidence changed so it fully recalibrates
+  - incremental: cached calibration, one observation added per query
+  - batch: get_belief_states over many patients' evidence (reported per patient)
+
+Usage:
+    python scripts/benchmarks/bayesian_inference.py --variables 30 --max-parents 3 --patients 500
+"""
+
+import argparse
+import copy
+import random
+import time
+from typing import Callable, Dict, List
+from uuid import uuid4
+
+from common import print_table, summarize  # noqa: E402  (sets sys.path)
+
+from app.domain.entities.knowledge_graph import BayesianBeliefNetwork
+from app.infrastructure.ml.bayesian import JunctionTreeInference
+
+
+def build_network(variables: int, max_parents: int, states: int, rng: random.Random) -> BayesianBeliefNetwork:
+    """Random DAG with fully specified random CPTs."""
+    network = BayesianBeliefNetwork(patient_id=uuid4(), inference=JunctionTreeInference())
+    names = [f"v{i}" for i in range(variables)]
+    for name in names:
+        network.add_variable(name, [f"s{k}" for k in range(states)])
+    for i, name in enumerate(names[1:], 1):
+        # Parents drawn from a recent window keep the treewidth realistic
+        window = names[max(0, i - 6):i]
+        for parent in rng.sample(window, min(len(window), rng.randint(1, max_parents))):
+            network.add_dependency(name, parent)
+    for name in names:
+        parents = network.variables[name]["parents"]
+        configs = [{}]
+        for parent in parents:
+            configs = [{**c, parent: s} for c in configs for s in network.variables[parent]["states"]]
+        for config in configs:
+            weights = [rng.random() + 0.05 for _ in range(states)]
+            network.set_conditional_probability(
+                name, config, {f"s{k}": w / sum(weights) for k, w in enumerate(weights)})
+    return network
+
+
+def random_evidence(network: BayesianBeliefNetwork, count: int, rng: random.Random) -> Dict[str, str]:
+    """Observe ``count`` random variables."""
+    return {name: rng.choice(network.variables[name]["states"])
+            for name in rng.sample(list(network.variables), count)}
+
+
+def time_each(fn: Callable[[int], object], calls: int) -> List[float]:
+    """Elapsed seconds of fn(i) for each call."""
+    samples = []
+    for i in range(calls):
+        started = time.perf_counter()
+        fn(i)
+        samples.append(time.perf_counter() - started)
+    return samples
+
+
+def main() -> None:
+    """Parse arguments and run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--variables", type=int, default=30, help="Variables in the network")
+    parser.add_argument("--max-parents", type=int, default=3, help="Maximum parents per variable")
+    parser.add_argument("--states", type=int, default=3, help="States per variable")
+    parser.add_argument("--patients", type=int, default=500, help="Evidence sets in the batch run")
+    parser.add_argument("--queries", type=int, default=20, help="Queries timed per mode")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    network = build_network(args.variables, args.max_parents, args.states, rng)
+    evidence = [random_evidence(network, 3, rng) for _ in range(max(args.queries, args.patients))]
+    order = rng.sample(list(network.variables), args.queries)
+
+    def recompile(i):
+        fresh = copy.deepcopy(network)
+        fresh.inference = JunctionTreeInference()
+        fresh.update_beliefs(evidence[i])
+        return fresh.get_belief_state()
+
+    def calibrate(i):
+        network.evidence = dict(evidence[i])
+        return network.get_belief_state()
+
+    def incremental(i):
+        network.update_beliefs({order[i]: network.variables[order[i]]["states"][0]})
+        return network.get_belief_state()
+
+    network.get_belief_state()
+    rows: List[Dict[str, object]] = [
+        {"mode": "recompile", "patients": 1, **summarize(time_each(recompile, args.queries))},
+        {"mode": "calibrate", "patients": 1, **summarize(time_each(calibrate, args.queries))},
+    ]
+    network.evidence = {}
+    network.get_belief_state()
+    rows.append({"mode": "incremental", "patients": 1, **summarize(time_each(incremental, args.queries))})
+
+    batch = evidence[:args.patients]
+    samples = time_each(lambda _: network.get_belief_states(batch), 3)
+    rows.append({"mode": "batch", "patients": args.patients,
+                 **summarize([s / args.patients for s in samples])})
+
+    print_table(f"Belief states: {args.variables} variables x {args.states} states, "
+                f"up to {args.max_parents} parents (times per patient)", rows)
+
+
+if __name__ == "__main__":
+    main()
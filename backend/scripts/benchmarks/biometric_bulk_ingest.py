@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+"""
+Biometric data point ingestion benchmark: per-row ORM saves vs. bulk insert.
+
+Ingests a twin's history in fixed-size batches into a SQLite file with:
+  - the previous save path (read every stored data_id for the twin, then
+    session.add one ORM object per new point)
+  - insert_ignore_conflicts (executemany INSERT ... ON CONFLICT DO NOTHING)
+
+then times a one-day range scan over the (twin_id, data_type, timestamp)
+index reading the native numeric column.
+
+Requires: sqlalchemy
+
+Usage:
+    python scripts/benchmarks/biometric_bulk_ingest.py --points 10000,100000,1000000 --batch 1000
+"""
+
+import argparse
+import os
+import tempfile
+import time
+from datetime import datetime, timedelta
+from typing import Any, Dict, List
+
+from common import print_table  # noqa: E402  (sets sys.path)
+
+from sqlalchemy import create_engine, event, select
+from sqlalchemy.orm import Session
+
+from app.infrastructure.persistence.sqlalchemy.bulk import insert_ignore_conflicts
+from app.infrastructure.persistence.sqlalchemy.models.biometric_twin_model import BiometricDataPointModel
+
+TABLE = BiometricDataPointModel.__table__
+START = datetime(2025, 1, 1)
+TWIN_ID = "twin-bench"
+DATA_TYPES = ("heart_rate", "hrv", "steps")
+
+
+def _rows(start: int, count: int) -> List[Dict[str, Any]]:
+    rows = []
+    for i in range(start, start + count):
+        value = 60.0 + (i % 40)
+        rows.append({
+            "data_id": f"dp-{i:08d}",
+            "twin_id": TWIN_ID,
+            "data_type": DATA_TYPES[i % len(DATA_TYPES)],
+            "value": str(value),
+            "value_type": "number",
+            "value_numeric": value,
+            "timestamp": START + timedelta(seconds=20 * i),
+            "source": "apple_watch",
+            "metadata": None,
+            "confidence": 1.0,
+        })
+    return rows
+
+
+def _engine(path: str):
+    """SQLite engine in WAL mode so commit fsyncs do not dominate both paths."""
+    engine = create_engine(f"sqlite:///{path}")
+
+    @event.listens_for(engine, "connect")
+    def _pragmas(connection, _record):
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.execute("PRAGMA synchronous=NORMAL")
+
+    return engine
+
+
+def legacy_save(session: Session, rows: List[Dict[str, Any]]) -> None:
+    """The previous save path: pre-read the twin's ids, then add row by row."""
+    existing = {data_id for data_id, in session.query(BiometricDataPointModel.data_id).filter(
+        BiometricDataPointModel.twin_id == TWIN_ID
+    ).all()}
+    for row in rows:
+        if row["data_id"] not in existing:
+            fields = {key: value for key, value in row.items() if key != "metadata"}
+            session.add(BiometricDataPointModel(data_metadata=row["metadata"], **fields))
+
+
+def bulk_save(session: Session, rows: List[Dict[str, Any]]) -> None:
+    """The bulk path: executemany with conflicts skipped by the database."""
+    insert_ignore_conflicts(session, TABLE, rows, key_column="data_id")
+
+
+def ingest(path: str, points: int, batch: int, save) -> float:
+    """Ingest ``points`` rows in batches, committing after each batch."""
+    engine = _engine(path)
+    TABLE.create(engine)
+    started = time.perf_counter()
+    with Session(engine) as session:
+        for start in range(0, points, batch):
+            save(session, _rows(start, min(batch, points - start)))
+            session.commit()
+    elapsed = time.perf_counter() - started
+    engine.dispose()
+    return elapsed
+
+
+def range_scan(path: str) -> float:
+    """Time reading one day of heart-rate values for the twin."""
+    engine = _engine(path)
+    query = select(TABLE.c.timestamp, TABLE.c.value_numeric).where(
+        TABLE.c.twin_id == TWIN_ID,
+        TABLE.c.data_type == "heart_rate",
+        TABLE.c.timestamp >= START + timedelta(days=1),
+        TABLE.c.timestamp < START + timedelta(days=2),
+    ).order_by(TABLE.c.timestamp)
+    with Session(engine) as session:
+        started = time.perf_counter()
+        session.execute(query).all()
+        elapsed = time.perf_counter() - started
+    engine.dispose()
+    return elapsed
+
+
+def run(points: int, batch: int, max_legacy_points: int) -> Dict[str, object]:
+    """Benchmark both save paths for one history size."""
+    row: Dict[str, object] = {"points": points, "batch": batch}
+    with tempfile.TemporaryDirectory() as directory:
+        if points <= max_legacy_points:
+            row["legacy_s"] = ingest(os.path.join(directory, "legacy.db"), points, batch, legacy_save)
+        else:
+            row["legacy_s"] = "skipped"
+        bulk_path = os.path.join(directory, "bulk.db")
+        row["bulk_s"] = ingest(bulk_path, points, batch, bulk_save)
+        row["bulk_rows_per_s"] = int(points / row["bulk_s"])
+        row["day_scan_ms"] = range_scan(bulk_path) * 1000
+    return row
+
+
+def main() -> None:
+    """Parse arguments and run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--points", default="10000,100000,1000000", help="Comma-separated points per twin")
+    parser.add_argument("--batch", type=int, default=1000, help="Points per save")
+    parser.add_argument("--max-legacy-points", type=int, default=100_000,
+                        help="Skip the legacy path above this history size")
+    args = parser.parse_args()
+
+    rows = [run(int(p), args.batch, args.max_legacy_points) for p in args.points.split(",")]
+    print_table("Biometric data point ingestion (SQLite)", rows)
+
+
+if __name__ == "__main__":
+    main()
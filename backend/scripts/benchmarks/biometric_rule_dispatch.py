@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""
+Biometric alert rule dispatch benchmark: linear rule scan vs. compiled rule index.
+
+Evaluates wearable samples against a mix of patient-specific and global
+threshold rules (plus a share of context-dependent rules) with:
+  - linear: the previous dispatch (every rule, AlertRule.evaluate per sample)
+  - indexed: process_data_point over the (patient, data type) rule index
+  - batch: process_data_points over the same index
+
+The linear path is timed on a prefix of the samples and reported as a rate.
+
+Usage:
+    python scripts/benchmarks/biometric_rule_dispatch.py --rules 10000 --samples 100000
+"""
+
+import argparse
+import random
+import time
+from datetime import datetime, timedelta
+from typing import Dict, List
+from uuid import UUID
+
+from common import print_table  # noqa: E402  (sets sys.path)
+
+from app.domain.entities.biometric_twin import BiometricDataPoint
+from app.domain.services.biometric_event_processor import AlertPriority, AlertRule, BiometricEventProcessor
+
+CLINICIAN_ID = UUID(int=1)
+DATA_TYPES = ("heart_rate", "hrv", "respiratory_rate", "temperature")
+OPERATORS = (">", ">=", "<", "<=")
+
+
+def build_rules(count: int, patients: List[UUID], global_share: float, rng: random.Random) -> List[AlertRule]:
+    """Threshold rules far enough out that only rare spikes alert."""
+    rules = []
+    for i in range(count):
+        operator_name = rng.choice(OPERATORS)
+        threshold = rng.uniform(140, 200) if operator_name.startswith(">") else rng.uniform(0, 20)
+        condition = {"data_type": rng.choice(DATA_TYPES), "operator": operator_name, "threshold": threshold}
+        if i % 50 == 0:
+            condition.update({"context_operator": ">", "context_threshold": 60.0})
+        patient_id = None if rng.random() < global_share else rng.choice(patients)
+        rules.append(AlertRule(f"rule-{i}", f"Rule {i}", "", AlertPriority.WARNING, condition,
+                               CLINICIAN_ID, patient_id))
+    return rules
+
+
+def build_samples(count: int, patients: List[UUID], rng: random.Random) -> List[BiometricDataPoint]:
+    """Mostly in-range values with rare spikes."""
+    start = datetime(2025, 3, 1)
+    samples = []
+    for i in range(count):
+        value = rng.uniform(30, 120) if rng.random() > 0.002 else rng.uniform(150, 220)
+        samples.append(BiometricDataPoint(
+            data_id=f"dp-{i}", patient_id=rng.choice(patients), data_type=rng.choice(DATA_TYPES),
+            value=value, timestamp=start + timedelta(seconds=i), source="apple_watch",
+        ))
+    return samples
+
+
+def linear_dispatch(processor: BiometricEventProcessor, data_point: BiometricDataPoint) -> int:
+    """The previous process_data_point loop: every rule is evaluated."""
+    context = processor._update_context(data_point)
+    fired = 0
+    for rule in processor.rules.values():
+        if rule.patient_id and rule.patient_id != data_point.patient_id:
+            continue
+        if rule.is_active and rule.evaluate(data_point, context):
+            fired += 1
+    return fired
+
+
+def main() -> None:
+    """Parse arguments and run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rules", type=int, default=10000, help="Alert rules")
+    parser.add_argument("--samples", type=int, default=100000, help="Data points")
+    parser.add_argument("--patients", type=int, default=500, help="Distinct patients")
+    parser.add_argument("--global-share", type=float, default=0.05, help="Fraction of rules without a patient")
+    parser.add_argument("--linear-samples", type=int, default=1000, help="Samples timed on the linear path")
+    parser.add_argument("--batch-size", type=int, default=10000, help="Samples per process_data_points call")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    patients = [UUID(int=i + 100) for i in range(args.patients)]
+    rules = build_rules(args.rules, patients, args.global_share, rng)
+    samples = build_samples(args.samples, patients, rng)
+    processor = BiometricEventProcessor()
+    started = time.perf_counter()
+    for rule in rules:
+        processor.add_rule(rule)
+    index_ms = (time.perf_counter() - started) * 1000
+
+    rows: List[Dict[str, object]] = []
+
+    linear = samples[:args.linear_samples]
+    started = time.perf_counter()
+    for point in linear:
+        linear_dispatch(processor, point)
+    elapsed = time.perf_counter() - started
+    rows.append({"mode": "linear", "samples": len(linear), "seconds": elapsed,
+                 "samples_per_s": int(len(linear) / elapsed), "alerts": "-"})
+
+    started = time.perf_counter()
+    alerts = sum(len(processor.process_data_point(point)) for point in samples)
+    elapsed = time.perf_counter() - started
+    rows.append({"mode": "indexed", "samples": len(samples), "seconds": elapsed,
+                 "samples_per_s": int(len(samples) / elapsed), "alerts": alerts})
+
+    processor.patient_context.clear()
+    started = time.perf_counter()
+    alerts = sum(
+        len(processor.process_data_points(samples[i:i + args.batch_size]))
+        for i in range(0, len(samples), args.batch_size)
+    )
+    elapsed = time.perf_counter() - started
+    rows.append({"mode": "batch", "samples": len(samples), "seconds": elapsed,
+                 "samples_per_s": int(len(samples) / elapsed), "alerts": alerts})
+
+    print_table(f"Rule dispatch: {args.rules} rules, {args.patients} patients (index built in {index_ms:.0f} ms)",
+                rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+"""
+Batching and serializer benchmark for RedisCache (fakeredis).
+
+Part 1 stores an analytics job result plus its status key the way the
+background tasks do - two separate awaits vs. one set_many - and reports
+round-trips and latency with a simulated network round-trip time.
+
+Part 2 encodes/decodes a large analytics payload with every available
+serializer and reports payload size and per-operation time.
+
+Requires: fakeredis (orjson and msgpack are measured when installed)
+
+Usage:
+    python scripts/benchmarks/cache_batch_serializers.py --jobs 500 --rtt-ms 0.3 --rows 2000
+"""
+
+import argparse
+import asyncio
+import time
+from typing import Dict, List
+
+from common import print_table, summarize  # noqa: E402  (sets sys.path)
+
+import fakeredis
+
+from app.infrastructure.cache.redis_cache import RedisCache
+from app.infrastructure.cache.serializers import SERIALIZERS
+
+
+class LatencyFakeRedis(fakeredis.FakeAsyncRedis):
+    """fakeredis client that counts round-trips and simulates network latency."""
+
+    def __init__(self, rtt_seconds: float, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.rtt_seconds = rtt_seconds
+        self.round_trips = 0
+
+    async def execute_command(self, *args, **options):
+        self.round_trips += 1
+        if self.rtt_seconds:
+            await asyncio.sleep(self.rtt_seconds)
+        return await super().execute_command(*args, **options)
+
+    def pipeline(self, *args, **kwargs):
+        pipe = super().pipeline(*args, **kwargs)
+        execute = pipe.execute
+
+        async def timed_execute(*execute_args, **execute_kwargs):
+            self.round_trips += 1
+            if self.rtt_seconds:
+                await asyncio.sleep(self.rtt_seconds)
+            return await execute(*execute_args, **execute_kwargs)
+
+        pipe.execute = timed_execute
+        return pipe
+
+
+def _payload(rows: int) -> Dict[str, object]:
+    """Build a representative practice-metrics result."""
+    return {
+        "summary": {"patients": rows, "visits": rows * 4, "no_show_rate": 0.071},
+        "series": [
+            {"day": f"2025-01-{1 + d % 28:02d}", "visits": d * 3, "avg_phq9": 9.5 + d % 7 * 0.25}
+            for d in range(rows)
+        ],
+    }
+
+
+async def run_writes(batched: bool, jobs: int, rtt: float, payload: Dict[str, object]) -> Dict[str, object]:
+    """Store result + status for each job and collect statistics."""
+    client = LatencyFakeRedis(rtt, decode_responses=True)
+    cache = RedisCache(redis_url="redis://fake:6379/0")
+    cache._client = client
+    latencies: List[float] = []
+
+    for job in range(jobs):
+        key = f"practice_metrics:{job}"
+        started = time.perf_counter()
+        if batched:
+            await cache.set_many(
+                {key: payload, f"status:{key}": {"status": "completed", "data": payload}},
+                expirations={key: 900, f"status:{key}": 1500},
+            )
+        else:
+            await cache.set(key, payload, expiration=900)
+            await cache.set(f"status:{key}", {"status": "completed", "data": payload}, expiration=1500)
+        latencies.append(time.perf_counter() - started)
+
+    stats = summarize(latencies)
+    await client.aclose()
+    return {
+        "impl": "set_many" if batched else "two set() awaits",
+        "jobs": jobs,
+        "round_trips_per_job": client.round_trips / jobs,
+        "mean_ms": stats["mean_ms"],
+        "p99_ms": stats["p99_ms"],
+    }
+
+
+def run_serializers(payload: Dict[str, object], repeat: int) -> List[Dict[str, object]]:
+    """Measure encoded size and encode/decode time per serializer."""
+    rows = []
+    for name, serializer_class in SERIALIZERS.items():
+        try:
+            serializer = serializer_class()
+        except ImportError:
+            continue
+        encoded = serializer.dumps(payload)
+        started = time.perf_counter()
+        for _ in range(repeat):
+            serializer.dumps(payload)
+        dumps_ms = (time.perf_counter() - started) * 1000.0 / repeat
+        started = time.perf_counter()
+        for _ in range(repeat):
+            serializer.loads(encoded)
+        loads_ms = (time.perf_counter() - started) * 1000.0 / repeat
+        rows.append({"serializer": name, "bytes": len(encoded), "dumps_ms": dumps_ms, "loads_ms": loads_ms})
+    return rows
+
+
+async def main_async(args: argparse.Namespace) -> None:
+    """Run all scenarios and print the results."""
+    rtt = args.rtt_ms / 1000.0
+    small = _payload(50)
+    print_table("Job result + status writes (fakeredis)", [
+        await run_writes(False, args.jobs, rtt, small),
+        await run_writes(True, args.jobs, rtt, small),
+    ])
+    print_table(f"Serializers ({args.rows}-row payload)", run_serializers(_payload(args.rows), args.repeat))
+
+
+def main() -> None:
+    """Parse arguments and run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--jobs", type=int, default=500, help="Background jobs to store")
+    parser.add_argument("--rtt-ms", type=float, default=0.3, help="Simulated round-trip time")
+    parser.add_argument("--rows", type=int, default=2000, help="Rows in the serializer payload")
+    parser.add_argument("--repeat", type=int, default=50, help="Serializer repetitions")
+    asyncio.run(main_async(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
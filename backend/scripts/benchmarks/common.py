@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+Shared helpers for the Novamind benchmark scripts.
+
+Each benchmark is a standalone script run from the backend directory; these
+helpers keep timing summaries and result tables consistent between them.
+"""
+
+import resource
+import statistics
+import sys
+from pathlib import Path
+from typing import Dict, List, Sequence
+
+# Make the application package importable when run as a script
+BACKEND_ROOT = Path(__file__).resolve().parents[2]
+if str(BACKEND_ROOT) not in sys.path:
+    sys.path.insert(0, str(BACKEND_ROOT))
+
+
+def percentile(samples: Sequence[float], pct: float) -> float:
+    """
+    Return the pct-th percentile of samples using nearest-rank.
+
+    Args:
+        samples: Measured values
+        pct: Percentile in the range [0, 100]
+
+    Returns:
+        The percentile value (0.0 for an empty sequence)
+    """
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    rank = max(0, min(len(ordered) - 1, int(round(pct / 100.0 * len(ordered) + 0.5)) - 1))
+    return ordered[rank]
+
+
+def summarize(samples_seconds: Sequence[float]) -> Dict[str, float]:
+    """
+    Summarize latency samples in milliseconds.
+
+    Args:
+        samples_seconds: Latency samples in seconds
+
+    Returns:
+        Dict with mean, p50, p99 and max in milliseconds
+    """
+    millis = [s * 1000.0 for s in samples_seconds]
+    return {
+        "mean_ms": statistics.fmean(millis) if millis else 0.0,
+        "p50_ms": percentile(millis, 50),
+        "p99_ms": percentile(millis, 99),
+        "max_ms": max(millis) if millis else 0.0,
+    }
+
+
+def peak_rss_mb() -> float:
+    """Return the peak resident set size of this process in MiB."""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is reported in KiB on Linux and bytes on macOS
+    divisor = 1024.0 * 1024.0 if sys.platform == "darwin" else 1024.0
+    return peak / divisor
+
+
+def print_table(title: str, rows: List[Dict[str, object]]) -> None:
+    """
+    Print benchmark rows as an aligned plain-text table.
+
+    Args:
+        title: Heading printed above the table
+        rows: Rows sharing the same keys
+    """
+    print(f"\n{title}")
+    if not rows:
+        print("  (no results)")
+        return
+    columns = list(rows[0].keys())
+
+    def fmt(value: object) -> str:
+        return f"{value:.3f}" if isinstance(value, float) else str(value)
+
+    widths = {c: max(len(c), *(len(fmt(r[c])) for r in rows)) for c in columns}
+    print("  " + "  ".join(c.ljust(widths[c]) for c in columns))
+    for row in rows:
+        print("  " + "  ".join(fmt(row[c]).ljust(widths[c]) for c in columns))
@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""
+Forecast load test: event-loop lag with inline vs. executor-offloaded inference.
+
+Fires concurrent forecast requests, each running a transformer-like and an
+xgboost-like model (numpy matrix work that, like torch and xgboost kernels,
+releases the GIL), while a heartbeat task measures how late the event loop
+wakes up:
+  - inline: the previous path, asyncio.gather over async predict methods
+    that never await, so the models run back to back on the loop
+  - executor: both models offloaded to InferenceExecutor family pools
+
+Usage:
+    python scripts/benchmarks/forecast_event_loop_lag.py --requests 200 --concurrency 16
+"""
+
+import argparse
+import asyncio
+import time
+from typing import Dict, List
+
+import numpy as np
+
+from common import percentile, print_table  # noqa: E402  (sets sys.path)
+
+from app.infrastructure.ml.inference_executor import (
+    TORCH_FAMILY,
+    XGBOOST_FAMILY,
+    FamilyPolicy,
+    InferenceExecutor,
+)
+
+
+class FakeModel:
+    """CPU-bound model: repeated matrix products standing in for a forward pass."""
+
+    def __init__(self, size: int, steps: int, seed: int):
+        rng = np.random.default_rng(seed)
+        self.weights = rng.normal(size=(size, size)) / np.sqrt(size)
+        self.steps = steps
+
+    def predict_sync(self, x: np.ndarray) -> np.ndarray:
+        for _ in range(self.steps):
+            x = np.tanh(x @ self.weights)
+        return x
+
+    async def predict(self, x: np.ndarray) -> np.ndarray:
+        # Same shape as the model classes: async, but never awaits
+        return self.predict_sync(x)
+
+
+async def heartbeat(stop: asyncio.Event, lags: List[float], interval: float = 0.01) -> None:
+    """Record how late each sleep(interval) wakes up until stop is set."""
+    loop = asyncio.get_running_loop()
+    while not stop.is_set():
+        started = loop.time()
+        await asyncio.sleep(interval)
+        lags.append(loop.time() - started - interval)
+
+
+async def run_load(mode: str, transformer: FakeModel, xgboost: FakeModel, x: np.ndarray,
+                   requests: int, concurrency: int, executor: InferenceExecutor) -> Dict[str, object]:
+    """Serve the requests at the given concurrency and summarize latency and loop lag."""
+    gate = asyncio.Semaphore(concurrency)
+    latencies: List[float] = []
+
+    async def forecast() -> None:
+        async with gate:
+            started = time.perf_counter()
+            if mode == "inline":
+                await asyncio.gather(transformer.predict(x), xgboost.predict(x))
+            else:
+                await asyncio.gather(
+                    executor.run(TORCH_FAMILY, transformer.predict_sync, x),
+                    executor.run(XGBOOST_FAMILY, xgboost.predict_sync, x),
+                )
+            latencies.append(time.perf_counter() - started)
+
+    stop = asyncio.Event()
+    lags: List[float] = []
+    monitor = asyncio.create_task(heartbeat(stop, lags))
+    started = time.perf_counter()
+    await asyncio.gather(*(forecast() for _ in range(requests)))
+    elapsed = time.perf_counter() - started
+    stop.set()
+    await monitor
+
+    lag_ms = [lag * 1000 for lag in lags] or [0.0]
+    return {
+        "mode": mode,
+        "requests_per_s": requests / elapsed,
+        "p50_ms": percentile([lat * 1000 for lat in latencies], 50),
+        "p99_ms": percentile([lat * 1000 for lat in latencies], 99),
+        "loop_lag_p50_ms": percentile(lag_ms, 50),
+        "loop_lag_p99_ms": percentile(lag_ms, 99),
+        "loop_lag_max_ms": max(lag_ms),
+    }
+
+
+def main() -> None:
+    """Parse arguments and run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=16, help="Requests in flight")
+    parser.add_argument("--size", type=int, default=256, help="Model width")
+    parser.add_argument("--steps", type=int, default=30, help="Matrix products per model call")
+    parser.add_argument("--workers", type=int, default=2, help="Workers per model family")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    transformer = FakeModel(args.size, args.steps, args.seed)
+    xgboost = FakeModel(args.size, max(1, args.steps // 3), args.seed + 1)
+    x = np.random.default_rng(args.seed).normal(size=(32, args.size))
+    queue = args.requests
+    executor = InferenceExecutor({
+        TORCH_FAMILY: FamilyPolicy(workers=args.workers, queue_size=queue, timeout_seconds=None),
+        XGBOOST_FAMILY: FamilyPolicy(workers=args.workers, queue_size=queue, timeout_seconds=None),
+    })
+
+    rows = [
+        asyncio.run(run_load(mode, transformer, xgboost, x, args.requests, args.concurrency, executor))
+        for mode in ("inline", "executor")
+    ]
+    executor.shutdown()
+
+    print_table(f"Forecast load: {args.requests} requests, {args.concurrency} in flight, "
+                f"{args.workers} workers per family", rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+Forecast micro-batching benchmark: one forward pass per request vs. batched.
+
+Concurrent callers each request a transformer forecast for one patient
+history (lengths vary around --history) with:
+  - single: every request runs its own predict_sync on the torch pool
+  - batched: requests go through a MicroBatcher that pads and buckets them
+    and runs predict_batch_sync once per batch
+
+Reports throughput, caller latency and mean batch size for each number of
+concurrent callers; --wait-ms trades latency for larger batches.
+
+Usage:
+    python scripts/benchmarks/forecast_micro_batching.py --callers 1,10,100 --wait-ms 5
+"""
+
+import argparse
+import asyncio
+import time
+from typing import Dict, List
+
+import numpy as np
+import torch
+
+from common import percentile, print_table  # noqa: E402  (sets sys.path)
+
+from app.infrastructure.ml.inference_executor import TORCH_FAMILY, FamilyPolicy, InferenceExecutor
+from app.infrastructure.ml.micro_batcher import MicroBatcher, length_bucket
+from app.infrastructure.ml.symptom_forecasting.transformer_model import SymptomTransformerModel
+
+
+async def run_callers(mode: str, model: SymptomTransformerModel, histories: List[np.ndarray], callers: int,
+                      horizon: int, args: argparse.Namespace) -> Dict[str, object]:
+    """Have callers issue requests back to back until every history is served."""
+    executor = InferenceExecutor({TORCH_FAMILY: FamilyPolicy(workers=args.workers, queue_size=len(histories),
+                                                             timeout_seconds=None)})
+
+    async def run_batch(key, items):
+        return await executor.run(TORCH_FAMILY, model.predict_batch_sync, [x for x, _ in items], key[0])
+
+    batcher = MicroBatcher(run_batch, max_batch_size=args.batch_size, max_wait_ms=args.wait_ms,
+                           bucket_key=lambda item: (item[1], length_bucket(item[0].shape[-2], args.bucket)))
+    queue = list(histories)
+    latencies: List[float] = []
+
+    async def caller() -> None:
+        while queue:
+            history = queue.pop()
+            started = time.perf_counter()
+            if mode == "single":
+                await executor.run(TORCH_FAMILY, model.predict_sync, history, horizon)
+            else:
+                await batcher.submit((history, horizon))
+            latencies.append(time.perf_counter() - started)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(caller() for _ in range(callers)))
+    elapsed = time.perf_counter() - started
+    executor.shutdown()
+
+    millis = [lat * 1000 for lat in latencies]
+    return {
+        "callers": callers,
+        "mode": mode,
+        "requests_per_s": len(histories) / elapsed,
+        "p50_ms": percentile(millis, 50),
+        "p99_ms": percentile(millis, 99),
+        "mean_batch": batcher.stats()["mean_batch_size"] if mode == "batched" else 1.0,
+    }
+
+
+def main() -> None:
+    """Parse arguments and run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--callers", default="1,10,100", help="Comma-separated concurrent caller counts")
+    parser.add_argument("--requests", type=int, default=200, help="Requests per run")
+    parser.add_argument("--history", type=int, default=60, help="Mean days of history per request")
+    parser.add_argument("--horizon", type=int, default=14)
+    parser.add_argument("--features", type=int, default=10)
+    parser.add_argument("--batch-size", type=int, default=32)
+    parser.add_argument("--wait-ms", type=float, default=5.0)
+    parser.add_argument("--bucket", type=int, default=16, help="History length bucket width")
+    parser.add_argument("--workers", type=int, default=2, help="Torch pool workers")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    torch.manual_seed(args.seed)
+    rng = np.random.default_rng(args.seed)
+    model = SymptomTransformerModel(input_dim=args.features, output_dim=args.features, device="cpu")
+    lengths = rng.integers(max(5, args.history // 2), args.history * 3 // 2 + 1, args.requests)
+    histories = [rng.normal(size=(1, n, args.features)).astype(np.float32) for n in lengths]
+
+    rows: List[Dict[str, object]] = []
+    for callers in (int(c) for c in args.callers.split(",")):
+        for mode in ("single", "batched"):
+            rows.append(asyncio.run(run_callers(mode, model, histories, callers, args.horizon, args)))
+
+    print_table(f"Transformer forecasts: {args.requests} requests, horizon {args.horizon}, "
+                f"wait {args.wait_ms} ms, batch <= {args.batch_size}", rows)
+
+
+if __name__ == "__main__":
+    main()
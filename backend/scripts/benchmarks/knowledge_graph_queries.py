@@ -0,0 +1,185 @@
+#!/usr/bin/env python3
+"""
+Knowledge graph query benchmark: full scans vs. maintained indexes.
+
+Builds a TemporalKnowledgeGraph and times, per query:
+  - neighbors: two scans over every edge vs. the adjacency index
+  - by_type: scanning every node vs. the type bucket
+  - subgraph: filtering every node and edge vs. a bisect range on created_at
+  - patterns: DFS from every edge plus one edge scan per diagnosis vs.
+    memoized chains and one grouped pass (on a layered causal graph)
+
+Usage:
+    python scripts/benchmarks/knowledge_graph_queries.py --nodes 20000 --edges 60000
+"""
+
+import argparse
+import random
+import time
+from datetime import datetime, timedelta
+from typing import Callable, Dict, List
+from uuid import uuid4
+
+from common import print_table  # noqa: E402  (sets sys.path)
+
+from app.domain.entities.knowledge_graph import (
+    EdgeType,
+    KnowledgeGraphEdge,
+    KnowledgeGraphNode,
+    NodeType,
+    TemporalKnowledgeGraph,
+)
+
+START = datetime(2025, 1, 1)
+
+
+def build_graph(nodes: int, edges: int, rng: random.Random) -> TemporalKnowledgeGraph:
+    """Random graph with creation times spread over a year."""
+    graph = TemporalKnowledgeGraph(patient_id=uuid4())
+    members = []
+    for i in range(nodes):
+        node = KnowledgeGraphNode.create(f"n{i}", rng.choice(list(NodeType)))
+        node.created_at = START + timedelta(minutes=rng.randrange(525600))
+        graph.add_node(node)
+        members.append(node)
+    for _ in range(edges):
+        source, target = rng.sample(members, 2)
+        edge = KnowledgeGraphEdge.create(source.id, target.id, rng.choice(list(EdgeType)))
+        edge.created_at = START + timedelta(minutes=rng.randrange(525600))
+        graph.add_edge(edge)
+    return graph
+
+
+def build_layered_graph(layers: int, width: int, fan_out: int, rng: random.Random) -> TemporalKnowledgeGraph:
+    """Layered causal DAG (dense enough that chains share long continuations)."""
+    graph = TemporalKnowledgeGraph(patient_id=uuid4())
+    grid = [[KnowledgeGraphNode.create(f"l{layer}n{i}", NodeType.BEHAVIOR) for i in range(width)]
+            for layer in range(layers)]
+    for row in grid:
+        for node in row:
+            graph.add_node(node)
+    for layer in range(layers - 1):
+        for node in grid[layer]:
+            for target in rng.sample(grid[layer + 1], fan_out):
+                graph.add_edge(KnowledgeGraphEdge.create(node.id, target.id, EdgeType.CAUSES))
+    diagnoses = [KnowledgeGraphNode.create(f"d{i}", NodeType.DIAGNOSIS) for i in range(width)]
+    for diagnosis in diagnoses:
+        graph.add_node(diagnosis)
+        for symptom in rng.sample(grid[0], 3):
+            graph.add_edge(KnowledgeGraphEdge.create(symptom.id, diagnosis.id, EdgeType.HAS_SYMPTOM))
+    return graph
+
+
+def scan_neighbors(graph: TemporalKnowledgeGraph, node_id) -> Dict:
+    """The previous get_node_neighbors: two passes over every edge."""
+    neighbors = {}
+    for edge in graph.edges.values():
+        if edge.source_id == node_id:
+            neighbors.setdefault(edge.edge_type, []).append(graph.nodes[edge.target_id])
+    for edge in graph.edges.values():
+        if edge.target_id == node_id:
+            neighbors.setdefault(f"reverse_{edge.edge_type.value}", []).append(graph.nodes[edge.source_id])
+    return neighbors
+
+
+def scan_subgraph(graph: TemporalKnowledgeGraph, start: datetime, end: datetime) -> int:
+    """The previous get_temporal_subgraph filter (counts instead of copying)."""
+    nodes = {i for i, n in graph.nodes.items() if start <= n.created_at <= end}
+    return len(nodes) + sum(1 for e in graph.edges.values()
+                            if start <= e.created_at <= end and e.source_id in nodes and e.target_id in nodes)
+
+
+def scan_patterns(graph: TemporalKnowledgeGraph) -> List[Dict]:
+    """The previous extract_patterns: DFS from every edge, one edge scan per diagnosis."""
+    patterns = []
+    for pattern_type, edge_type in (("causal_chain", EdgeType.CAUSES), ("temporal_sequence", EdgeType.PRECEDES)):
+        edges = [e for e in graph.edges.values() if e.edge_type == edge_type]
+        adjacency = {}
+        for edge in edges:
+            adjacency.setdefault(edge.source_id, []).append(edge)
+        chains = []
+
+        def dfs(edge, chain):
+            chain.append(edge)
+            if edge.target_id not in adjacency:
+                if len(chain) >= 2:
+                    chains.append(chain.copy())
+            else:
+                for next_edge in adjacency[edge.target_id]:
+                    dfs(next_edge, chain)
+            chain.pop()
+
+        for edge in edges:
+            dfs(edge, [])
+        for chain in chains:
+            patterns.append({
+                "type": pattern_type,
+                "nodes": [graph.nodes[e.source_id].label for e in chain] + [graph.nodes[chain[-1].target_id].label],
+                "confidence": min(e.confidence for e in chain),
+            })
+    for node in [n for n in graph.nodes.values() if n.node_type == NodeType.DIAGNOSIS]:
+        symptom_edges = [e for e in graph.edges.values()
+                         if e.target_id == node.id and e.edge_type == EdgeType.HAS_SYMPTOM]
+        if len(symptom_edges) >= 3:
+            patterns.append({
+                "type": "symptom_cluster",
+                "diagnosis": node.label,
+                "symptoms": [graph.nodes[e.source_id].label for e in symptom_edges],
+                "confidence": min(e.confidence for e in symptom_edges),
+            })
+    return patterns
+
+
+def per_call_ms(fn: Callable[[], object], calls: int) -> float:
+    """Mean milliseconds per call."""
+    started = time.perf_counter()
+    for _ in range(calls):
+        fn()
+    return (time.perf_counter() - started) * 1000 / calls
+
+
+def main() -> None:
+    """Parse arguments and run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--nodes", type=int, default=20000, help="Nodes in the random graph")
+    parser.add_argument("--edges", type=int, default=60000, help="Edges in the random graph")
+    parser.add_argument("--queries", type=int, default=50, help="Calls timed per query")
+    parser.add_argument("--layers", type=int, default=8, help="Layers in the causal graph")
+    parser.add_argument("--width", type=int, default=40, help="Nodes per causal layer")
+    parser.add_argument("--fan-out", type=int, default=3, help="Causal edges per node")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    graph = build_graph(args.nodes, args.edges, rng)
+    node_ids = rng.sample(list(graph.nodes), args.queries)
+    ids = iter(node_ids * 2)
+    start, end = START + timedelta(days=100), START + timedelta(days=107)
+    causal = build_layered_graph(args.layers, args.width, args.fan_out, rng)
+
+    rows: List[Dict[str, object]] = []
+    queries = {
+        "neighbors": (lambda: scan_neighbors(graph, next(ids)), lambda: graph.get_node_neighbors(next(ids))),
+        "by_type": (lambda: [n for n in graph.nodes.values() if n.node_type == NodeType.SYMPTOM],
+                    lambda: graph.get_nodes_by_type(NodeType.SYMPTOM)),
+        "subgraph": (lambda: scan_subgraph(graph, start, end), lambda: graph.get_temporal_subgraph(start, end)),
+    }
+    for name, (scan, indexed) in queries.items():
+        ids = iter(node_ids * 2)
+        scan_ms = per_call_ms(scan, args.queries)
+        ids = iter(node_ids * 2)
+        indexed_ms = per_call_ms(indexed, args.queries)
+        rows.append({"query": name, "scan_ms": scan_ms, "indexed_ms": indexed_ms,
+                     "speedup": f"{scan_ms / indexed_ms:.0f}x"})
+
+    scan_ms = per_call_ms(lambda: scan_patterns(causal), 1)
+    indexed_ms = per_call_ms(causal.extract_patterns, 1)
+    rows.append({"query": f"patterns ({len(causal.extract_patterns())})", "scan_ms": scan_ms,
+                 "indexed_ms": indexed_ms, "speedup": f"{scan_ms / indexed_ms:.0f}x"})
+
+    print_table(f"Knowledge graph: {args.nodes} nodes, {args.edges} edges; causal graph "
+                f"{args.layers}x{args.width}, fan-out {args.fan_out}", rows)
+
+
+if __name__ == "__main__":
+    main()
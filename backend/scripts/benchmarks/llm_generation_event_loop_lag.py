@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+"""
+Local LLM generation load test: inline model.generate vs. the generation worker.
+
+Fires concurrent generation requests at a small randomly initialised GPT-2
+(or a transformers model named with --model) while a heartbeat task measures
+how late the event loop wakes up:
+  - inline: the previous path, tokenizer and model.generate called directly
+    in the async method, so every generation blocks the loop until it is done
+  - worker: GenerationWorker, one thread decoding all in-flight prompts with
+    continuous batching and streaming tokens back
+
+Every request generates exactly --tokens tokens (greedy, EOS ignored).
+Reports throughput, request latency, time to first streamed chunk and loop
+lag.
+
+Usage:
+    python scripts/benchmarks/llm_generation_event_loop_lag.py --requests 32 --concurrency 8 --tokens 32
+"""
+
+import argparse
+import asyncio
+import time
+from typing import Any, Dict, List
+
+import torch
+
+from common import percentile, print_table  # noqa: E402  (sets sys.path)
+
+from app.infrastructure.ml.mentallama.generation_worker import CausalLMStepper, GenerationWorker, SamplingParams
+
+
+class ByteTokenizer:
+    """UTF-8 bytes as token ids, for the randomly initialised model."""
+
+    def encode(self, text: str) -> List[int]:
+        return list(text.encode("utf-8"))
+
+    def decode(self, ids: List[int], skip_special_tokens: bool = True) -> str:
+        return bytes(i % 256 for i in ids).decode("utf-8", errors="replace")
+
+
+def load_model(args: argparse.Namespace) -> Any:
+    """Return (model, tokenizer) for the benchmark."""
+    import transformers
+
+    if args.model:
+        tokenizer = transformers.AutoTokenizer.from_pretrained(args.model)
+        model = transformers.AutoModelForCausalLM.from_pretrained(args.model)
+        return model.eval(), tokenizer
+    config = transformers.GPT2Config(vocab_size=256, n_positions=512, n_embd=args.width,
+                                     n_layer=args.layers, n_head=max(1, args.width // 64),
+                                     bos_token_id=0, eos_token_id=0)
+    return transformers.GPT2LMHeadModel(config).eval(), ByteTokenizer()
+
+
+async def heartbeat(stop: asyncio.Event, lags: List[float], interval: float = 0.01) -> None:
+    """Record how late each sleep(interval) wakes up until stop is set."""
+    loop = asyncio.get_running_loop()
+    while not stop.is_set():
+        started = loop.time()
+        await asyncio.sleep(interval)
+        lags.append(loop.time() - started - interval)
+
+
+async def run_load(mode: str, model: Any, tokenizer: Any, prompts: List[str],
+                   args: argparse.Namespace) -> Dict[str, object]:
+    """Serve the prompts at the given concurrency and summarize latency and loop lag."""
+    gate = asyncio.Semaphore(args.concurrency)
+    worker = GenerationWorker(CausalLMStepper(model, pad_token_id=0), tokenizer,
+                              max_batch_size=args.concurrency, queue_size=len(prompts))
+    params = SamplingParams(max_new_tokens=args.tokens, temperature=0.0)
+    latencies: List[float] = []
+    first_chunks: List[float] = []
+
+    async def generate_inline(prompt: str) -> None:
+        # The previous _generate_text_local body: async, but never awaits
+        input_ids = torch.tensor([tokenizer.encode(prompt)])
+        with torch.no_grad():
+            output = model.generate(input_ids, max_new_tokens=args.tokens, min_new_tokens=args.tokens,
+                                    do_sample=False, pad_token_id=0)
+        tokenizer.decode(output[0][input_ids.shape[1]:], skip_special_tokens=True)
+
+    async def request(prompt: str) -> None:
+        async with gate:
+            started = time.perf_counter()
+            if mode == "inline":
+                await generate_inline(prompt)
+                first_chunks.append(time.perf_counter() - started)
+            else:
+                first_chunk = None
+                async with worker.stream(prompt, params) as stream:
+                    async for _ in stream:
+                        first_chunk = first_chunk or time.perf_counter() - started
+                first_chunks.append(first_chunk or time.perf_counter() - started)
+            latencies.append(time.perf_counter() - started)
+
+    stop = asyncio.Event()
+    lags: List[float] = []
+    monitor = asyncio.create_task(heartbeat(stop, lags))
+    started = time.perf_counter()
+    await asyncio.gather(*(request(p) for p in prompts))
+    elapsed = time.perf_counter() - started
+    stop.set()
+    await monitor
+    worker.shutdown()
+
+    lag_ms = [lag * 1000 for lag in lags] or [0.0]
+    return {
+        "mode": mode,
+        "tokens_per_s": len(prompts) * args.tokens / elapsed,
+        "p50_ms": percentile([lat * 1000 for lat in latencies], 50),
+        "p99_ms": percentile([lat * 1000 for lat in latencies], 99),
+        "first_chunk_p50_ms": percentile([lat * 1000 for lat in first_chunks], 50),
+        "loop_lag_p50_ms": percentile(lag_ms, 50),
+        "loop_lag_p99_ms": percentile(lag_ms, 99),
+        "loop_lag_max_ms": max(lag_ms),
+    }
+
+
+def main() -> None:
+    """Parse arguments and run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=32)
+    parser.add_argument("--concurrency", type=int, default=8, help="Requests in flight")
+    parser.add_argument("--tokens", type=int, default=32, help="Tokens generated per request")
+    parser.add_argument("--model", default="", help="transformers model name (default: random GPT-2)")
+    parser.add_argument("--width", type=int, default=256, help="Random GPT-2 hidden size")
+    parser.add_argument("--layers", type=int, default=4, help="Random GPT-2 layers")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    torch.manual_seed(args.seed)
+    model, tokenizer = load_model(args)
+    prompts = [f"Patient {i} reports {'poor' if i % 2 else 'improved'} sleep this week." for i in range(args.requests)]
+
+    rows = [asyncio.run(run_load(mode, model, tokenizer, prompts, args)) for mode in ("inline", "worker")]
+
+    print_table(f"Local generation: {args.requests} requests x {args.tokens} tokens, "
+                f"{args.concurrency} in flight", rows)
+
+
+if __name__ == "__main__":
+    main()
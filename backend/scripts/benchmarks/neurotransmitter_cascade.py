@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+Neurotransmitter cascade benchmark: nested-dict Python loop vs. matrix simulator.
+
+Simulates activity spreading from a starting brain region with:
+  - loop: the previous implementation (connectivity dict rebuilt per call,
+    time steps x target regions x source regions in Python)
+  - matrix: one matrix-vector update per step on a prebuilt transmission matrix
+  - batch: many starting conditions in one call (reported per simulation)
+
+Usage:
+    python scripts/benchmarks/neurotransmitter_cascade.py --time-steps 100 --batch 1000
+"""
+
+import argparse
+import copy
+import time
+from typing import Callable, Dict, List
+
+import numpy as np
+
+from common import print_table, summarize  # noqa: E402  (sets sys.path)
+
+from app.domain.entities.digital_twin_enums import BrainRegion
+from app.domain.entities.neurotransmitter_cascade import DEFAULT_REGION_CONNECTIVITY, CascadeSimulator
+
+
+def loop_cascade(starting_region: BrainRegion, initial_level: float, time_steps: int) -> Dict:
+    """The previous _predict_temporal_cascade loop."""
+    connectivity = copy.deepcopy(DEFAULT_REGION_CONNECTIVITY)  # was a literal rebuilt per call
+    result = {region: [0.0] * time_steps for region in BrainRegion}
+    result[starting_region][0] = initial_level
+    for t in range(1, time_steps):
+        for target_region in BrainRegion:
+            result[target_region][t] = result[target_region][t - 1] * 0.8
+            for source_region, connections in connectivity.items():
+                if target_region in connections and result[source_region][t - 1] > 0.01:
+                    result[target_region][t] += result[source_region][t - 1] * connections[target_region] * 0.4
+            result[target_region][t] = max(0.0, min(1.0, result[target_region][t]))
+    return result
+
+
+def time_call(fn: Callable[[], object], repeats: int) -> List[float]:
+    """Run fn repeatedly and return the elapsed seconds of each run."""
+    samples = []
+    for _ in range(repeats):
+        started = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - started)
+    return samples
+
+
+def main() -> None:
+    """Parse arguments and run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--time-steps", type=int, default=100, help="Steps per simulation")
+    parser.add_argument("--batch", type=int, default=1000, help="Starting conditions in the batch run")
+    parser.add_argument("--repeats", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(args.seed)
+    simulator = CascadeSimulator()
+    start = simulator.initial_levels([{BrainRegion.AMYGDALA: 0.8}])[0]
+    batch = rng.random((args.batch, len(simulator.regions))) * (rng.random((args.batch, len(simulator.regions))) < 0.2)
+
+    def matrix():
+        return simulator.to_region_series(simulator.simulate(start, args.time_steps))
+
+    reference = loop_cascade(BrainRegion.AMYGDALA, 0.8, args.time_steps)
+    diff = max(abs(a - b) for region, levels in matrix().items() for a, b in zip(levels, reference[region]))
+
+    rows: List[Dict[str, object]] = [
+        {"mode": "loop", "simulations": 1,
+         **summarize(time_call(lambda: loop_cascade(BrainRegion.AMYGDALA, 0.8, args.time_steps), args.repeats)),
+         "max_abs_diff": "-"},
+        {"mode": "matrix", "simulations": 1, **summarize(time_call(matrix, args.repeats)), "max_abs_diff": diff},
+    ]
+    samples = time_call(lambda: simulator.simulate(batch, args.time_steps), max(args.repeats // 4, 1))
+    rows.append({"mode": "batch", "simulations": args.batch,
+                 **summarize([s / args.batch for s in samples]), "max_abs_diff": "-"})
+
+    print_table(f"Cascade: {len(simulator.regions)} regions x {args.time_steps} steps (times per simulation)", rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""
+Actigraphy ingestion benchmark for PAT preprocessing.
+
+Converts and resamples synthetic 30 Hz accelerometer windows through:
+  - the previous per-reading loop (datetime.fromisoformat + float() per value)
+  - ActigraphyArray.from_records (bulk column extraction + vectorized parsing)
+  - ActigraphyArray.from_buffer (zero-copy view over packed binary records)
+
+and reports wall time, readings per second and peak RSS growth. List-of-dict
+inputs are only built for windows up to --max-dict-readings because the dicts
+themselves need several GiB for multi-day windows.
+
+Requires: numpy
+
+Usage:
+    python scripts/benchmarks/pat_actigraphy_ingestion.py --hours 1,24,168 --rate 30
+"""
+
+import argparse
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List
+
+from common import peak_rss_mb, print_table  # noqa: E402  (sets sys.path)
+
+import numpy as np
+
+from app.core.services.ml.pat.actigraphy_data import READING_DTYPE, ActigraphyArray
+
+START = datetime(2025, 3, 1, tzinfo=timezone.utc)
+
+
+def _records(count: int, rate: float) -> List[Dict[str, Any]]:
+    """Build reading dicts the way the JSON endpoints receive them."""
+    rng = np.random.default_rng(0)
+    xyz = rng.normal(size=(count, 3)).round(4).tolist()
+    step = timedelta(seconds=1.0 / rate)
+    return [
+        {"timestamp": (START + i * step).isoformat(), "x": x, "y": y, "z": z}
+        for i, (x, y, z) in enumerate(xyz)
+    ]
+
+
+def _packed(count: int, rate: float) -> bytes:
+    """Build the packed binary upload for the same readings."""
+    rng = np.random.default_rng(0)
+    records = np.empty(count, dtype=READING_DTYPE)
+    start_ns = int(START.timestamp()) * 1_000_000_000
+    records["timestamp_ns"] = start_ns + np.round(np.arange(count) * 1e9 / rate).astype(np.int64)
+    for axis in ("x", "y", "z"):
+        records[axis] = rng.normal(size=count)
+    return records.tobytes()
+
+
+def legacy_preprocess(readings: List[Dict[str, Any]], target_length: int) -> np.ndarray:
+    """The per-reading conversion and index resampling this change replaced."""
+    timestamps, x_values, y_values, z_values = [], [], [], []
+    for entry in readings:
+        timestamps.append(datetime.fromisoformat(entry["timestamp"]).timestamp())
+        x_values.append(float(entry["x"]))
+        y_values.append(float(entry["y"]))
+        z_values.append(float(entry["z"]))
+    data = np.column_stack((x_values, y_values, z_values))
+    if len(data) > target_length:
+        data = data[np.linspace(0, len(data) - 1, target_length, dtype=int)]
+    elif len(data) < target_length:
+        data = np.repeat(data, int(np.ceil(target_length / len(data))), axis=0)[:target_length]
+    return data
+
+
+def _measure(impl: str, hours: float, count: int, fn) -> Dict[str, object]:
+    rss_before = peak_rss_mb()
+    started = time.perf_counter()
+    fn()
+    elapsed = time.perf_counter() - started
+    return {
+        "window": f"{hours:g}h",
+        "impl": impl,
+        "readings": count,
+        "seconds": elapsed,
+        "readings_per_s": count / elapsed if elapsed else 0.0,
+        "peak_rss_growth_mb": peak_rss_mb() - rss_before,
+    }
+
+
+def run_window(hours: float, rate: float, max_dict_readings: int) -> List[Dict[str, object]]:
+    """Benchmark every ingestion path for one window length."""
+    window_seconds = int(hours * 3600)
+    count = int(window_seconds * rate)
+    rows = []
+
+    if count <= max_dict_readings:
+        readings = _records(count, rate)
+        target = int(window_seconds * rate)
+        rows.append(_measure("per-reading loop", hours, count, lambda: legacy_preprocess(readings, target)))
+        rows.append(_measure(
+            "from_records", hours, count,
+            lambda: ActigraphyArray.from_records(readings).resample(rate, window_seconds),
+        ))
+        del readings
+
+    payload = _packed(count, rate)
+    rows.append(_measure(
+        "from_buffer", hours, count,
+        lambda: ActigraphyArray.from_buffer(payload).resample(rate, window_seconds),
+    ))
+    return rows
+
+
+def main() -> None:
+    """Parse arguments and run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--hours", default="1,24,168", help="Comma-separated window lengths in hours")
+    parser.add_argument("--rate", type=float, default=30.0, help="Sampling rate in Hz")
+    parser.add_argument("--max-dict-readings", type=int, default=3_000_000,
+                        help="Largest window built as a list of dicts")
+    args = parser.parse_args()
+
+    rows = []
+    for hours in (float(h) for h in args.hours.split(",")):
+        rows.extend(run_window(hours, args.rate, args.max_dict_readings))
+    print_table(f"Actigraphy ingestion + resampling ({args.rate:g} Hz)", rows)
+
+
+if __name__ == "__main__":
+    main()
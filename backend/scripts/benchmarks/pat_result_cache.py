@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""
+PAT result cache benchmark: cache key cost and store latency per backend.
+
+Compares the previous cache key, ``hash(str(actigraphy_data))`` over the
+per-reading request list, with the streaming BLAKE2b ``content_digest`` over
+the columnar readings, and counts key collisions between windows that differ
+in a single reading (``str()`` of a large ndarray elides its middle).
+Then measures get/set latency of the file, SQLite and (fake) Redis stores.
+
+Requires: numpy (fakeredis for the redis row)
+
+Usage:
+    python scripts/benchmarks/pat_result_cache.py --hours 1,6 --rate 30 --ops 500
+"""
+
+import argparse
+import asyncio
+import tempfile
+import time
+from typing import Dict, List
+
+from common import print_table, summarize  # noqa: E402  (sets sys.path)
+
+import numpy as np
+
+from app.core.services.ml.pat.actigraphy_data import ActigraphyArray
+from app.infrastructure.cache.result_store import (
+    FileResultStore,
+    RedisResultStore,
+    SQLiteResultStore,
+    content_digest,
+)
+
+START_NS = 1_740_816_000 * 1_000_000_000
+RESULT = {
+    "analysis_type": "sleep_quality",
+    "metrics": {"sleep_efficiency": 0.82, "wake_after_sleep_onset": 31.5},
+    "hourly_activity": [0.1 * i for i in range(24)],
+}
+
+
+def _readings(count: int, rate: float, seed: int = 0) -> ActigraphyArray:
+    rng = np.random.default_rng(seed)
+    timestamps = START_NS + np.round(np.arange(count) * 1e9 / rate).astype(np.int64)
+    return ActigraphyArray(rng.normal(scale=0.5, size=(count, 3)).astype(np.float32), timestamps)
+
+
+def _digest(readings: ActigraphyArray) -> str:
+    return content_digest([readings.values, readings.timestamps_ns], model_size="medium",
+                          analysis_type="sleep_quality", model_version="bench", patient_metadata=None)
+
+
+def bench_keys(hours: float, rate: float) -> List[Dict[str, object]]:
+    """Time both key schemes and check whether a one-reading change alters the key."""
+    count = int(hours * 3600 * rate)
+    readings = _readings(count, rate)
+    changed = ActigraphyArray(readings.values.copy(), readings.timestamps_ns)
+    changed.values[count // 2, 0] += 1.0
+    records = [
+        {"timestamp": int(ts), "x": float(x), "y": float(y), "z": float(z)}
+        for ts, (x, y, z) in zip(readings.timestamps_ns, readings.values)
+    ]
+
+    rows = []
+    started = time.perf_counter()
+    hash(str(records))
+    rows.append({"window": f"{hours:g}h", "key": "hash(str(list))", "key_s": time.perf_counter() - started,
+                 "detects_change": "n/a"})
+    started = time.perf_counter()
+    hash(str(readings.values))
+    rows.append({"window": f"{hours:g}h", "key": "hash(str(ndarray))", "key_s": time.perf_counter() - started,
+                 "detects_change": hash(str(readings.values)) != hash(str(changed.values))})
+    started = time.perf_counter()
+    key = _digest(readings)
+    rows.append({"window": f"{hours:g}h", "key": "content_digest", "key_s": time.perf_counter() - started,
+                 "detects_change": key != _digest(changed)})
+    return rows
+
+
+async def bench_store(name: str, store, ops: int) -> Dict[str, object]:
+    """Measure set and get latency for distinct keys."""
+    keys = [content_digest([np.array([i])]) for i in range(ops)]
+    set_samples, get_samples = [], []
+    for key in keys:
+        started = time.perf_counter()
+        await store.set(key, RESULT)
+        set_samples.append(time.perf_counter() - started)
+    for key in keys:
+        started = time.perf_counter()
+        assert await store.get(key) == RESULT
+        get_samples.append(time.perf_counter() - started)
+    sets, gets = summarize(set_samples), summarize(get_samples)
+    return {"backend": name, "set_p50_ms": sets["p50_ms"], "set_p99_ms": sets["p99_ms"],
+            "get_p50_ms": gets["p50_ms"], "get_p99_ms": gets["p99_ms"]}
+
+
+async def bench_stores(ops: int) -> List[Dict[str, object]]:
+    """Benchmark every available backend."""
+    rows = []
+    with tempfile.TemporaryDirectory() as directory:
+        rows.append(await bench_store("file", FileResultStore(directory + "/files"), ops))
+        sqlite_store = SQLiteResultStore(directory + "/results.sqlite3")
+        rows.append(await bench_store("sqlite", sqlite_store, ops))
+        sqlite_store.close()
+    try:
+        import fakeredis
+
+        from app.infrastructure.cache.redis_cache import RedisCache
+    except ImportError:
+        return rows
+    cache = RedisCache(redis_url="redis://fake:6379/0")
+    cache._client = fakeredis.FakeAsyncRedis(decode_responses=True)
+    rows.append(await bench_store("redis (fake)", RedisResultStore(cache), ops))
+    return rows
+
+
+def main() -> None:
+    """Parse arguments and run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--hours", default="1,6", help="Comma-separated window lengths in hours")
+    parser.add_argument("--rate", type=float, default=30.0, help="Sampling rate in Hz")
+    parser.add_argument("--ops", type=int, default=500, help="Store operations per backend")
+    args = parser.parse_args()
+
+    rows = []
+    for hours in (float(h) for h in args.hours.split(",")):
+        rows.extend(bench_keys(hours, args.rate))
+    print_table(f"PAT result cache keys ({args.rate:g} Hz)", rows)
+    print_table("Result store latency", asyncio.run(bench_stores(args.ops)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+Benchmark the combined single-pass PHI detection engine against the
+sequential one-scan-per-pattern engine.
+
+Runs ``PHIService.sanitize`` over a response-shaped corpus (keys, ids,
+timestamps, labels and a minority of free-text fields containing PHI) and
+reports throughput for both engines after verifying identical output.
+
+Usage:
+    python scripts/benchmarks/phi_detection_engine.py --records 2000
+"""
+
+import argparse
+import time
+from typing import Any, Dict, List
+
+from common import print_table  # noqa: E402  (sets sys.path)
+
+from app.infrastructure.security.phi.phi_service import PHIService
+
+
+def build_corpus(records: int) -> List[Dict[str, Any]]:
+    """Build a list of API-response-like records."""
+    corpus = []
+    for i in range(records):
+        record: Dict[str, Any] = {
+            "id": f"3f2a{i:08x}-9c1e-4d2b-8f00-{i:012d}",
+            "timestamp": f"2025-03-01T{i % 24:02d}:{i % 60:02d}:00Z",
+            "data_type": "heart_rate",
+            "status": "ok",
+            "value": 60 + i % 40,
+            "notes": "Within normal range",
+        }
+        if i % 10 == 0:
+            record["notes"] = f"Patient John Smith (SSN 123-45-{i % 10000:04d}) called 555-123-4567"
+        corpus.append(record)
+    return corpus
+
+
+def time_engine(service: PHIService, corpus: List[Dict[str, Any]], repeat: int) -> float:
+    """Return the best wall time of sanitizing the corpus."""
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        service.sanitize(corpus, sensitivity="high")
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def main() -> None:
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--records", type=int, default=2000, help="Records in the corpus")
+    parser.add_argument("--repeat", type=int, default=3, help="Repetitions (best is reported)")
+    args = parser.parse_args()
+
+    corpus = build_corpus(args.records)
+    sequential = PHIService(use_combined_engine=False)
+    combined = PHIService(use_combined_engine=True)
+    if sequential.sanitize(corpus, "high") != combined.sanitize(corpus, "high"):
+        raise SystemExit("Engines disagree on the benchmark corpus")
+
+    strings = args.records * 12
+    rows = []
+    for name, service in (("sequential", sequential), ("combined", combined)):
+        elapsed = time_engine(service, corpus, args.repeat)
+        rows.append({
+            "engine": name,
+            "records": args.records,
+            "total_ms": elapsed * 1000.0,
+            "us_per_string": elapsed * 1e6 / strings,
+        })
+    print_table("PHIService.sanitize engine comparison", rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""
+Benchmark buffered vs. streaming JSON sanitization in PHIMiddleware.
+
+Generates an actigraphy-style JSON payload lazily in chunks, pushes it through
+``PHIMiddleware._sanitize_response`` in either mode and consumes the result.
+Each mode runs in its own subprocess so the reported peak RSS is isolated.
+
+Usage:
+    python scripts/benchmarks/phi_middleware_streaming.py --size-mb 8 --iterations 20
+"""
+
+import argparse
+import asyncio
+import json
+import subprocess
+import sys
+import time
+from typing import AsyncIterator, Dict, List
+
+from common import peak_rss_mb, print_table, summarize  # noqa: E402  (sets sys.path)
+
+from starlette.responses import StreamingResponse
+
+from app.infrastructure.security.phi.phi_service import PHIService
+from app.presentation.middleware.phi_middleware import PHIMiddleware
+
+CHUNK_SIZE = 64 * 1024
+
+
+async def generate_payload(size_bytes: int) -> AsyncIterator[bytes]:
+    """Yield an actigraphy-like JSON document of roughly size_bytes in chunks."""
+    header = b'{"analysis_id": "a1b2c3", "patient_contact": "john.smith@example.com", "readings": ['
+    yield header
+    emitted = len(header)
+    buffer: List[bytes] = []
+    buffered = 0
+    index = 0
+    while emitted < size_bytes:
+        reading = json.dumps({
+            "timestamp": f"2025-03-01T00:{(index // 60) % 60:02d}:{index % 60:02d}Z",
+            "x": 0.01 * (index % 97), "y": -0.02 * (index % 89), "z": 0.98,
+            "label": "resting",
+        }).encode("utf-8")
+        piece = (b", " if index else b"") + reading
+        buffer.append(piece)
+        buffered += len(piece)
+        emitted += len(piece)
+        index += 1
+        if buffered >= CHUNK_SIZE:
+            yield b"".join(buffer)
+            buffer, buffered = [], 0
+    if buffer:
+        yield b"".join(buffer)
+    yield b"]}"
+
+
+async def run_mode(streaming: bool, size_bytes: int, iterations: int) -> Dict[str, float]:
+    """Run the middleware in one mode and collect latency statistics."""
+    middleware = PHIMiddleware(lambda scope, receive, send: None, phi_service=PHIService(),
+                               streaming=streaming)
+    baseline_rss = peak_rss_mb()
+    latencies: List[float] = []
+    first_byte: List[float] = []
+    output_bytes = 0
+
+    for _ in range(iterations):
+        response = StreamingResponse(generate_payload(size_bytes), media_type="application/json")
+        started = time.perf_counter()
+        sanitized = await middleware._sanitize_response(response, "/api/v1/actigraphy/analyze")
+        output_bytes = 0
+        first = None
+        if hasattr(sanitized, "body_iterator"):
+            async for chunk in sanitized.body_iterator:
+                if first is None:
+                    first = time.perf_counter() - started
+                output_bytes += len(chunk)
+        else:
+            output_bytes = len(sanitized.body)
+        elapsed = time.perf_counter() - started
+        latencies.append(elapsed)
+        first_byte.append(first if first is not None else elapsed)
+
+    stats = summarize(latencies)
+    return {
+        "mode": "streaming" if streaming else "buffered",
+        "payload_mb": size_bytes / (1024 * 1024),
+        "output_mb": output_bytes / (1024 * 1024),
+        "p50_ms": stats["p50_ms"],
+        "p99_ms": stats["p99_ms"],
+        "ttfb_p99_ms": summarize(first_byte)["p99_ms"],
+        "peak_rss_delta_mb": peak_rss_mb() - baseline_rss,
+    }
+
+
+def main() -> None:
+    """Parse arguments and run both modes in isolated subprocesses."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--size-mb", type=float, default=8.0, help="Payload size in MiB")
+    parser.add_argument("--iterations", type=int, default=20, help="Requests per mode")
+    parser.add_argument("--child", choices=["buffered", "streaming"], help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    size_bytes = int(args.size_mb * 1024 * 1024)
+
+    if args.child:
+        result = asyncio.run(run_mode(args.child == "streaming", size_bytes, args.iterations))
+        print(json.dumps(result))
+        return
+
+    rows = []
+    for mode in ("buffered", "streaming"):
+        completed = subprocess.run(
+            [sys.executable, __file__, "--child", mode,
+             "--size-mb", str(args.size_mb), "--iterations", str(args.iterations)],
+            check=True, capture_output=True, text=True,
+        )
+        rows.append(json.loads(completed.stdout.strip().splitlines()[-1]))
+    print_table("PHIMiddleware response sanitization", rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+Load test for DistributedRateLimiter against a local Redis stand-in (fakeredis).
+
+Fires bursts of concurrent rate limit checks at a single key and compares the
+read-modify-write implementation with the atomic Lua implementation:
+round-trips per request, admitted requests vs. the configured limit
+(over-admission under concurrency) and p99 latency. An artificial per-command
+round-trip time can be injected to approximate a networked Redis.
+
+Requires: fakeredis[lua]
+
+Usage:
+    python scripts/benchmarks/rate_limiter_load.py --concurrency 200 --limit 50 --rtt-ms 0.5
+"""
+
+import argparse
+import asyncio
+import time
+from typing import Dict, List
+
+from common import print_table, summarize  # noqa: E402  (sets sys.path)
+
+import fakeredis
+
+from app.infrastructure.cache.redis_cache import RedisCache
+from app.infrastructure.security.rate_limiting.rate_limiter import (
+    DistributedRateLimiter,
+    RateLimitAlgorithm,
+    RateLimitConfig,
+    RateLimitType,
+)
+
+
+class LatencyFakeRedis(fakeredis.FakeAsyncRedis):
+    """fakeredis client that counts commands and simulates network latency."""
+
+    def __init__(self, rtt_seconds: float, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.rtt_seconds = rtt_seconds
+        self.command_count = 0
+
+    async def execute_command(self, *args, **options):
+        self.command_count += 1
+        if self.rtt_seconds:
+            await asyncio.sleep(self.rtt_seconds)
+        return await super().execute_command(*args, **options)
+
+
+async def run_scenario(
+    atomic: bool, algorithm: RateLimitAlgorithm, concurrency: int, limit: int, rounds: int, rtt: float
+) -> Dict[str, object]:
+    """Run one implementation and collect statistics."""
+    client = LatencyFakeRedis(rtt, decode_responses=True, max_connections=concurrency * 2)
+    cache = RedisCache(redis_url="redis://fake:6379/0")
+    cache._client = client
+    limiter = DistributedRateLimiter(cache_service=cache, atomic=atomic)
+    limiter.configure(
+        RateLimitType.DEFAULT,
+        RateLimitConfig(requests_per_period=limit, period_seconds=3600, algorithm=algorithm),
+    )
+    # Warm up script registration so it is not counted
+    await limiter.is_rate_limited("warmup")
+    client.command_count = 0
+
+    latencies: List[float] = []
+    admitted = 0
+
+    async def one_request(key: str) -> bool:
+        started = time.perf_counter()
+        limited, _ = await limiter.is_rate_limited(key)
+        latencies.append(time.perf_counter() - started)
+        return not limited
+
+    for round_index in range(rounds):
+        results = await asyncio.gather(*(one_request(f"ip:{round_index}") for _ in range(concurrency)))
+        admitted += sum(results)
+
+    total = concurrency * rounds
+    stats = summarize(latencies)
+    await client.aclose()
+    return {
+        "impl": "atomic" if atomic else "read-modify-write",
+        "algorithm": algorithm.value if atomic else "token_bucket",
+        "requests": total,
+        "round_trips_per_req": client.command_count / total,
+        "admitted": admitted,
+        "allowed_max": limit * rounds,
+        "p50_ms": stats["p50_ms"],
+        "p99_ms": stats["p99_ms"],
+    }
+
+
+async def main_async(args: argparse.Namespace) -> None:
+    """Run all scenarios and print the results."""
+    rtt = args.rtt_ms / 1000.0
+    rows = [
+        await run_scenario(False, RateLimitAlgorithm.FIXED_WINDOW, args.concurrency, args.limit, args.rounds, rtt),
+        await run_scenario(True, RateLimitAlgorithm.FIXED_WINDOW, args.concurrency, args.limit, args.rounds, rtt),
+        await run_scenario(True, RateLimitAlgorithm.GCRA, args.concurrency, args.limit, args.rounds, rtt),
+    ]
+    print_table("DistributedRateLimiter load test (fakeredis)", rows)
+
+
+def main() -> None:
+    """Parse arguments and run the load test."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--concurrency", type=int, default=200, help="Concurrent requests per key")
+    parser.add_argument("--limit", type=int, default=50, help="Requests allowed per period")
+    parser.add_argument("--rounds", type=int, default=5, help="Bursts (one key per burst)")
+    parser.add_argument("--rtt-ms", type=float, default=0.5, help="Simulated round-trip time per command")
+    asyncio.run(main_async(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+Rolling-window time series benchmark: per-index loops vs. O(n) vectorized utilities.
+
+Times and measures peak allocation (tracemalloc) for:
+  - anomalies: the previous loop (np.mean/np.std per window) vs.
+    cumulative-sum rolling statistics, plus the online detector fed in chunks
+  - sequences: the previous list of slices + np.array copy vs.
+    sliding_window_view strided views
+
+The previous loops are run on --legacy-samples (they are O(n*w) and copy
+every window); ns_per_sample makes the rows comparable.
+
+Usage:
+    python scripts/benchmarks/rolling_window_processing.py --samples 1000000 --window 30
+"""
+
+import argparse
+import time
+import tracemalloc
+from typing import Callable, Dict, List
+
+import numpy as np
+
+from common import print_table  # noqa: E402  (sets sys.path)
+
+from app.core.utils.rolling_statistics import OnlineAnomalyDetector, detect_anomalies, sliding_sequences
+
+
+def loop_anomalies(data: np.ndarray, window_size: int, threshold: float) -> np.ndarray:
+    """The previous TimeSeriesProcessor.detect_anomalies."""
+    anomalies = np.zeros(len(data), dtype=bool)
+    for i in range(len(data) - window_size):
+        window = data[i : i + window_size]
+        window_mean = np.mean(window)
+        window_std = np.std(window)
+        if window_std == 0:
+            continue
+        if abs((data[i + window_size] - window_mean) / window_std) > threshold:
+            anomalies[i + window_size] = True
+    return anomalies
+
+
+def loop_sequences(data: np.ndarray, sequence_length: int, target_column: int):
+    """The previous TimeSeriesProcessor.create_sequences."""
+    X, y = [], []
+    for i in range(len(data) - sequence_length):
+        X.append(data[i : i + sequence_length])
+        y.append(data[i + sequence_length, target_column])
+    return np.array(X), np.array(y)
+
+
+def measure(name: str, samples: int, fn: Callable[[], object]) -> Dict[str, object]:
+    """Elapsed time and peak traced allocation of one call."""
+    tracemalloc.start()
+    started = time.perf_counter()
+    fn()
+    elapsed = time.perf_counter() - started
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return {"mode": name, "samples": samples, "total_ms": elapsed * 1000,
+            "ns_per_sample": elapsed * 1e9 / samples, "peak_mb": peak / 2**20}
+
+
+def main() -> None:
+    """Parse arguments and run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--samples", type=int, default=1_000_000, help="Samples in the series")
+    parser.add_argument("--legacy-samples", type=int, default=100_000, help="Samples given to the previous loops")
+    parser.add_argument("--window", type=int, default=30, help="Window / sequence length")
+    parser.add_argument("--features", type=int, default=4, help="Features for sequence creation")
+    parser.add_argument("--chunk", type=int, default=1000, help="Chunk size for the online detector")
+    parser.add_argument("--threshold", type=float, default=3.0)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(args.seed)
+    series = 70 + rng.normal(0, 3, args.samples)
+    series[rng.choice(args.samples, args.samples // 1000, replace=False)] += 25
+    matrix = rng.normal(size=(args.samples, args.features))
+    legacy = min(args.legacy_samples, args.samples)
+
+    def online():
+        detector = OnlineAnomalyDetector(args.window, args.threshold)
+        for start in range(0, args.samples, args.chunk):
+            detector.update(series[start:start + args.chunk])
+
+    rows: List[Dict[str, object]] = [
+        measure("anomalies: loop", legacy, lambda: loop_anomalies(series[:legacy], args.window, args.threshold)),
+        measure("anomalies: cumsum", args.samples, lambda: detect_anomalies(series, args.window, args.threshold)),
+        measure(f"anomalies: online ({args.chunk}/chunk)", args.samples, online),
+        measure("sequences: copy", legacy, lambda: loop_sequences(matrix[:legacy], args.window, 0)),
+        measure("sequences: view", args.samples, lambda: sliding_sequences(matrix, args.window, 0)),
+    ]
+    agree = np.array_equal(loop_anomalies(series[:legacy], args.window, args.threshold),
+                           detect_anomalies(series[:legacy], args.window, args.threshold))
+
+    print_table(f"Rolling windows: window {args.window}, {args.features} features "
+                f"(flags identical to loop: {agree})", rows)
+
+
+if __name__ == "__main__":
+    main()
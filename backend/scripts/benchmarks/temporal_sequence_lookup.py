@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+TemporalSequence lookup benchmark: linear scans vs. binary search vs. batch.
+
+Interpolates values at random timestamps in sequences of increasing length
+with:
+  - the previous list-based get_value_at (exact-match scan plus two full
+    neighbour index lists per lookup)
+  - the array-backed get_value_at (searchsorted per lookup)
+  - values_at (one vectorized call for all lookups)
+
+Requires: numpy
+
+Usage:
+    python scripts/benchmarks/temporal_sequence_lookup.py --points 1000,10000,100000 --lookups 1000
+"""
+
+import argparse
+import time
+import uuid
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional
+
+from common import print_table  # noqa: E402  (sets sys.path)
+
+import numpy as np
+
+from app.domain.entities.temporal_sequence import TemporalSequence
+from app.domain.utils.datetime_utils import UTC
+
+START = datetime(2025, 1, 1, tzinfo=UTC)
+
+
+def legacy_get_value_at(timestamps: List[datetime], values: List[List[float]],
+                        timestamp: datetime, feature_index: int = 0) -> Optional[float]:
+    """The previous linear-scan implementation (linear interpolation)."""
+    for i, ts in enumerate(timestamps):
+        if ts == timestamp:
+            return values[i][feature_index]
+    before_indices = [i for i, ts in enumerate(timestamps) if ts < timestamp]
+    after_indices = [i for i, ts in enumerate(timestamps) if ts > timestamp]
+    if not before_indices or not after_indices:
+        return None
+    before_idx, after_idx = max(before_indices), min(after_indices)
+    before_ts, after_ts = timestamps[before_idx], timestamps[after_idx]
+    position = (timestamp - before_ts).total_seconds() / (after_ts - before_ts).total_seconds()
+    before_value = values[before_idx][feature_index]
+    return before_value + (values[after_idx][feature_index] - before_value) * position
+
+
+def run(points: int, lookups: int, max_legacy_work: int) -> Dict[str, object]:
+    """Benchmark the three lookup paths for one sequence length."""
+    rng = np.random.default_rng(0)
+    timestamps = [START + timedelta(minutes=5 * i) for i in range(points)]
+    values = rng.normal(size=(points, 4)).tolist()
+    sequence = TemporalSequence(sequence_id=uuid.uuid4(), feature_names=["a", "b", "c", "d"],
+                                timestamps=timestamps, values=values, patient_id=uuid.uuid4())
+    queries = [START + timedelta(seconds=float(s)) for s in rng.uniform(0, 300 * (points - 1), lookups)]
+
+    row: Dict[str, object] = {"points": points, "lookups": lookups}
+    if points * lookups <= max_legacy_work:
+        started = time.perf_counter()
+        expected = [legacy_get_value_at(timestamps, values, q) for q in queries]
+        row["legacy_s"] = time.perf_counter() - started
+    else:
+        expected = None
+        row["legacy_s"] = "skipped"
+
+    started = time.perf_counter()
+    scalar = [sequence.get_value_at(q) for q in queries]
+    row["bisect_s"] = time.perf_counter() - started
+
+    started = time.perf_counter()
+    batch = sequence.values_at(queries, feature_index=0)
+    row["values_at_s"] = time.perf_counter() - started
+
+    assert np.allclose(batch, scalar)
+    if expected is not None:
+        assert np.allclose(scalar, expected)
+    return row
+
+
+def main() -> None:
+    """Parse arguments and run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--points", default="1000,10000,100000", help="Comma-separated sequence lengths")
+    parser.add_argument("--lookups", type=int, default=1000, help="Lookups per sequence")
+    parser.add_argument("--max-legacy-work", type=int, default=20_000_000,
+                        help="Skip the legacy scan above points * lookups")
+    args = parser.parse_args()
+
+    rows = [run(int(p), args.lookups, args.max_legacy_work) for p in args.points.split(",")]
+    print_table("TemporalSequence interpolated lookups", rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Hot-key read benchmark for RedisCache vs. TieredCache (fakeredis).
+
+Repeatedly reads a small set of hot analytics keys through both caches and
+reports Redis round-trips per read, L1 hit ratio and per-read latency. An
+artificial per-command round-trip time approximates a networked Redis.
+
+Requires: fakeredis
+
+Usage:
+    python scripts/benchmarks/tiered_cache_hot_keys.py --reads 20000 --keys 50 --rtt-ms 0.3
+"""
+
+import argparse
+import asyncio
+import random
+import time
+from typing import Dict, List
+
+from common import print_table, summarize  # noqa: E402  (sets sys.path)
+
+import fakeredis
+
+from app.infrastructure.cache.redis_cache import RedisCache
+from app.infrastructure.cache.tiered_cache import TieredCache
+
+
+class LatencyFakeRedis(fakeredis.FakeAsyncRedis):
+    """fakeredis client that counts commands and simulates network latency."""
+
+    def __init__(self, rtt_seconds: float, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.rtt_seconds = rtt_seconds
+        self.command_count = 0
+
+    async def execute_command(self, *args, **options):
+        self.command_count += 1
+        if self.rtt_seconds:
+            await asyncio.sleep(self.rtt_seconds)
+        return await super().execute_command(*args, **options)
+
+
+def _payload(index: int) -> Dict[str, object]:
+    """Build a representative analytics result document."""
+    return {
+        "provider_id": f"provider-{index}",
+        "metrics": {f"metric_{m}": m * 1.5 for m in range(40)},
+        "series": [{"day": d, "visits": d * 3, "no_shows": d % 4} for d in range(30)],
+    }
+
+
+async def run_scenario(tiered: bool, reads: int, keys: int, rtt: float, seed: int) -> Dict[str, object]:
+    """Run one cache implementation and collect statistics."""
+    client = LatencyFakeRedis(rtt, decode_responses=True)
+    cache = TieredCache(redis_url="redis://fake:6379/0", invalidation=None) if tiered \
+        else RedisCache(redis_url="redis://fake:6379/0")
+    cache._client = client
+
+    names = [f"practice_metrics:{i}:2025-01-01:now" for i in range(keys)]
+    for index, name in enumerate(names):
+        await cache.set(name, _payload(index), expiration=300)
+    client.command_count = 0
+
+    rng = random.Random(seed)
+    latencies: List[float] = []
+    for _ in range(reads):
+        key = names[min(int(rng.expovariate(5.0 / keys)), keys - 1)]
+        started = time.perf_counter()
+        await cache.get(key)
+        latencies.append(time.perf_counter() - started)
+
+    stats = summarize(latencies)
+    hit_ratio = cache.stats()["hit_ratio"] if tiered else 0.0
+    await client.aclose()
+    return {
+        "impl": "TieredCache" if tiered else "RedisCache",
+        "reads": reads,
+        "round_trips_per_read": client.command_count / reads,
+        "l1_hit_ratio": hit_ratio,
+        "mean_ms": stats["mean_ms"],
+        "p99_ms": stats["p99_ms"],
+    }
+
+
+async def main_async(args: argparse.Namespace) -> None:
+    """Run both scenarios and print the results."""
+    rtt = args.rtt_ms / 1000.0
+    rows = [
+        await run_scenario(False, args.reads, args.keys, rtt, args.seed),
+        await run_scenario(True, args.reads, args.keys, rtt, args.seed),
+    ]
+    print_table("Hot-key reads (fakeredis)", rows)
+
+
+def main() -> None:
+    """Parse arguments and run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--reads", type=int, default=20000, help="Number of cache reads")
+    parser.add_argument("--keys", type=int, default=50, help="Number of distinct hot keys")
+    parser.add_argument("--rtt-ms", type=float, default=0.3, help="Simulated round-trip time per command")
+    parser.add_argument("--seed", type=int, default=7, help="Random seed for the key distribution")
+    asyncio.run(main_async(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""
+Transformer forecasting benchmark: full recompute vs. encoder-cached decoding.
+
+Times MultiHorizonTransformer.predict on CPU for each horizon with:
+  - full: the previous path, re-running the encoder over the history and the
+    decoder over the whole growing target at every step
+  - cached: the history encoded once, each step decoding only the new
+    position against per-layer key/value caches
+
+Usage:
+    python scripts/benchmarks/transformer_decoding.py --horizons 7,30,90 --history 90
+"""
+
+import argparse
+import asyncio
+import time
+from typing import Dict, List
+
+import numpy as np
+import torch
+
+from common import print_table, summarize  # noqa: E402  (sets sys.path)
+
+from app.infrastructure.ml.symptom_forecasting.transformer_model import MultiHorizonTransformer
+
+
+def time_predict(model: MultiHorizonTransformer, history: torch.Tensor, horizon: int,
+                 use_cache: bool, repeats: int) -> List[float]:
+    """Run predict repeatedly and return the elapsed seconds of each run."""
+    samples = []
+    for _ in range(repeats):
+        started = time.perf_counter()
+        asyncio.run(model.predict(history, horizon, use_cache=use_cache))
+        samples.append(time.perf_counter() - started)
+    return samples
+
+
+def main() -> None:
+    """Parse arguments and run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--horizons", default="7,30,90", help="Comma-separated forecast horizons")
+    parser.add_argument("--history", type=int, default=90, help="Days of history encoded")
+    parser.add_argument("--features", type=int, default=10, help="Input/output features")
+    parser.add_argument("--batch", type=int, default=1)
+    parser.add_argument("--repeats", type=int, default=5)
+    parser.add_argument("--threads", type=int, default=1, help="torch intra-op threads")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    torch.manual_seed(args.seed)
+    torch.set_num_threads(args.threads)
+    # Production dimensions (see SymptomTransformerModel)
+    model = MultiHorizonTransformer(input_dim=args.features, output_dim=args.features).eval()
+    history = torch.randn(args.batch, args.history, args.features)
+
+    rows: List[Dict[str, object]] = []
+    for horizon in (int(h) for h in args.horizons.split(",")):
+        full = asyncio.run(model.predict(history, horizon, use_cache=False))["values"]
+        cached = asyncio.run(model.predict(history, horizon))["values"]
+        diff = float(np.max(np.abs(full - cached)))
+        for mode, use_cache in (("full", False), ("cached", True)):
+            rows.append({"horizon": horizon, "mode": mode,
+                         **summarize(time_predict(model, history, horizon, use_cache, args.repeats)),
+                         "max_abs_diff": diff if use_cache else "-"})
+
+    print_table(f"Transformer predict on CPU: history {args.history}, batch {args.batch}, "
+                f"{args.threads} thread(s)", rows)
+
+
+if __name__ == "__main__":
+    main()
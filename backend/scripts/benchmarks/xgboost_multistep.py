@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+XGBoost multi-step forecast benchmark: per-step DMatrix + np.roll vs. ring buffer.
+
+Forecasts --horizon steps for --targets targets on a batch of --batch rows:
+  - loop: the previous predict (a DMatrix and an np.roll copy per step per
+    target, plus get_score on every request)
+  - ring: per-target boosters predicting in place from a preallocated ring
+    buffer, with memoized feature importance
+  - ring (multi-output): one multi-output booster pass per step
+
+Also reports bytes allocated per request (tracemalloc; xgboost's own native
+allocations are not traced).
+
+Usage:
+    python scripts/benchmarks/xgboost_multistep.py --horizon 30 --targets 5 --batch 64
+"""
+
+import argparse
+import time
+import tracemalloc
+from typing import Callable, Dict, List
+
+import numpy as np
+import xgboost as xgb
+
+from common import print_table, summarize  # noqa: E402  (sets sys.path)
+
+from app.infrastructure.ml.symptom_forecasting.xgboost_model import XGBoostSymptomModel
+
+
+def loop_predict(model: XGBoostSymptomModel, X: np.ndarray, horizon: int) -> Dict:
+    """The previous XGBoostSymptomModel.predict body."""
+    dmatrix = xgb.DMatrix(X, feature_names=model.feature_names)
+    feature_importance = {}
+    for target_name, booster in model.models.items():
+        booster.predict(dmatrix)
+        feature_importance[target_name] = booster.get_score(importance_type="gain")
+    combined = np.zeros((X.shape[0], horizon, len(model.target_names)))
+    for i, target_name in enumerate(model.target_names):
+        current_input = X.copy()
+        for h in range(horizon):
+            step_pred = model.models[target_name].predict(
+                xgb.DMatrix(current_input, feature_names=model.feature_names))
+            combined[:, h, i] = step_pred
+            current_input = np.roll(current_input, -1, axis=1)
+            current_input[:, -1] = step_pred
+    return {"values": combined, "feature_importance": feature_importance}
+
+
+def measure(fn: Callable[[], object], repeats: int) -> Dict[str, float]:
+    """Latency summary plus peak traced bytes of one call."""
+    fn()  # warm up
+    samples = []
+    for _ in range(repeats):
+        started = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - started)
+    tracemalloc.start()
+    fn()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return {**summarize(samples), "peak_kb": peak / 1024}
+
+
+def main() -> None:
+    """Parse arguments and run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--horizon", type=int, default=30)
+    parser.add_argument("--targets", type=int, default=5)
+    parser.add_argument("--batch", type=int, default=64)
+    parser.add_argument("--features", type=int, default=20)
+    parser.add_argument("--trees", type=int, default=200, help="Boosting rounds per model")
+    parser.add_argument("--nthread", type=int, default=1)
+    parser.add_argument("--repeats", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(args.seed)
+    X_train = rng.normal(size=(2000, args.features))
+    y_train = X_train[:, :args.targets] + rng.normal(scale=0.1, size=(2000, args.targets))
+    X = rng.normal(size=(args.batch, args.features))
+
+    per_target = XGBoostSymptomModel(n_estimators=args.trees)
+    per_target.train(X_train, y_train, optimize=False)
+    per_target.set_nthread(args.nthread)
+    multi = XGBoostSymptomModel(n_estimators=args.trees)
+    multi.train(X_train, y_train, optimize=False, multi_output=True)
+    multi.set_nthread(args.nthread)
+
+    diff = float(np.max(np.abs(loop_predict(per_target, X, args.horizon)["values"]
+                               - per_target.predict_sync(X, args.horizon)["values"])))
+    rows: List[Dict[str, object]] = [
+        {"mode": "loop", **measure(lambda: loop_predict(per_target, X, args.horizon), args.repeats),
+         "max_abs_diff": "-"},
+        {"mode": "ring", **measure(lambda: per_target.predict_sync(X, args.horizon), args.repeats),
+         "max_abs_diff": diff},
+        {"mode": "ring (multi-output)", **measure(lambda: multi.predict_sync(X, args.horizon), args.repeats),
+         "max_abs_diff": "-"},
+    ]
+
+    print_table(f"XGBoost forecast: horizon {args.horizon} x {args.targets} targets x batch {args.batch}, "
+                f"{args.trees} trees, nthread {args.nthread}", rows)
+
+
+if __name__ == "__main__":
+    main()